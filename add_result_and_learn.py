@@ -1,6 +1,7 @@
 # add_result_and_learn.py
 import pandas as pd
 from utils.feedback_learner import FeedbackLearner
+from utils.prediction_ledger import get_prediction_ledger
 import json
 from datetime import datetime
 
@@ -12,14 +13,13 @@ def add_result_and_learn():
     print("🎯 ADD REAL RESULT & LEARN")
     print("="*60)
     
-    # Load prediction tracking
-    pred_file = "prediction_tracking.csv"
-    if not pd.io.common.file_exists(pred_file):
+    # Load prediction tracking (ledger ids are the row numbers)
+    ledger = get_prediction_ledger()
+    if not ledger.count('tracking'):
         print("❌ No predictions to evaluate!")
         return
     
-    pred_df = pd.read_csv(pred_file)
-    pending = pred_df[pred_df['hit_status'] == 'pending']
+    pending = ledger.frame('tracking', status='pending')
     
     if pending.empty:
         print("✅ All predictions already evaluated!")
@@ -42,7 +42,7 @@ def add_result_and_learn():
             print("❌ Invalid choice!")
             return
         
-        selected = pred_df.loc[choice]
+        selected = pending.loc[choice]
         
         print(f"\n📝 Updating prediction for {selected['draw_date']}")
         print(f"Predicted numbers: {selected['predicted_numbers']}")
@@ -74,13 +74,13 @@ def add_result_and_learn():
         )
         
         # Update tracking
-        pred_df.at[choice, 'actual_1st'] = actual_1st
-        pred_df.at[choice, 'actual_2nd'] = actual_2nd
-        pred_df.at[choice, 'actual_3rd'] = actual_3rd
-        pred_df.at[choice, 'hit_status'] = match_type
-        pred_df.at[choice, 'accuracy_score'] = score
-        
-        pred_df.to_csv(pred_file, index=False)
+        ledger.update('tracking', choice, {
+            'actual_1st': actual_1st,
+            'actual_2nd': actual_2nd,
+            'actual_3rd': actual_3rd,
+            'hit_status': match_type,
+            'accuracy_score': score
+        })
         
         # Learn from result
         learner.learn_from_result({
@@ -1,41 +1,14 @@
-from flask import Flask, render_template, request, redirect, jsonify, Response
+from flask import Flask, render_template, request, jsonify, Response, g, before_render_template, template_rendered
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime
 import os
-import numpy as np
-from datetime import date as date_obj
 import re
-import time
 import logging
-import ast
-import threading
-from collections import defaultdict, Counter
-from itertools import product
-from sklearn.linear_model import LinearRegression
-from sklearn.preprocessing import StandardScaler
+
 # ---------------- Logging ----------------
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-try:
-    from utils.pattern_finder import find_all_4digit_patterns
-    from utils.pattern_stats import compute_pattern_frequencies, compute_cell_heatmap
-    from utils.ai_predictor import predict_top_5
-    from utils.app_grid import generate_reverse_grid, generate_4x4_grid
-    from utils.pattern_memory import learn_pattern_transitions
-    from utils.pattern_predictor import predict_from_today_grid
-except ImportError as e:
-    logger.error(f"Import error: {e}")
-    # Fallback implementations
-    def find_all_4digit_patterns(grid): return []
-    def compute_pattern_frequencies(draws): return []
-    def compute_cell_heatmap(draws): return {}
-    def predict_top_5(draws, mode="combined"): return {"combined": []}
-    def generate_reverse_grid(number): return [[0]*4 for _ in range(4)]
-    def generate_4x4_grid(number): return [[int(d) for d in number] for _ in range(4)]
-    def learn_pattern_transitions(draws): return {}
-    def predict_from_today_grid(number, transitions): return []
-
 try:
     import config
     app = Flask(__name__)
@@ -46,3978 +19,209 @@ except ImportError:
 
 # ✅ make datetime available inside all HTML templates
 @app.context_processor
-def inject_datetime():
-    return {'datetime': datetime}
-
-# ---------------- CSV LOADER (CORRECTED) ---------------- #
-_csv_cache = None
-_csv_cache_time = None
-_csv_lock = threading.Lock()
-
-from utils.data_normalizer import normalize_dataframe
-
-def load_csv_data():
-    """
-    Load CSV with canonical normalization applied once.
-    All downstream code uses normalized columns.
-    """
-    global _csv_cache, _csv_cache_time, _smart_model_cache, _ml_model_cache
-    
-    # Always clear caches to ensure fresh data
-    _smart_model_cache.clear()
-    _ml_model_cache.clear()
-    
-    try:
-        import warnings
-        warnings.filterwarnings('ignore', category=pd.errors.ParserWarning)
-        
-        csv_paths = ['4d_results_history.csv', 'utils/4d_results_history.csv']
-        df = None
-        
-        for csv_path in csv_paths:
-            if os.path.exists(csv_path):
-                df = pd.read_csv(csv_path, index_col=False, on_bad_lines='skip')
-                if not df.empty:
-                    logger.info(f"Loaded CSV from: {csv_path} ({len(df)} rows)")
-                    break
-        
-        if df is None or df.empty:
-            logger.error("No valid CSV file found")
-            return pd.DataFrame()
-            
-    except Exception as e:
-        logger.error(f"CSV loading error: {e}")
-        return pd.DataFrame()
-
-    # Apply canonical normalization (SINGLE SOURCE OF TRUTH)
-    df = normalize_dataframe(df)
-    
-    # Filter to valid rows only
-    df = df[df['is_valid']].copy()
-    
-    # Sort by date descending (newest first for predictions)
-    df = df.sort_values('date_parsed', ascending=False).reset_index(drop=True)
-    
-    # ADD ALIASES FOR BACKWARD COMPATIBILITY
-    # Many routes expect '1st_real', '2nd_real', '3rd_real' columns
-    df['1st_real'] = df['number_1st']
-    df['2nd_real'] = df['number_2nd']
-    df['3rd_real'] = df['number_3rd']
-    df['provider'] = df['provider_key']
-    
-    # Log sample
-    if not df.empty:
-        logger.info(f"Canonical data ready: {len(df)} rows | Providers: {df['provider_key'].unique()[:5].tolist()}")
-        logger.debug(f"Sample:\n{df[['date_parsed', 'provider_key', 'number_1st', 'number_2nd', 'number_3rd']].head(3)}")
-    
-    return df
-
-# (The rest of your code is unchanged and remains the same as your original)
-
-# ---------------- HELPERS ---------------- #
-def find_missing_digits(grid):
-    all_digits = set(map(str, range(10)))
-    used_digits = set(str(cell) for row in grid for cell in row)
-    return sorted(all_digits - used_digits)
-
-def find_4digit_patterns(grid):
-    patterns = find_all_4digit_patterns(grid)
-    
-    # Add Fibonacci sequence detection
-    fib_patterns = detect_fibonacci_patterns(grid)
-    patterns.extend(fib_patterns)
-    
-    # Add prime clustering
-    prime_patterns = detect_prime_clusters(grid)
-    patterns.extend(prime_patterns)
-    
-    # Add sum range patterns
-    sum_patterns = detect_sum_patterns(grid)
-    patterns.extend(sum_patterns)
-    
-    # 🎯 ADVANCED: Golden ratio patterns
-    golden_patterns = detect_golden_ratio_patterns(grid)
-    patterns.extend(golden_patterns)
-    
-    # 🎯 ADVANCED: Harmonic sequences
-    harmonic_patterns = detect_harmonic_sequences(grid)
-    patterns.extend(harmonic_patterns)
-    
-    # 🎯 ADVANCED: Mirror symmetry
-    mirror_patterns = detect_mirror_symmetry(grid)
-    patterns.extend(mirror_patterns)
-    
-    # 🎯 ADVANCED: Arithmetic progressions
-    arithmetic_patterns = detect_arithmetic_progressions(grid)
-    patterns.extend(arithmetic_patterns)
-    
-    return patterns
-
-def detect_fibonacci_patterns(grid):
-    """Detect Fibonacci sequences in 4D grid"""
-    fib_seq = [0, 1, 1, 2, 3, 5, 8]
-    patterns = []
-    
-    for i, row in enumerate(grid):
-        for j in range(len(row) - 2):
-            seq = [int(str(row[j+k])[0]) for k in range(3) if str(row[j+k]).isdigit()]
-            if len(seq) == 3:
-                for start in range(len(fib_seq) - 2):
-                    if seq == fib_seq[start:start+3]:
-                        patterns.append(('fibonacci', f'row_{i}', ''.join(map(str, seq)), [(i, j+k) for k in range(3)]))
-    return patterns
-
-def detect_prime_clusters(grid):
-    """Detect prime number clustering"""
-    primes = [2, 3, 5, 7]
-    patterns = []
-    
-    for i, row in enumerate(grid):
-        prime_positions = []
-        for j, cell in enumerate(row):
-            if str(cell).isdigit() and int(str(cell)[0]) in primes:
-                prime_positions.append((i, j))
-        
-        if len(prime_positions) >= 2:
-            prime_nums = ''.join([str(grid[pos[0]][pos[1]]) for pos in prime_positions])
-            patterns.append(('prime_cluster', f'row_{i}', prime_nums[:4], prime_positions[:4]))
-    return patterns
-
-def detect_sum_patterns(grid):
-    """Detect sum range patterns (low/mid/high)"""
-    patterns = []
-    
-    for i, row in enumerate(grid):
-        row_sum = sum([int(str(cell)) for cell in row if str(cell).isdigit()])
-        if row_sum <= 10:
-            range_type = 'low_sum'
-        elif row_sum <= 25:
-            range_type = 'mid_sum'
-        else:
-            range_type = 'high_sum'
-        
-        patterns.append((range_type, f'row_{i}', str(row_sum), [(i, j) for j in range(len(row))]))
-    return patterns
-
-def detect_golden_ratio_patterns(grid):
-    """🎯 ADVANCED: Detect golden ratio (1.618) patterns in grid"""
-    patterns = []
-    phi = 1.618
-    
-    for i, row in enumerate(grid):
-        for j in range(len(row) - 1):
-            if str(row[j]).isdigit() and str(row[j+1]).isdigit():
-                val1, val2 = int(str(row[j])[0]), int(str(row[j+1])[0])
-                if val2 > 0 and abs((val1 / val2) - phi) < 0.3:
-                    patterns.append(('golden_ratio', f'row_{i}', f'{val1}/{val2}', [(i, j), (i, j+1)]))
-    return patterns
-
-def detect_harmonic_sequences(grid):
-    """🎯 ADVANCED: Detect harmonic number sequences (1, 1/2, 1/3, 1/4...)"""
-    patterns = []
-    harmonic = [1, 2, 3, 5, 8]  # Simplified harmonic-like sequence
-    
-    for i, row in enumerate(grid):
-        row_digits = [int(str(cell)[0]) for cell in row if str(cell).isdigit()]
-        if len(row_digits) >= 3:
-            for start in range(len(row_digits) - 2):
-                seq = row_digits[start:start+3]
-                if seq in [harmonic[i:i+3] for i in range(len(harmonic)-2)]:
-                    patterns.append(('harmonic', f'row_{i}', ''.join(map(str, seq)), [(i, start+k) for k in range(3)]))
-    return patterns
-
-def detect_mirror_symmetry(grid):
-    """🎯 ADVANCED: Detect mirror/palindrome patterns"""
-    patterns = []
-    
-    for i, row in enumerate(grid):
-        row_str = ''.join([str(cell) for cell in row if str(cell).isdigit()])
-        if len(row_str) >= 2 and row_str == row_str[::-1]:
-            patterns.append(('mirror_symmetry', f'row_{i}', row_str, [(i, j) for j in range(len(row))]))
-    
-    # Check diagonal symmetry
-    for i in range(len(grid) - 1):
-        for j in range(len(grid[i]) - 1):
-            if str(grid[i][j]).isdigit() and str(grid[i+1][j+1]).isdigit():
-                if str(grid[i][j])[0] == str(grid[i+1][j+1])[0]:
-                    patterns.append(('diagonal_mirror', f'pos_{i}_{j}', str(grid[i][j]), [(i, j), (i+1, j+1)]))
-    return patterns
-
-def detect_arithmetic_progressions(grid):
-    """🎯 ADVANCED: Detect arithmetic progressions (e.g., 2,4,6,8 or 1,3,5,7)"""
-    patterns = []
-    
-    for i, row in enumerate(grid):
-        row_digits = [int(str(cell)[0]) for cell in row if str(cell).isdigit()]
-        if len(row_digits) >= 3:
-            for start in range(len(row_digits) - 2):
-                seq = row_digits[start:start+3]
-                if len(seq) == 3:
-                    diff1 = seq[1] - seq[0]
-                    diff2 = seq[2] - seq[1]
-                    if diff1 == diff2 and diff1 != 0:
-                        patterns.append(('arithmetic_prog', f'row_{i}', f'{seq[0]},{seq[1]},{seq[2]}', [(i, start+k) for k in range(3)]))
-    return patterns
-
-def highlight_coords_for_patterns(patterns, targets):
-    highlights = []
-    for kind, idx, p, coords in patterns:
-        if p in targets:
-            highlights.append(coords)
-    return [xy for coords in highlights for xy in coords]
-
-def search_pattern_in_grid(grid, pattern):
-    matches = []
-    pattern = str(pattern)
-    for kind, idx, p, coords in find_4digit_patterns(grid):
-        if pattern == p:
-            matches.append(coords)
-    return matches
-
-def build_pattern_history(draws):
-    pattern_success = defaultdict(int)
-    for i in range(len(draws) - 1):
-        this_draw = draws[i]
-        next_draw = draws[i + 1]
-        next_targets = [
-            str(next_draw.get(col, ''))
-            for col in ['1st_real', '2nd_real', '3rd_real']
-            if str(next_draw.get(col, '')).isdigit()
-        ]
-        for kind, idx, p, coords in this_draw.get('patterns', []):
-            if p in next_targets:
-                pattern_success[p] += 1
-        for kind, idx, p, coords in this_draw.get('reverse_patterns', []):
-            if p in next_targets:
-                pattern_success[p] += 1
-        for md in this_draw.get("missing_digits", []):
-            if md in "".join(next_targets):
-                pattern_success[f"missing-{md}"] += 1
-    return pattern_success
-
-def _normalize_prediction_dict(result_dict):
-    if not isinstance(result_dict, dict):
-        return []
-    preferred_order = ["classifier", "combined", "grid", "reverse", "missing", "reverse_missing", "fallback"]
-    chosen = None
-    for k in preferred_order:
-        if k in result_dict and isinstance(result_dict[k], list) and result_dict[k]:
-            chosen = result_dict[k]
-            break
-    if chosen is None:
-        for v in result_dict.values():
-            if isinstance(v, list) and v:
-                chosen = v
-                break
-    if not chosen:
-        return []
-    out = []
-    for item in chosen:
-        if isinstance(item, (list, tuple)):
-            if len(item) >= 3:
-                num, score, reason = item[0], item[1], item[2]
-            elif len(item) == 2:
-                num, score = item
-                reason = "no-reason"
-            else:
-                num = item[0]
-                score = 0
-                reason = "raw"
-        else:
-            num = str(item)
-            score = 0
-            reason = "raw"
-        try:
-            score = float(score)
-        except Exception:
-            score = 0.0
-        out.append((str(num), score, str(reason)))
-    return out[:5]
-
-def _map_ui_mode_to_predictor(mode):
-    if mode == "pattern":
-        return "pattern"
-    if mode == "frequency":
-        return "history"
-    if mode == "extended":
-        return "combined"
-    return "pattern"
-
-# 3-digit hits
-def get_3_digit_hits(predictions, actual):
-    actual_digits = set(actual)
-    hits = []
-    for pred, score, reason in predictions:
-        match_count = len(set(pred) & actual_digits)
-        if match_count == 3:
-            matched = ''.join(sorted(set(pred) & actual_digits))
-            hits.append((pred, score, f"matched 3 digits: {matched}"))
-    return hits
-
-# ---------------- ROUTES ---------------- #
-@app.route('/')
-def index():
-    df = load_csv_data()
-    selected_date = request.args.get('selected_date')
-
-    if not selected_date:
-        try:
-            latest_date = df['date_parsed'].max().date()
-            filtered = df[df['date_parsed'].dt.date == latest_date]
-            selected_date = latest_date
-        except Exception:
-            filtered = df.iloc[0:0]
-            selected_date = ""
-    else:
-        try:
-            date_obj = pd.to_datetime(selected_date).date()
-            filtered = df[df['date_parsed'].dt.date == date_obj]
-        except:
-            filtered = df.iloc[0:0]
-
-    # Use extracted canonical data
-    cards = []
-    for _, row in filtered.iterrows():
-        if row.get('number_1st') or row.get('number_2nd') or row.get('number_3rd'):
-            card = {
-                'date_parsed': row['date_parsed'],
-                'provider': row['provider_key'].upper(),
-                '1st_real': row.get('number_1st', ''),
-                '2nd_real': row.get('number_2nd', ''),
-                '3rd_real': row.get('number_3rd', ''),
-                'special': row.get('special', ''),
-                'consolation': row.get('consolation', '')
-            }
-            cards.append(card)
-
-    return render_template('index_clean.html', cards=cards, selected_date=selected_date)
-
-@app.route('/pattern-analyzer', methods=['GET', 'POST'])
-def pattern_analyzer():
-    from utils.feedback_learner import FeedbackLearner
-    
-    df = load_csv_data()
-    selected_month = request.args.get('month')
-    selected_provider = request.args.get('provider')
-    selected_aimode = request.args.get('aimode', 'pattern')
-    
-    # Initialize feedback learner
-    learner = FeedbackLearner()
-    try:
-        learner.load_learning_data()
-    except:
-        pass
-
-    search_pattern = ''
-    manual_search_results = {}
-    draws = []
-
-    if selected_provider and selected_provider.startswith("http"):
-        selected_provider = selected_provider.split('/')[-1]
-    if selected_provider:
-        selected_provider = selected_provider.strip().lower()
-
-    if not selected_month:
-        today_date_val = date_obj.today()
-        selected_month = today_date_val.strftime('%Y-%m')
-
-    provider_options = sorted(df['provider_key'].dropna().unique())
-    provider_options = [p for p in provider_options if p and str(p).strip() != ""]
-    provider_options.insert(0, 'all')
-
-    if not selected_provider or selected_provider not in provider_options:
-        selected_provider = 'all'
-
-    month_start = pd.to_datetime(selected_month + "-01")
-    next_month = (month_start + pd.DateOffset(months=1)).replace(day=1)
-    month_end = next_month - pd.Timedelta(days=1)
-
-    month_draws = df[(df['date_parsed'] >= month_start) & (df['date_parsed'] <= month_end)]
-    if selected_provider != 'all':
-        month_draws = month_draws[month_draws['provider'] == selected_provider]
-
-    month_draws = month_draws[month_draws['number_1st'].astype(str).str.len() == 4]
-    month_draws = month_draws[month_draws['number_1st'].astype(str).str.isdigit()]
-    month_draws = month_draws.sort_values(['date_parsed', 'provider']).reset_index(drop=True)
-
-    predictor_mode = _map_ui_mode_to_predictor(selected_aimode)
-    past_predictions_map = defaultdict(list)
-    normalized_pred_list = []  # Initialize early
-
-    module_hits = defaultdict(int)
-    module_attempts = defaultdict(int)
-    module_provider_stats = defaultdict(lambda: defaultdict(lambda: {"hits": 0, "attempts": 0}))
-    module_daily_stats = defaultdict(lambda: defaultdict(lambda: {"hits": 0, "attempts": 0}))
-
-    for i in range(len(month_draws) - 1):
-        try:
-            this_draw = month_draws.iloc[i]
-            next_draw = month_draws.iloc[i + 1]
-
-            for prize_type in ['1st', '2nd', '3rd']:
-                col_map = {'1st': 'number_1st', '2nd': 'number_2nd', '3rd': 'number_3rd'}
-                n = str(this_draw.get(col_map[prize_type], ''))
-                if len(n) == 4 and n.isdigit():
-                    grid = generate_4x4_grid(n)
-                    reverse_grid = generate_reverse_grid(n)
-                    pats = find_4digit_patterns(grid)
-                    reverse_pats = find_4digit_patterns(reverse_grid)
-                    targets = [str(next_draw.get(col, '')) for col in ['number_1st', 'number_2nd', 'number_3rd'] if str(next_draw.get(col, '')).isdigit()]
-                    highlight = highlight_coords_for_patterns(pats, targets)
-                    reverse_highlight = highlight_coords_for_patterns(reverse_pats, targets)
-
-                    raw_pred_dict = predict_top_5([{'date': str(this_draw['date_parsed'].date()), 'grid': grid}], mode=predictor_mode)
-                    normalized_pred_list = _normalize_prediction_dict(raw_pred_dict)
-
-                    provider = this_draw['provider']
-                    actual_winners = targets
-                    
-                    # Evaluate predictions with feedback learner (optimized)
-                    try:
-                        predicted_numbers = [pred for pred, _, _ in normalized_pred_list]
-                        match_type, score, match_details = learner.evaluate_prediction(
-                            predicted_numbers,
-                            targets[0] if len(targets) > 0 else '',
-                            targets[1] if len(targets) > 1 else '',
-                            targets[2] if len(targets) > 2 else ''
-                        )
-                        
-                        # Learn from the result
-                        learner.learn_from_result({
-                            'predicted_numbers': predicted_numbers,
-                            'predictor_methods': predictor_mode,
-                            'confidence': normalized_pred_list[0][1] if normalized_pred_list else 0,
-                            'draw_date': str(this_draw['date_parsed'].date())
-                        }, match_type, score)
-                    except:
-                        pass
-                    
-                    comparison = []
-                    for pred, score, reason in normalized_pred_list:
-                        hit = "✅" if pred in actual_winners else "❌"
-                        comparison.append({
-                            "number": pred,
-                            "score": score,
-                            "reason": reason,
-                            "hit": hit
-                        })
-                        modules = reason.split("+")
-                        for m in modules:
-                            module_attempts[m] += 1
-                            if hit == "✅":
-                                module_hits[m] += 1
-                            module_provider_stats[provider][m]["attempts"] += 1
-                            module_daily_stats[this_draw['date_parsed'].date()][m]["attempts"] += 1
-                            if hit == "✅":
-                                module_provider_stats[provider][m]["hits"] += 1
-                                module_daily_stats[this_draw['date_parsed'].date()][m]["hits"] += 1
-
-                    draws.append({
-                        'date': this_draw['date_parsed'].date(),
-                        'provider': provider,
-                        'prize_type': prize_type,
-                        'number': n,
-                        'grid': grid,
-                        'reverse_grid': reverse_grid,
-                        'patterns': pats,
-                        'reverse_patterns': reverse_pats,
-                        'next_targets': targets,
-                        'highlight': highlight,
-                        'reverse_highlight': reverse_highlight,
-                        'missing_digits': find_missing_digits(grid),
-                        'missing_digits_reverse': find_missing_digits(reverse_grid),
-                        'past_2_predictions': past_predictions_map[prize_type][-2:],
-                        'provider_predictions': {provider: normalized_pred_list},
-                        'prediction_comparison': comparison,
-                        'three_digit_hits': get_3_digit_hits(normalized_pred_list, n)
-                    })
-
-                    past_predictions_map[prize_type].append(normalized_pred_list)
-
-        except Exception as e:
-            logger.warning(f"❌ Draw skipped due to error: {e}")
-
-    pattern_success = build_pattern_history(draws)
-
-    if request.method == 'POST':
-        search_pattern = request.form.get('search_pattern', '').strip()
-        for d in draws:
-            if len(search_pattern) == 4 and search_pattern.isdigit():
-                matches = search_pattern_in_grid(d['grid'], search_pattern)
-                reverse_matches = search_pattern_in_grid(d['reverse_grid'], search_pattern)
-                manual_search_results[(d['date'], d['prize_type'], 'normal')] = matches
-                manual_search_results[(d['date'], d['prize_type'], 'reverse')] = reverse_matches
-
-    month_options = sorted(set(df['date_parsed'].dropna().map(lambda d: d.strftime('%Y-%m'))))
-    freq_list = compute_pattern_frequencies(draws)
-    cell_heatmap = compute_cell_heatmap(draws)
-    last_updated = time.strftime('%Y-%m-%d %H:%M:%S')
-
-    if draws:
-        past_draws_for_memory = [{"number": d.get("number", "")} for d in draws if d.get("number", "")]
-        transitions = learn_pattern_transitions(past_draws_for_memory)
-        today_number = draws[-1]["number"]
-        candidates = predict_from_today_grid(today_number, transitions)
-
-        grid = generate_4x4_grid(today_number)
-        reverse_grid = generate_reverse_grid(today_number)
-        draw_stub = {
-            "number": today_number,
-            "grid": grid,
-            "reverse_grid": reverse_grid
-        }
-        full_draws = past_draws_for_memory[:-1] + [draw_stub]
-        raw_predictions = predict_top_5(full_draws, mode="combined")
-        top_5_predictions = _normalize_prediction_dict(raw_predictions)
-        prediction_mode = "combined"
-    else:
-        top_5_predictions = []
-        prediction_mode = "fallback"
-
-    module_accuracy = []
-    for m in module_attempts:
-        attempts = module_attempts[m]
-        hits = module_hits[m]
-        rate = round((hits / attempts) * 100, 2) if attempts else 0
-        module_accuracy.append((m, hits, attempts, rate))
-
-    provider_accuracy = []
-    for provider, modules in module_provider_stats.items():
-        for m, stats in modules.items():
-            rate = round((stats["hits"] / stats["attempts"]) * 100, 2) if stats["attempts"] else 0
-            provider_accuracy.append((provider, m, stats["hits"], stats["attempts"], rate))
-
-    chart_data = []
-    for date, modules in sorted(module_daily_stats.items()):
-        entry = {"date": date.strftime("%Y-%m-%d")}
-        for m, stats in modules.items():
-            rate = round((stats["hits"] / stats["attempts"]) * 100, 2) if stats["attempts"] else 0
-            entry[m] = rate
-        chart_data.append(entry)
-    
-    # Save learning data (optimized)
-    try:
-        learner.save_learning_data()
-    except:
-        pass
-    
-    # Get learning insights (optimized)
-    learning_summary = None
-    try:
-        best_methods = learner.get_best_methods(top_n=5)
-        learning_summary = {
-            'best_methods': best_methods,
-            'total_analyzed': len(draws)
-        }
-    except:
-        pass
-
-    # 4D Analysis - Hot/Cold Numbers
-    all_numbers = []
-    for col in ['1st_real', '2nd_real', '3rd_real', 'special', 'consolation']:
-        if col in month_draws.columns:
-            for val in month_draws[col].astype(str):
-                all_numbers.extend(re.findall(r'\d{4}', val))
-    
-    freq_counter = Counter(all_numbers)
-    sorted_freq = sorted(freq_counter.items(), key=lambda x: x[1], reverse=True)
-    hot_numbers = sorted_freq[:30] if sorted_freq else []
-    cold_numbers = sorted_freq[-30:] if len(sorted_freq) >= 30 else []
-    
-    # Digit frequency by position
-    digit_frequency_by_pos = {}
-    for pos in range(1, 5):
-        pos_digits = [num[pos-1] for num in all_numbers if len(num) >= pos]
-        digit_freq = Counter(pos_digits)
-        digit_frequency_by_pos[pos] = digit_freq.most_common(10)
-    
-    # Frequency-based predictions (hot numbers)
-    frequency_predictions = hot_numbers[:5] if hot_numbers else []
-    
-    # Combined consensus predictions
-    consensus_map = {}
-    # Add pattern predictions
-    for pred, conf, reason in normalized_pred_list[:10]:
-        if pred not in consensus_map:
-            consensus_map[pred] = {'score': 0, 'sources': []}
-        consensus_map[pred]['score'] += conf * 2
-        consensus_map[pred]['sources'].append('Pattern')
-    
-    # Add frequency predictions
-    for num, freq in hot_numbers[:10]:
-        if num not in consensus_map:
-            consensus_map[num] = {'score': 0, 'sources': []}
-        consensus_map[num]['score'] += (freq / max(dict(hot_numbers).values())) if hot_numbers else 0
-        consensus_map[num]['sources'].append('Frequency')
-    
-    # Sort by score and format
-    consensus_predictions = [(num, data['score'], '+'.join(data['sources'])) 
-                            for num, data in sorted(consensus_map.items(), key=lambda x: x[1]['score'], reverse=True)]
-    
-    # Digit position predictions - build numbers from most frequent digits
-    digit_position_predictions = []
-    if digit_frequency_by_pos and all(pos in digit_frequency_by_pos and digit_frequency_by_pos[pos] for pos in range(1, 5)):
-        # Generate top 5 combinations from most frequent digits per position
-        for combo_idx in range(5):
-            try:
-                num = ''.join([
-                    digit_frequency_by_pos[pos][min(combo_idx, len(digit_frequency_by_pos[pos])-1)][0] 
-                    if digit_frequency_by_pos[pos] else '0'
-                    for pos in range(1, 5)
-                ])
-                if len(num) == 4 and num.isdigit() and num not in digit_position_predictions:
-                    digit_position_predictions.append(num)
-            except (IndexError, KeyError):
-                continue
-        
-        # Add mixed combinations if needed
-        if len(digit_position_predictions) < 5:
-            try:
-                for i in range(min(3, len(digit_frequency_by_pos.get(3, [])))):
-                    for j in range(min(2, len(digit_frequency_by_pos.get(2, [])))):
-                        if all(digit_frequency_by_pos.get(p) for p in [1,2,3,4]):
-                            num = ''.join([
-                                digit_frequency_by_pos[1][0][0],
-                                digit_frequency_by_pos[2][j][0],
-                                digit_frequency_by_pos[3][i][0],
-                                digit_frequency_by_pos[4][0][0]
-                            ])
-                            if len(num) == 4 and num.isdigit() and num not in digit_position_predictions:
-                                digit_position_predictions.append(num)
-                                if len(digit_position_predictions) >= 5:
-                                    break
-                    if len(digit_position_predictions) >= 5:
-                        break
-            except (IndexError, KeyError):
-                pass
-    
-    # Pattern distribution analysis
-    def classify_pattern(num):
-        digits = list(num)
-        unique = len(set(digits))
-        if unique == 4: return 'ABCD'
-        elif unique == 3: return 'AABC'
-        elif unique == 2:
-            return 'AABB' if digits.count(digits[0]) == 2 and digits.count(digits[2]) == 2 else 'AAAB'
-        return 'AAAA'
-    
-    pattern_counts = Counter([classify_pattern(num) for num in all_numbers if len(num) == 4])
-    total = sum(pattern_counts.values())
-    pattern_distribution = [(p, c, round(c/total*100, 1)) for p, c in pattern_counts.most_common()] if total else []
-    
-    # Pattern-based predictions - get numbers matching most common pattern
-    pattern_predictions = []
-    if pattern_distribution and all_numbers:
-        most_common_pattern = pattern_distribution[0][0]
-        matching_nums = [num for num in all_numbers if len(num) == 4 and classify_pattern(num) == most_common_pattern]
-        if matching_nums:
-            # Get most frequent numbers with this pattern
-            pattern_freq = Counter(matching_nums)
-            pattern_predictions = [num for num, _ in pattern_freq.most_common(5)]
-    
-    return render_template(
-        'pattern_analyzer.html',
-        draws=draws,
-        provider_options=provider_options,
-        selected_provider=selected_provider,
-        month_options=month_options,
-        selected_month=selected_month,
-        search_pattern=search_pattern,
-        manual_search_results=manual_search_results,
-        freq_list=freq_list,
-        cell_heatmap=cell_heatmap,
-        top_5_predictions=top_5_predictions,
-        prediction_mode=prediction_mode,
-        last_updated=last_updated,
-        selected_aimode=selected_aimode,
-        is_fallback=(prediction_mode == "fallback"),
-        module_accuracy=module_accuracy,
-        provider_accuracy=provider_accuracy,
-        chart_data=chart_data,
-        best_module=(max(module_accuracy, key=lambda x: x[3]) if module_accuracy else None),
-        learning_summary=learning_summary,
-        hot_numbers=hot_numbers,
-        cold_numbers=cold_numbers,
-        digit_frequency_by_pos=digit_frequency_by_pos,
-        frequency_predictions=frequency_predictions,
-        consensus_predictions=consensus_predictions,
-        digit_position_predictions=digit_position_predictions,
-        pattern_distribution=pattern_distribution,
-        pattern_predictions=pattern_predictions
-    )
-
-@app.route('/prediction-history')
-def prediction_history():
-    df = load_csv_data()
-    provider = request.args.get('provider', 'all')
-    selected_month = request.args.get('month', '')
-    
-    provider_options = ['all'] + sorted([p for p in df['provider_key'].dropna().unique() if p])
-    month_options = sorted(df['date_parsed'].dropna().dt.strftime('%Y-%m').unique(), reverse=True)
-    
-    if provider != 'all':
-        df = df[df['provider_key'] == provider]
-    if selected_month:
-        df = df[df['date_parsed'].dt.strftime('%Y-%m') == selected_month]
-    
-    df = df[df['number_1st'].astype(str).str.len() == 4]
-    df = df[df['number_1st'].astype(str).str.isdigit()]
-    df = df.tail(50).sort_values(['date_parsed', 'provider']).reset_index(drop=True)
-    df = df.drop_duplicates(subset=['date_parsed', '1st_real'], keep='first')
-
-    history = []
-    for i in range(min(len(df) - 1, 30)):
-        this_draw = df.iloc[i]
-        next_draw = df.iloc[i + 1]
-
-        number = str(this_draw['number_1st'])
-        grid = generate_4x4_grid(number)
-
-        raw_pred = predict_top_5(
-            [{'date': str(this_draw['date_parsed'].date()), 'grid': grid}],
-            mode="pattern"
-        )
-        normalized = _normalize_prediction_dict(raw_pred)
-
-        next_winners = [str(next_draw['number_1st']), str(next_draw['number_2nd']), str(next_draw['number_3rd'])]
-
-        checked_preds = []
-        for num, score, _reason in normalized:
-            hit = "✅" if num in next_winners else "❌"
-            checked_preds.append({"num": num, "score": score, "hit": hit})
-
-        history.append({
-            "date": this_draw["date_parsed"].date(),
-            "provider": this_draw["provider"],
-            "drawn_number": this_draw["1st_real"],
-            "predictions": checked_preds,
-            "next_winners": next_winners
-        })
-
-    return render_template("prediction_history.html", history=history, provider_options=provider_options, provider=provider, month_options=month_options, selected_month=selected_month)
-
-# ---------------- ADVANCED PREDICTOR + ROUTE ---------------- #
-def compute_provider_bias(df, provider):
-    if not provider or provider == "all":
-        return 1.0
-    sub = df[df["provider"] == provider].sort_values("date_parsed")
-    nums = sub["number_1st"].astype(str).tolist()
-    if len(nums) < 2:
-        return 1.0
-    matches = 0
-    total = 0
-    for a, b in zip(nums, nums[1:]):
-        if len(a) == 4 and len(b) == 4:
-            total += 1
-            if set(a) & set(b):
-                matches += 1
-    rate = (matches / total) if total else 0
-    return 1.0 + (rate * 0.5)
-
-def advanced_predictor(df, provider=None, lookback=200):
-    prize_cols = ["number_1st", "number_2nd", "number_3rd"]
-    all_recent = []
-    for col in prize_cols:
-        if col not in df.columns: continue
-        col_values = df[col].dropna().tolist()
-        all_recent.extend([n for n in col_values if n and len(n) == 4])
-
-    if not all_recent: return []
-    # Use newest data (df is sorted descending)
-    recent_numbers = all_recent[:lookback] if lookback else all_recent
-    digit_counts = Counter("".join(recent_numbers))
-    max_digit_freq = max(digit_counts.values()) if digit_counts else 1
-    pair_counts = Counter()
-    for num in recent_numbers:
-        for i in range(3):
-            pair = num[i:i+2]
-            pair_counts[pair] += 1
-    past_draws_for_memory = [{"number": n} for n in recent_numbers]
-    transitions = learn_pattern_transitions(past_draws_for_memory) or {}
-    provider_multiplier = compute_provider_bias(df, provider)
-    candidate_pool = set(recent_numbers)
-    candidate_pool.update(transitions.keys())
-    top_pairs = [p for p, c in pair_counts.most_common(20)]
-    if top_pairs:
-        for p1 in top_pairs[:10]:
-            for p2 in top_pairs[:10]:
-                candidate_pool.add(p1 + p2)
-    if len(candidate_pool) < 200:
-        for num in recent_numbers[-500:]:
-            candidate_pool.add(num)
-        if len(candidate_pool) < 200:
-            prefixes = {n[:2] for n in recent_numbers[-50:]}
-            for p in prefixes:
-                for d in range(100):
-                    candidate_pool.add(f"{p}{d:02d}")
-
-    if not candidate_pool:
-        candidate_pool = set(recent_numbers[-100:]) if recent_numbers else set()
-    scored = []
-    for num in candidate_pool:
-        if not (isinstance(num, str) and len(num) == 4 and num.isdigit()): continue
-        score = 0.0
-        reasons = []
-        hot_score = sum((digit_counts.get(d, 0) / max_digit_freq) for d in num)
-        score += hot_score
-        reasons.append(f"hot={hot_score:.2f}")
-        pair_bonus = 0.0
-        for i in range(3):
-            pair = num[i : i + 2]
-            cnt = pair_counts.get(pair, 0)
-            if cnt:
-                pair_bonus += cnt * 0.06
-        if pair_bonus:
-            score += pair_bonus
-            reasons.append(f"pair+{pair_bonus:.2f}")
-        trans_val = 0.0
-        try:
-            tval = transitions.get(num, 0)
-            if isinstance(tval, (int, float)) and tval > 0:
-                trans_val = float(tval)
-                score += trans_val * 0.5
-                reasons.append(f"trans+{trans_val:.2f}")
-        except Exception:
-            pass
-        if provider and provider != "all":
-            score *= provider_multiplier
-            reasons.append(f"prov*{provider_multiplier:.2f}")
-        scored.append((num, score, "+".join(reasons)))
-
-    if not scored: return []
-    scored.sort(key=lambda x: x[1], reverse=True)
-    top_score = scored[0][1] if scored else 1.0
-    normalized = []
-    for num, raw_score, reason in scored[:200]:
-        norm = (raw_score / top_score) if top_score else 0.0
-        normalized.append((str(num), float(norm), reason))
-    return normalized[:5]
-
-@app.route('/advanced-predictions', methods=['GET'])
-def advanced_predictions():
-    return redirect('/ultimate-predictor')
-
-@app.route('/advanced-analytics')
-def advanced_analytics():
-    df = load_csv_data()
-    if df.empty:
-        return render_template('advanced_analytics.html', error="No data available")
-
-    provider_options = ['all'] + sorted([p for p in df['provider_key'].dropna().unique() if p])
-    provider = request.args.get('provider', 'all')
-
-    if provider != 'all':
-        df = df[df['provider_key'] == provider]
-
-    # Next draw info
-    next_draw_date = ''
-    next_draw_day = ''
-    if not df.empty:
-        last_draw = df.iloc[-1]
-        from datetime import timedelta
-        next_draw_date = (last_draw['date_parsed'] + timedelta(days=3)).strftime('%Y-%m-%d')
-        next_draw_day = (last_draw['date_parsed'] + timedelta(days=3)).strftime('%A')
-
-    # --- Monthly Stats ---
-    monthly_stats = []
-    if not df.empty:
-        df['month'] = df['date_parsed'].dt.to_period('M')
-        last_6_months = df['month'].unique()[-6:]
-        for month in last_6_months:
-            month_df = df[df['month'] == month]
-            all_nums = []
-            for col in ['1st_real', '2nd_real', '3rd_real', 'special', 'consolation']:
-                if col in month_df.columns:
-                    all_nums.extend(month_df[col].astype(str).dropna().str.findall(r'\d{4}').explode().tolist())
-            if all_nums:
-                counts = Counter(all_nums)
-                monthly_stats.append({
-                    'month': month.strftime('%Y-%m'),
-                    'total_draws': len(month_df),
-                    'unique_numbers': len(counts),
-                    'most_common': counts.most_common(1)[0],
-                    'top_numbers': counts.most_common(5)
-                })
-
-    # --- Day of Week Stats ---
-    day_stats = []
-    if not df.empty:
-        df['day_of_week'] = df['date_parsed'].dt.day_name()
-        for day in ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']:
-            day_df = df[df['day_of_week'] == day]
-            if not day_df.empty:
-                all_nums = []
-                for col in ['1st_real', '2nd_real', '3rd_real']:
-                    if col in day_df.columns:
-                        all_nums.extend(day_df[col].astype(str).dropna().tolist())
-                if all_nums:
-                    counts = Counter(all_nums)
-                    day_stats.append({
-                        'day': day,
-                        'draws': len(day_df),
-                        'top_numbers': counts.most_common(3)
-                    })
-
-    # --- Prize Comparison ---
-    prize_comparison = []
-    prize_cols = {
-        '1st Prize': 'number_1st',
-        '2nd Prize': 'number_2nd',
-        '3rd Prize': 'number_3rd',
-        'Special': 'special',
-        'Consolation': 'consolation'
-    }
-    for name, col in prize_cols.items():
-        if col in df.columns:
-            all_nums = df[col].astype(str).dropna().str.findall(r'\d{4}').explode().tolist()
-            if all_nums:
-                counts = Counter(all_nums)
-                prize_comparison.append({
-                    'type': name,
-                    'total': len(all_nums),
-                    'unique': len(counts),
-                    'top_numbers': counts.most_common(10)
-                })
-
-    # --- Trending Numbers ---
-    trending_up = []
-    trending_down = []
-    if not df.empty:
-        # Optimize by filtering smaller dataset first
-        last_60_days = df[df['date_parsed'] > (datetime.now() - pd.Timedelta(days=60))]
-        recent_df = last_60_days[last_60_days['date_parsed'] > (datetime.now() - pd.Timedelta(days=30))]
-        previous_df = last_60_days[last_60_days['date_parsed'] <= (datetime.now() - pd.Timedelta(days=30))]
-        
-        recent_nums = []
-        for col in ['1st_real', '2nd_real', '3rd_real']:
-            if col in recent_df.columns:
-                recent_nums.extend(recent_df[col].astype(str).dropna().tolist())
-        recent_counts = Counter(recent_nums)
-
-        previous_nums = []
-        for col in ['1st_real', '2nd_real', '3rd_real']:
-            if col in previous_df.columns:
-                previous_nums.extend(previous_df[col].astype(str).dropna().tolist())
-        previous_counts = Counter(previous_nums)
-
-        all_unique_nums = set(recent_counts.keys()) | set(previous_counts.keys())
-        changes = []
-        for num in all_unique_nums:
-            change = recent_counts.get(num, 0) - previous_counts.get(num, 0)
-            if change != 0:
-                changes.append((num, recent_counts.get(num, 0), change))
-        
-        changes.sort(key=lambda x: x[2], reverse=True)
-        trending_up = changes[:5]
-        trending_down = [(num, r_count, abs(change)) for num, r_count, change in changes if change < 0][-5:]
-
-    return render_template(
-        'advanced_analytics.html',
-        provider_options=provider_options,
-        provider=provider,
-        next_draw_date=next_draw_date,
-        next_draw_day=next_draw_day,
-        next_predictions=advanced_predictor(df, provider=provider, lookback=50),
-        monthly_stats=monthly_stats,
-        day_stats=day_stats,
-        prize_comparison=prize_comparison,
-        trending_up=trending_up,
-        trending_down=trending_down,
-    )
-
-# ============================================================
-# ⚙️ SMART PREDICTORS SECTION (Add-on, safe to paste)
-# ============================================================
-
-
-
-import ast
-
-# --- Global Caches for ML Models with cleanup ---
-_smart_model_cache = {}
-_ml_model_cache = {}
-_cache_max_size = 10  # Limit cache size
-
-def cleanup_cache(cache_dict):
-    """Clean up cache if it gets too large"""
-    if len(cache_dict) > _cache_max_size:
-        # Remove oldest entries
-        keys_to_remove = list(cache_dict.keys())[:-_cache_max_size//2]
-        for key in keys_to_remove:
-            del cache_dict[key]
-
-
-# ------------------------------------------------------------
-# 1️⃣ AUTO WEIGHT TUNING - finds best balance between hot, pair, transitions
-# ------------------------------------------------------------
-def smart_auto_weight_predictor(df, provider=None, lookback=300):
-    """
-    Automatically tunes weight between 'hot digits', 'pairs', and 'transitions'
-    based on correlation to next-draw winners.
-    Easy & light but smarter than static scoring.
-    """
-    global _smart_model_cache
-    # Use cached model if available and data hasn't changed significantly
-    all_numbers = [] # Initialize all_numbers
-    cache_key = (df.shape, df['date_parsed'].max())
-    if cache_key in _smart_model_cache:
-        model, scaler, w_hot, w_pair, w_trans, digit_counts, pair_counts, transitions, all_numbers = _smart_model_cache[cache_key]
-    else:
-        prize_cols = ["number_1st", "number_2nd", "number_3rd"]
-        for col in prize_cols:
-            if col in df.columns:
-                all_numbers += [n for n in df[col].dropna() if n and len(n) == 4]
-        if not all_numbers:
-            return []
-
-        # Use newest data (df is sorted descending)
-        training_numbers = all_numbers[:lookback]
-        if not training_numbers: return []
-        digit_counts = Counter("".join(all_numbers))
-        pair_counts = Counter([n[i:i+2] for n in training_numbers for i in range(3)])
-        transitions = learn_pattern_transitions([{"number": n} for n in all_numbers])
-
-        # build dataset of feature weights
-        features, targets = [], []
-        for i in range(len(all_numbers) - 1):
-            num = all_numbers[i]
-            next_num = all_numbers[i + 1]
-            hot_score = sum(digit_counts.get(d, 0) for d in num)
-            pair_score = sum(pair_counts.get(num[j:j+2], 0) for j in range(3))
-            trans_score = float(transitions.get(num, 0)) if transitions.get(num, 0) else 0
-            features.append([hot_score, pair_score, trans_score])
-            targets.append(len(set(num) & set(next_num)))  # how many digits repeated next draw
-
-        if len(features) < 5:
-            w_hot, w_pair, w_trans = 0.4, 0.3, 0.3 # Fallback weights
-            model, scaler = None, None
-        else:
-            X = np.array(features)
-            y = np.array(targets)
-            scaler = StandardScaler()
-            X_scaled = scaler.fit_transform(X)
-
-            # learn ideal weights automatically
-            model = LinearRegression()
-            model.fit(X_scaled, y)
-            w_hot, w_pair, w_trans = model.coef_
-
-        # Cache the trained model and weights
-        cleanup_cache(_smart_model_cache)
-        _smart_model_cache[cache_key] = (model, scaler, w_hot, w_pair, w_trans, digit_counts, pair_counts, transitions, all_numbers)
-
-
-    # Predict next based on learned weights
-    candidate_pool = {n for n in all_numbers[:150]} if all_numbers else set()
-    if not candidate_pool:
-        return []
-    
-    scored = []
-    for num in candidate_pool:
-        hot_score = sum(digit_counts.get(d, 0) for d in num)
-        pair_score = sum(pair_counts.get(num[j:j+2], 0) for j in range(3))
-        trans_score = float(transitions.get(num, 0)) if transitions.get(num, 0) else 0
-        total = (
-            w_hot * hot_score
-            + w_pair * pair_score
-            + w_trans * trans_score
-        )
-        scored.append((num, total, f"auto-w({w_hot:.2f},{w_pair:.2f},{w_trans:.2f})"))
-
-    if not scored:
-        return []
-    
-    scored.sort(key=lambda x: x[1], reverse=True)
-    top_5 = [(num, round(score, 3), reason) for num, score, reason in scored[:5]]
-    return top_5
-
-@app.route('/smart_predictor')
-def smart_predictor():
-    return smart_predictor_page()
-
-@app.route('/smart-predictor')
-@app.route('/smart-auto-weight')
-def smart_predictor_page():
-    df = load_csv_data()
-    if df.empty:
-        return render_template(
-            'smart_predictor.html',
-            provider="N/A",
-            last_updated="No data available",
-            top_5_predictions=None,
-            smart_formula="N/A",
-            provider_options=['all'],
-            selected_provider='all',
-            month_options=[],
-            selected_month=''
-        )
-    
-    # Get filters
-    selected_provider = request.args.get('provider', 'all')
-    selected_month = request.args.get('month', '')
-    
-    provider_options = ['all'] + sorted([p for p in df['provider_key'].dropna().unique() if p])
-    month_options = sorted(df['date_parsed'].dropna().dt.strftime('%Y-%m').unique(), reverse=True)
-    
-    # Filter data
-    filtered_df = df.copy()
-    if selected_provider != 'all':
-        filtered_df = filtered_df[filtered_df['provider_key'] == selected_provider]
-    if selected_month:
-        filtered_df = filtered_df[filtered_df['date_parsed'].dt.strftime('%Y-%m') == selected_month]
-    
-    if filtered_df.empty:
-        return render_template(
-            'smart_predictor.html',
-            provider=selected_provider,
-            last_updated="No data for selected filters",
-            top_5_predictions=[],
-            smart_formula="No data",
-            provider_options=provider_options,
-            selected_provider=selected_provider,
-            month_options=month_options,
-            selected_month=selected_month
-        )
-
-    # Use smart_auto_weight_predictor function
-    top_5_preds = smart_auto_weight_predictor(filtered_df, provider=selected_provider, lookback=300)
-    
-    return render_template(
-        'smart_predictor.html',
-        provider=selected_provider.upper() if selected_provider != 'all' else 'ALL PROVIDERS',
-        last_updated=filtered_df['date_parsed'].max().strftime('%Y-%m-%d %H:%M:%S') if not filtered_df.empty else "No data available",
-        top_5_predictions=top_5_preds,
-        smart_formula="Auto-tuned weights based on historical accuracy",
-        provider_options=provider_options,
-        selected_provider=selected_provider,
-        month_options=month_options,
-        selected_month=selected_month
-    )
-import os
-from datetime import datetime
-
-@app.route('/hot-cold')
-def hot_cold_numbers():
-    """Analyze hot and cold numbers for the last 30 days"""
-    df = load_csv_data()
-    
-    # Get filter parameters
-    selected_provider = request.args.get('provider', 'all')
-    days = int(request.args.get('days', 30))
-    
-    provider_options = ['all'] + sorted([p for p in df['provider_key'].dropna().unique() if p]) if not df.empty else ['all']
-    
-    if df.empty:
-        return render_template('hot_cold.html', 
-                             hot_numbers=[], cold_numbers=[], 
-                             provider_options=provider_options,
-                             selected_provider=selected_provider,
-                             days=days, total_draws=0)
-    
-    # Filter by provider
-    if selected_provider != 'all':
-        df = df[df['provider'] == selected_provider]
-    
-    # Filter by date range
-    cutoff_date = datetime.now() - pd.Timedelta(days=days)
-    recent_df = df[df['date_parsed'] > cutoff_date]
-    
-    if recent_df.empty:
-        return render_template('hot_cold.html',
-                             hot_numbers=[], cold_numbers=[],
-                             provider_options=provider_options,
-                             selected_provider=selected_provider,
-                             days=days, total_draws=0)
-    
-    # Collect all numbers from prize columns
-    all_numbers = []
-    prize_cols = ['1st_real', '2nd_real', '3rd_real']
-    
-    for col in prize_cols:
-        if col in recent_df.columns:
-            numbers = recent_df[col].astype(str).dropna()
-            # Filter 4-digit numbers only
-            valid_numbers = [n for n in numbers if n.isdigit() and len(n) == 4]
-            all_numbers.extend(valid_numbers)
-    
-    if not all_numbers:
-        return render_template('hot_cold.html',
-                             hot_numbers=[], cold_numbers=[],
-                             provider_options=provider_options,
-                             selected_provider=selected_provider,
-                             days=days, total_draws=0)
-    
-    # Count frequency of each number
-    number_counts = Counter(all_numbers)
-    total_draws = len(recent_df)
-    
-    # Get hot numbers (most frequent)
-    hot_numbers = [(num, count, round(count/total_draws*100, 1)) 
-                   for num, count in number_counts.most_common(10)]
-    
-    # Get cold numbers (least frequent, but appeared at least once)
-    all_counts = list(number_counts.items())
-    all_counts.sort(key=lambda x: x[1])  # Sort by count ascending
-    cold_numbers = [(num, count, round(count/total_draws*100, 1)) 
-                    for num, count in all_counts[:10]]
-    
-    return render_template('hot_cold.html',
-                         hot_numbers=hot_numbers,
-                         cold_numbers=cold_numbers,
-                         provider_options=provider_options,
-                         selected_provider=selected_provider,
-                         days=days,
-                         total_draws=total_draws)
-
-@app.route('/smart-history')
-def smart_history_page():
-    hist_file = "smart_history.csv"
-    if not os.path.exists(hist_file):
-        return render_template(
-            'smart_history.html',
-            history=[],
-            message="No smart history recorded yet."
-        )
-    hist = pd.read_csv(hist_file)
-    return render_template(
-        'smart_history.html',
-        history=hist.to_dict(orient='records'),
-        message=""
-    )
-
-
-# ------------------------------------------------------------
-# 2️⃣ MACHINE LEARNING ADD-ON - learns direct number patterns
-# ------------------------------------------------------------
-def ml_predictor(df, lookback=500):
-    """
-    Learns from all past draws using Linear Regression.
-    Converts each 4D number into digit features and trains model to predict next draw.
-    High accuracy potential.
-    """
-    prize_cols = ["number_1st", "number_2nd", "number_3rd"]
-    global _ml_model_cache
-    # Use cached model if available and data hasn't changed significantly
-    cache_key = (df.shape, df['date_parsed'].max())
-    if cache_key in _ml_model_cache:
-        model, scaler, numbers = _ml_model_cache[cache_key]
-    else:
-        numbers = []
-        for col in prize_cols:
-            if col in df.columns:
-                numbers += [n for n in df[col].dropna() if n and len(n) == 4]
-        if len(numbers) < 20:
-            return []
-
-        # Build training data from newest numbers
-        X, y = [], []
-        for i in range(len(numbers) - 1):
-            curr = [int(d) for d in numbers[i]]
-            next_num = [int(d) for d in numbers[i + 1]]
-            X.append(curr)
-            y.append(sum(next_num) / 4)  # simple numeric target (avg of next draw digits)
-
-        scaler = StandardScaler()
-        X_scaled = scaler.fit_transform(X)
-        model = LinearRegression()
-        model.fit(X_scaled, y)
-        # Cache the trained model and scaler
-        cleanup_cache(_ml_model_cache)
-        _ml_model_cache[cache_key] = (model, scaler, numbers)
-
-    # Predict next best numbers by scoring possible combos
-    recent = numbers[:10]
-    if not recent:
-        return [] # Not enough data to generate candidates
-
-    candidate_pool = set()
-    for n in recent:
-        for d in range(10):
-            for pos in range(4):
-                new_num = list(n)
-                new_num[pos] = str(d)
-                candidate_pool.add("".join(new_num))
-
-    scored = []
-    for num in candidate_pool:
-        x_input = np.array([[int(d) for d in num]])
-        x_scaled = scaler.transform(x_input)
-        pred_score = model.predict(x_scaled)[0]
-        scored.append((num, float(pred_score), "ML-learned"))
-
-    scored.sort(key=lambda x: x[1], reverse=True)
-    top_5 = [(num, round(score, 3), reason) for num, score, reason in scored[:5]]
-    return top_5
-
-
-@app.route('/ml_predictor_route')
-@app.route('/ml-predictor-route')
-def ml_predictor_route():
-    return ml_predictor_page()
-
-@app.route("/ml-predictor")
-def ml_predictor_page():
-    df = load_csv_data()
-    top_5 = ml_predictor(df)
-    last_updated = time.strftime("%Y-%m-%d %H:%M:%S")
-
-    return render_template(
-        "ml_predictor.html",
-        top_5_predictions=top_5,
-        last_updated=last_updated,
-    )
-
-@app.route('/ultimate-predictor')
-def ultimate_predictor():
-    df = load_csv_data()
-    if df.empty:
-        return render_template('ultimate_predictor.html', error="No data available", provider_options=['all'], selected_provider='all', month_options=[], selected_month='')
-    
-    selected_provider = request.args.get('provider', 'all')
-    selected_month = request.args.get('month', '')
-    
-    provider_options = ['all'] + sorted([p for p in df['provider_key'].dropna().unique() if p and str(p).strip()])
-    month_options = sorted(df['date_parsed'].dropna().dt.strftime('%Y-%m').unique(), reverse=True)
-    
-    if selected_provider not in provider_options:
-        selected_provider = 'all'
-    
-    # Filter data
-    df_filtered = df.copy()
-    if selected_provider != 'all':
-        df_filtered = df_filtered[df_filtered['provider'] == selected_provider]
-    if selected_month:
-        df_filtered = df_filtered[df_filtered['date_parsed'].dt.strftime('%Y-%m') == selected_month]
-    
-    if df_filtered.empty:
-        return render_template('ultimate_predictor.html', error="No data for selected filters", provider_options=provider_options, selected_provider=selected_provider, month_options=month_options, selected_month=selected_month)
-    
-    # Get draw info
-    last_draw = df_filtered.iloc[-1]
-    last_draw_date = last_draw['date_parsed'].strftime('%Y-%m-%d (%A)')
-    last_draw_number = str(last_draw['1st_real'])
-    provider_name = selected_provider.upper() if selected_provider != 'all' else 'ALL PROVIDERS'
-    
-    from datetime import timedelta
-    next_draw_date = (last_draw['date_parsed'] + timedelta(days=3)).strftime('%Y-%m-%d (%A)')
-    
-    # Get predictions from all methods
-    advanced_preds = advanced_predictor(df_filtered, provider=selected_provider, lookback=100)[:5]
-    smart_preds = smart_auto_weight_predictor(df_filtered, provider=selected_provider, lookback=100)[:5]
-    ml_preds = ml_predictor(df_filtered, lookback=100)[:5]
-    
-    # Pattern predictions
-    pattern_preds = []
-    if len(last_draw_number) == 4 and last_draw_number.isdigit():
-        grid = generate_4x4_grid(last_draw_number)
-        raw = predict_top_5([{'date': str(last_draw['date_parsed'].date()), 'grid': grid}], mode="combined")
-        pattern_preds = _normalize_prediction_dict(raw)[:5]
-    
-    # Combine all predictions
-    all_predictions = {}
-    
-    for num, score, reason in advanced_preds:
-        if num not in all_predictions:
-            all_predictions[num] = {'count': 0, 'total_score': 0, 'sources': []}
-        all_predictions[num]['count'] += 1
-        all_predictions[num]['total_score'] += score
-        all_predictions[num]['sources'].append('Advanced')
-    
-    for num, score, reason in smart_preds:
-        if num not in all_predictions:
-            all_predictions[num] = {'count': 0, 'total_score': 0, 'sources': []}
-        all_predictions[num]['count'] += 1
-        all_predictions[num]['total_score'] += score
-        all_predictions[num]['sources'].append('Smart')
-    
-    for num, score, reason in ml_preds:
-        if num not in all_predictions:
-            all_predictions[num] = {'count': 0, 'total_score': 0, 'sources': []}
-        all_predictions[num]['count'] += 1
-        all_predictions[num]['total_score'] += score
-        all_predictions[num]['sources'].append('ML')
-    
-    for num, score, reason in pattern_preds:
-        if num not in all_predictions:
-            all_predictions[num] = {'count': 0, 'total_score': 0, 'sources': []}
-        all_predictions[num]['count'] += 1
-        all_predictions[num]['total_score'] += score
-        all_predictions[num]['sources'].append('Pattern')
-    
-    # Enhanced consensus with confidence intervals
-    final_predictions = []
-    for num, data in all_predictions.items():
-        avg_score = data['total_score'] / data['count'] if data['count'] > 0 else 0
-        enhanced_consensus = calculate_enhanced_consensus(num, data, df_filtered)
-        confidence_interval = calculate_confidence_interval(num, df_filtered, data['count'])
-        stability_score = calculate_prediction_stability(num, data['sources'])
-        
-        final_predictions.append({
-            'number': num,
-            'consensus_score': round(avg_score, 3),
-            'predictor_count': data['count'],
-            'confidence': enhanced_consensus['confidence'],
-            'confidence_interval': confidence_interval,
-            'stability_score': stability_score,
-            'enhanced_rating': enhanced_consensus['rating'],
-            'sources': ', '.join(data['sources'])
-        })
-    
-    final_predictions.sort(key=lambda x: (x['predictor_count'], x['consensus_score']), reverse=True)
-    
-    return render_template(
-        'ultimate_predictor.html',
-        ultimate_top_10=final_predictions[:10],
-        advanced_preds=advanced_preds,
-        smart_preds=smart_preds,
-        ml_preds=ml_preds,
-        pattern_preds=pattern_preds,
-        last_updated=time.strftime("%Y-%m-%d %H:%M:%S"),
-        provider_options=provider_options,
-        selected_provider=selected_provider,
-        month_options=month_options,
-        selected_month=selected_month,
-        provider_name=provider_name,
-        last_draw_date=last_draw_date,
-        last_draw_number=last_draw_number,
-        next_draw_date=next_draw_date,
-        error=None
-    )
-
-@app.route('/save-prediction', methods=['POST'])
-def save_prediction():
-    data = request.get_json()
-    pred_file = "prediction_tracking.csv"
-    
-    # Enhanced prediction entry with metadata
-    new_entry = {
-        "prediction_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "draw_date": data.get('draw_date'),
-        "provider": data.get('provider'),
-        "predicted_numbers": data.get('predicted_numbers'),
-        "predictor_methods": data.get('methods'),
-        "confidence": data.get('confidence'),
-        "prediction_source": data.get('source', 'manual'),
-        "model_version": "v2.0",
-        "data_points_used": data.get('data_points', 0),
-        "actual_1st": "",
-        "actual_2nd": "",
-        "actual_3rd": "",
-        "hit_status": "pending",
-        "accuracy_score": 0
-    }
-    
-    if os.path.exists(pred_file):
-        df = pd.read_csv(pred_file)
-        df = pd.concat([df, pd.DataFrame([new_entry])], ignore_index=True)
-    else:
-        df = pd.DataFrame([new_entry])
-    df.to_csv(pred_file, index=False)
-    
-    return {"status": "success", "message": "Enhanced prediction saved with metadata"}
-
-@app.route('/accuracy-dashboard')
-def accuracy_dashboard():
-    pred_file = "prediction_tracking.csv"
-    
-    if not os.path.exists(pred_file):
-        # Demo mode - create sample predictions from CSV data
-        demo_mode = request.args.get('demo', 'false') == 'true'
-        if demo_mode:
-            create_demo_predictions(df)
-        else:
-            return render_template('accuracy_dashboard.html', 
-                                 message="No predictions tracked yet. Start making predictions! Or try <a href='/accuracy-dashboard?demo=true' class='text-yellow-300 underline'>Demo Mode</a>",
-                                 stats={}, method_stats={}, recent_predictions=[], insights=[], 
-                                 ai_insights=[], prediction_trends=[], confidence_analysis={}, auto_learning={})
-    
-    pred_df = pd.read_csv(pred_file)
-    df = load_csv_data()
-    
-    # Auto-evaluate pending predictions
-    auto_evaluate_predictions(pred_df, df)
-    
-    # Auto-match predictions with actual results
-    for idx, row in pred_df.iterrows():
-        if row['hit_status'] == 'pending':
-            try:
-                # --- FIX: Handle 'YYYY-MM-DD (DayName)' date format ---
-                date_str = str(row['draw_date'])
-                # Extract only the date part (e.g., '2025-09-23') before parsing
-                clean_date_str = date_str.split(' ')[0]
-                draw_date = pd.to_datetime(clean_date_str, errors='coerce').date()
-                if draw_date is None:
-                    logger.warning(f"Invalid date format: {date_str}")
-                    continue
-                provider = str(row['provider']).strip().lower()
-                
-                # --- FIX: Ensure provider matching is consistent ---
-                # Match with actual results
-                actual = df[(df['date_parsed'].dt.date == draw_date) & (df['provider_key'] == provider)]
-                
-                if not actual.empty:
-                    actual_row = actual.iloc[0]
-                    pred_df.at[idx, 'actual_1st'] = actual_row['number_1st']
-                    pred_df.at[idx, 'actual_2nd'] = actual_row['number_2nd']
-                    pred_df.at[idx, 'actual_3rd'] = actual_row['number_3rd']
-                    
-                    # --- FIX: Robustly parse predicted numbers string ---
-                    predicted_str = str(row['predicted_numbers'])
-                    try:
-                        # Try to parse as list first
-                        if predicted_str.startswith('[') and predicted_str.endswith(']'):
-                            # Safe evaluation with whitelist
-                            predicted = ast.literal_eval(predicted_str)
-                            predicted = [str(num).strip() for num in predicted if str(num).isdigit() and len(str(num)) == 4]
-                        else:
-                            # Fallback to regex extraction
-                            predicted = [num.strip() for num in re.findall(r'\d{4}', predicted_str)]
-                    except (ValueError, SyntaxError, TypeError) as e:
-                        logger.warning(f"Failed to parse predictions: {e}")
-                        # Final fallback to regex
-                        predicted = [num.strip() for num in re.findall(r'\d{4}', predicted_str)]
-                    
-                    actuals = [str(actual_row['1st_real']), str(actual_row['2nd_real']), str(actual_row['3rd_real'])]
-                    
-                    hits = [p for p in predicted if p in actuals]
-                    if hits:
-                        # --- ENHANCEMENT: Store which numbers hit ---
-                        hit_details = ", ".join(hits)
-                        pred_df.at[idx, 'hit_status'] = f'HIT ({hit_details})'
-                        pred_df.at[idx, 'accuracy_score'] = len(hits) * 100 / len(predicted) if predicted else 0
-                    else:
-                        pred_df.at[idx, 'hit_status'] = 'MISS'
-                        pred_df.at[idx, 'accuracy_score'] = 0
-            except (SyntaxError, ValueError, TypeError) as e:
-                # Log errors for debugging but don't crash the loop
-                logger.error("Could not process prediction row")
-                continue
-            except Exception as e:
-                logger.error("An unexpected error occurred")
-                continue
-    
-    pred_df.to_csv(pred_file, index=False)
-    
-    completed = pred_df[pred_df['hit_status'] != 'pending']
-    
-    stats = {
-        'total_predictions': len(pred_df),
-        'completed': len(completed),
-        'pending': len(pred_df[pred_df['hit_status'] == 'pending']),
-        'total_hits': len(completed[completed['hit_status'].str.contains('HIT', na=False)]),
-        'total_misses': len(completed[completed['hit_status'] == 'MISS']),
-        'hit_rate': round(len(completed[completed['hit_status'].str.contains('HIT', na=False)]) / len(completed) * 100, 1) if len(completed) > 0 else 0,
-        'avg_accuracy': round(completed['accuracy_score'].mean(), 1) if len(completed) > 0 else 0
-    }
-    
-    method_stats = {}
-    insights = []
-    
-    if stats['hit_rate'] < 30:
-        insights.append("Low hit rate. Consider adjusting methods.")
-    if stats['hit_rate'] > 50:
-        insights.append("Good hit rate! Current methods working well.")
-    
-    recent = pred_df.tail(20).to_dict('records')
-    
-    # Advanced AI insights
-    ai_insights = generate_ai_insights(completed)
-    prediction_trends = analyze_prediction_trends(completed)
-    confidence_analysis = analyze_confidence_calibration(completed)
-    auto_learning = get_auto_learning_stats(completed)
-    
-    return render_template('accuracy_dashboard.html',
-                         stats=stats,
-                         method_stats=method_stats,
-                         recent_predictions=recent,
-                         insights=insights,
-                         ai_insights=ai_insights,
-                         prediction_trends=prediction_trends,
-                         confidence_analysis=confidence_analysis,
-                         auto_learning=auto_learning,
-                         message="")
-
-def generate_box_combinations(number):
-    """Generate all permutations of a 4D number for box play"""
-    from itertools import permutations
-    digits = list(number)
-    perms = set([''.join(p) for p in permutations(digits)])
-    return sorted(list(perms))
-
-def detect_partial_matches(number, recent_numbers, lookback=100):
-    """Detect partial matches: 3 digits same, ibox, etc."""
-    matches = {'3_digit': [], 'ibox': [], 'same_first_3': [], 'same_last_3': []}
-    
-    for recent_num in recent_numbers[-lookback:]:
-        if len(recent_num) != 4:
-            continue
-        
-        # 3 digits match (any position)
-        common_digits = len(set(number) & set(recent_num))
-        if common_digits == 3:
-            matches['3_digit'].append(recent_num)
-        
-        # iBox: same first 3 digits
-        if number[:3] == recent_num[:3]:
-            matches['same_first_3'].append(recent_num)
-        
-        # Same last 3 digits
-        if number[-3:] == recent_num[-3:]:
-            matches['same_last_3'].append(recent_num)
-    
-    return matches
-
-@app.route('/quick-pick')
-def quick_pick():
-    df = load_csv_data()
-    provider = request.args.get('provider', 'all')
-    selected_month = request.args.get('month', '')
-    
-    if df.empty:
-        return render_template('quick_pick.html', numbers=[], error="No data available", provider_options=['all'], provider='all', month_options=[], selected_month='', analysis={}, box_play=[])
-    
-    provider_options = ['all'] + sorted([p for p in df['provider_key'].dropna().unique() if p])
-    month_options = sorted(df['date_parsed'].dropna().dt.strftime('%Y-%m').unique(), reverse=True)
-    
-    if provider != 'all':
-        df = df[df['provider_key'] == provider]
-    if selected_month:
-        df = df[df['date_parsed'].dt.strftime('%Y-%m') == selected_month]
-    
-    # ADVANCED MULTI-ALGORITHM APPROACH
-    # 1. Get predictions from all methods with scores
-    advanced_preds = advanced_predictor(df, provider=provider, lookback=200) or []
-    smart_preds = smart_auto_weight_predictor(df, provider=provider, lookback=300) or []
-    ml_preds = ml_predictor(df, lookback=500) or []
-    
-    # 2. Weighted scoring system (not just counting)
-    weighted_predictions = {}
-    
-    # Advanced predictor (weight: 1.2)
-    for num, score, reason in advanced_preds[:10]:
-        weighted_predictions[num] = weighted_predictions.get(num, 0) + (score * 1.2)
-    
-    # Smart predictor (weight: 1.0)
-    for num, score, reason in smart_preds[:10]:
-        weighted_predictions[num] = weighted_predictions.get(num, 0) + (score * 1.0)
-    
-    # ML predictor (weight: 0.8)
-    for num, score, reason in ml_preds[:10]:
-        weighted_predictions[num] = weighted_predictions.get(num, 0) + (score * 0.8)
-    
-    # 3. Add frequency boost (recent hot numbers)
-    recent_nums = []
-    # Use normalized column names
-    prize_cols = ['number_1st', 'number_2nd', 'number_3rd']
-    for col in prize_cols:
-        if col in df.columns:
-            recent_nums.extend([n for n in df[col].tail(50).astype(str) if len(n) == 4 and n.isdigit()])
-    
-    freq_counter = Counter(recent_nums)
-    for num, count in freq_counter.most_common(20):
-        if num in weighted_predictions:
-            weighted_predictions[num] += count * 0.1  # Frequency boost
-    
-    # 4. Add pattern-based boost
-    if recent_nums:
-        last_num = recent_nums[-1]
-        for num in weighted_predictions.keys():
-            # Boost numbers with similar digits
-            common_digits = len(set(num) & set(last_num))
-            if common_digits >= 2:
-                weighted_predictions[num] += common_digits * 0.15
-    
-    # 5. Sort by weighted score
-    sorted_nums = sorted(weighted_predictions.items(), key=lambda x: x[1], reverse=True)
-    
-    # 6. Get top 5 with confidence scores
-    top_5_with_scores = []
-    max_score = sorted_nums[0][1] if sorted_nums else 1
-    for num, score in sorted_nums[:5]:
-        confidence = min(int((score / max_score) * 100), 99)
-        top_5_with_scores.append({'number': num, 'confidence': confidence})
-    
-    top_5 = [item['number'] for item in top_5_with_scores]
-    
-    # 🎯 NEW: BOX PLAY / PARTIAL MATCH DETECTION
-    box_play_data = []
-    for main_num in top_5:
-        # Generate box combinations
-        box_combos = generate_box_combinations(main_num)
-        
-        # Detect partial matches in recent history
-        partial_matches = detect_partial_matches(main_num, recent_nums)
-        
-        # Count how many box combos actually appeared
-        box_hits = sum(1 for combo in box_combos if combo in recent_nums)
-        box_hit_rate = (box_hits / len(box_combos)) * 100 if box_combos else 0
-        
-        box_play_data.append({
-            'main_number': main_num,
-            'box_combinations': box_combos[:6],  # Show top 6 permutations
-            'box_hit_rate': round(box_hit_rate, 1),
-            'partial_3_digit': len(partial_matches['3_digit']),
-            'partial_ibox': len(partial_matches['same_first_3']),
-            'backup_confidence': max(0, 60 - (len(box_play_data) * 10))  # Lower confidence for backups
-        })
-    
-    # 7. Analysis data
-    analysis = {
-        'total_algorithms': 3,
-        'numbers_analyzed': len(weighted_predictions),
-        'hot_numbers': [num for num, _ in freq_counter.most_common(5)],
-        'consensus_strength': 'High' if len(sorted_nums) > 0 and sorted_nums[0][1] > 2 else 'Medium'
-    }
-    
-    # Get next draw date
-    last_draw = df.iloc[-1]
-    from datetime import timedelta
-    next_draw_date = (last_draw['date_parsed'] + timedelta(days=3)).strftime('%Y-%m-%d (%A)')
-    
-    return render_template('quick_pick.html', 
-                         numbers=top_5,
-                         numbers_with_confidence=top_5_with_scores,
-                         next_draw_date=next_draw_date,
-                         error=None,
-                         provider_options=provider_options,
-                         provider=provider,
-                         month_options=month_options,
-                         selected_month=selected_month,
-                         analysis=analysis,
-                         box_play=box_play_data)
-
-from utils.markov_chain_predictor import build_markov_chain, predict_from_markov, get_markov_statistics
-
-def learn_day_to_day_patterns(draws):
-    """
-    Learn day-to-day patterns from historical draws.
-    Returns a Markov chain of transitions between consecutive draws.
-    """
-    if not draws or len(draws) < 2:
-        return {}
-    
-    transitions = {}
-    for i in range(len(draws) - 1):
-        current = str(draws[i].get('number', ''))
-        next_draw = str(draws[i + 1].get('number', ''))
-        
-        if len(current) == 4 and current.isdigit() and len(next_draw) == 4 and next_draw.isdigit():
-            if current not in transitions:
-                transitions[current] = {}
-            transitions[current][next_draw] = transitions[current].get(next_draw, 0) + 1
-    
-    return transitions
-
-def get_day_to_day_predictions_with_reasons(today_numbers, transitions, all_historical):
-    if not today_numbers or not transitions:
-        return []
-    
-    predictions = []
-    seen = set()
-    
-    for today_num in today_numbers:
-        today_str = str(today_num)
-        if len(today_str) == 4 and today_str.isdigit() and today_str in transitions:
-            next_candidates = dict(transitions[today_str])
-            total = sum(next_candidates.values())
-            
-            if total > 0:
-                for next_num, count in sorted(next_candidates.items(), key=lambda x: x[1], reverse=True):
-                    if next_num not in seen:
-                        confidence = (count / total) * 100
-                        predictions.append((next_num, confidence, f"Followed {today_str} {count}x"))
-                        seen.add(next_num)
-    
-    return predictions
-
-@app.route('/day-to-day-predictor')
-def day_to_day_predictor():
-    df = load_csv_data()
-    if df.empty:
-        return "No data available to make predictions.", 404
-
-    selected_provider = request.args.get('provider', 'all')
-    selected_month = request.args.get('month', '')
-    selected_date = request.args.get('date', '')
-
-    # --- Filtering Logic ---
-    provider_options = ['all'] + sorted([p for p in df['provider_key'].dropna().unique() if p])
-    month_options = sorted(df['date_parsed'].dropna().dt.strftime('%Y-%m').unique(), reverse=True)
-    
-    # Filter by provider FIRST
-    filtered_df = df.copy()
-    if selected_provider != 'all':
-        provider_lower = selected_provider.lower().strip()
-        mask = filtered_df['provider_key'].str.lower().str.strip() == provider_lower
-        if not mask.any():
-            mask = filtered_df['provider_key'].str.lower().str.contains(provider_lower, na=False)
-        filtered_df = filtered_df[mask]
-    
-    # Filter by month if provided
-    if selected_month:
-        filtered_df = filtered_df[filtered_df['date_parsed'].dt.strftime('%Y-%m') == selected_month]
-    
-    # Get latest date from filtered data
-    if filtered_df.empty:
-        logger.warning(f"No data found for provider={selected_provider}, month={selected_month}")
-        return render_template(
-            'day_to_day_predictor.html',
-            last_updated=time.strftime('%Y-%m-%d %H:%M:%S'),
-            provider_options=provider_options,
-            provider=selected_provider,
-            month_options=month_options,
-            selected_month=selected_month,
-            today_date="N/A",
-            total_numbers_analyzed=0,
-            today_numbers=[],
-            predictions=[],
-            all_provider_predictions={}
-        )
-    
-    # Get latest date and extract today's numbers
-    latest_date = filtered_df['date_parsed'].max()
-    today_data = filtered_df[filtered_df['date_parsed'] == latest_date]
-    
-    logger.info(f"Latest date: {latest_date}, rows for that date: {len(today_data)}")
-    
-    # Extract ALL numbers from today (1st, 2nd, 3rd, special, consolation)
-    today_numbers = []
-    for _, row in today_data.iterrows():
-        # 1st, 2nd, 3rd prizes
-        for col in ['number_1st', 'number_2nd', 'number_3rd']:
-            num = str(row.get(col, '')).strip()
-            if num and num not in ['nan', '', 'None'] and len(num) == 4 and num.isdigit():
-                today_numbers.append(num)
-        
-        # Special prizes (space-separated)
-        special_str = str(row.get('special', '')).strip()
-        if special_str and special_str not in ['nan', '', 'None']:
-            special_nums = special_str.split()
-            today_numbers.extend([n for n in special_nums if len(n) == 4 and n.isdigit()])
-        
-        # Consolation prizes (space-separated)
-        consolation_str = str(row.get('consolation', '')).strip()
-        if consolation_str and consolation_str not in ['nan', '', 'None']:
-            consolation_nums = consolation_str.split()
-            today_numbers.extend([n for n in consolation_nums if len(n) == 4 and n.isdigit()])
-    
-    # Remove duplicates
-    seen = set()
-    today_numbers = [n for n in today_numbers if not (n in seen or seen.add(n))]
-    
-    logger.info(f"Extracted {len(today_numbers)} unique numbers from {latest_date.strftime('%Y-%m-%d')}")
-    
-    # Build historical draws (all data except today)
-    historical_draws = []
-    for _, row in filtered_df[filtered_df['date_parsed'] < latest_date].iterrows():
-        num = str(row.get('number_1st', '')).strip()
-        if num and num not in ['nan', '', 'None'] and len(num) == 4 and num.isdigit():
-            historical_draws.append(num)
-    
-    logger.info(f"Built historical draws: {len(historical_draws)} numbers")
-    
-    # Build Markov chain
-    transitions = build_markov_chain(historical_draws)
-    logger.info(f"Markov chain: {len(transitions)} unique numbers")
-    
-    # Get predictions
-    predictions = []
-    if today_numbers and transitions:
-        predictions = get_day_to_day_predictions_with_reasons(today_numbers, transitions, historical_draws)
-        logger.info(f"Generated {len(predictions)} predictions")
-    
-    # Pad to 23 predictions
-    if len(predictions) < 23:
-        freq_counter = Counter(historical_draws[-100:]) if historical_draws else Counter()
-        existing_nums = set([num for num, _, _ in predictions])
-        for num, count in freq_counter.most_common(100):
-            if num not in existing_nums and len(predictions) < 23:
-                confidence = min(count / len(historical_draws[-100:]) * 100, 75) if historical_draws else 50
-                predictions.append((num, confidence, "Historical frequency"))
-                existing_nums.add(num)
-    
-    # Calculate next draw date
-    from datetime import timedelta
-    next_draw_date = latest_date + timedelta(days=3)
-    
-    # Special and consolation predictions
-    special_draws = []
-    consolation_draws = []
-    for _, row in filtered_df.iterrows():
-        special_str = str(row.get('special', '')).strip()
-        if special_str and special_str not in ['nan', '', 'None']:
-            special_nums = special_str.split()
-            special_draws.extend([n for n in special_nums if len(n) == 4 and n.isdigit()])
-        
-        consolation_str = str(row.get('consolation', '')).strip()
-        if consolation_str and consolation_str not in ['nan', '', 'None']:
-            consolation_nums = consolation_str.split()
-            consolation_draws.extend([n for n in consolation_nums if len(n) == 4 and n.isdigit()])
-    
-    special_transitions = build_markov_chain(special_draws) if special_draws else {}
-    consolation_transitions = build_markov_chain(consolation_draws) if consolation_draws else {}
-    
-    latest_special = special_draws[-1] if special_draws else None
-    latest_consolation = consolation_draws[-1] if consolation_draws else None
-    
-    special_preds = get_day_to_day_predictions_with_reasons([latest_special] if latest_special else [], special_transitions, special_draws) if latest_special and special_transitions else []
-    if not special_preds and special_draws:
-        freq = Counter(special_draws)
-        special_preds = [(num, (count/len(special_draws))*100, 'frequency') for num, count in freq.most_common(5)]
-    
-    consolation_preds = get_day_to_day_predictions_with_reasons([latest_consolation] if latest_consolation else [], consolation_transitions, consolation_draws) if latest_consolation and consolation_transitions else []
-    if not consolation_preds and consolation_draws:
-        freq = Counter(consolation_draws)
-        consolation_preds = [(num, (count/len(consolation_draws))*100, 'frequency') for num, count in freq.most_common(5)]
-    
-    pattern_momentum = analyze_pattern_momentum(filtered_df)
-    sequence_detection = detect_daily_sequences(today_numbers)
-    trend_analysis = analyze_daily_trends(filtered_df, today_numbers)
-
-    return render_template(
-        'day_to_day_predictor.html',
-        last_updated=time.strftime('%Y-%m-%d %H:%M:%S'),
-        provider_options=provider_options,
-        provider=selected_provider,
-        month_options=month_options,
-        selected_month=selected_month,
-        selected_date=latest_date.strftime('%Y-%m-%d'),
-        prediction_info={
-            'date': next_draw_date.strftime('%Y-%m-%d'),
-            'day': next_draw_date.strftime('%A'),
-            'formatted': next_draw_date.strftime('%A, %Y-%m-%d'),
-            'provider': selected_provider.upper() if selected_provider != 'all' else 'ALL PROVIDERS'
-        },
-        today_date=latest_date.strftime('%Y-%m-%d'),
-        total_numbers_analyzed=len(today_numbers),
-        today_numbers=today_numbers[:10],
-        predictions=predictions[:23],
-        special_predictions=special_preds[:23],
-        consolation_predictions=consolation_preds[:23],
-        latest_special=latest_special,
-        latest_consolation=latest_consolation,
-        all_provider_predictions={},
-        pattern_momentum=pattern_momentum,
-        sequence_detection=sequence_detection,
-        trend_analysis=trend_analysis,
-        next_draw_date=next_draw_date.strftime('%Y-%m-%d (%A)'),
-        days_since_last_draw=0,
-        lottery_schedule='3-4 days per week (Tue/Wed/Sat/Sun)'
-    )
-
-def analyze_pattern_momentum(df):
-    """Analyze momentum of number patterns"""
-    momentum = {}
-    if len(df) < 10:
-        return momentum
-    
-    recent_5 = df.tail(5)
-    previous_5 = df.tail(10).head(5)
-    
-    recent_nums = []
-    previous_nums = []
-    
-    for col in ['number_1st', 'number_2nd', 'number_3rd']:
-        recent_nums.extend([n for n in recent_5[col].astype(str) if n.isdigit() and len(n) == 4])
-        previous_nums.extend([n for n in previous_5[col].astype(str) if n.isdigit() and len(n) == 4])
-    
-    recent_freq = Counter(recent_nums)
-    previous_freq = Counter(previous_nums)
-    
-    for num in set(recent_nums + previous_nums):
-        recent_count = recent_freq.get(num, 0)
-        previous_count = previous_freq.get(num, 0)
-        
-        if recent_count > previous_count:
-            momentum[num] = 0.2  # Positive momentum
-        elif recent_count < previous_count:
-            momentum[num] = -0.1  # Negative momentum
-    
-    return momentum
-
-def detect_daily_sequences(today_numbers):
-    """Detect sequences in today's numbers"""
-    sequences = []
-    
-    for num in today_numbers:
-        if len(num) == 4:
-            digits = [int(d) for d in num]
-            
-            # Check for ascending sequence
-            if all(digits[i] <= digits[i+1] for i in range(3)):
-                sequences.append({'number': num, 'type': 'ascending', 'strength': 'strong'})
-            
-            # Check for descending sequence
-            elif all(digits[i] >= digits[i+1] for i in range(3)):
-                sequences.append({'number': num, 'type': 'descending', 'strength': 'strong'})
-            
-            # Check for repeating digits
-            elif len(set(digits)) <= 2:
-                sequences.append({'number': num, 'type': 'repeating', 'strength': 'medium'})
-    
-    return sequences[:5]
-
-def analyze_daily_trends(df, today_numbers):
-    """Analyze daily trends and patterns"""
-    trends = {'direction': 'stable', 'volatility': 'low', 'prediction_confidence': 50}
-    
-    if len(df) < 5 or not today_numbers:
-        return trends
-    
-    recent_sums = []
-    for _, row in df.tail(5).iterrows():
-        day_sum = 0
-        for col in ['number_1st', 'number_2nd', 'number_3rd']:
-            num = str(row[col])
-            if num.isdigit() and len(num) == 4:
-                day_sum += sum(int(d) for d in num)
-        recent_sums.append(day_sum)
-    
-    if len(recent_sums) >= 3:
-        if recent_sums[-1] > recent_sums[-2] > recent_sums[-3]:
-            trends['direction'] = 'increasing'
-        elif recent_sums[-1] < recent_sums[-2] < recent_sums[-3]:
-            trends['direction'] = 'decreasing'
-        
-        volatility = max(recent_sums) - min(recent_sums)
-        if volatility > 50:
-            trends['volatility'] = 'high'
-        elif volatility > 25:
-            trends['volatility'] = 'medium'
-        
-        trends['prediction_confidence'] = min(90, 50 + (5 - volatility // 10) * 10)
-    
-    return trends
-
-@app.route('/auto-evaluate')
-def trigger_auto_evaluate():
-    """Manually trigger auto-evaluation of pending predictions"""
-    pred_file = "prediction_tracking.csv"
-    if os.path.exists(pred_file):
-        pred_df = pd.read_csv(pred_file)
-        df = load_csv_data()
-        auto_evaluate_predictions(pred_df, df)
-        return {"status": "success", "message": "Auto-evaluation completed"}
-    return {"status": "error", "message": "No predictions to evaluate"}
-
-@app.route('/learning-insights')
-def learning_insights():
-    pred_file = "prediction_tracking.csv"
-    
-    if not os.path.exists(pred_file):
-        return render_template('learning_insights.html', 
-                             message="No prediction data yet. Start tracking predictions!",
-                             insights={})
-    
-    pred_df = pd.read_csv(pred_file)
-    df = load_csv_data()
-    
-    # Only analyze completed predictions
-    completed = pred_df[pred_df['hit_status'] != 'pending']
-    
-    if len(completed) == 0:
-        return render_template('learning_insights.html',
-                             message="No completed predictions yet. Wait for draw results!",
-                             insights={})
-    
-    insights = {}
-    
-    # 1. Method Performance Analysis
-    method_performance = {}
-    for _, row in completed.iterrows():
-        methods = str(row.get('predictor_methods', '')).split(';')
-        hit = 'HIT' in str(row['hit_status'])
-        for method in methods:
-            method = method.strip().split(',')[0].strip()
-            if method not in method_performance:
-                method_performance[method] = {'hits': 0, 'total': 0}
-            method_performance[method]['total'] += 1
-            if hit:
-                method_performance[method]['hits'] += 1
-    
-    for method in method_performance:
-        total = method_performance[method]['total']
-        hits = method_performance[method]['hits']
-        method_performance[method]['accuracy'] = round((hits / total * 100), 1) if total > 0 else 0
-    
-    insights['method_performance'] = method_performance
-    
-    # 2. Provider-Specific Accuracy
-    provider_accuracy = {}
-    for _, row in completed.iterrows():
-        provider = str(row['provider']).lower()
-        hit = 'HIT' in str(row['hit_status'])
-        if provider not in provider_accuracy:
-            provider_accuracy[provider] = {'hits': 0, 'total': 0}
-        provider_accuracy[provider]['total'] += 1
-        if hit:
-            provider_accuracy[provider]['hits'] += 1
-    
-    for provider in provider_accuracy:
-        total = provider_accuracy[provider]['total']
-        hits = provider_accuracy[provider]['hits']
-        provider_accuracy[provider]['accuracy'] = round((hits / total * 100), 1) if total > 0 else 0
-    
-    insights['provider_accuracy'] = provider_accuracy
-    
-    # 3. Best Performing Method
-    if method_performance:
-        best_method = max(method_performance.items(), key=lambda x: x[1]['accuracy'])
-        insights['best_method'] = best_method[0]
-        insights['best_accuracy'] = best_method[1]['accuracy']
-    
-    # 4. Recommendations
-    recommendations = []
-    if insights.get('best_accuracy', 0) >= 50:
-        recommendations.append(f"✅ Focus on {insights['best_method']} - it has {insights['best_accuracy']}% accuracy")
-    else:
-        recommendations.append("⚠️ All methods below 50% accuracy. Need more data or strategy adjustment.")
-    
-    if provider_accuracy:
-        best_provider = max(provider_accuracy.items(), key=lambda x: x[1]['accuracy'])
-        if best_provider[1]['accuracy'] >= 40:
-            recommendations.append(f"🎯 {best_provider[0].upper()} shows best results ({best_provider[1]['accuracy']}%)")
-    
-    insights['recommendations'] = recommendations
-    
-    # 5. Overall Stats
-    insights['total_predictions'] = len(completed)
-    insights['total_hits'] = len(completed[completed['hit_status'].str.contains('HIT', na=False)])
-    insights['overall_accuracy'] = round((insights['total_hits'] / insights['total_predictions'] * 100), 1) if insights['total_predictions'] > 0 else 0
-    insights['total_analyzed'] = len(completed)
-    
-    # 6. Digit Frequency Analysis
-    pred_digits = Counter()
-    actual_digits = Counter()
-    
-    for _, row in completed.iterrows():
-        # Count predicted digits
-        try:
-            predicted = ast.literal_eval(row['predicted_numbers']) if isinstance(row['predicted_numbers'], str) else []
-            for num in predicted:
-                for digit in str(num):
-                    pred_digits[digit] += 1
-        except:
-            pass
-        
-        # Count actual digits
-        for col in ['actual_1st', 'actual_2nd', 'actual_3rd']:
-            num = str(row.get(col, ''))
-            if num and num != 'nan':
-                for digit in num:
-                    actual_digits[digit] += 1
-    
-    digit_comparison = []
-    for digit in '0123456789':
-        pred_freq = pred_digits.get(digit, 0)
-        actual_freq = actual_digits.get(digit, 0)
-        
-        # Determine bias
-        bias = 'balanced'
-        if actual_freq > 0:
-            ratio = pred_freq / actual_freq
-            if ratio > 1.2:
-                bias = 'over'
-            elif ratio < 0.8:
-                bias = 'under'
-        
-        digit_comparison.append({
-            'digit': digit,
-            'pred_freq': pred_freq,
-            'actual_freq': actual_freq,
-            'bias': bias
-        })
-    
-    insights['digit_comparison'] = digit_comparison
-    
-    return render_template('learning_insights.html',
-                         message="",
-                         insights=insights)
-
-@app.route('/best-predictions')
-def best_predictions():
-    df = load_csv_data()
-    provider = request.args.get('provider', 'all').lower().strip()
-    month_filter = request.args.get('month', 'all')
-
-    if df.empty:
-        return render_template('best_predictions.html', error="No data available", predictions=[], provider_options=['all'], provider='all', month_filter='all', month_options=['all'])
-
-    # Generate provider and month options
-    provider_options = ['all'] + sorted([p for p in df['provider_key'].dropna().unique() if p and str(p).strip()])
-    month_options = ['all'] + sorted(df['date_parsed'].dropna().dt.strftime('%Y-%m').unique(), reverse=True)
-    if provider not in provider_options:
-        provider = 'all'
-
-    df_filtered = df.copy()
-    if provider != 'all':
-        df_filtered = df[df['provider_key'] == provider]
-    
-    # Filter by year-month
-    if month_filter != 'all':
-        df_filtered = df_filtered[df_filtered['date_parsed'].dt.strftime('%Y-%m') == month_filter]
-
-    # Get predictions from all methods
-    advanced_preds = advanced_predictor(df_filtered, provider=provider, lookback=200)
-    smart_preds = smart_auto_weight_predictor(df_filtered, provider=provider, lookback=300)
-    ml_preds = ml_predictor(df_filtered, lookback=500)
-
-    all_predictions = {}
-    
-    for num, score, reason in advanced_preds:
-        if num not in all_predictions:
-            all_predictions[num] = {'count': 0, 'total_score': 0, 'sources': []}
-        all_predictions[num]['count'] += 1
-        all_predictions[num]['total_score'] += score
-        all_predictions[num]['sources'].append(f'Advanced: {reason}')
-
-    for num, score, reason in smart_preds:
-        if num not in all_predictions:
-            all_predictions[num] = {'count': 0, 'total_score': 0, 'sources': []}
-        all_predictions[num]['count'] += 1
-        all_predictions[num]['total_score'] += score
-        all_predictions[num]['sources'].append(f'Smart: {reason}')
-
-    for num, score, reason in ml_preds:
-        if num not in all_predictions:
-            all_predictions[num] = {'count': 0, 'total_score': 0, 'sources': []}
-        all_predictions[num]['count'] += 1
-        all_predictions[num]['total_score'] += score
-        all_predictions[num]['sources'].append(f'ML: {reason}')
-
-    final_predictions = []
-    for num, data in all_predictions.items():
-        consensus_score = data['count'] * (data['total_score'] / data['count'])
-        confidence = calculate_confidence_score(num, df_filtered, data)
-        risk_reward = calculate_risk_reward_ratio(num, df_filtered)
-        multi_timeframe = analyze_multi_timeframe_consensus(num, df_filtered)
-        
-        final_predictions.append({
-            'number': num,
-            'score': round(consensus_score, 3),
-            'source_count': data['count'],
-            'confidence': confidence,
-            'risk_reward': risk_reward,
-            'timeframe_consensus': multi_timeframe,
-            'sources': data['sources']
-        })
-
-    final_predictions.sort(key=lambda x: (x['source_count'], x['score']), reverse=True)
-
-    # Get next draw date
-    next_draw_date = ''
-    next_draw_day = ''
-    if not df.empty:
-        last_draw = df.iloc[-1]
-        from datetime import timedelta
-        next_draw_date = (last_draw['date_parsed'] + timedelta(days=3)).strftime('%Y-%m-%d')
-        next_draw_day = (last_draw['date_parsed'] + timedelta(days=3)).strftime('%A')
-
-
-    return render_template('best_predictions.html',
-                         predictions=final_predictions[:10],
-                         provider_options=provider_options,
-                         provider=provider,
-                         month_filter=month_filter,
-                         month_options=month_options,
-                         next_draw_date=next_draw_date,
-                         next_draw_day=next_draw_day,
-                         error=None)
-
-def calculate_confidence_score(number, df, prediction_data):
-    """Calculate 0-100% confidence based on historical accuracy"""
-    recent_nums = []
-    for col in ['1st_real', '2nd_real', '3rd_real']:
-        recent_nums.extend([n for n in df[col].tail(100).astype(str) if n.isdigit() and len(n) == 4])
-    
-    frequency_score = (recent_nums.count(number) / len(recent_nums)) * 100 if recent_nums else 0
-    predictor_consensus = (prediction_data['count'] / 3) * 100
-    avg_prediction_score = prediction_data['total_score'] / prediction_data['count'] if prediction_data['count'] > 0 else 0
-    
-    confidence = (frequency_score * 0.4 + predictor_consensus * 0.4 + avg_prediction_score * 20) / 3
-    return round(min(confidence, 100), 1)
-
-def calculate_risk_reward_ratio(number, df):
-    """Calculate risk vs reward potential"""
-    all_nums = []
-    for col in ['1st_real', '2nd_real', '3rd_real']:
-        all_nums.extend([n for n in df[col].astype(str) if n.isdigit() and len(n) == 4])
-    
-    frequency = all_nums.count(number)
-    total_draws = len(all_nums)
-    
-    if frequency == 0:
-        return {'risk': 'High', 'reward': 'High', 'ratio': 'High Risk/High Reward'}
-    elif frequency / total_draws > 0.02:
-        return {'risk': 'Low', 'reward': 'Medium', 'ratio': 'Low Risk/Medium Reward'}
-    else:
-        return {'risk': 'Medium', 'reward': 'High', 'ratio': 'Medium Risk/High Reward'}
-
-def analyze_multi_timeframe_consensus(number, df):
-    """Analyze consensus across different timeframes"""
-    timeframes = {
-        '7d': df.tail(20),
-        '30d': df.tail(100),
-        '90d': df.tail(300)
-    }
-    
-    consensus = {}
-    for period, data in timeframes.items():
-        nums = []
-        for col in ['1st_real', '2nd_real', '3rd_real']:
-            nums.extend([n for n in data[col].astype(str) if n.isdigit() and len(n) == 4])
-        
-        freq = nums.count(number)
-        total = len(nums)
-        consensus[period] = round((freq / total) * 100, 2) if total > 0 else 0
-    
-    return consensus
-
-@app.route('/statistics')
-def statistics():
-    df = load_csv_data()
-    if df.empty:
-        return render_template('statistics.html', total_draws=0, top_20=[], digit_freq=[], predictions=[], provider_options=['all'], provider='all', month_options=[], selected_month='', message="No data available")
-    
-    provider = request.args.get('provider', 'all')
-    selected_month = request.args.get('month', '')
-    
-    provider_options = ['all'] + sorted([p for p in df['provider_key'].dropna().unique() if p])
-    month_options = sorted(df['date_parsed'].dropna().dt.strftime('%Y-%m').unique(), reverse=True)
-    
-    # Apply tail(500) first for better performance
-    filtered_df = df.tail(500).copy()
-    if provider != 'all':
-        filtered_df = filtered_df[filtered_df['provider_key'] == provider]
-    if selected_month:
-        filtered_df = filtered_df[filtered_df['date_parsed'].dt.strftime('%Y-%m') == selected_month]
-    total_draws = len(filtered_df)
-    
-    all_numbers = []
-    for col in ['1st_real', '2nd_real', '3rd_real']:
-        all_numbers.extend([n for n in filtered_df[col].astype(str) if n.isdigit() and len(n) == 4])
-    
-    digit_freq = Counter(''.join(all_numbers)).most_common(10)
-    number_freq = Counter(all_numbers)
-    top_20 = number_freq.most_common(20)
-    
-    # Enhanced statistics analysis
-    draw_intervals = analyze_draw_intervals(filtered_df)
-    pair_strength = analyze_number_pair_strength(all_numbers)
-    provider_rankings = analyze_provider_performance(df)
-    predictions = advanced_predictor(filtered_df, provider=provider, lookback=200)[:5]
-    
-    return render_template('statistics.html', 
-                         total_draws=total_draws, 
-                         top_20=top_20, 
-                         digit_freq=digit_freq, 
-                         predictions=predictions,
-                         provider_options=provider_options, 
-                         provider=provider, 
-                         month_options=month_options, 
-                         selected_month=selected_month, 
-                         message="", 
-                         last_updated=time.strftime("%Y-%m-%d %H:%M:%S"),
-                         draw_intervals=draw_intervals,
-                         pair_strength=pair_strength,
-                         provider_rankings=provider_rankings)
-
-def analyze_draw_intervals(df):
-    """Analyze intervals between draws for patterns"""
-    df_sorted = df.sort_values('date_parsed')
-    intervals = []
-    
-    for i in range(1, len(df_sorted)):
-        prev_date = df_sorted.iloc[i-1]['date_parsed']
-        curr_date = df_sorted.iloc[i]['date_parsed']
-        interval = (curr_date - prev_date).days
-        intervals.append(interval)
-    
-    if not intervals:
-        return {'avg_interval': 0, 'most_common': 0, 'next_predicted': 0}
-    
-    avg_interval = sum(intervals) / len(intervals)
-    most_common = Counter(intervals).most_common(1)[0][0] if intervals else 0
-    
-    return {
-        'avg_interval': round(avg_interval, 1),
-        'most_common': most_common,
-        'next_predicted': most_common,
-        'distribution': Counter(intervals).most_common(5)
-    }
-
-def analyze_number_pair_strength(numbers):
-    """Analyze strength of number pairs appearing together"""
-    pair_counts = Counter()
-    
-    for i in range(len(numbers)):
-        for j in range(i+1, min(i+10, len(numbers))):
-            pair = tuple(sorted([numbers[i], numbers[j]]))
-            pair_counts[pair] += 1
-    
-    strong_pairs = []
-    for pair, count in pair_counts.most_common(10):
-        strength = 'Strong' if count >= 5 else 'Medium' if count >= 3 else 'Weak'
-        strong_pairs.append({
-            'pair': f'{pair[0]} + {pair[1]}',
-            'count': count,
-            'strength': strength
-        })
-    
-    return strong_pairs
-
-def analyze_provider_performance(df):
-    """Rank providers by various performance metrics"""
-    provider_stats = {}
-    
-    for provider in df['provider'].unique():
-        if not provider or str(provider).strip() == '':
-            continue
-            
-        provider_df = df[df['provider_key'] == provider]
-        
-        # Calculate metrics
-        total_draws = len(provider_df)
-        unique_numbers = set()
-        for col in ['1st_real', '2nd_real', '3rd_real']:
-            unique_numbers.update([n for n in provider_df[col].astype(str) if n.isdigit() and len(n) == 4])
-        
-        diversity_score = len(unique_numbers) / total_draws if total_draws > 0 else 0
-        
-        provider_stats[provider] = {
-            'total_draws': total_draws,
-            'unique_numbers': len(unique_numbers),
-            'diversity_score': round(diversity_score, 3),
-            'avg_per_month': round(total_draws / 12, 1) if total_draws > 0 else 0
-        }
-    
-    # Rank by diversity score
-    ranked = sorted(provider_stats.items(), key=lambda x: x[1]['diversity_score'], reverse=True)
-    return ranked[:10]
-
-@app.route('/lucky-generator')
-def lucky_generator():
-    df = load_csv_data()
-    if df.empty:
-        return render_template('lucky_generator.html', lucky_numbers=[], message="No data available", provider_options=['all'], provider='all', month_options=[], selected_month='', selected_date='', date_options=[])
-    
-    provider = request.args.get('provider', 'all')
-    selected_month = request.args.get('month', '')
-    selected_date = request.args.get('date', datetime.now().strftime('%Y-%m-%d'))
-    
-    provider_options = ['all'] + sorted([p for p in df['provider_key'].dropna().unique() if p])
-    month_options = sorted(df['date_parsed'].dropna().dt.strftime('%Y-%m').unique(), reverse=True)
-    date_options = sorted(df['date_parsed'].dropna().dt.strftime('%Y-%m-%d').unique(), reverse=True)[:30]
-    
-    if provider != 'all':
-        df = df[df['provider_key'] == provider]
-    if selected_month:
-        df = df[df['date_parsed'].dt.strftime('%Y-%m') == selected_month]
-    
-    all_numbers = []
-    for col in ['number_1st', 'number_2nd', 'number_3rd']:
-        if col in df.columns:
-            all_numbers.extend([n for n in df[col].astype(str) if n and n != 'nan' and len(n) == 4 and n.isdigit()])
-    digit_freq = Counter(''.join(all_numbers))
-    lucky_digits = [d for d, _ in digit_freq.most_common(6)]
-    
-    # Enhanced lucky number generation
-    astrological_numbers = generate_astrological_numbers(selected_date)
-    personal_learned = get_personal_lucky_patterns(df, provider)
-    date_based = generate_date_based_numbers(selected_date)
-    
-    if not all_numbers:
-        lucky_numbers = astrological_numbers + personal_learned + date_based
-    else:
-        number_freq = Counter(all_numbers)
-        frequency_based = [num for num, count in number_freq.most_common(5)]
-        lucky_numbers = frequency_based + astrological_numbers[:3] + personal_learned[:2]
-    
-    return render_template('lucky_generator.html', lucky_numbers=lucky_numbers[:10], lucky_digits=lucky_digits, message="Based on frequency + astrology + personal patterns", last_updated=time.strftime("%Y-%m-%d %H:%M:%S"), provider_options=provider_options, provider=provider, month_options=month_options, selected_month=selected_month, selected_date=selected_date, date_options=date_options, astrological_numbers=astrological_numbers, personal_patterns=personal_learned, date_based_numbers=date_based)
-
-@app.route('/frequency-analyzer')
-def frequency_analyzer():
-    df = load_csv_data()
-    date_range = request.args.get('range', '30')
-    provider = request.args.get('provider', 'all')
-    selected_month = request.args.get('month', '')
-    
-    if df.empty:
-        return render_template('frequency_analyzer.html', hot_numbers=[], cold_numbers=[], odd_pct=0, even_pct=0, total_draws=0, top_4_prediction=[], chart_data=[], provider_options=['all'], provider='all', month_options=[], selected_month='', last_updated='')
-    
-    provider_options = ['all'] + sorted([p for p in df['provider_key'].dropna().unique() if p])
-    month_options = sorted(df['date_parsed'].dropna().dt.strftime('%Y-%m').unique(), reverse=True)
-    
-    if provider != 'all':
-        # Fix provider matching - convert to lowercase for comparison
-        provider_lower = provider.lower().strip()
-        df = df[df['provider'].str.lower().str.strip() == provider_lower]
-    if selected_month:
-        df = df[df['date_parsed'].dt.strftime('%Y-%m') == selected_month]
-    
-    try:
-        days = min(int(date_range), 365)
-    except:
-        days = 30
-    cutoff_date = df['date_parsed'].max() - timedelta(days=days)
-    filtered_df = df[df['date_parsed'] >= cutoff_date]
-    
-    all_numbers = []
-    for col in ['number_1st', 'number_2nd', 'number_3rd']:
-        if col in filtered_df.columns:
-            all_numbers.extend([n for n in filtered_df[col].astype(str) if n and n != 'nan' and len(n) == 4 and n.isdigit()])
-    
-    if not all_numbers:
-        return render_template('frequency_analyzer.html', hot_numbers=[], cold_numbers=[], odd_pct=0, even_pct=0, total_draws=0, top_4_prediction=[], chart_data=[], provider_options=provider_options, provider=provider, month_options=month_options, selected_month=selected_month, last_updated=time.strftime("%Y-%m-%d %H:%M:%S"), provider_bias={'bias_numbers': [], 'recommendation': 'No data'}, weighted_predictions=[])
-    
-    freq_counter = Counter(all_numbers)
-    total_draws = len(filtered_df)
-    
-    # Enhanced frequency analysis with weighted scoring
-    weighted_freq = calculate_weighted_frequency(filtered_df, all_numbers, days)
-    provider_bias = analyze_provider_bias(filtered_df, provider)
-    time_decay_scores = calculate_time_decay_frequency(filtered_df, all_numbers)
-    
-    sorted_freq = freq_counter.most_common()
-    hot_numbers = sorted_freq[:10]
-    cold_numbers = sorted_freq[-10:] if len(sorted_freq) >= 10 else []
-    
-    # Odd/Even analysis
-    odd_count = sum(1 for num in all_numbers if int(num) % 2 == 1)
-    even_count = len(all_numbers) - odd_count
-    odd_pct = round((odd_count / len(all_numbers)) * 100, 1) if all_numbers else 0
-    even_pct = round((even_count / len(all_numbers)) * 100, 1) if all_numbers else 0
-    
-    # Top 4 prediction (most frequent numbers)
-    top_4_prediction = [num for num, count in sorted_freq[:4]]
-    
-    # Chart data for top 50
-    chart_data = [[num, count] for num, count in sorted_freq[:50]]
-    
-    return render_template('frequency_analyzer.html', 
-                         hot_numbers=hot_numbers,
-                         cold_numbers=cold_numbers,
-                         odd_pct=odd_pct,
-                         even_pct=even_pct,
-                         total_draws=total_draws,
-                         top_4_prediction=top_4_prediction,
-                         chart_data=chart_data,
-                         provider_options=provider_options, 
-                         provider=provider, 
-                         month_options=month_options, 
-                         selected_month=selected_month,
-                         last_updated=time.strftime("%Y-%m-%d %H:%M:%S"),
-                         provider_bias=provider_bias,
-                         weighted_predictions=sorted(weighted_freq.items(), key=lambda x: x[1], reverse=True)[:5])
-
-def calculate_weighted_frequency(df, numbers, days):
-    """Calculate weighted frequency where recent draws count more"""
-    weighted_scores = {}
-    df_sorted = df.sort_values('date_parsed')
-    
-    for i, row in df_sorted.iterrows():
-        age_weight = 1.0 - (i / len(df_sorted)) * 0.5
-        for col in ['1st_real', '2nd_real', '3rd_real']:
-            num = str(row[col])
-            if num in numbers:
-                weighted_scores[num] = weighted_scores.get(num, 0) + age_weight
-    return weighted_scores
-
-def analyze_provider_bias(df, provider):
-    """Analyze provider-specific frequency patterns"""
-    if provider == 'all':
-        return {'bias_score': 1.0, 'recommendation': 'No specific bias'}
-    
-    provider_df = df[df['provider_key'] == provider]
-    provider_nums = []
-    all_nums = []
-    
-    # Extract numbers using working logic from '3rd' column
-    for _, row in provider_df.iterrows():
-        prize_text = str(row.get('3rd', ''))
-        matches = re.findall(r'\d{4}', prize_text)
-        provider_nums.extend(matches[:3])  # Take first 3 matches
-    
-    for _, row in df.iterrows():
-        prize_text = str(row.get('3rd', ''))
-        matches = re.findall(r'\d{4}', prize_text)
-        all_nums.extend(matches[:3])  # Take first 3 matches
-    
-    provider_freq = Counter(provider_nums)
-    all_freq = Counter(all_nums)
-    
-    bias_numbers = []
-    for num, count in provider_freq.most_common(10):
-        provider_rate = count / len(provider_nums) if provider_nums else 0
-        all_rate = all_freq[num] / len(all_nums) if all_nums else 0
-        if provider_rate > all_rate * 1.2:
-            bias_numbers.append({'number': num, 'bias_ratio': round(provider_rate / all_rate, 2) if all_rate > 0 else 0})
-    
-    return {'bias_numbers': bias_numbers[:5], 'recommendation': f'{provider.upper()} shows bias toward certain numbers'}
-
-def calculate_time_decay_frequency(df, numbers):
-    """Calculate frequency with exponential time decay"""
-    decay_scores = {}
-    df_sorted = df.sort_values('date_parsed', ascending=False)
-    
-    for i, row in df_sorted.iterrows():
-        decay_factor = 0.95 ** i
-        prize_text = str(row.get('3rd', ''))
-        
-        matches = re.findall(r'\d{4}', prize_text)
-        for num in matches[:3]:  # Take first 3 matches
-            if num in numbers:
-                decay_scores[num] = decay_scores.get(num, 0) + decay_factor
-    return decay_scores
-
-@app.route('/empty-box-predictor')
-def empty_box_predictor():
-    try:
-        df = load_csv_data()
-        if df.empty:
-            return render_template('empty_box_predictor.html', predictions=[], message="No data available", next_empty_predictions=[], draws=[], provider_options=['all'], provider='all', month_options=[], selected_month='', last_updated=time.strftime("%Y-%m-%d %H:%M:%S"))
-        
-        provider = request.args.get('provider', 'all')
-        selected_month = request.args.get('month', '')
-        
-        provider_options = ['all'] + sorted([p for p in df['provider_key'].dropna().unique() if p and str(p).strip() and str(p) != 'nan'])
-        month_options = sorted(df['date_parsed'].dropna().dt.strftime('%Y-%m').unique(), reverse=True)
-        
-        filtered_df = df.copy()
-        if provider != 'all':
-            filtered_df = filtered_df[filtered_df['provider_key'] == provider]
-        if selected_month:
-            filtered_df = filtered_df[filtered_df['date_parsed'].dt.strftime('%Y-%m') == selected_month]
-        
-        draws = []
-        empty_position_tracker = defaultdict(lambda: {'count': 0})
-        
-        # Process last 20 draws
-        for _, row in filtered_df.tail(20).iterrows():
-            try:
-                # Extract special and consolation numbers
-                special_text = str(row.get('special', ''))
-                consolation_text = str(row.get('consolation', ''))
-                
-                # Find all 4-digit numbers in the text
-                special_nums = re.findall(r'\b\d{4}\b', special_text)
-                consolation_nums = re.findall(r'\b\d{4}\b', consolation_text)
-                
-                # Create 2x5 grids (10 positions each)
-                special_grid = [['----'] * 5 for _ in range(2)]
-                consolation_grid = [['----'] * 5 for _ in range(2)]
-                
-                # Fill special grid
-                for i, num in enumerate(special_nums[:10]):
-                    row_idx = i // 5
-                    col_idx = i % 5
-                    special_grid[row_idx][col_idx] = num
-                
-                # Fill consolation grid
-                for i, num in enumerate(consolation_nums[:10]):
-                    row_idx = i // 5
-                    col_idx = i % 5
-                    consolation_grid[row_idx][col_idx] = num
-                
-                # Track empty positions
-                empty_positions = []
-                label_idx = 0
-                
-                # Check special grid for empty positions
-                for r in range(2):
-                    for c in range(5):
-                        if special_grid[r][c] == '----':
-                            empty_positions.append({
-                                'label': chr(65 + label_idx),
-                                'section': 'Special',
-                                'row': r+1,
-                                'col': c+1
-                            })
-                            empty_position_tracker[f"Special_R{r+1}_C{c+1}"]['count'] += 1
-                            label_idx += 1
-                
-                # Check consolation grid for empty positions
-                for r in range(2):
-                    for c in range(5):
-                        if consolation_grid[r][c] == '----':
-                            empty_positions.append({
-                                'label': chr(65 + label_idx),
-                                'section': 'Consolation',
-                                'row': r+1,
-                                'col': c+1
-                            })
-                            empty_position_tracker[f"Consolation_R{r+1}_C{c+1}"]['count'] += 1
-                            label_idx += 1
-                
-                draws.append({
-                    'date': row['date_parsed'].date(),
-                    'provider': str(row['provider']).upper(),
-                    'draw_no': str(row.get('draw_info', f"Draw-{row['date_parsed'].strftime('%Y%m%d')}"))[:20],
-                    'prizes': {
-                        '1st': str(row.get('1st_real', '----'))[:4],
-                        '2nd': str(row.get('2nd_real', '----'))[:4],
-                        '3rd': str(row.get('3rd_real', '----'))[:4]
-                    },
-                    'special_grid': special_grid,
-                    'consolation_grid': consolation_grid,
-                    'empty_positions': empty_positions
-                })
-            except Exception as e:
-                logger.error(f"Error processing row: {e}")
-                continue
-        
-        # Generate predictions
-        next_empty_predictions = []
-        total_draws = len(draws)
-        
-        if total_draws > 0:
-            # Get recent winning numbers for predictions
-            recent_nums = []
-            for col in ['1st_real', '2nd_real', '3rd_real']:
-                recent_nums.extend([n for n in filtered_df[col].tail(50).astype(str) if len(n) == 4 and n.isdigit()])
-            
-            num_freq = Counter(recent_nums)
-            top_nums = num_freq.most_common(3) if num_freq else [('1234', 1), ('5678', 1), ('9012', 1)]
-            
-            # Create predictions for most frequent empty positions
-            for i, (key, data) in enumerate(sorted(empty_position_tracker.items(), key=lambda x: x[1]['count'], reverse=True)[:6]):
-                section = 'Special' if 'Special' in key else 'Consolation'
-                position_match = re.search(r'R(\d+)_C(\d+)', key)
-                position = f"R{position_match.group(1)}C{position_match.group(2)}" if position_match else f"Pos{i+1}"
-                
-                probability = round((data['count'] / total_draws) * 100, 1)
-                
-                predicted_numbers = []
-                for num, cnt in top_nums:
-                    confidence = round((cnt / len(recent_nums)) * 100, 1) if recent_nums else 10
-                    predicted_numbers.append({'number': num, 'confidence': confidence})
-                
-                completion_prob = calculate_box_completion_probability(section, position, filtered_df)
-                urgency_score = calculate_urgency_score(data['count'], total_draws)
-                pattern_history = analyze_box_pattern_history(section, position, filtered_df)
-                
-                next_empty_predictions.append({
-                    'label': chr(65 + i),
-                    'section': section,
-                    'position': position,
-                    'probability': probability,
-                    'predicted_numbers': predicted_numbers,
-                    'frequency': data['count'],
-                    'completion_probability': completion_prob,
-                    'urgency_score': urgency_score,
-                    'pattern_history': pattern_history
-                })
-        
-        return render_template('empty_box_predictor.html', 
-                             predictions=[], 
-                             message="", 
-                             last_updated=time.strftime("%Y-%m-%d %H:%M:%S"), 
-                             next_empty_predictions=next_empty_predictions, 
-                             draws=draws, 
-                             provider_options=provider_options, 
-                             provider=provider, 
-                             month_options=month_options, 
-                             selected_month=selected_month)
-    except Exception as e:
-        logger.error(f"Empty box predictor error: {e}")
-        return render_template('empty_box_predictor.html', 
-                             predictions=[], 
-                             message=f"Error: {str(e)}", 
-                             next_empty_predictions=[], 
-                             draws=[], 
-                             provider_options=['all'], 
-                             provider='all', 
-                             month_options=[], 
-                             selected_month='')
-
-@app.route('/hot-cold')
-def hot_cold():
-    df = load_csv_data()
-    days = int(request.args.get('days', '30'))
-    provider = request.args.get('provider', 'all')
-    selected_month = request.args.get('month', '')
-    
-    if df.empty:
-        return render_template('hot_cold.html', hot=[], cold=[], neutral=[], message="No data available", provider_options=['all'], provider='all', month_options=[], selected_month='', days=30, temperature_momentum=[], cross_provider_sync=[], transition_timing=[])
-    
-    provider_options = ['all'] + sorted([p for p in df['provider_key'].dropna().unique() if p and str(p).strip() and str(p) != 'nan'])
-    month_options = sorted(df['date_parsed'].dropna().dt.strftime('%Y-%m').unique(), reverse=True)
-    
-    if provider != 'all':
-        df = df[df['provider_key'] == provider]
-    if selected_month:
-        df = df[df['date_parsed'].dt.strftime('%Y-%m') == selected_month]
-    
-    if df.empty:
-        return render_template('hot_cold.html', hot=[], cold=[], neutral=[], message="No data for selected filters", provider_options=provider_options, provider=provider, month_options=month_options, selected_month=selected_month, days=days, temperature_momentum=[], cross_provider_sync=[], transition_timing=[])
-    
-    cutoff_date = df['date_parsed'].max() - timedelta(days=days)
-    recent_df = df[df['date_parsed'] >= cutoff_date]
-    all_numbers = []
-    for col in ['1st_real', '2nd_real', '3rd_real']:
-        all_numbers.extend([n for n in recent_df[col].astype(str) if n.isdigit() and len(n) == 4])
-    
-    if not all_numbers:
-        return render_template('hot_cold.html', hot=[], cold=[], neutral=[], message="No numbers found for selected filters", provider_options=provider_options, provider=provider, month_options=month_options, selected_month=selected_month, days=days, temperature_momentum=[], cross_provider_sync=[], transition_timing=[])
-    
-    freq_counter = Counter(all_numbers)
-    sorted_freq = sorted(freq_counter.items(), key=lambda x: x[1], reverse=True)
-    
-    # Enhanced hot/cold with momentum
-    hot = sorted_freq[:20]
-    cold = sorted_freq[-20:] if len(sorted_freq) >= 20 else []
-    
-    # Cross-provider temperature sync
-    cross_provider_sync = analyze_cross_provider_sync(df, [num for num, count in hot[:10]]) if hot else []
-    
-    # Hot-cold transition timing
-    transition_timing = analyze_transition_timing(recent_df) if not recent_df.empty else []
-    
-    temperature_momentum = hot[:5]
-    
-    return render_template('hot_cold.html', hot=hot, cold=cold, neutral=[], days=days, message="", last_updated=time.strftime("%Y-%m-%d %H:%M:%S"), provider_options=provider_options, provider=provider, month_options=month_options, selected_month=selected_month, temperature_momentum=temperature_momentum, cross_provider_sync=cross_provider_sync, transition_timing=transition_timing)
-
-def calculate_temperature_momentum(number, df):
-    """Calculate if number is heating up or cooling down"""
-    recent_7d = df[df['date_parsed'] >= (df['date_parsed'].max() - timedelta(days=7))]
-    previous_7d = df[(df['date_parsed'] >= (df['date_parsed'].max() - timedelta(days=14))) & (df['date_parsed'] < (df['date_parsed'].max() - timedelta(days=7)))]
-    
-    recent_count = sum([1 for col in ['1st_real', '2nd_real', '3rd_real'] for n in recent_7d[col].astype(str) if n == number])
-    previous_count = sum([1 for col in ['1st_real', '2nd_real', '3rd_real'] for n in previous_7d[col].astype(str) if n == number])
-    
-    if recent_count > previous_count:
-        return 'heating_up'
-    elif recent_count < previous_count:
-        return 'cooling_down'
-    return 'stable'
-
-def analyze_cross_provider_sync(df, top_numbers):
-    """Analyze if hot numbers appear across multiple providers"""
-    sync_data = []
-    providers = df['provider'].unique()
-    
-    for num in top_numbers:
-        provider_counts = {}
-        for provider in providers:
-            provider_df = df[df['provider_key'] == provider]
-            count = sum([1 for col in ['1st_real', '2nd_real', '3rd_real'] for n in provider_df[col].astype(str) if n == num])
-            if count > 0:
-                provider_counts[provider] = count
-        
-        if len(provider_counts) >= 2:
-            sync_data.append({'number': num, 'providers': len(provider_counts), 'sync_score': sum(provider_counts.values())})
-    
-    return sorted(sync_data, key=lambda x: x['sync_score'], reverse=True)[:5]
-
-def analyze_transition_timing(df):
-    """Analyze timing patterns of hot-cold transitions"""
-    transitions = []
-    df_sorted = df.sort_values('date_parsed')
-    
-    for i in range(len(df_sorted) - 5):
-        window = df_sorted.iloc[i:i+5]
-        all_nums = []
-        for col in ['1st_real', '2nd_real', '3rd_real']:
-            all_nums.extend([n for n in window[col].astype(str) if n.isdigit() and len(n) == 4])
-        
-        freq = Counter(all_nums)
-        if freq:
-            hottest = freq.most_common(1)[0]
-            transitions.append({'date': window.iloc[-1]['date_parsed'].date(), 'number': hottest[0], 'frequency': hottest[1]})
-    
-    return transitions[-10:]
-
-@app.route('/test-route')
-def test_route_function():
-    return "Test route is working!"
-
-# Unique route implementations
-@app.route('/hot_and_cold_numbers')
-@app.route('/hot_cold_numbers')
-def hot_and_cold_numbers():
-    return redirect('/hot-cold')
-
-@app.route('/accuracy_tracker')
-def accuracy_tracker():
-    return render_template('accuracy_dashboard.html', stats={'total_predictions': 0}, method_stats={}, recent_predictions=[], insights=[], message="Accuracy tracking active")
-
-@app.route('/missing-number-finder')
-def missing_number_finder():
-    df = load_csv_data()
-    recent = df.tail(50)
-    all_digits = ''.join([str(row['1st_real']) for _, row in recent.iterrows() if str(row['1st_real']).isdigit()])
-    digit_freq = Counter(all_digits)
-    missing = [d for d in '0123456789' if digit_freq.get(d, 0) < 5]
-    return render_template('empty_box_predictor.html', predictions=[{'position': f'Missing: {m}', 'top_digits': []} for m in missing], message="", last_updated=time.strftime("%Y-%m-%d %H:%M:%S"), next_empty_predictions=[])
-
-@app.route('/master-analyzer')
-def master_analyzer():
-    df = load_csv_data()
-    if df.empty:
-        return render_template('master_analyzer.html', error="No data available", master_predictions=[], provider_options=['all'], provider='all')
-    
-    provider = request.args.get('provider', 'all')
-    provider_options = ['all'] + sorted([p for p in df['provider_key'].dropna().unique() if p])
-    
-    if provider != 'all':
-        df = df[df['provider_key'] == provider]
-    
-    # Get all numbers for analysis
-    all_numbers = [n for col in ['1st_real', '2nd_real', '3rd_real'] for n in df[col].astype(str) if n.isdigit() and len(n) == 4]
-    
-    # Enhanced master analysis with cross-correlation
-    advanced_preds = advanced_predictor(df, provider=provider, lookback=200)
-    smart_preds = smart_auto_weight_predictor(df, provider=provider, lookback=300)
-    ml_preds = ml_predictor(df, lookback=500)
-    
-    cross_correlations = analyze_cross_correlations(all_numbers)
-    pattern_mining = advanced_pattern_mining(all_numbers)
-    multi_dimensional = multi_dimensional_analysis(df)
-    
-    master_predictions = []
-    for i, (num, score, reason) in enumerate(advanced_preds[:20]):
-        correlation_boost = cross_correlations.get(num, 0)
-        pattern_strength = pattern_mining.get(num, 0)
-        enhanced_confidence = min(100, (score * 100) + correlation_boost + pattern_strength)
-        
-        master_predictions.append({
-            'number': num,
-            'confidence': round(enhanced_confidence, 1),
-            'reasons': [reason, 'Advanced Algorithm', f'Correlation+{correlation_boost}', f'Pattern+{pattern_strength}']
-        })
-    
-    # Generate real data based on actual frequency analysis
-    digit_freq_counter = Counter(''.join(all_numbers))
-    total_digits = sum(digit_freq_counter.values())
-    
-    digit_freq = {
-        'percentages': {str(i): round((digit_freq_counter.get(str(i), 0) / total_digits) * 100, 1) if total_digits > 0 else 10.0 for i in range(10)},
-        'hot_digits': [d for d, c in digit_freq_counter.most_common(4)],
-        'predictions': [{'number': num, 'confidence': round(score * 100, 1), 'reason': reason} for num, score, reason in advanced_preds[:5]]
-    }
-    
-    # Real hot/cold analysis based on actual data
-    number_freq = Counter(all_numbers)
-    sorted_nums = sorted(number_freq.items(), key=lambda x: x[1], reverse=True)
-    
-    hot_cold = {
-        '7d': {'hot': sorted_nums[:10], 'cold': sorted_nums[-10:] if len(sorted_nums) >= 10 else []},
-        '30d': {'hot': sorted_nums[:10], 'cold': sorted_nums[-10:] if len(sorted_nums) >= 10 else []},
-        '90d': {'hot': sorted_nums[:10], 'cold': sorted_nums[-10:] if len(sorted_nums) >= 10 else []}
-    }
-    
-    accuracy = {
-        'best_method': 'advanced_predictor',
-        'accuracy': {'advanced_predictor': {'rate': 28.5}, 'smart_predictor': {'rate': 24.1}, 'ml_predictor': {'rate': 19.8}},
-        'ranked': [('advanced_predictor', {'rate': 28.5, 'wins': 12, 'total': 42}), ('smart_predictor', {'rate': 24.1, 'wins': 10, 'total': 41}), ('ml_predictor', {'rate': 19.8, 'wins': 8, 'total': 40})]
-    }
-    
-    return render_template('master_analyzer.html',
-                         master_predictions=master_predictions,
-                         digit_freq=digit_freq,
-                         hot_cold=hot_cold,
-                         accuracy=accuracy,
-                         repeaters=[],
-                         pairs={'digit_pairs': [], 'consecutive_pairs': []},
-                         sums={'ranges': {}, 'most_common': [], 'predictions': []},
-                         positions={'heatmap': [[0]*10 for _ in range(4)], 'prediction': '1234'},
-                         gaps=[],
-                         odd_even={'distribution': [], 'recent': [], 'recommendation': 'EOEO'},
-                         provider_comparison={},
-                         time_patterns={'day_patterns': {}},
-                         recent_sequence=[],
-                         multi_step=[],
-                         provider_options=provider_options,
-                         provider=provider,
-                         last_updated=time.strftime('%Y-%m-%d %H:%M:%S'),
-                         error=None)
-
-@app.route('/statistics_dashboard')
-def statistics_dashboard():
-    return redirect('/statistics')
-
-
-
-
-
-@app.route('/best-pick')
-def best_pick():
-    df = load_csv_data()
-    selected_date = request.args.get('date', '')
-    provider = request.args.get('provider', 'all')
-    month_filter = request.args.get('month', 'all')
-    
-    if df.empty:
-        return render_template('best_pick.html', top_5=[], message="No data available", provider_options=['all'], provider='all', selected_date='', month_filter='all', month_options=['all'], next_draw_info={})
-    
-    provider_options = ['all'] + sorted([p for p in df['provider_key'].dropna().unique() if p])
-    month_options = ['all'] + [str(i) for i in range(1, 13)]
-    
-    # Filter by provider
-    if provider != 'all':
-        df = df[df['provider_key'] == provider]
-    
-    # Filter by month
-    if month_filter != 'all':
-        df = df[df['date_parsed'].dt.month == int(month_filter)]
-    
-    # Calculate next draw date
-    last_draw = df.iloc[-1]
-    from datetime import timedelta
-    if selected_date:
-        try:
-            next_draw_date = pd.to_datetime(selected_date)
-        except:
-            next_draw_date = last_draw['date_parsed'] + timedelta(days=3)
-    else:
-        next_draw_date = last_draw['date_parsed'] + timedelta(days=3)
-        selected_date = next_draw_date.strftime('%Y-%m-%d')
-    
-    next_draw_info = {
-        'date': next_draw_date.strftime('%Y-%m-%d'),
-        'day': next_draw_date.strftime('%A'),
-        'formatted': next_draw_date.strftime('%A, %Y-%m-%d'),
-        'provider': provider.upper() if provider != 'all' else 'ALL PROVIDERS'
-    }
-    
-    # Enhanced consensus with weighted voting
-    adv = advanced_predictor(df, provider, 200)[:10]
-    smart = smart_auto_weight_predictor(df, provider, 200)[:10]
-    ml = ml_predictor(df, 200)[:10]
-    
-    pattern = []
-    if not df.empty:
-        last_num = str(df.iloc[-1]['number_1st'])
-        if len(last_num) == 4 and last_num.isdigit():
-            grid = generate_4x4_grid(last_num)
-            raw = predict_top_5([{'date': str(df.iloc[-1]['date_parsed'].date()), 'grid': grid}], mode="combined")
-            pattern = _normalize_prediction_dict(raw)[:10]
-    
-    # Weighted consensus voting
-    weighted_votes = {}
-    method_weights = {'advanced': 1.2, 'smart': 1.0, 'ml': 0.8, 'pattern': 1.1}
-    
-    for num, score, _ in adv:
-        weighted_votes[num] = weighted_votes.get(num, 0) + (method_weights['advanced'] * score)
-    for num, score, _ in smart:
-        weighted_votes[num] = weighted_votes.get(num, 0) + (method_weights['smart'] * score)
-    for num, score, _ in ml:
-        weighted_votes[num] = weighted_votes.get(num, 0) + (method_weights['ml'] * score)
-    for num, score, _ in pattern:
-        weighted_votes[num] = weighted_votes.get(num, 0) + (method_weights['pattern'] * score)
-    
-    # Apply consensus strength multiplier
-    consensus_strength = calculate_consensus_strength(weighted_votes)
-    
-    top_5 = sorted(weighted_votes.items(), key=lambda x: x[1], reverse=True)[:5]
-    
-    return render_template('best_pick.html', 
-                         top_5=[{'number': num, 'weighted_score': round(score, 2), 'confidence': min(score*10, 100)} for num, score in top_5],
-                         total_methods=4,
-                         consensus_strength=consensus_strength,
-                         message="Weighted consensus from all prediction methods",
-                         provider_options=provider_options,
-                         provider=provider,
-                         selected_date=selected_date,
-                         month_filter=month_filter,
-                         month_options=month_options,
-                         next_draw_info=next_draw_info)
+def inject_datetime():
+    return {'datetime': datetime}
 
-@app.route('/export/predictions')
-def export_predictions():
-    df = load_csv_data()
-    provider = request.args.get('provider', 'all')
-    df_filtered = df if provider == 'all' else df[df['provider_key'] == provider]
-    
-    adv = advanced_predictor(df_filtered, provider, 200)
-    smart = smart_auto_weight_predictor(df_filtered, None, 300)
-    ml = ml_predictor(df_filtered, 500)
-    
-    export_data = []
-    for num, score, reason in adv + smart + ml:
-        export_data.append({'number': num, 'score': score, 'method': reason, 'timestamp': datetime.now()})
-    
-    export_df = pd.DataFrame(export_data)
-    csv_data = export_df.to_csv(index=False)
-    
-    from flask import Response
-    return Response(csv_data, mimetype='text/csv', headers={'Content-Disposition': f'attachment;filename=predictions_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'})
+# ---------------- SHARED HELPERS ---------------- #
+# The predictors are re-exported for scripts that import them from app (quick_test.py, full_test.py)
+from blueprints.shared import (load_csv_data, advanced_predictor, smart_auto_weight_predictor, ml_predictor,
+                               precompute, ensemble, dataset_validators, with_validators, not_modified,
+                               uses_precompute, warm_dashboard_predictions)
+from blueprints import register_families, registered_families
+from utils.stats_store import get_stats_store
+from utils.startup import get_warm_up, warm_up_enabled
+from utils.metrics import get_metrics, Sample, PHASES
+from utils.sampling_profiler import get_sampling_profiler
+from utils.cache import cache_stats
 
-@app.route('/export/statistics')
-def export_statistics():
-    df = load_csv_data()
-    all_nums = [n for col in ['1st_real', '2nd_real', '3rd_real'] for n in df[col].astype(str) if n.isdigit() and len(n) == 4]
-    freq = Counter(all_nums)
-    
-    stats_data = [{'number': num, 'frequency': count, 'percentage': round(count/len(all_nums)*100, 2)} for num, count in freq.most_common()]
-    stats_df = pd.DataFrame(stats_data)
-    csv_data = stats_df.to_csv(index=False)
-    
-    from flask import Response
-    return Response(csv_data, mimetype='text/csv', headers={'Content-Disposition': f'attachment;filename=statistics_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'})
+# ---------------- INSTRUMENTATION ---------------- #
+metrics = get_metrics()
+profiler = get_sampling_profiler()  # None unless PROFILE_SLOW_REQUESTS is set
 
-@app.route('/export/accuracy')
-def export_accuracy():
-    pred_file = "prediction_tracking.csv"
-    if os.path.exists(pred_file):
-        df = pd.read_csv(pred_file)
-        
-        # Enhanced export with analysis
-        completed = df[df['hit_status'] != 'pending']
-        if not completed.empty:
-            # Add analysis columns
-            completed['hit_count'] = completed['hit_status'].str.extract(r'(\d+)').fillna(0).astype(int)
-            completed['is_hit'] = completed['hit_status'].str.contains('HIT', na=False)
-            completed['prediction_hour'] = pd.to_datetime(completed['prediction_date']).dt.hour
-            completed['days_ahead'] = (pd.to_datetime(completed['draw_date']) - pd.to_datetime(completed['prediction_date'])).dt.days
-            
-            # Summary stats
-            summary = pd.DataFrame({
-                'Metric': ['Total Predictions', 'Total Hits', 'Hit Rate %', 'Avg Confidence', 'Best Method'],
-                'Value': [
-                    len(completed),
-                    len(completed[completed['is_hit']]),
-                    round(len(completed[completed['is_hit']]) / len(completed) * 100, 1),
-                    round(completed['confidence'].mean(), 1) if 'confidence' in completed.columns else 'N/A',
-                    completed['predictor_methods'].mode().iloc[0] if 'predictor_methods' in completed.columns else 'N/A'
-                ]
-            })
-            
-            # Combine data
-            with pd.ExcelWriter(f'accuracy_report_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx', engine='openpyxl') as writer:
-                summary.to_excel(writer, sheet_name='Summary', index=False)
-                completed.to_excel(writer, sheet_name='Detailed_Data', index=False)
-        
-        csv_data = df.to_csv(index=False)
-        from flask import Response
-        return Response(csv_data, mimetype='text/csv', headers={'Content-Disposition': f'attachment;filename=accuracy_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'})
-    return "No data available", 404
 
-@app.route('/ai-dashboard')
-def ai_dashboard():
-    """Enhanced AI Dashboard with all 16 features"""
-    try:
-        df = load_csv_data()
-        from utils.realtime_engine import RealtimeEngine
-        from utils.adaptive_learner import AdaptiveLearner
-        
-        engine = RealtimeEngine(df)
-        learner = AdaptiveLearner()
-        
-        sequences = engine.detect_sequences(100)
-        adv = advanced_predictor(df, lookback=200)
-        smart = smart_auto_weight_predictor(df, lookback=300)
-        ml = ml_predictor(df, lookback=500)
-        best_preds = learner.get_adaptive_predictions(adv, smart, ml)
-        weights = learner.calculate_method_accuracy()
-        pairs = engine.get_number_pairs(20)
-        overdue = engine.get_overdue_numbers(30)
-        hot_cold = engine.get_hot_cold_analysis(90)
-        realtime_pred = engine.predict_next_draw()
-        
-        return render_template('ai_dashboard.html',
-            sequences=sequences,
-            best_predictions=best_preds[:10],
-            adaptive_weights=weights,
-            number_pairs=pairs,
-            overdue_numbers=overdue[:20],
-            hot_numbers=hot_cold['hot'],
-            cold_numbers=hot_cold['cold'],
-            realtime_predictions=realtime_pred,
-            last_updated=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        )
-    except Exception as e:
-        logger.error(f"AI Dashboard error: {e}")
-        return f"Error: {str(e)}", 500
+@app.before_request
+def _begin_request_metrics():
+    metrics.begin_request()
+    if profiler is not None:
+        g.profile = profiler.begin()
 
-@app.route('/api/realtime-update')
-def realtime_update():
-    """API endpoint for real-time data updates"""
-    try:
-        df = load_csv_data()
-        from utils.realtime_engine import RealtimeEngine
-        from flask import jsonify
-        
-        engine = RealtimeEngine(df)
-        latest = df.tail(1).iloc[0]
-        
-        return jsonify({
-            'latest_draw': {
-                'date': str(latest['date_parsed'].date()),
-                'provider': latest['provider'],
-                '1st': latest['1st_real'],
-                '2nd': latest['2nd_real'],
-                '3rd': latest['3rd_real']
-            },
-            'hot_numbers': engine.get_hot_cold_analysis(30)['hot'][:5],
-            'predictions': engine.predict_next_draw(),
-            'timestamp': datetime.now().isoformat()
-        })
-    except Exception as e:
-        from flask import jsonify
-        return jsonify({'error': str(e)}), 500
 
-@app.route('/save-smart-prediction', methods=['POST'])
-def save_smart_prediction():
-    """Save prediction with adaptive learning"""
-    from utils.adaptive_learner import AdaptiveLearner
-    from flask import jsonify
-    
-    data = request.get_json()
-    learner = AdaptiveLearner()
-    
-    success = learner.save_prediction(
-        numbers=data.get('numbers'),
-        methods=data.get('methods'),
-        confidence=data.get('confidence'),
-        draw_date=data.get('draw_date'),
-        provider=data.get('provider')
-    )
-    
-    return jsonify({'status': 'success' if success else 'failed'})
+@app.after_request
+def _server_timing(response):
+    g.status = response.status_code
+    phases = metrics.request_phases()
+    if phases:
+        response.headers['Server-Timing'] = ', '.join(f"{phase};dur={phases[phase] * 1000:.1f}" for phase in PHASES)
+    return response
 
-@app.route('/export/dashboard')
-def export_dashboard():
-    """Export complete dashboard data"""
-    try:
-        df = load_csv_data()
-        from utils.realtime_engine import RealtimeEngine
-        from flask import Response
-        
-        engine = RealtimeEngine(df)
-        export_data = {
-            'sequences': engine.detect_sequences(100),
-            'overdue': engine.get_overdue_numbers(30),
-            'pairs': engine.get_number_pairs(20),
-            'hot_cold': engine.get_hot_cold_analysis(90),
-            'predictions': engine.predict_next_draw()
-        }
-        
-        rows = []
-        rows.append(['RECURRING SEQUENCES', '', ''])
-        for seq, count in export_data['sequences']:
-            rows.append(['Sequence', seq, count])
-        
-        rows.append(['', '', ''])
-        rows.append(['OVERDUE NUMBERS', '', ''])
-        for num in export_data['overdue'][:20]:
-            rows.append(['Overdue', num, ''])
-        
-        rows.append(['', '', ''])
-        rows.append(['HOT NUMBERS', '', ''])
-        for item in export_data['hot_cold']['hot']:
-            rows.append(['Hot', item['number'], f"{item['count']} {item['trend']}"])
-        
-        export_df = pd.DataFrame(rows, columns=['Category', 'Value', 'Count'])
-        csv_data = export_df.to_csv(index=False)
-        
-        return Response(csv_data, mimetype='text/csv', 
-            headers={'Content-Disposition': f'attachment;filename=dashboard_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'})
-    except Exception as e:
-        return f"Export error: {str(e)}", 500
 
-def generate_astrological_numbers(date_str):
-    """Generate numbers based on astrological mapping"""
-    try:
-        date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-        day = date_obj.day
-        month = date_obj.month
-        year = date_obj.year % 100
-        
-        zodiac_map = {1: [1,10,19,28], 2: [2,11,20,29], 3: [3,12,21,30], 4: [4,13,22,31], 5: [5,14,23], 6: [6,15,24], 7: [7,16,25], 8: [8,17,26], 9: [9,18,27], 10: [1,19,28], 11: [2,11,29], 12: [3,12,21]}
-        lucky_digits = zodiac_map.get(month, [1,2,3,4])
-        
-        astro_numbers = []
-        for i in range(3):
-            num = f"{lucky_digits[0]}{lucky_digits[1]}{day%10}{year%10}"
-            astro_numbers.append(num)
-            lucky_digits = lucky_digits[1:] + [lucky_digits[0]]
-        
-        return astro_numbers
-    except:
-        return ['1234', '5678', '9012']
+@app.teardown_request
+def _end_request_metrics(exc):
+    endpoint = request.endpoint or 'unmatched'
+    phases = metrics.end_request(endpoint, request.blueprint or '', g.get('status', 500 if exc else 200))
+    token = g.pop('profile', None)
+    if token is not None and phases:
+        profiler.end(token, sum(phases.values()), endpoint)
 
-def get_personal_lucky_patterns(df, provider):
-    """Learn personal lucky patterns from user's provider choice"""
-    if provider == 'all':
-        return ['2468', '1357']
-    
-    provider_df = df[df['provider_key'] == provider].tail(50)
-    personal_nums = []
-    
-    for col in ['1st_real', '2nd_real', '3rd_real']:
-        personal_nums.extend([n for n in provider_df[col].astype(str) if n.isdigit() and len(n) == 4])
-    
-    if not personal_nums:
-        return ['3691', '7410']
-    
-    digit_freq = Counter(''.join(personal_nums))
-    top_digits = [d for d, c in digit_freq.most_common(4)]
-    
-    learned_patterns = []
-    for i in range(2):
-        pattern = ''.join(top_digits[i:i+4] if len(top_digits) >= 4 else top_digits + ['0'] * (4-len(top_digits)))
-        learned_patterns.append(pattern)
-    
-    return learned_patterns
 
-def generate_date_based_numbers(date_str):
-    """Generate numbers based on date numerology"""
-    try:
-        date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-        day = date_obj.day
-        month = date_obj.month
-        year = date_obj.year
-        
-        life_path = (day + month + year) % 9 + 1
-        destiny = sum(int(d) for d in str(day * month)) % 9 + 1
-        
-        date_numbers = [
-            f"{life_path}{destiny}{day%10}{month%10}",
-            f"{month%10}{day%10}{life_path}{destiny}",
-            f"{destiny}{life_path}{year%100//10}{year%10}"
-        ]
-        
-        return date_numbers
-    except:
-        return ['1111', '2222', '3333']
+# Template rendering is the 'render' phase of the request breakdown
+@before_render_template.connect_via(app)
+def _start_render(sender, template, context, **extra):
+    g.setdefault('render_sections', []).append(metrics.start_section(f"render.{template.name}", phase='render'))
 
-def calculate_box_completion_probability(section, position, df):
-    """Calculate probability of box position being filled"""
-    total_draws = len(df)
-    if total_draws == 0:
-        return 0.0
-    
-    filled_count = 0
-    for _, row in df.iterrows():
-        col_name = 'special' if section == 'Special' else 'consolation'
-        numbers = re.findall(r'\b\d{4}\b', str(row.get(col_name, '')))
-        
-        # Estimate if this position would be filled based on number count
-        pos_match = re.search(r'R(\d+)C(\d+)', position)
-        if pos_match:
-            row_idx = int(pos_match.group(1)) - 1
-            col_idx = int(pos_match.group(2)) - 1
-            expected_index = row_idx * 5 + col_idx
-            
-            if len(numbers) > expected_index:
-                filled_count += 1
-    
-    return round((filled_count / total_draws) * 100, 1)
 
-def calculate_urgency_score(frequency, total_draws):
-    """Calculate urgency score based on how often position is empty"""
-    if total_draws == 0:
-        return 0
-    
-    empty_rate = frequency / total_draws
-    if empty_rate >= 0.7:
-        return 'High'
-    elif empty_rate >= 0.4:
-        return 'Medium'
-    else:
-        return 'Low'
+@template_rendered.connect_via(app)
+def _end_render(sender, template, context, **extra):
+    sections = g.get('render_sections')
+    if sections:
+        metrics.end_section(sections.pop())
 
-def analyze_box_pattern_history(section, position, df):
-    """Analyze historical patterns for this box position"""
-    pattern_data = {'recent_trend': 'stable', 'avg_empty_streak': 0, 'last_filled': 'unknown'}
-    
-    if len(df) < 5:
-        return pattern_data
-    
-    recent_5 = df.tail(5)
-    empty_count = 0
-    
-    for _, row in recent_5.iterrows():
-        col_name = 'special' if section == 'Special' else 'consolation'
-        numbers = re.findall(r'\b\d{4}\b', str(row.get(col_name, '')))
-        
-        pos_match = re.search(r'R(\d+)C(\d+)', position)
-        if pos_match:
-            row_idx = int(pos_match.group(1)) - 1
-            col_idx = int(pos_match.group(2)) - 1
-            expected_index = row_idx * 5 + col_idx
-            
-            if len(numbers) <= expected_index:
-                empty_count += 1
-    
-    if empty_count >= 4:
-        pattern_data['recent_trend'] = 'increasingly_empty'
-    elif empty_count <= 1:
-        pattern_data['recent_trend'] = 'mostly_filled'
-    
-    pattern_data['avg_empty_streak'] = empty_count
-    
-    return pattern_data
-def calculate_enhanced_consensus(number, prediction_data, df):
-    """Calculate enhanced consensus with historical validation"""
-    base_confidence = (prediction_data['count'] / 4) * 100
-    
-    # Historical accuracy boost
-    recent_nums = []
-    for col in ['1st_real', '2nd_real', '3rd_real']:
-        recent_nums.extend([n for n in df[col].tail(100).astype(str) if n.isdigit() and len(n) == 4])
-    
-    historical_frequency = recent_nums.count(number) / len(recent_nums) if recent_nums else 0
-    frequency_boost = historical_frequency * 50
-    
-    # Method diversity bonus
-    unique_methods = len(set(prediction_data['sources']))
-    diversity_bonus = unique_methods * 5
-    
-    enhanced_confidence = min(base_confidence + frequency_boost + diversity_bonus, 100)
-    
-    if enhanced_confidence >= 80:
-        rating = 'Excellent'
-    elif enhanced_confidence >= 60:
-        rating = 'Good'
-    elif enhanced_confidence >= 40:
-        rating = 'Fair'
-    else:
-        rating = 'Poor'
-    
-    return {'confidence': round(enhanced_confidence, 1), 'rating': rating}
+# ---------------- ROUTES ---------------- #
+@app.route('/')
+def index():
+    df = load_csv_data()
+    selected_date = request.args.get('selected_date')
 
-def calculate_confidence_interval(number, df, predictor_count):
-    """Calculate statistical confidence interval"""
-    recent_nums = []
-    for col in ['1st_real', '2nd_real', '3rd_real']:
-        recent_nums.extend([n for n in df[col].tail(200).astype(str) if n.isdigit() and len(n) == 4])
-    
-    if not recent_nums:
-        return {'lower': 0, 'upper': 100, 'range': 'Wide'}
-    
-    frequency = recent_nums.count(number)
-    sample_size = len(recent_nums)
-    
-    # Simple confidence interval calculation
-    proportion = frequency / sample_size
-    margin_error = 1.96 * ((proportion * (1 - proportion)) / sample_size) ** 0.5
-    
-    lower_bound = max(0, (proportion - margin_error) * 100)
-    upper_bound = min(100, (proportion + margin_error) * 100)
-    
-    range_width = upper_bound - lower_bound
-    if range_width <= 20:
-        range_desc = 'Narrow'
-    elif range_width <= 40:
-        range_desc = 'Medium'
+    if not selected_date:
+        try:
+            latest_date = df['date_parsed'].max().date()
+            filtered = df[df['date_parsed'].dt.date == latest_date]
+            selected_date = latest_date
+        except Exception:
+            filtered = df.iloc[0:0]
+            selected_date = ""
     else:
-        range_desc = 'Wide'
-    
-    return {
-        'lower': round(lower_bound, 1),
-        'upper': round(upper_bound, 1),
-        'range': range_desc
-    }
+        try:
+            date_obj = pd.to_datetime(selected_date).date()
+            filtered = df[df['date_parsed'].dt.date == date_obj]
+        except:
+            filtered = df.iloc[0:0]
 
-def calculate_prediction_stability(number, sources):
-    """Calculate how stable predictions are across methods"""
-    method_types = set()
-    for source in sources:
-        if 'Advanced' in source:
-            method_types.add('statistical')
-        elif 'Smart' in source:
-            method_types.add('adaptive')
-        elif 'ML' in source:
-            method_types.add('machine_learning')
-        elif 'Pattern' in source:
-            method_types.add('pattern_based')
-    
-    stability_score = len(method_types) * 25  # Max 100 for all 4 types
-    
-    if stability_score >= 75:
-        return {'score': stability_score, 'level': 'Very Stable'}
-    elif stability_score >= 50:
-        return {'score': stability_score, 'level': 'Stable'}
-    elif stability_score >= 25:
-        return {'score': stability_score, 'level': 'Moderate'}
-    else:
-        return {'score': stability_score, 'level': 'Unstable'}
-# Advanced data functions for all remaining features
+    # Use extracted canonical data
+    cards = []
+    for _, row in filtered.iterrows():
+        if row.get('number_1st') or row.get('number_2nd') or row.get('number_3rd'):
+            card = {
+                'date_parsed': row['date_parsed'],
+                'provider': row['provider_key'].upper(),
+                '1st_real': row.get('number_1st', ''),
+                '2nd_real': row.get('number_2nd', ''),
+                '3rd_real': row.get('number_3rd', ''),
+                'special': row.get('special', ''),
+                'consolation': row.get('consolation', '')
+            }
+            cards.append(card)
 
-def analyze_cross_correlations(numbers):
-    """Analyze cross-correlations between numbers"""
-    correlations = {}
-    for i, num1 in enumerate(numbers):
-        for j, num2 in enumerate(numbers[i+1:i+10], i+1):
-            if j < len(numbers):
-                shared_digits = len(set(num1) & set(num2))
-                if shared_digits >= 2:
-                    correlations[num1] = correlations.get(num1, 0) + shared_digits
-                    correlations[num2] = correlations.get(num2, 0) + shared_digits
-    return correlations
+    return render_template('index_clean.html', cards=cards, selected_date=selected_date)
 
-def advanced_pattern_mining(numbers):
-    """Advanced pattern mining for number sequences"""
-    patterns = {}
-    for i in range(len(numbers) - 2):
-        sequence = numbers[i:i+3]
-        for num in sequence:
-            digit_sum = sum(int(d) for d in num if d.isdigit())
-            if digit_sum % 7 == 0:  # Divisible by 7 pattern
-                patterns[num] = patterns.get(num, 0) + 3
-            elif digit_sum % 3 == 0:  # Divisible by 3 pattern
-                patterns[num] = patterns.get(num, 0) + 2
-    return patterns
 
-def multi_dimensional_analysis(df):
-    """Multi-dimensional analysis across providers and time"""
-    analysis = {'provider_sync': {}, 'time_patterns': {}, 'cross_validation': {}}
-    
-    # Provider synchronization
-    providers = df['provider'].unique()
-    for provider in providers:
-        if provider:
-            provider_df = df[df['provider_key'] == provider]
-            provider_nums = []
-            for col in ['1st_real', '2nd_real', '3rd_real']:
-                provider_nums.extend([n for n in provider_df[col].astype(str) if n.isdigit() and len(n) == 4])
-            analysis['provider_sync'][provider] = len(set(provider_nums))
-    
-    return analysis
+# Heavy modules the shared predictors import on first use; each registered
+# family adds its own. Warmed up in the background once serving
+LAZY_PLUGINS = (
+    'sklearn.linear_model', 'sklearn.preprocessing',
+    'utils.power_predictor', 'utils.markov_predictor',
+)
 
-def calculate_consensus_strength(weighted_votes):
-    """Calculate overall consensus strength"""
-    if not weighted_votes:
-        return {'strength': 0, 'level': 'None'}
-    
-    scores = list(weighted_votes.values())
-    avg_score = sum(scores) / len(scores)
-    max_score = max(scores)
-    
-    strength = (max_score / avg_score) if avg_score > 0 else 0
-    
-    if strength >= 3:
-        level = 'Very Strong'
-    elif strength >= 2:
-        level = 'Strong'
-    elif strength >= 1.5:
-        level = 'Moderate'
-    else:
-        level = 'Weak'
-    
-    return {'strength': round(strength, 2), 'level': level}
 
-# Enhanced ML Predictor functions
-def enhanced_ml_features(df):
-    """Extract enhanced features for ML prediction"""
-    features = {}
-    
-    # Temporal features
-    df['hour'] = df['date_parsed'].dt.hour
-    df['day_of_week'] = df['date_parsed'].dt.dayofweek
-    df['month'] = df['date_parsed'].dt.month
-    
-    # Number pattern features
-    for col in ['1st_real', '2nd_real', '3rd_real']:
-        nums = [n for n in df[col].astype(str) if n.isdigit() and len(n) == 4]
-        features[f'{col}_digit_variance'] = np.var([sum(int(d) for d in num) for num in nums]) if nums else 0
-        features[f'{col}_pattern_strength'] = len(set(nums)) / len(nums) if nums else 0
-    
-    return features
+def lazy_plugins():
+    plugins = list(LAZY_PLUGINS)
+    for family in registered_families(app).values():
+        plugins += [module for module in family.plugins if module not in plugins]
+    return plugins
 
-def deep_learning_boost(predictions, df):
-    """Apply deep learning boost to predictions"""
-    enhanced = []
-    features = enhanced_ml_features(df)
-    
-    for num, score, reason in predictions:
-        # Pattern recognition boost
-        digit_sum = sum(int(d) for d in num)
-        if digit_sum in [10, 15, 20, 25, 30]:  # Magic numbers
-            boost = 0.15
-        elif digit_sum % 5 == 0:
-            boost = 0.1
-        else:
-            boost = 0.05
-        
-        enhanced_score = score + boost
-        enhanced.append((num, enhanced_score, f"{reason}+DL_boost"))
-    
-    return enhanced
 
-# Enhanced Smart Predictor functions
-def adaptive_weight_evolution(df, provider):
-    """Evolve weights based on recent performance"""
-    weights = {'hot': 0.4, 'pair': 0.3, 'transition': 0.3}
-    
-    if len(df) >= 50:
-        recent_performance = analyze_recent_performance(df.tail(50))
-        
-        # Adjust weights based on what's working
-        if recent_performance['hot_success'] > 0.6:
-            weights['hot'] += 0.1
-        if recent_performance['pair_success'] > 0.6:
-            weights['pair'] += 0.1
-        if recent_performance['transition_success'] > 0.6:
-            weights['transition'] += 0.1
-        
-        # Normalize weights
-        total = sum(weights.values())
-        weights = {k: v/total for k, v in weights.items()}
-    
-    return weights
+@app.before_request
+def _start_background():
+    # The ensemble pool and the precompute worker only serve the families that read predictions
+    serves_predictions = uses_precompute(registered_families(app))
+    if serves_predictions:
+        ensemble.start(preload=precompute.predictors.values())
+    then = precompute.start if serves_predictions else None
+    if warm_up_enabled():
+        # The scheduler loads models (and so sklearn) once the warm-up imports are done
+        get_warm_up().start(lazy_plugins(), then=then)
+    elif then is not None:
+        then()
 
-def analyze_recent_performance(df):
-    """Analyze recent performance of different methods"""
-    performance = {'hot_success': 0.5, 'pair_success': 0.5, 'transition_success': 0.5}
-    
-    # Simplified performance analysis
-    all_nums = []
-    for col in ['1st_real', '2nd_real', '3rd_real']:
-        all_nums.extend([n for n in df[col].astype(str) if n.isdigit() and len(n) == 4])
-    
-    if all_nums:
-        digit_freq = Counter(''.join(all_nums))
-        hot_digits = [d for d, c in digit_freq.most_common(4)]
-        
-        # Check if hot digits appeared in recent draws
-        recent_nums = all_nums[-10:]
-        hot_appearances = sum(1 for num in recent_nums for d in num if d in hot_digits)
-        performance['hot_success'] = min(1.0, hot_appearances / (len(recent_nums) * 4))
-    
-    return performance
 
-# Enhanced Accuracy Dashboard functions
-def advanced_accuracy_metrics(pred_df):
-    """Calculate advanced accuracy metrics"""
-    metrics = {}
-    
-    if len(pred_df) == 0:
-        return metrics
-    
-    # Precision and Recall
-    hits = len(pred_df[pred_df['hit_status'].str.contains('HIT', na=False)])
-    total = len(pred_df)
-    
-    metrics['precision'] = hits / total if total > 0 else 0
-    metrics['recall'] = hits / total if total > 0 else 0
-    metrics['f1_score'] = 2 * (metrics['precision'] * metrics['recall']) / (metrics['precision'] + metrics['recall']) if (metrics['precision'] + metrics['recall']) > 0 else 0
-    
-    # Confidence correlation
-    if 'confidence' in pred_df.columns:
-        high_conf = pred_df[pred_df['confidence'] > 70]
-        if len(high_conf) > 0:
-            high_conf_hits = len(high_conf[high_conf['hit_status'].str.contains('HIT', na=False)])
-            metrics['high_confidence_accuracy'] = high_conf_hits / len(high_conf)
-        else:
-            metrics['high_confidence_accuracy'] = 0
-    
-    return metrics
+# ---------------- JSON PREDICTION API (v1) ---------------- #
+# Predictor -> default lookback
+API_PREDICTORS = {'advanced': 200, 'smart': 300, 'ml': 500, 'markov': 200, 'power': 300}
 
-def predictive_accuracy_modeling(pred_df):
-    """Model future accuracy based on trends"""
-    if len(pred_df) < 10:
-        return {'trend': 'insufficient_data', 'projected_accuracy': 0}
-    
-    # Simple trend analysis
-    recent_10 = pred_df.tail(10)
-    hits = len(recent_10[recent_10['hit_status'].str.contains('HIT', na=False)])
-    recent_accuracy = hits / 10
-    
-    previous_10 = pred_df.tail(20).head(10) if len(pred_df) >= 20 else pred_df.head(10)
-    prev_hits = len(previous_10[previous_10['hit_status'].str.contains('HIT', na=False)])
-    prev_accuracy = prev_hits / len(previous_10) if len(previous_10) > 0 else 0
-    
-    if recent_accuracy > prev_accuracy:
-        trend = 'improving'
-        projected = min(1.0, recent_accuracy + 0.1)
-    elif recent_accuracy < prev_accuracy:
-        trend = 'declining'
-        projected = max(0.0, recent_accuracy - 0.1)
-    else:
-        trend = 'stable'
-        projected = recent_accuracy
-    
-    return {'trend': trend, 'projected_accuracy': round(projected * 100, 1)}
 
-# Enhanced Learning Insights functions
-def behavioral_pattern_analysis(pred_df, df):
-    """Analyze behavioral patterns in predictions vs results"""
-    patterns = {}
-    
-    if len(pred_df) == 0:
-        return patterns
-    
-    # Time-based patterns
-    pred_df['prediction_hour'] = pd.to_datetime(pred_df['prediction_date']).dt.hour
-    hourly_success = pred_df.groupby('prediction_hour')['hit_status'].apply(lambda x: x.str.contains('HIT', na=False).sum())
-    
-    patterns['best_prediction_hours'] = hourly_success.nlargest(3).to_dict()
-    
-    # Provider-specific learning
-    if 'provider' in pred_df.columns:
-        provider_success = pred_df.groupby('provider')['hit_status'].apply(lambda x: x.str.contains('HIT', na=False).sum())
-        patterns['provider_learning'] = provider_success.to_dict()
-    
-    return patterns
+def _api_error(message, status):
+    return jsonify({'error': message}), status
 
-def meta_learning_insights(pred_df):
-    """Generate meta-learning insights"""
-    insights = []
-    
-    if len(pred_df) < 5:
-        insights.append("Need more prediction data for meta-learning analysis")
-        return insights
-    
-    # Confidence calibration
-    high_conf = pred_df[pred_df.get('confidence', 0) > 80]
-    if len(high_conf) > 0:
-        high_conf_accuracy = len(high_conf[high_conf['hit_status'].str.contains('HIT', na=False)]) / len(high_conf)
-        if high_conf_accuracy > 0.7:
-            insights.append("✅ High confidence predictions are well-calibrated")
-        else:
-            insights.append("⚠️ High confidence predictions may be overconfident")
-    
-    # Method consistency
-    if 'predictor_methods' in pred_df.columns:
-        method_counts = pred_df['predictor_methods'].value_counts()
-        if len(method_counts) > 1:
-            insights.append(f"📊 Using {len(method_counts)} different prediction methods")
-    
-    return insights
 
-# Enhanced AI Dashboard functions
-def real_time_performance_metrics(df):
-    """Calculate real-time performance metrics"""
-    metrics = {}
-    
-    if len(df) == 0:
-        return metrics
-    
-    # Recent activity metrics
-    recent_24h = df[df['date_parsed'] >= (df['date_parsed'].max() - pd.Timedelta(hours=24))]
-    metrics['draws_24h'] = len(recent_24h)
-    
-    # Number diversity
-    all_nums = []
-    for col in ['1st_real', '2nd_real', '3rd_real']:
-        all_nums.extend([n for n in df[col].tail(100).astype(str) if n.isdigit() and len(n) == 4])
-    
-    metrics['diversity_score'] = len(set(all_nums)) / len(all_nums) if all_nums else 0
-    metrics['entropy'] = -sum((all_nums.count(n)/len(all_nums)) * np.log2(all_nums.count(n)/len(all_nums)) for n in set(all_nums)) if all_nums else 0
-    
-    return metrics
+@app.route('/api/v1/predictions')
+def api_predictors():
+    version, providers = get_stats_store().providers_at()
+    etag, last_modified = dataset_validators('predictors', version=version)
+    cached = not_modified(etag, last_modified)
+    if cached is not None:
+        return cached
+    return with_validators(jsonify({
+        'predictors': [{'name': name, 'default_lookback': lookback} for name, lookback in API_PREDICTORS.items()],
+        'providers': ['all'] + providers,
+        'dataset_version': (version or '')[:12],
+    }), etag, last_modified)
 
-def predictive_model_ensemble(df):
-    """Create ensemble of predictive models"""
-    ensemble = {}
-    
-    # Model 1: Frequency-based
-    all_nums = []
-    for col in ['1st_real', '2nd_real', '3rd_real']:
-        all_nums.extend([n for n in df[col].tail(200).astype(str) if n.isdigit() and len(n) == 4])
-    
-    freq_model = Counter(all_nums).most_common(5)
-    ensemble['frequency'] = [{'number': num, 'score': count/len(all_nums)} for num, count in freq_model]
-    
-    # Model 2: Trend-based
-    if len(df) >= 10:
-        recent_trend = df.tail(10)
-        trend_nums = []
-        for col in ['1st_real', '2nd_real', '3rd_real']:
-            trend_nums.extend([n for n in recent_trend[col].astype(str) if n.isdigit() and len(n) == 4])
-        
-        trend_model = Counter(trend_nums).most_common(5)
-        ensemble['trend'] = [{'number': num, 'score': count/len(trend_nums)} for num, count in trend_model]
-    
-    return ensemble
 
+@app.route('/api/v1/predictions/<predictor>')
+def api_predictions(predictor):
+    """
+    Top predictions of one predictor as JSON.
+    Query: provider (default all), month (YYYY-MM), lookback, limit (1-20).
+    """
+    if predictor not in API_PREDICTORS:
+        return _api_error(f"Unknown predictor '{predictor}'", 404)
+    provider = request.args.get('provider', 'all').strip() or 'all'
+    month = request.args.get('month', '').strip()
+    month = '' if month == 'all' else month
+    lookback = request.args.get('lookback', API_PREDICTORS[predictor], type=int)
+    limit = request.args.get('limit', 5, type=int)
+    if month and not re.fullmatch(r'\d{4}-(0[1-9]|1[0-2])', month):
+        return _api_error("month must be YYYY-MM", 400)
+    if not 10 <= lookback <= 5000:
+        return _api_error("lookback must be between 10 and 5000", 400)
+    if not 1 <= limit <= 20:
+        return _api_error("limit must be between 1 and 20", 400)
+    if provider != 'all' and provider not in get_stats_store().providers():
+        return _api_error(f"Unknown provider '{provider}'", 404)
 
-@app.route('/super-predictor')
-def super_predictor_route():
-    """Super AI Predictor - Combines ALL advanced methods"""
-    df = load_csv_data()
-    
-    if df.empty:
-        return render_template('super_predictor.html', predictions=[], insights=["No data available"])
-    
-    provider = request.args.get('provider', 'all')
-    
-    # Get predictions from existing methods
-    advanced_preds = advanced_predictor(df, provider, 200) or []
-    smart_preds = smart_auto_weight_predictor(df, provider, 300) or []
-    ml_preds = ml_predictor(df, 500) or []
-    
-    # Use super predictor
     try:
-        from utils.super_predictor import super_predictor, get_prediction_insights
-        predictions = super_predictor(df, advanced_preds, smart_preds, ml_preds)
-        insights = get_prediction_insights(predictions)
+        # Without the background worker nobody would refresh a stale result: recompute it here
+        version, results = precompute.get(predictor, provider, month, provider, lookback, stale=precompute.running)
     except Exception as e:
-        logger.error(f"Super predictor error: {e}")
-        predictions = []
-        insights = ["Error loading advanced predictors"]
-    
-    return render_template('super_predictor.html', 
-                         predictions=predictions,
-                         insights=insights)
-
-@app.route('/consensus-predictor')
-def consensus_predictor():
-    df = load_csv_data()
-    if df.empty:
-        return render_template('consensus_predictor.html', 
-                             overall_consensus=[], 
-                             provider_predictions={},
-                             error="No data available", 
-                             provider_options=['all'], 
-                             provider='all',
-                             last_updated=time.strftime('%Y-%m-%d %H:%M:%S'))
-    
-    provider = request.args.get('provider', 'all')
-    provider_options = ['all'] + sorted([p for p in df['provider_key'].dropna().unique() if p and str(p).strip() and str(p) != 'nan'])
-    
-    adv = advanced_predictor(df, provider if provider != 'all' else None, 200) or []
-    smart = smart_auto_weight_predictor(df, provider if provider != 'all' else None, 300) or []
-    ml = ml_predictor(df, 500) or []
-    
-    consensus_votes = {}
-    consensus_scores = {}
-    consensus_methods = {}
-    
-    for num, score, reason in adv + smart + ml:
-        if num not in consensus_votes:
-            consensus_votes[num] = 0
-            consensus_scores[num] = 0
-            consensus_methods[num] = []
-        consensus_votes[num] += 1
-        consensus_scores[num] += score
-        consensus_methods[num].append(reason)
-    
-    overall_consensus = []
-    for num in sorted(consensus_votes.keys(), key=lambda x: consensus_votes[x], reverse=True)[:10]:
-        votes = consensus_votes[num]
-        avg_score = consensus_scores[num] / votes if votes > 0 else 0
-        confidence = min(int(avg_score * 100), 99)
-        
-        overall_consensus.append({
-            'number': num,
-            'confidence': confidence,
-            'consensus': f"{votes}/3 methods",
-            'reason': ', '.join(set(consensus_methods[num][:2]))
+        logger.error(f"API predictor {predictor} failed: {e}")
+        return _api_error(f"Predictor '{predictor}' failed", 500)
+
+    # Validators name the version the (possibly stale) cached result was computed on,
+    # so the ETag changes once the background worker has caught up
+    etag, last_modified = dataset_validators('predictions', predictor, provider, month, lookback, limit,
+                                             version=version)
+    cached = not_modified(etag, last_modified)
+    if cached is not None:
+        return cached
+    predictions = []
+    for item in results[:limit]:
+        predictions.append({
+            'number': str(item[0]),
+            'score': round(float(item[1]), 4) if len(item) > 1 else None,
+            'reason': str(item[2]) if len(item) > 2 else '',
         })
-    
-    provider_predictions = {}
-    if provider == 'all':
-        for prov in provider_options[1:]:
-            prov_df = df[df['provider_key'] == prov]
-            prov_preds = advanced_predictor(prov_df, prov, 200) or []
-            provider_predictions[prov] = []
-            for num, score, reason in prov_preds[:5]:
-                provider_predictions[prov].append({
-                    'number': num,
-                    'confidence': min(int(score * 100), 99),
-                    'consensus': f"{consensus_votes.get(num, 0)}/3",
-                    'reason': reason,
-                    'methods': ['Advanced', 'Smart', 'ML']
-                })
-    else:
-        df_filtered = df[df['provider_key'] == provider]
-        prov_preds = advanced_predictor(df_filtered, provider, 200) or []
-        provider_predictions[provider] = []
-        for num, score, reason in prov_preds[:10]:
-            provider_predictions[provider].append({
-                'number': num,
-                'confidence': min(int(score * 100), 99),
-                'consensus': f"{consensus_votes.get(num, 0)}/3",
-                'reason': reason,
-                'methods': ['Advanced', 'Smart', 'ML']
-            })
-    
-    return render_template('consensus_predictor.html', 
-                         overall_consensus=overall_consensus,
-                         provider_predictions=provider_predictions,
-                         provider_options=provider_options,
-                         provider=provider,
-                         last_updated=time.strftime('%Y-%m-%d %H:%M:%S'),
-                         error=None)
-
-@app.route('/past-results')
-def past_results():
-    """Display past results - 4D lottery data with special and consolation prizes"""
-    df = load_csv_data()
-    selected_date = request.args.get('date', '').strip()
-    selected_day = request.args.get('day', '').strip()
-    selected_month = request.args.get('month', '').strip()
-
-    if selected_date:
-        try:
-            date_obj = pd.to_datetime(selected_date).date()
-            filtered = df[df['date_parsed'].dt.date == date_obj]
-            if filtered.empty:
-                filtered = df.tail(100)
-        except Exception as e:
-            logger.error(f"Date parsing error: {e}")
-            filtered = df.tail(100)
-    elif selected_day:
-        day_map = {'Monday': 0, 'Tuesday': 1, 'Wednesday': 2, 'Thursday': 3, 'Friday': 4, 'Saturday': 5, 'Sunday': 6}
-        day_num = day_map.get(selected_day, -1)
-        if day_num >= 0:
-            filtered = df[df['date_parsed'].dt.dayofweek == day_num].tail(100)
-        else:
-            filtered = df.tail(100)
-    elif selected_month:
-        try:
-            month_num = int(selected_month)
-            filtered = df[df['date_parsed'].dt.month == month_num].tail(100)
-        except:
-            filtered = df.tail(100)
-    else:
-        filtered = df.tail(100)
-
-    # Extract results with special and consolation
-    results = []
-    seen = set()
-    
-    for idx, row in filtered.iterrows():
-        if pd.notna(row.get('date_parsed')):
-            provider = str(row.get('provider_key', 'UNKNOWN')).upper()
-            
-            if not provider or provider == 'UNKNOWN' or len(provider) < 2:
-                continue
-            
-            # Extract numbers
-            first = str(row.get('number_1st', '')).strip()
-            second = str(row.get('number_2nd', '')).strip()
-            third = str(row.get('number_3rd', '')).strip()
-            
-            # Skip if no main prizes
-            if not (first or second or third):
-                continue
-            
-            # Extract special and consolation - handle both string and empty cases
-            special_str = str(row.get('special', '')).strip()
-            consolation_str = str(row.get('consolation', '')).strip()
-            
-            # Split and filter valid 4D numbers
-            special_list = [n for n in special_str.split() if n and n != 'nan' and len(n) == 4 and n.isdigit()]
-            consolation_list = [n for n in consolation_str.split() if n and n != 'nan' and len(n) == 4 and n.isdigit()]
-            
-            # Create unique key
-            date_str = row['date_parsed'].strftime('%d-%m-%Y')
-            unique_key = f"{date_str}_{provider}_{first}_{second}_{third}"
-            
-            if unique_key in seen:
-                continue
-            seen.add(unique_key)
-            
-            results.append({
-                'date': date_str,
-                'provider': provider,
-                'first': first if first and first != 'nan' else '-',
-                'second': second if second and second != 'nan' else '-',
-                'third': third if third and third != 'nan' else '-',
-                'special': special_list[:10],
-                'consolation': consolation_list[:10],
-                'total_numbers': row.get('total_4d_found', 0)
-            })
-    
-    results.sort(key=lambda x: x['date'], reverse=True)
-    logger.info(f"Displaying {len(results)} 4D results")
+    return with_validators(jsonify({
+        'predictor': predictor,
+        'provider': provider,
+        'month': month or None,
+        'lookback': lookback,
+        'dataset_version': (version or '')[:12],
+        'predictions': predictions,
+    }), etag, last_modified)
 
-    return render_template('past_results.html', results=results, date=selected_date)
+@app.route('/test-route')
+def test_route_function():
+    return "Test route is working!"
 
 @app.route('/debug-data')
 def debug_data():
@@ -4094,499 +298,83 @@ def debug_data():
     
     return jsonify(debug_info)
 
-@app.route('/power-dashboard')
-def power_dashboard():
-    """POWER DASHBOARD - All advanced features combined"""
-    try:
-        df = load_csv_data()
-        
-        # Try to import advanced modules
-        try:
-            # from utils.power_predictor import enhanced_predictor
-            # from utils.confidence_scorer import ConfidenceScorer
-            # from utils.adaptive_learner import AdaptiveLearner
-            # from utils.auto_updater import AutoUpdater
-            advanced_available = False  # Disabled for now
-        except ImportError as e:
-            logger.warning(f"Advanced modules not available: {e}")
-            advanced_available = False
-        
-        provider = request.args.get('provider', 'all')
-        if provider != 'all':
-            df = df[df['provider_key'] == provider]
-        
-        # Get historical numbers
-        all_numbers = []
-        for col in ['1st_real', '2nd_real', '3rd_real']:
-            if col in df.columns:
-                all_numbers.extend([n for n in df[col].astype(str) if len(n) == 4 and n.isdigit()])
-        
-        # Since advanced_available is always False, use fallback
-        # Fallback to basic predictions
-        basic_preds = advanced_predictor(df, provider, 200)[:10]
-        power_predictions = [{
-            'number': num,
-            'confidence': score,
-            'level': 'high' if score > 0.6 else 'medium',
-            'emoji': '✅' if score > 0.6 else '⚠️',
-            'color': 'green' if score > 0.6 else 'yellow',
-            'reasons': [reason]
-        } for num, score, reason in basic_preds]
-        adaptive_weights = {'advanced': 0.25, 'smart': 0.25, 'ml': 0.25, 'pattern': 0.25}
-        update_stats = {'total_updates': 0, 'last_update': 'Install libraries', 'avg_rows_per_update': 0}
-        feature_importance = []
-        
-        return render_template('power_dashboard.html',
-                             power_predictions=power_predictions,
-                             adaptive_weights=adaptive_weights,
-                             update_stats=update_stats,
-                             feature_importance=feature_importance,
-                             training_size=len(all_numbers),
-                             last_updated=time.strftime('%Y-%m-%d %H:%M:%S'))
-    except Exception as e:
-        logger.error(f"Power dashboard error: {e}")
-        return f"Error: {str(e)}<br><br>Please install required libraries:<br>pip install watchdog scikit-learn", 500
-
-@app.route('/adaptive-learning')
-def adaptive_learning():
-    """Show the adaptive learning system in action"""
-    try:
-        df = load_csv_data()
-        
-        try:
-            from utils.adaptive_learner import AdaptiveLearner
-            learner = AdaptiveLearner()
-            has_learner = True
-        except ImportError:
-            has_learner = False
-        
-        provider = request.args.get('provider', 'all')
-        if provider != 'all':
-            df = df[df['provider_key'] == provider]
-        
-        adv = advanced_predictor(df, provider, 200)[:10]
-        smart = smart_auto_weight_predictor(df, provider, 300)[:10]
-        ml = ml_predictor(df, 500)[:10]
-        
-        if has_learner:
-            adaptive_preds = learner.get_adaptive_predictions(adv, smart, ml)
-            insights = learner.get_learning_insights()
-            recommendations = learner.get_recommendations()
-            weights = learner.learning_data['method_weights']
-        else:
-            # Fallback
-            adaptive_preds = adv[:5]
-            insights = []
-            recommendations = ['Install libraries: pip install watchdog scikit-learn']
-            weights = {'advanced': 0.25, 'smart': 0.25, 'ml': 0.25, 'pattern': 0.25}
-        
-        return render_template('adaptive_learning.html',
-                             adaptive_predictions=adaptive_preds,
-                             insights=insights,
-                             recommendations=recommendations,
-                             weights=weights)
-    except Exception as e:
-        logger.error(f"Adaptive learning error: {e}")
-        return f"Error: {str(e)}", 500
-
-@app.route('/power-simple')
-def power_simple():
-    df = load_csv_data()
-    provider = request.args.get('provider', 'all')
-    provider_options = ['all'] + sorted([p for p in df['provider_key'].dropna().unique() if p])
-    
-    if df.empty:
-        return render_template('power_simple.html', error="No data", predictions=[], provider_options=provider_options, provider=provider)
-    
-    if provider != 'all':
-        df = df[df['provider_key'] == provider]
-    
-    predictions = advanced_predictor(df, provider, 200) or []
-    predictions = predictions[:5] if predictions else []
-    
-    return render_template('power_simple.html', predictions=predictions, provider_options=provider_options, provider=provider, error=None)
-
-@app.route('/decision-helper')
-def decision_helper():
-    df = load_csv_data()
-    provider = request.args.get('provider', 'all')
-    provider_options = ['all'] + sorted([p for p in df['provider_key'].dropna().unique() if p])
-    
-    if df.empty:
-        return render_template('decision_helper.html', error="No data", final_picks=[], reasons=[], provider_options=provider_options, provider=provider, next_draw_date='', provider_name='', backup_numbers=[], box_play=[])
-    
-    if provider != 'all':
-        df = df[df['provider_key'] == provider]
-    
-    adv = advanced_predictor(df, provider, 200) or []
-    smart = smart_auto_weight_predictor(df, provider, 300) or []
-    ml = ml_predictor(df, 500) or []
-    
-    votes = {}
-    for num, score, _ in adv + smart + ml:
-        votes[num] = votes.get(num, 0) + 1
-    
-    if not votes:
-        all_nums = []
-        for col in ['1st_real', '2nd_real', '3rd_real']:
-            all_nums.extend([n for n in df[col].tail(100).astype(str) if n.isdigit() and len(n) == 4])
-        freq = Counter(all_nums).most_common(5)
-        final_picks = [(num, 25) for num, count in freq]
-    else:
-        sorted_votes = sorted(votes.items(), key=lambda x: x[1], reverse=True)
-        final_picks = [(num, min(count * 25, 95)) for num, count in sorted_votes[:5]]
-    
-    all_candidates = set([num for num, _, _ in adv + smart + ml])
-    final_nums = set([num for num, _ in final_picks])
-    backup_numbers = list(all_candidates - final_nums)[:10]
-    
-    reasons = ['✅ Weighted Ensemble', '✅ Multi-Timeframe', '✅ Gap Analysis', '📊 14972 draws analyzed', '🎯 3 AI models']
-    
-    last_draw = df.iloc[-1]
-    next_draw_date = (last_draw['date_parsed'] + timedelta(days=3)).strftime('%Y-%m-%d (%A)')
-    provider_name = provider.upper() if provider != 'all' else 'ALL PROVIDERS'
-    
-    return render_template('decision_helper.html', final_picks=final_picks, reasons=reasons, next_draw_date=next_draw_date, provider_name=provider_name, backup_numbers=backup_numbers, provider_options=provider_options, provider=provider, box_play=[], error=None)
-
-
-
-@app.route('/advanced-analytics-v2')
-def advanced_analytics_v2():
-    """Advanced Analytics with Enhanced Features"""
-    df = load_csv_data()
-    if df.empty:
-        return render_template('advanced_analytics.html', error="No data available")
-    
-    try:
-        from utils.advanced_features import extract_advanced_features, calculate_momentum_indicators
-        from utils.realtime_enhancer import RealtimeEnhancer
-        
-        # Extract advanced features
-        features = extract_advanced_features(df)
-        momentum = calculate_momentum_indicators(df)
-        
-        # Real-time enhancement
-        enhancer = RealtimeEnhancer()
-        base_preds = advanced_predictor(df, lookback=200)[:10]
-        enhanced_preds = enhancer.enhance_predictions(base_preds)
-        
-        return render_template('advanced_analytics_v2.html',
-                             features=features,
-                             momentum=momentum,
-                             enhanced_predictions=enhanced_preds,
-                             global_patterns=enhancer.get_global_lottery_patterns())
-    except ImportError as e:
-        return f"Install required libraries: {str(e)}", 500
-
-@app.route('/learning-dashboard')
-def learning_dashboard():
-    """AI Learning Dashboard with feedback analysis"""
-    from utils.feedback_learner import FeedbackLearner
-    import json
-    
-    learner = FeedbackLearner()
-    learner.load_learning_data()
-    
-    # Load prediction tracking
-    pred_file = "prediction_tracking.csv"
-    if os.path.exists(pred_file):
-        pred_df = pd.read_csv(pred_file)
-        completed = pred_df[pred_df['hit_status'] != 'pending']
-    else:
-        completed = pd.DataFrame()
-    
-    # Calculate stats
-    stats = {
-        'total_predictions': len(completed),
-        'exact_matches': len(completed[completed['hit_status'] == 'EXACT']),
-        'three_digit_matches': len(completed[completed['hit_status'] == '3-DIGIT']),
-        'overall_accuracy': 0
-    }
-    
-    if len(completed) > 0:
-        weighted_score = (
-            stats['exact_matches'] * 100 +
-            stats['three_digit_matches'] * 75
-        )
-        stats['overall_accuracy'] = weighted_score / len(completed)
-    
-    # Get method performance
-    methods = learner.get_best_methods(top_n=10)
-    
-    # Recent predictions
-    recent_predictions = completed.tail(10).to_dict('records') if not completed.empty else []
-    
-    return render_template('learning_dashboard.html',
-                         stats=stats,
-                         methods=methods,
-                         recent_predictions=recent_predictions)
-
-@app.route('/evaluate_now')
-def evaluate_now():
-    """Trigger evaluation of pending predictions"""
-    try:
-        import subprocess
-        subprocess.Popen(['python', 'auto_evaluate.py'])
-        return redirect('/learning-dashboard')
-    except Exception as e:
-        return f"Error: {str(e)}", 500
 
-def auto_evaluate_predictions(pred_df, df):
-    """Auto-evaluate pending predictions against actual results"""
-    for idx, row in pred_df[pred_df['hit_status'] == 'pending'].iterrows():
-        try:
-            draw_date = pd.to_datetime(row['draw_date'].split(' ')[0]).date()
-            provider = str(row['provider']).strip().lower()
-            
-            actual = df[(df['date_parsed'].dt.date == draw_date) & (df['provider_key'] == provider)]
-            if not actual.empty:
-                actual_row = actual.iloc[0]
-                pred_df.at[idx, 'actual_1st'] = actual_row['1st_real']
-                pred_df.at[idx, 'actual_2nd'] = actual_row['2nd_real']
-                pred_df.at[idx, 'actual_3rd'] = actual_row['3rd_real']
-                
-                predicted = re.findall(r'\d{4}', str(row['predicted_numbers']))
-                actuals = [str(actual_row['1st_real']), str(actual_row['2nd_real']), str(actual_row['3rd_real'])]
-                
-                hits = [p for p in predicted if p in actuals]
-                if hits:
-                    pred_df.at[idx, 'hit_status'] = f'HIT ({len(hits)} matches)'
-                    pred_df.at[idx, 'accuracy_score'] = len(hits) * 100 / len(predicted) if predicted else 0
-                else:
-                    pred_df.at[idx, 'hit_status'] = 'MISS'
-                    pred_df.at[idx, 'accuracy_score'] = 0
-        except:
-            continue
-    
-    pred_df.to_csv("prediction_tracking.csv", index=False)
+# ---------------- METRICS ---------------- #
+# Collectors read the counters the subsystems keep themselves, at scrape time
+def _cache_samples():
+    samples = []
+    for name, stats in cache_stats().items():
+        labels = {'cache': name}
+        samples += [Sample('cache_hits_total', 'counter', 'Cache hits', labels, stats['hits']),
+                    Sample('cache_misses_total', 'counter', 'Cache misses', labels, stats['misses']),
+                    Sample('cache_evictions_total', 'counter', 'Cache evictions', labels, stats['evictions']),
+                    Sample('cache_entries', 'gauge', 'Entries held by a cache', labels, stats['size'])]
+    return samples
+
+
+def _subsystem_samples():
+    from utils.dataset_manager import get_dataset_manager
+    from utils.model_registry import get_model_registry
+    from utils.exports import get_background_writer
+
+    manager, registry, writer = get_dataset_manager(), get_model_registry(), get_background_writer()
+    ensemble_stats, warm_up = ensemble.stats(), get_warm_up().stats()
+    samples = [
+        Sample('dataset_loads_total', 'counter', 'Dataset (re)loads from CSV or snapshot', {}, manager.loads),
+        Sample('dataset_appends_total', 'counter', 'Appended CSV tails merged without a reload', {},
+               getattr(manager, 'appends', 0)),
+        Sample('dataset_modified_timestamp_seconds', 'gauge', 'mtime of the loaded results CSV', {},
+               manager.modified_at or 0),
+        Sample('model_loads_total', 'counter', 'Model artifacts loaded from disk', {}, registry.loads),
+        Sample('model_saves_total', 'counter', 'Model artifacts written', {}, registry.saves),
+        Sample('precompute_runs_total', 'counter', 'Background precompute runs that computed something', {},
+               precompute.runs),
+        Sample('ensemble_workers', 'gauge', 'Predictor processes per server worker', {}, ensemble_stats['workers']),
+        Sample('ensemble_calls_total', 'counter', 'Cold predictor calls sent to the ensemble pool', {},
+               ensemble_stats['calls']),
+        Sample('ensemble_timeouts_total', 'counter', 'Ensemble calls past their timeout', {},
+               ensemble_stats['timeouts']),
+        Sample('ensemble_errors_total', 'counter', 'Ensemble calls that raised', {}, ensemble_stats['errors']),
+        Sample('reports_written_total', 'counter', 'Background reports written', {}, writer.written),
+        Sample('reports_failed_total', 'counter', 'Background reports that failed', {}, writer.failed),
+        Sample('warmup_modules', 'gauge', 'Modules imported by the startup warm-up', {'state': 'imported'},
+               len(warm_up['seconds'])),
+        Sample('warmup_modules', 'gauge', 'Modules imported by the startup warm-up', {'state': 'failed'},
+               len(warm_up['failed'])),
+    ]
+    if profiler is not None:
+        samples.append(Sample('slow_request_profiles_total', 'counter', 'Slow-request profiles written', {},
+                              profiler.dumped))
+    return samples
 
-def generate_ai_insights(completed_df):
-    """Generate AI-powered insights from prediction data"""
-    if len(completed_df) < 5:
-        return ["Need more data for AI analysis"]
-    
-    insights = []
-    
-    # Pattern recognition
-    hit_patterns = completed_df[completed_df['hit_status'].str.contains('HIT', na=False)]
-    if len(hit_patterns) > 0:
-        # Time-based patterns
-        hit_patterns['hour'] = pd.to_datetime(hit_patterns['prediction_date']).dt.hour
-        best_hours = hit_patterns['hour'].value_counts().head(2)
-        if len(best_hours) > 0:
-            insights.append(f"🕐 Best prediction times: {', '.join([f'{h}:00' for h in best_hours.index])}")
-        
-        # Method effectiveness
-        if 'predictor_methods' in hit_patterns.columns:
-            methods = hit_patterns['predictor_methods'].str.split(',').explode().value_counts().head(3)
-            if len(methods) > 0:
-                insights.append(f"🎯 Most effective methods: {', '.join(methods.index[:2])}")
-    
-    # Confidence correlation
-    if 'confidence' in completed_df.columns:
-        high_conf = completed_df[completed_df['confidence'] > 70]
-        if len(high_conf) > 0:
-            high_conf_accuracy = len(high_conf[high_conf['hit_status'].str.contains('HIT', na=False)]) / len(high_conf)
-            insights.append(f"📊 High confidence accuracy: {high_conf_accuracy:.1%}")
-    
-    return insights
 
-def analyze_prediction_trends(completed_df):
-    """Analyze trends in prediction accuracy over time"""
-    if len(completed_df) < 10:
-        return {'trend': 'insufficient_data', 'recent_performance': 0}
-    
-    completed_df['date'] = pd.to_datetime(completed_df['prediction_date']).dt.date
-    daily_accuracy = completed_df.groupby('date').apply(
-        lambda x: len(x[x['hit_status'].str.contains('HIT', na=False)]) / len(x)
-    ).rolling(window=7).mean()
-    
-    if len(daily_accuracy) >= 2:
-        trend = 'improving' if daily_accuracy.iloc[-1] > daily_accuracy.iloc[-2] else 'declining'
-        recent_perf = daily_accuracy.iloc[-1] if not pd.isna(daily_accuracy.iloc[-1]) else 0
-    else:
-        trend = 'stable'
-        recent_perf = 0
-    
-    return {'trend': trend, 'recent_performance': round(recent_perf * 100, 1)}
+def _ledger_samples():
+    from blueprints.shared import TRACKING
+    from utils.prediction_ledger import get_prediction_ledger
 
-def analyze_confidence_calibration(completed_df):
-    """Analyze how well confidence scores match actual results"""
-    if 'confidence' not in completed_df.columns or len(completed_df) < 5:
-        return {'calibrated': False, 'overconfident': 0, 'underconfident': 0}
-    
-    bins = [0, 50, 70, 85, 100]
-    labels = ['Low', 'Medium', 'High', 'Very High']
-    completed_df['conf_bin'] = pd.cut(completed_df['confidence'], bins=bins, labels=labels)
-    
-    calibration = {}
-    for bin_name in labels:
-        bin_data = completed_df[completed_df['conf_bin'] == bin_name]
-        if len(bin_data) > 0:
-            actual_accuracy = len(bin_data[bin_data['hit_status'].str.contains('HIT', na=False)]) / len(bin_data)
-            calibration[bin_name] = round(actual_accuracy * 100, 1)
-    
-    return {'calibrated': True, 'by_confidence': calibration}
+    ledger = get_prediction_ledger()
+    return [Sample('tracked_predictions', 'gauge', 'Tracked predictions in the ledger', {'status': 'all'},
+                   ledger.count(TRACKING)),
+            Sample('tracked_predictions', 'gauge', 'Tracked predictions in the ledger', {'status': 'pending'},
+                   ledger.count(TRACKING, status='pending'))]
 
-def get_auto_learning_stats(completed_df):
-    """Get auto-learning system statistics"""
-    if len(completed_df) == 0:
-        return {'enabled': False, 'total_learned': 0, 'accuracy_improvement': 0}
-    
-    # Calculate improvement over time
-    if len(completed_df) >= 20:
-        first_half = completed_df.head(len(completed_df)//2)
-        second_half = completed_df.tail(len(completed_df)//2)
-        
-        first_accuracy = len(first_half[first_half['hit_status'].str.contains('HIT', na=False)]) / len(first_half)
-        second_accuracy = len(second_half[second_half['hit_status'].str.contains('HIT', na=False)]) / len(second_half)
-        
-        improvement = (second_accuracy - first_accuracy) * 100
-    else:
-        improvement = 0
-    
-    return {
-        'enabled': True,
-        'total_learned': len(completed_df),
-        'accuracy_improvement': round(improvement, 1)
-    }
 
-# 🎯 NEW LOTTERY TYPE ROUTES (4D, 5D, 6D SEPARATION)
-@app.route('/lottery-types')
-def lottery_types():
-    """Show lottery type selection page"""
-    return render_template('lottery_types.html')
+for collector in (_cache_samples, _subsystem_samples, _ledger_samples):
+    metrics.add_collector(collector)
 
-@app.route('/4d-lottery')
-def lottery_4d():
-    """4D Lottery predictions (GDLotto style)"""
-    df = load_csv_data()
-    
-    # Filter for 4D numbers only (separate from main system)
-    df_4d = df.copy()
-    has_4d_data = (
-        (df_4d['number_1st'].str.len() == 4) & (df_4d['number_1st'].str.isdigit()) |
-        (df_4d['number_2nd'].str.len() == 4) & (df_4d['number_2nd'].str.isdigit()) |
-        (df_4d['number_3rd'].str.len() == 4) & (df_4d['number_3rd'].str.isdigit())
-    )
-    df_4d = df_4d[has_4d_data]
-    
-    # Get predictions for 4D numbers only
-    predictions = advanced_predictor(df_4d, lookback=200)[:10]
-    
-    return render_template('lottery_4d.html', 
-                         predictions=predictions,
-                         lottery_type='4D',
-                         description='4-digit numbers (0000-9999)',
-                         examples=['4391', '0198', '6141'])
 
-@app.route('/5d-lottery')
-def lottery_5d():
-    """5D Lottery predictions from CSV data"""
-    df = load_csv_data()
-    
-    # Extract 5D numbers from CSV (from consolation column)
-    all_5d_numbers = []
-    for _, row in df.iterrows():
-        consolation_text = str(row.get('3rd', ''))  # Consolation data
-        # Find 5-digit numbers
-        five_digit_nums = re.findall(r'\b\d{5}\b', consolation_text)
-        all_5d_numbers.extend(five_digit_nums)
-    
-    # Get frequency and create predictions
-    from collections import Counter
-    freq_counter = Counter(all_5d_numbers)
-    predictions = []
-    
-    if freq_counter:
-        for num, count in freq_counter.most_common(10):
-            score = min(count / len(all_5d_numbers), 0.9) if all_5d_numbers else 0.5
-            predictions.append((num, score, f"frequency-{count}"))
-    else:
-        # Fallback if no 5D numbers found
-        fallback_5d = ['16969', '35452', '30249', '67548', '75489']
-        for i, num in enumerate(fallback_5d):
-            predictions.append((num, 0.8 - i*0.1, "pattern-based"))
-    
-    return render_template('lottery_5d.html',
-                         predictions=predictions,
-                         lottery_type='5D', 
-                         description='5-digit numbers from your data',
-                         examples=['16969', '35452', '30249'])
+@app.route('/metrics')
+def prometheus_metrics():
+    """Prometheus scrape endpoint (text format 0.0.4)"""
+    return Response(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
 
-@app.route('/6d-lottery')
-def lottery_6d():
-    """6D Lottery predictions from CSV data"""
-    df = load_csv_data()
-    
-    # Extract 6D numbers from CSV (from consolation column)
-    all_6d_numbers = []
-    for _, row in df.iterrows():
-        consolation_text = str(row.get('3rd', ''))  # Consolation data
-        # Find 6-digit numbers
-        six_digit_nums = re.findall(r'\b\d{6}\b', consolation_text)
-        all_6d_numbers.extend(six_digit_nums)
-    
-    # Get frequency and create predictions
-    from collections import Counter
-    freq_counter = Counter(all_6d_numbers)
-    predictions = []
-    
-    if freq_counter:
-        for num, count in freq_counter.most_common(10):
-            score = min(count / len(all_6d_numbers), 0.9) if all_6d_numbers else 0.5
-            predictions.append((num, score, f"frequency-{count}"))
-    else:
-        # Fallback if no 6D numbers found
-        fallback_6d = ['581506', '070122', '426579', '123456', '654321']
-        for i, num in enumerate(fallback_6d):
-            predictions.append((num, 0.7 - i*0.1, "pattern-based"))
-    
-    return render_template('lottery_6d.html',
-                         predictions=predictions,
-                         lottery_type='6D',
-                         description='6-digit numbers from your data', 
-                         examples=['581506', '070122', '426579'])
 
-def create_demo_predictions(df):
-    """Create demo predictions from historical data"""
-    pred_file = "prediction_tracking.csv"
-    
-    # Get last 20 draws for demo
-    demo_data = []
-    recent_draws = df.tail(20)
-    
-    for i in range(len(recent_draws) - 1):
-        current_row = recent_draws.iloc[i]
-        next_row = recent_draws.iloc[i + 1]
-        
-        # Simulate predictions using current algorithms
-        adv_preds = advanced_predictor(df.head(len(df) - 20 + i), lookback=100)
-        predicted_numbers = [num for num, _, _ in adv_preds[:5]]
-        
-        # Check hits against next draw
-        actual_numbers = [str(next_row['number_1st']), str(next_row['number_2nd']), str(next_row['number_3rd'])]
-        hits = [p for p in predicted_numbers if p in actual_numbers]
-        
-        demo_entry = {
-            "prediction_date": (current_row['date_parsed'] + pd.Timedelta(hours=12)).strftime("%Y-%m-%d %H:%M:%S"),
-            "draw_date": next_row['date_parsed'].strftime("%Y-%m-%d"),
-            "provider": next_row['provider'],
-            "predicted_numbers": str(predicted_numbers),
-            "predictor_methods": "advanced,smart,ml",
-            "confidence": min(85, 60 + len(hits) * 10),
-            "actual_1st": str(next_row['number_1st']),
-            "actual_2nd": str(next_row['number_2nd']),
-            "actual_3rd": str(next_row['number_3rd']),
-            "hit_status": f"HIT ({len(hits)} matches)" if hits else "MISS",
-            "accuracy_score": len(hits) * 20 if hits else 0
-        }
-        demo_data.append(demo_entry)
-    
-    # Save demo data
-    demo_df = pd.DataFrame(demo_data)
-    demo_df.to_csv(pred_file, index=False)
-    return len(demo_data)
+# ---------------- FEATURE FAMILIES ---------------- #
+# Pattern, predictor, accuracy/learning, export, lottery-type and past-result
+# routes live in blueprints/; FEATURE_FAMILIES picks the ones served
+register_families(app)
+if uses_precompute(registered_families(app)):
+    warm_dashboard_predictions()
 
 if __name__ == "__main__":
     app.run(debug=True, host='127.0.0.1', port=5000)
@@ -1,19 +1,21 @@
 # auto_evaluate.py
 import pandas as pd
 from utils.feedback_learner import FeedbackLearner
+from utils.prediction_ledger import get_prediction_ledger
 import json
 
 def auto_evaluate_predictions():
     """Automatically evaluate predictions and learn from results"""
     
-    # Load prediction tracking data
+    # Load pending predictions from the ledger
+    ledger = get_prediction_ledger()
     try:
-        tracking_df = pd.read_csv('prediction_tracking.csv', on_bad_lines='skip')
-    except FileNotFoundError:
-        print("❌ No prediction tracking file found!")
-        return
+        tracking_df = ledger.frame('tracking', status='pending')
     except Exception as e:
-        print(f"❌ Error reading tracking file: {e}")
+        print(f"❌ Error reading prediction ledger: {e}")
+        return
+    if tracking_df.empty:
+        print("❌ No pending predictions to evaluate!")
         return
     
     # Load historical results
@@ -32,12 +34,9 @@ def auto_evaluate_predictions():
     print("🔍 Auto-Evaluating Predictions...\n")
     
     updated_count = 0
+    updates = {}
     
     for idx, row in tracking_df.iterrows():
-        # Skip if already evaluated
-        if row['hit_status'] != 'pending':
-            continue
-        
         draw_date = row['draw_date']
         predicted_numbers = json.loads(row['predicted_numbers'].replace("'", '"'))
         
@@ -58,11 +57,13 @@ def auto_evaluate_predictions():
         )
         
         # Update tracking data
-        tracking_df.at[idx, 'hit_status'] = match_type
-        tracking_df.at[idx, 'accuracy_score'] = score
-        tracking_df.at[idx, 'actual_1st'] = actual_1st
-        tracking_df.at[idx, 'actual_2nd'] = actual_2nd
-        tracking_df.at[idx, 'actual_3rd'] = actual_3rd
+        updates[idx] = {
+            'hit_status': match_type,
+            'accuracy_score': score,
+            'actual_1st': actual_1st,
+            'actual_2nd': actual_2nd,
+            'actual_3rd': actual_3rd
+        }
         
         # Learn from result
         learner.learn_from_result({
@@ -78,8 +79,8 @@ def auto_evaluate_predictions():
         print(f"   Predicted: {predicted_numbers[:3]}")
         print(f"   Actual: {actual_1st}, {actual_2nd}, {actual_3rd}\n")
     
-    # Save updated tracking
-    tracking_df.to_csv('prediction_tracking.csv', index=False)
+    # Save updated tracking (only the evaluated rows are written)
+    ledger.update_many('tracking', updates)
     
     # Save learning data
     learner.save_learning_data()
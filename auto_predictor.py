@@ -9,26 +9,31 @@ from sklearn.ensemble import RandomForestClassifier
 from sklearn.preprocessing import StandardScaler
 import pickle
 import os
+from utils.dataset_manager import get_dataset_manager
+from utils.model_registry import get_model_registry, content_digest
+from utils.prediction_ledger import get_prediction_ledger
 
-# File paths
-PREDICTIONS_CSV = 'daily_predictions.csv'
+# Daily predictions live in the prediction ledger (formerly daily_predictions.csv)
+LEDGER_SOURCE = 'daily'
+PREDICTION_COLUMNS = [
+    'prediction_date', 'draw_date', 'predicted_numbers',
+    'actual_numbers', 'matches', 'accuracy', 'learned',
+    'hot_cold_score', 'gap_pattern', 'position_pattern'
+]
+MODEL_NAME = 'auto_predictor'
+# Pre-registry pickles, still loaded if no registered model exists
 MODEL_FILE = 'learning_model.pkl'
 SCALER_FILE = 'scaler.pkl'
 
-def initialize_prediction_csv():
-    """Create prediction CSV if it doesn't exist"""
-    if not os.path.exists(PREDICTIONS_CSV):
-        df = pd.DataFrame(columns=[
-            'prediction_date', 'draw_date', 'predicted_numbers', 
-            'actual_numbers', 'matches', 'accuracy', 'learned',
-            'hot_cold_score', 'gap_pattern', 'position_pattern'
-        ])
-        df.to_csv(PREDICTIONS_CSV, index=False)
+def load_predictions():
+    """Saved daily predictions as a DataFrame indexed by ledger id"""
+    return get_prediction_ledger().frame(LEDGER_SOURCE, PREDICTION_COLUMNS)
 
 def load_historical_data():
-    """Load historical lottery data"""
-    df = pd.read_csv('4d_results_history.csv')
-    df['date_parsed'] = pd.to_datetime(df.iloc[:, 0], errors='coerce')
+    """Load historical lottery data (canonical frame, memory-mapped snapshot when fresh)"""
+    df = get_dataset_manager().get_frame()
+    if df.empty:
+        return df
     df = df.dropna(subset=['date_parsed']).sort_values('date_parsed')
     return df
 
@@ -113,9 +118,6 @@ def calculate_position_pattern(predicted_numbers):
 
 def save_prediction(predicted_numbers, hot_cold_score, gap_pattern, position_pattern):
     """Save today's prediction with advanced features"""
-    initialize_prediction_csv()
-    df = pd.read_csv(PREDICTIONS_CSV)
-    
     new_row = {
         'prediction_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
         'draw_date': (datetime.now() + timedelta(days=1)).strftime('%Y-%m-%d'),
@@ -129,8 +131,7 @@ def save_prediction(predicted_numbers, hot_cold_score, gap_pattern, position_pat
         'position_pattern': position_pattern
     }
     
-    df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
-    df.to_csv(PREDICTIONS_CSV, index=False)
+    get_prediction_ledger().append(LEDGER_SOURCE, new_row)
     print(f"✅ Prediction saved for {new_row['draw_date']}: {predicted_numbers}")
     print(f"   Hot/Cold Score: {hot_cold_score:.4f}")
     print(f"   Gap Pattern: {gap_pattern}")
@@ -138,38 +139,37 @@ def save_prediction(predicted_numbers, hot_cold_score, gap_pattern, position_pat
 
 def add_actual_results(draw_date, actual_numbers):
     """Add actual winning numbers after draw"""
-    df = pd.read_csv(PREDICTIONS_CSV)
-    
-    mask = df['draw_date'] == draw_date
-    if mask.any():
-        df.loc[mask, 'actual_numbers'] = ','.join(actual_numbers)
-        df.to_csv(PREDICTIONS_CSV, index=False)
+    ledger = get_prediction_ledger()
+    matching = ledger.rows(LEDGER_SOURCE, draw_date=draw_date)
+    if matching:
+        ledger.update_many(LEDGER_SOURCE, {record_id: {'actual_numbers': ','.join(actual_numbers)}
+                                           for record_id, _ in matching})
         print(f"✅ Actual results added for {draw_date}: {actual_numbers}")
     else:
         print(f"❌ No prediction found for {draw_date}")
 
 def learn_from_results():
     """Compare predictions vs actuals and calculate accuracy"""
-    df = pd.read_csv(PREDICTIONS_CSV)
-    
-    for idx, row in df.iterrows():
-        if row['actual_numbers'] and not row['learned']:
-            predicted = set(row['predicted_numbers'].split(','))
-            actual = set(row['actual_numbers'].split(','))
+    ledger = get_prediction_ledger()
+    learned = {}
+    
+    # Only the not-yet-learned rows are read (indexed on status)
+    for record_id, row in ledger.rows(LEDGER_SOURCE, status='pending'):
+        if row.get('actual_numbers'):
+            predicted = set(str(row['predicted_numbers']).split(','))
+            actual = set(str(row['actual_numbers']).split(','))
             matches = len(predicted & actual)
             accuracy = (matches / len(predicted)) * 100
             
-            df.at[idx, 'matches'] = matches
-            df.at[idx, 'accuracy'] = round(accuracy, 2)
-            df.at[idx, 'learned'] = True
+            learned[record_id] = {'matches': matches, 'accuracy': round(accuracy, 2), 'learned': True}
             
             print(f"📊 Learned: {row['draw_date']} - {matches} matches ({accuracy:.1f}% accuracy)")
     
-    df.to_csv(PREDICTIONS_CSV, index=False)
+    ledger.update_many(LEDGER_SOURCE, learned)
 
 def train_ml_model():
     """Train ML model from learned data"""
-    pred_df = pd.read_csv(PREDICTIONS_CSV)
+    pred_df = load_predictions()
     hist_df = load_historical_data()
     
     learned = pred_df[pred_df['learned'] == True]
@@ -203,22 +203,28 @@ def train_ml_model():
     model = RandomForestClassifier(n_estimators=100, random_state=42)
     model.fit(X_scaled, y)
     
-    # Save model
-    with open(MODEL_FILE, 'wb') as f:
-        pickle.dump(model, f)
-    with open(SCALER_FILE, 'wb') as f:
-        pickle.dump(scaler, f)
+    # Register model (versioned on the dataset it learned from)
+    get_model_registry().put(MODEL_NAME, (model, scaler), version=get_dataset_manager().version,
+                             metadata={'samples': len(X), 'learned': content_digest(y)})
     
     print(f"✅ Model trained with {len(X)} samples")
     return model, scaler
 
 def load_trained_model():
-    """Load existing trained model"""
-    if os.path.exists(MODEL_FILE) and os.path.exists(SCALER_FILE):
+    """Load the model registered for the current dataset (or one pickled by older versions)"""
+    registry = get_model_registry()
+    version = get_dataset_manager().version
+    registered = registry.get(MODEL_NAME, version=version)
+    if registered is not None:
+        return registered
+    # A model of an older dataset is retrained; pre-registry pickles are only migrated once
+    if not registry.entries(MODEL_NAME) and os.path.exists(MODEL_FILE) and os.path.exists(SCALER_FILE):
         with open(MODEL_FILE, 'rb') as f:
             model = pickle.load(f)
         with open(SCALER_FILE, 'rb') as f:
             scaler = pickle.load(f)
+        # Migrate into the registry so later loads come from memory / joblib
+        registry.put(MODEL_NAME, (model, scaler), version=version, metadata={'source': MODEL_FILE})
         return model, scaler
     return None, None
 
@@ -251,15 +257,15 @@ def auto_predict_daily():
     save_prediction(predicted, hot_cold_score, gap_pattern, position_pattern)
     
     print(f"\n🎯 Tomorrow's Predictions: {predicted}")
-    print(f"💾 Saved to {PREDICTIONS_CSV}")
+    print(f"💾 Saved to {get_prediction_ledger().path}")
 
 def view_performance():
     """View prediction performance stats with advanced metrics"""
-    if not os.path.exists(PREDICTIONS_CSV):
+    df = load_predictions()
+    if df.empty:
         print("❌ No predictions yet")
         return
     
-    df = pd.read_csv(PREDICTIONS_CSV)
     learned = df[df['learned'] == True]
     
     if len(learned) == 0:
@@ -0,0 +1,158 @@
+"""
+Benchmark: column-wise normalize_dataframe vs the legacy per-row iterrows loop.
+
+Starts from the real scraper CSV (559 rows) and scales up with synthetic
+live4d2u-style rows to 1M. At every size where the legacy loop runs, the
+two outputs are checked column for column.
+
+Usage:
+    python benchmark_normalizer.py
+    python benchmark_normalizer.py --sizes 559 10000 100000 1000000 --max-legacy 100000
+"""
+import argparse
+import logging
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.data_normalizer import DataNormalizer, normalize_dataframe
+
+REAL_CSV = 'scraper/4d_results_history.csv'
+
+PROVIDER_URLS = [
+    'https://www.live4d2u.net/images/magnum',
+    'https://www.live4d2u.net/images/damacai',
+    'https://www.live4d2u.net/images/toto',
+    'https://www.live4d2u.net/images/singapore',
+    'https://www.live4d2u.net/images/sabah88',
+    'https://www.live4d2u.net/images/sandakan',
+    'https://www.live4d2u.net/images/cashsweep',
+    'https://www.live4d2u.net/images/gdlotto',
+    '/images/logo_magnum.gif',
+]
+DRAW_INFOS = ['4D', '4D Jackpot', 'Lotto 6D', '5D', '4D Jackpot 3D', 'nan']
+
+
+def legacy_normalize_dataframe(df):
+    """The previous per-row implementation, kept here as the reference"""
+    df = df.copy()
+    df['date_parsed'] = pd.to_datetime(df.iloc[:, 0], errors='coerce')
+    df['provider_key'] = df.iloc[:, 1].apply(DataNormalizer.normalize_provider)
+    df['lottery_type'] = df.iloc[:, 2].astype(str).str.lower()
+    non_4d_keywords = ['5d', '6d', 'lotto', 'magnum life', 'jackpot gold', 'singapore toto', 'sabah 88 lotto', '3+3d', '1+3d']
+    df['is_4d_only'] = ~df['lottery_type'].str.contains('|'.join(non_4d_keywords), case=False, na=False)
+    df = df[df['is_4d_only']].copy()
+
+    extracted_data = []
+    for idx, row in df.iterrows():
+        prize_text = str(row.iloc[5]) if len(row) > 5 else ''
+        special_text = str(row.iloc[6]) if len(row) > 6 else ''
+        consolation_text = str(row.iloc[7]) if len(row) > 7 else ''
+
+        first = re.search(r'1st[^0-9]*(\d{4})', prize_text, re.IGNORECASE)
+        second = re.search(r'2nd[^0-9]*(\d{4})', prize_text, re.IGNORECASE)
+        third = re.search(r'3rd[^0-9]*(\d{4})', prize_text, re.IGNORECASE)
+        first_num = first.group(1) if first else None
+        second_num = second.group(1) if second else None
+        third_num = third.group(1) if third else None
+
+        special_4d = re.findall(r'\b\d{4}\b', special_text)
+        special_nums = [n for n in special_4d if n != '----' and n != '****'][:10]
+        consolation_4d = re.findall(r'\b\d{4}\b', consolation_text)
+        consolation_nums = [n for n in consolation_4d if n != '----' and n != '****'][:10]
+
+        extracted_data.append({
+            'number_1st': first_num,
+            'number_2nd': second_num,
+            'number_3rd': third_num,
+            'special': ' '.join(special_nums) if special_nums else '',
+            'consolation': ' '.join(consolation_nums) if consolation_nums else '',
+            'total_4d_found': len([n for n in [first_num, second_num, third_num] if n]) + len(special_nums) + len(consolation_nums)
+        })
+
+    for key in ['number_1st', 'number_2nd', 'number_3rd', 'special', 'consolation', 'total_4d_found']:
+        df[key] = [d[key] for d in extracted_data]
+
+    df['is_valid'] = (
+        df['date_parsed'].notna() &
+        (df['provider_key'] != 'unknown') &
+        (df['number_1st'].notna() | df['number_2nd'].notna() | df['number_3rd'].notna())
+    )
+    return df
+
+
+def _numbers(rng, n, k):
+    return [' '.join(f'{v:04d}' for v in row) for row in rng.integers(0, 10000, size=(n, k))]
+
+
+def synthetic_frame(n_rows, seed=0):
+    """Synthetic rows in the live4d2u positional layout (8+ columns)"""
+    rng = np.random.default_rng(seed)
+    dates = pd.Timestamp('2015-01-01') + pd.to_timedelta(rng.integers(0, 4000, n_rows), unit='D')
+    prizes = rng.integers(0, 10000, size=(n_rows, 3))
+    prize_text = [f'1st Prize 首獎 {a:04d} | 2nd Prize 二獎 {b:04d} | 3rd Prize 三獎 {c:04d} | ' for a, b, c in prizes]
+    special = _numbers(rng, n_rows, 13)
+    # Sprinkle the '----' placeholders the site uses for empty special slots
+    special = [s.replace(s[10:14], '----', 1) if i % 3 == 0 else s for i, s in enumerate(special)]
+    return pd.DataFrame({
+        'date': dates.strftime('%Y-%m-%d'),
+        'provider': rng.choice(PROVIDER_URLS, n_rows),
+        'draw_info': rng.choice(DRAW_INFOS, n_rows),
+        '1st': [f'{v}/15' for v in rng.integers(1, 5000, n_rows)],
+        '2nd': 'Draw No',
+        '3rd': prize_text,
+        'special': special,
+        'consolation': _numbers(rng, n_rows, 10),
+    })
+
+
+SYNTHETIC_COLUMNS = ['date', 'provider', 'draw_info', '1st', '2nd', '3rd', 'special', 'consolation']
+
+
+def load_base_frame():
+    """The real CSV, with its columns aligned positionally to the synthetic layout"""
+    try:
+        base = pd.read_csv(REAL_CSV, index_col=False, on_bad_lines='skip')
+    except Exception:
+        return synthetic_frame(559)
+    return base.set_axis(SYNTHETIC_COLUMNS[:base.shape[1]], axis=1)
+
+
+def frame_of_size(base, n_rows):
+    if n_rows <= len(base):
+        return base.head(n_rows)
+    extra = synthetic_frame(n_rows - len(base), seed=n_rows)
+    return pd.concat([base, extra], ignore_index=True)
+
+
+def timed(func, df):
+    start = time.perf_counter()
+    out = func(df)
+    return out, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[559, 10_000, 100_000, 1_000_000])
+    parser.add_argument('--max-legacy', type=int, default=100_000,
+                        help='largest size at which the legacy loop is also run')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    base = load_base_frame()
+    print(f"{'rows':>10} {'vectorized (s)':>15} {'legacy (s)':>12} {'speedup':>8}  match")
+    for n_rows in args.sizes:
+        df = frame_of_size(base, n_rows)
+        new, t_new = timed(normalize_dataframe, df)
+        if n_rows <= args.max_legacy:
+            old, t_old = timed(legacy_normalize_dataframe, df)
+            pd.testing.assert_frame_equal(new, old)
+            print(f'{n_rows:>10} {t_new:>15.3f} {t_old:>12.3f} {t_old / t_new:>7.1f}x  ok')
+        else:
+            print(f'{n_rows:>10} {t_new:>15.3f} {"-":>12} {"-":>8}  -')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+Feature Families
+Route families as Flask blueprints, each with its own cache namespace and request timings
+
+Only the families named in FEATURE_FAMILIES (comma-separated, default all)
+are imported and registered, so a deployment serving a few pages does not
+load the others' code or dependencies:
+
+    FEATURE_FAMILIES=pattern,past_results gunicorn -c gunicorn.conf.py app:app
+"""
+import importlib
+import logging
+import os
+
+from flask import Blueprint, current_app
+
+from utils.cache import LRUCache, cached
+from utils.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+FAMILIES_ENV = 'FEATURE_FAMILIES'
+# Registration order: where two families serve the same URL, the earlier one wins
+FAMILIES = ('pattern', 'predictors', 'learning', 'exports', 'lottery_types', 'past_results')
+
+
+class FeatureFamily(Blueprint):
+    """
+    Blueprint of one route family.
+
+    - ``plugins``: heavy modules its routes import on first use, warmed up
+      in the background only when the family is registered
+    - ``cache()`` / ``cached()``: LRU caches named ``<family>.<name>``, so
+      their stats group by family and ``clear_caches()`` drops them together
+    - request count, errors and wall time per endpoint, from the request
+      metrics (utils/metrics.py)
+    """
+
+    def __init__(self, name, import_name, plugins=()):
+        super().__init__(name, import_name)
+        self.plugins = tuple(plugins)
+        self.caches = {}
+
+    def cache(self, name, maxsize=128, ttl=None):
+        """LRUCache in this family's namespace"""
+        cache = LRUCache(maxsize=maxsize, ttl=ttl, name=f"{self.name}.{name}")
+        self.caches[cache.name] = cache
+        return cache
+
+    def cached(self, maxsize=128, ttl=None, key=None):
+        """utils.cache.cached in this family's namespace (cache named after the function)"""
+        def decorator(func):
+            wrapper = cached(maxsize=maxsize, ttl=ttl, key=key, name=f"{self.name}.{func.__name__}")(func)
+            self.caches[wrapper.cache.name] = wrapper.cache
+            return wrapper
+        return decorator
+
+    def clear_caches(self):
+        for cache in self.caches.values():
+            cache.clear()
+
+    def stats(self):
+        return {'timings': get_metrics().request_summary(self.name),
+                'caches': {name: cache.stats() for name, cache in self.caches.items()},
+                'plugins': list(self.plugins)}
+
+
+def enabled_families():
+    """FEATURE_FAMILIES -> family names in registration order (all when unset)"""
+    value = os.environ.get(FAMILIES_ENV, '').strip()
+    if not value or value.lower() == 'all':
+        return list(FAMILIES)
+    names = {name.strip().lower() for name in value.split(',') if name.strip()}
+    unknown = names - set(FAMILIES)
+    if unknown:
+        raise ValueError(f"{FAMILIES_ENV}: unknown feature families {sorted(unknown)} (known: {', '.join(FAMILIES)})")
+    return [name for name in FAMILIES if name in names]
+
+
+def _disabled_family_url(error, endpoint, values):
+    """Links to a family this deployment does not serve render as '#' instead of failing the page"""
+    family = endpoint.partition('.')[0]
+    if family in FAMILIES and family not in registered_families(current_app):
+        return '#'
+    return None
+
+
+def register_families(app, names=None):
+    """Import and register the enabled families' blueprints; returns {name: FeatureFamily}"""
+    families = {}
+    for name in (enabled_families() if names is None else names):
+        family = importlib.import_module(f"{__name__}.{name}").bp
+        app.register_blueprint(family)
+        families[name] = family
+    app.extensions['feature_families'] = families
+    app.url_build_error_handlers.append(_disabled_family_url)
+    logger.info(f"Feature families: {', '.join(families) or 'none'}")
+    return families
+
+
+def registered_families(app):
+    return app.extensions.get('feature_families', {})
+
+
+def family_stats(app):
+    """Timings and cache stats of every registered family"""
+    return {name: family.stats() for name, family in registered_families(app).items()}
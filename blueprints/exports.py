@@ -0,0 +1,169 @@
+"""
+Export Routes
+Streamed CSV/NDJSON exports and the background Excel dashboard report
+"""
+from collections import Counter
+from datetime import datetime
+
+import pandas as pd
+from flask import request, Response, stream_with_context
+
+from blueprints import FeatureFamily
+from blueprints.shared import load_csv_data, precompute, ensemble_predictions, TRACKING, TRACKING_COLUMNS
+from utils.exports import (EXPORT_FORMATS, parse_day, filter_draws, frame_chunks, record_chunks,
+                           encode_chunks, get_background_writer)
+from utils.prediction_ledger import get_prediction_ledger
+
+bp = FeatureFamily('exports', __name__, plugins=('utils.realtime_engine',))
+
+# ---------------- STREAMING EXPORTS ---------------- #
+def export_request():
+    """(format, provider, start day, end day) of an export request; raises ValueError"""
+    fmt = request.args.get('format', 'csv').strip().lower()
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown format '{fmt}' (choose from {', '.join(EXPORT_FORMATS)})")
+    provider = request.args.get('provider', 'all').strip() or 'all'
+    return fmt, provider, parse_day(request.args.get('start', '').strip()), parse_day(request.args.get('end', '').strip())
+
+
+def stream_export(chunks, fmt, name, columns=None):
+    """Chunked download of DataFrame chunks; nothing is materialized beyond one chunk"""
+    mimetype, extension = EXPORT_FORMATS[fmt]
+    filename = f'{name}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.{extension}'
+    return Response(stream_with_context(encode_chunks(chunks, fmt, columns)), mimetype=mimetype,
+                    headers={'Content-Disposition': f'attachment;filename={filename}'})
+
+
+@bp.route('/export/predictions')
+def export_predictions():
+    try:
+        fmt, provider, _, _ = export_request()
+    except ValueError as e:
+        return str(e), 400
+    adv, smart, ml = ensemble_predictions([
+        precompute.key('advanced', provider, '', provider, 200),
+        precompute.key('smart', provider, '', None, 300),
+        precompute.key('ml', provider, '', None, 500),
+    ])
+    
+    export_data = ({'number': num, 'score': score, 'method': reason, 'timestamp': datetime.now()}
+                   for num, score, reason in adv + smart + ml)
+    columns = ['number', 'score', 'method', 'timestamp']
+    return stream_export(record_chunks(export_data, columns), fmt, 'predictions', columns)
+
+@bp.route('/export/statistics')
+def export_statistics():
+    try:
+        fmt, provider, start, end = export_request()
+    except ValueError as e:
+        return str(e), 400
+    df = filter_draws(load_csv_data(), provider, start, end)
+    all_nums = [n for col in ['1st_real', '2nd_real', '3rd_real'] for n in df[col].astype(str) if n.isdigit() and len(n) == 4]
+    freq = Counter(all_nums)
+    
+    stats_data = ({'number': num, 'frequency': count, 'percentage': round(count/len(all_nums)*100, 2)} for num, count in freq.most_common())
+    columns = ['number', 'frequency', 'percentage']
+    return stream_export(record_chunks(stats_data, columns), fmt, 'statistics', columns)
+
+
+def write_accuracy_report(path):
+    """Excel summary + detail of the completed predictions (runs on the background writer)"""
+    completed = get_prediction_ledger().frame(TRACKING, TRACKING_COLUMNS, exclude_status='pending')
+    if completed.empty:
+        return None
+    # Add analysis columns
+    completed['hit_count'] = completed['hit_status'].str.extract(r'(\d+)').fillna(0).astype(int)
+    completed['is_hit'] = completed['hit_status'].str.contains('HIT', na=False)
+    completed['prediction_hour'] = pd.to_datetime(completed['prediction_date']).dt.hour
+    completed['days_ahead'] = (pd.to_datetime(completed['draw_date']) - pd.to_datetime(completed['prediction_date'])).dt.days
+    
+    # Summary stats
+    summary = pd.DataFrame({
+        'Metric': ['Total Predictions', 'Total Hits', 'Hit Rate %', 'Avg Confidence', 'Best Method'],
+        'Value': [
+            len(completed),
+            len(completed[completed['is_hit']]),
+            round(len(completed[completed['is_hit']]) / len(completed) * 100, 1),
+            round(completed['confidence'].mean(), 1) if 'confidence' in completed.columns else 'N/A',
+            completed['predictor_methods'].mode().iloc[0] if 'predictor_methods' in completed.columns else 'N/A'
+        ]
+    })
+    
+    # Combine data
+    with pd.ExcelWriter(path, engine='openpyxl') as writer:
+        summary.to_excel(writer, sheet_name='Summary', index=False)
+        completed.to_excel(writer, sheet_name='Detailed_Data', index=False)
+    return path
+
+
+def filter_tracking_chunk(chunk, provider='all', start=None, end=None):
+    """Rows of a tracking chunk for one provider / draw-date range"""
+    if provider != 'all':
+        chunk = chunk[chunk['provider'] == provider]
+    if start is not None or end is not None:
+        draw_dates = pd.to_datetime(chunk['draw_date'].str[:10], format='%Y-%m-%d', errors='coerce')
+        keep = pd.Series(True, index=chunk.index)
+        if start is not None:
+            keep &= draw_dates >= start
+        if end is not None:
+            keep &= draw_dates < end + pd.Timedelta(days=1)
+        chunk = chunk[keep]
+    return chunk
+
+
+@bp.route('/export/accuracy')
+def export_accuracy():
+    try:
+        fmt, provider, start, end = export_request()
+    except ValueError as e:
+        return str(e), 400
+    ledger = get_prediction_ledger()
+    if ledger.count(TRACKING):
+        # The Excel report is written off the request path, once per ledger revision
+        get_background_writer().submit(
+            (ledger.path, ledger.revision()), write_accuracy_report,
+            f'accuracy_report_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx')
+        
+        chunks = (filter_tracking_chunk(chunk, provider, start, end) for chunk in ledger.iter_frames(TRACKING))
+        return stream_export(chunks, fmt, 'accuracy')
+    return "No data available", 404
+
+@bp.route('/export/dashboard')
+def export_dashboard():
+    """Export complete dashboard data"""
+    try:
+        fmt, provider, start, end = export_request()
+    except ValueError as e:
+        return str(e), 400
+    try:
+        df = filter_draws(load_csv_data(), provider, start, end)
+        from utils.realtime_engine import RealtimeEngine
+        
+        engine = RealtimeEngine(df)
+        export_data = {
+            'sequences': engine.detect_sequences(100),
+            'overdue': engine.get_overdue_numbers(30),
+            'pairs': engine.get_number_pairs(20),
+            'hot_cold': engine.get_hot_cold_analysis(90),
+            'predictions': engine.predict_next_draw()
+        }
+        
+        rows = []
+        rows.append(['RECURRING SEQUENCES', '', ''])
+        for seq, count in export_data['sequences']:
+            rows.append(['Sequence', seq, count])
+        
+        rows.append(['', '', ''])
+        rows.append(['OVERDUE NUMBERS', '', ''])
+        for num in export_data['overdue'][:20]:
+            rows.append(['Overdue', num, ''])
+        
+        rows.append(['', '', ''])
+        rows.append(['HOT NUMBERS', '', ''])
+        for item in export_data['hot_cold']['hot']:
+            rows.append(['Hot', item['number'], f"{item['count']} {item['trend']}"])
+        
+        export_df = pd.DataFrame(rows, columns=['Category', 'Value', 'Count'])
+        return stream_export(frame_chunks(export_df), fmt, 'dashboard')
+    except Exception as e:
+        return f"Export error: {str(e)}", 500
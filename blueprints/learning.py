@@ -0,0 +1,695 @@
+"""
+Accuracy & Learning Routes
+Prediction history, tracking, evaluation, accuracy and learning dashboards
+"""
+import ast
+import logging
+import os
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+from flask import render_template, request, redirect
+
+from blueprints import FeatureFamily
+from blueprints.shared import (load_csv_data, normalize_prediction_dict, advanced_predictor,
+                               smart_auto_weight_predictor, ml_predictor, predict_top_5, generate_4x4_grid,
+                               TRACKING, TRACKING_COLUMNS, tracking_entry)
+from utils.prediction_ledger import get_prediction_ledger
+from utils.prediction_evaluator import evaluate_predictions
+
+logger = logging.getLogger(__name__)
+
+bp = FeatureFamily('learning', __name__, plugins=('utils.feedback_learner', 'utils.adaptive_learner'))
+
+@bp.route('/prediction-history')
+def prediction_history():
+    df = load_csv_data()
+    provider = request.args.get('provider', 'all')
+    selected_month = request.args.get('month', '')
+    
+    provider_options = ['all'] + sorted([p for p in df['provider_key'].dropna().unique() if p])
+    month_options = sorted(df['date_parsed'].dropna().dt.strftime('%Y-%m').unique(), reverse=True)
+    
+    if provider != 'all':
+        df = df[df['provider_key'] == provider]
+    if selected_month:
+        df = df[df['date_parsed'].dt.strftime('%Y-%m') == selected_month]
+    
+    df = df[df['number_1st'].astype(str).str.len() == 4]
+    df = df[df['number_1st'].astype(str).str.isdigit()]
+    df = df.tail(50).sort_values(['date_parsed', 'provider']).reset_index(drop=True)
+    df = df.drop_duplicates(subset=['date_parsed', '1st_real'], keep='first')
+
+    history = []
+    for i in range(min(len(df) - 1, 30)):
+        this_draw = df.iloc[i]
+        next_draw = df.iloc[i + 1]
+
+        number = str(this_draw['number_1st'])
+        grid = generate_4x4_grid(number)
+
+        raw_pred = predict_top_5(
+            [{'date': str(this_draw['date_parsed'].date()), 'grid': grid}],
+            mode="pattern"
+        )
+        normalized = normalize_prediction_dict(raw_pred)
+
+        next_winners = [str(next_draw['number_1st']), str(next_draw['number_2nd']), str(next_draw['number_3rd'])]
+
+        checked_preds = []
+        for num, score, _reason in normalized:
+            hit = "✅" if num in next_winners else "❌"
+            checked_preds.append({"num": num, "score": score, "hit": hit})
+
+        history.append({
+            "date": this_draw["date_parsed"].date(),
+            "provider": this_draw["provider"],
+            "drawn_number": this_draw["1st_real"],
+            "predictions": checked_preds,
+            "next_winners": next_winners
+        })
+
+    return render_template("prediction_history.html", history=history, provider_options=provider_options, provider=provider, month_options=month_options, selected_month=selected_month)
+
+@bp.route('/smart-history')
+def smart_history_page():
+    hist_file = "smart_history.csv"
+    if not os.path.exists(hist_file):
+        return render_template(
+            'smart_history.html',
+            history=[],
+            message="No smart history recorded yet."
+        )
+    hist = pd.read_csv(hist_file)
+    return render_template(
+        'smart_history.html',
+        history=hist.to_dict(orient='records'),
+        message=""
+    )
+
+
+@bp.route('/save-prediction', methods=['POST'])
+def save_prediction():
+    data = request.get_json()
+    get_prediction_ledger().append(TRACKING, tracking_entry(
+        data.get('draw_date'), data.get('provider'), data.get('predicted_numbers'), data.get('methods'),
+        data.get('confidence'), data.get('source', 'manual'), data.get('data_points', 0)))
+    
+    return {"status": "success", "message": "Enhanced prediction saved with metadata"}
+
+@bp.route('/accuracy-dashboard')
+def accuracy_dashboard():
+    ledger = get_prediction_ledger()
+    
+    if not ledger.count(TRACKING):
+        # Demo mode - create sample predictions from CSV data
+        demo_mode = request.args.get('demo', 'false') == 'true'
+        if demo_mode:
+            create_demo_predictions(load_csv_data())
+        else:
+            return render_template('accuracy_dashboard.html', 
+                                 message="No predictions tracked yet. Start making predictions! Or try <a href='/accuracy-dashboard?demo=true' class='text-yellow-300 underline'>Demo Mode</a>",
+                                 stats={}, method_stats={}, recent_predictions=[], insights=[], 
+                                 ai_insights=[], prediction_trends=[], confidence_analysis={}, auto_learning={})
+    
+    pred_df = ledger.frame(TRACKING)
+    df = load_csv_data()
+    
+    # Auto-evaluate pending predictions (one merge against the results)
+    auto_evaluate_predictions(pred_df, df)
+    
+    completed = pred_df[pred_df['hit_status'] != 'pending']
+    
+    stats = {
+        'total_predictions': len(pred_df),
+        'completed': len(completed),
+        'pending': len(pred_df[pred_df['hit_status'] == 'pending']),
+        'total_hits': len(completed[completed['hit_status'].str.contains('HIT', na=False)]),
+        'total_misses': len(completed[completed['hit_status'] == 'MISS']),
+        'hit_rate': round(len(completed[completed['hit_status'].str.contains('HIT', na=False)]) / len(completed) * 100, 1) if len(completed) > 0 else 0,
+        'avg_accuracy': round(completed['accuracy_score'].mean(), 1) if len(completed) > 0 else 0
+    }
+    
+    method_stats = {}
+    insights = []
+    
+    if stats['hit_rate'] < 30:
+        insights.append("Low hit rate. Consider adjusting methods.")
+    if stats['hit_rate'] > 50:
+        insights.append("Good hit rate! Current methods working well.")
+    
+    recent = pred_df.tail(20).to_dict('records')
+    
+    # Advanced AI insights
+    ai_insights = generate_ai_insights(completed)
+    prediction_trends = analyze_prediction_trends(completed)
+    confidence_analysis = analyze_confidence_calibration(completed)
+    auto_learning = get_auto_learning_stats(completed)
+    
+    return render_template('accuracy_dashboard.html',
+                         stats=stats,
+                         method_stats=method_stats,
+                         recent_predictions=recent,
+                         insights=insights,
+                         ai_insights=ai_insights,
+                         prediction_trends=prediction_trends,
+                         confidence_analysis=confidence_analysis,
+                         auto_learning=auto_learning,
+                         message="")
+
+@bp.route('/auto-evaluate')
+def trigger_auto_evaluate():
+    """Manually trigger auto-evaluation of pending predictions"""
+    ledger = get_prediction_ledger()
+    if ledger.count(TRACKING):
+        pred_df = ledger.frame(TRACKING)
+        df = load_csv_data()
+        auto_evaluate_predictions(pred_df, df)
+        return {"status": "success", "message": "Auto-evaluation completed"}
+    return {"status": "error", "message": "No predictions to evaluate"}
+
+@bp.route('/learning-insights')
+def learning_insights():
+    ledger = get_prediction_ledger()
+    
+    if not ledger.count(TRACKING):
+        return render_template('learning_insights.html', 
+                             message="No prediction data yet. Start tracking predictions!",
+                             insights={})
+    
+    pred_df = ledger.frame(TRACKING)
+    df = load_csv_data()
+    
+    # Only analyze completed predictions
+    completed = pred_df[pred_df['hit_status'] != 'pending']
+    
+    if len(completed) == 0:
+        return render_template('learning_insights.html',
+                             message="No completed predictions yet. Wait for draw results!",
+                             insights={})
+    
+    insights = {}
+    
+    # 1. Method Performance Analysis
+    method_performance = {}
+    for _, row in completed.iterrows():
+        methods = str(row.get('predictor_methods', '')).split(';')
+        hit = 'HIT' in str(row['hit_status'])
+        for method in methods:
+            method = method.strip().split(',')[0].strip()
+            if method not in method_performance:
+                method_performance[method] = {'hits': 0, 'total': 0}
+            method_performance[method]['total'] += 1
+            if hit:
+                method_performance[method]['hits'] += 1
+    
+    for method in method_performance:
+        total = method_performance[method]['total']
+        hits = method_performance[method]['hits']
+        method_performance[method]['accuracy'] = round((hits / total * 100), 1) if total > 0 else 0
+    
+    insights['method_performance'] = method_performance
+    
+    # 2. Provider-Specific Accuracy
+    provider_accuracy = {}
+    for _, row in completed.iterrows():
+        provider = str(row['provider']).lower()
+        hit = 'HIT' in str(row['hit_status'])
+        if provider not in provider_accuracy:
+            provider_accuracy[provider] = {'hits': 0, 'total': 0}
+        provider_accuracy[provider]['total'] += 1
+        if hit:
+            provider_accuracy[provider]['hits'] += 1
+    
+    for provider in provider_accuracy:
+        total = provider_accuracy[provider]['total']
+        hits = provider_accuracy[provider]['hits']
+        provider_accuracy[provider]['accuracy'] = round((hits / total * 100), 1) if total > 0 else 0
+    
+    insights['provider_accuracy'] = provider_accuracy
+    
+    # 3. Best Performing Method
+    if method_performance:
+        best_method = max(method_performance.items(), key=lambda x: x[1]['accuracy'])
+        insights['best_method'] = best_method[0]
+        insights['best_accuracy'] = best_method[1]['accuracy']
+    
+    # 4. Recommendations
+    recommendations = []
+    if insights.get('best_accuracy', 0) >= 50:
+        recommendations.append(f"✅ Focus on {insights['best_method']} - it has {insights['best_accuracy']}% accuracy")
+    else:
+        recommendations.append("⚠️ All methods below 50% accuracy. Need more data or strategy adjustment.")
+    
+    if provider_accuracy:
+        best_provider = max(provider_accuracy.items(), key=lambda x: x[1]['accuracy'])
+        if best_provider[1]['accuracy'] >= 40:
+            recommendations.append(f"🎯 {best_provider[0].upper()} shows best results ({best_provider[1]['accuracy']}%)")
+    
+    insights['recommendations'] = recommendations
+    
+    # 5. Overall Stats
+    insights['total_predictions'] = len(completed)
+    insights['total_hits'] = len(completed[completed['hit_status'].str.contains('HIT', na=False)])
+    insights['overall_accuracy'] = round((insights['total_hits'] / insights['total_predictions'] * 100), 1) if insights['total_predictions'] > 0 else 0
+    insights['total_analyzed'] = len(completed)
+    
+    # 6. Digit Frequency Analysis
+    pred_digits = Counter()
+    actual_digits = Counter()
+    
+    for _, row in completed.iterrows():
+        # Count predicted digits
+        try:
+            predicted = ast.literal_eval(row['predicted_numbers']) if isinstance(row['predicted_numbers'], str) else []
+            for num in predicted:
+                for digit in str(num):
+                    pred_digits[digit] += 1
+        except:
+            pass
+        
+        # Count actual digits
+        for col in ['actual_1st', 'actual_2nd', 'actual_3rd']:
+            num = str(row.get(col, ''))
+            if num and num != 'nan':
+                for digit in num:
+                    actual_digits[digit] += 1
+    
+    digit_comparison = []
+    for digit in '0123456789':
+        pred_freq = pred_digits.get(digit, 0)
+        actual_freq = actual_digits.get(digit, 0)
+        
+        # Determine bias
+        bias = 'balanced'
+        if actual_freq > 0:
+            ratio = pred_freq / actual_freq
+            if ratio > 1.2:
+                bias = 'over'
+            elif ratio < 0.8:
+                bias = 'under'
+        
+        digit_comparison.append({
+            'digit': digit,
+            'pred_freq': pred_freq,
+            'actual_freq': actual_freq,
+            'bias': bias
+        })
+    
+    insights['digit_comparison'] = digit_comparison
+    
+    return render_template('learning_insights.html',
+                         message="",
+                         insights=insights)
+
+@bp.route('/accuracy_tracker')
+def accuracy_tracker():
+    return render_template('accuracy_dashboard.html', stats={'total_predictions': 0}, method_stats={}, recent_predictions=[], insights=[], message="Accuracy tracking active")
+
+@bp.route('/save-smart-prediction', methods=['POST'])
+def save_smart_prediction():
+    """Save prediction with adaptive learning"""
+    from flask import jsonify
+    
+    data = request.get_json()
+    get_prediction_ledger().append(TRACKING, tracking_entry(
+        data.get('draw_date'), data.get('provider'), data.get('numbers'), data.get('methods'),
+        data.get('confidence'), 'smart'))
+    
+    return jsonify({'status': 'success'})
+
+# Enhanced Accuracy Dashboard functions
+def advanced_accuracy_metrics(pred_df):
+    """Calculate advanced accuracy metrics"""
+    metrics = {}
+    
+    if len(pred_df) == 0:
+        return metrics
+    
+    # Precision and Recall
+    hits = len(pred_df[pred_df['hit_status'].str.contains('HIT', na=False)])
+    total = len(pred_df)
+    
+    metrics['precision'] = hits / total if total > 0 else 0
+    metrics['recall'] = hits / total if total > 0 else 0
+    metrics['f1_score'] = 2 * (metrics['precision'] * metrics['recall']) / (metrics['precision'] + metrics['recall']) if (metrics['precision'] + metrics['recall']) > 0 else 0
+    
+    # Confidence correlation
+    if 'confidence' in pred_df.columns:
+        high_conf = pred_df[pred_df['confidence'] > 70]
+        if len(high_conf) > 0:
+            high_conf_hits = len(high_conf[high_conf['hit_status'].str.contains('HIT', na=False)])
+            metrics['high_confidence_accuracy'] = high_conf_hits / len(high_conf)
+        else:
+            metrics['high_confidence_accuracy'] = 0
+    
+    return metrics
+
+def predictive_accuracy_modeling(pred_df):
+    """Model future accuracy based on trends"""
+    if len(pred_df) < 10:
+        return {'trend': 'insufficient_data', 'projected_accuracy': 0}
+    
+    # Simple trend analysis
+    recent_10 = pred_df.tail(10)
+    hits = len(recent_10[recent_10['hit_status'].str.contains('HIT', na=False)])
+    recent_accuracy = hits / 10
+    
+    previous_10 = pred_df.tail(20).head(10) if len(pred_df) >= 20 else pred_df.head(10)
+    prev_hits = len(previous_10[previous_10['hit_status'].str.contains('HIT', na=False)])
+    prev_accuracy = prev_hits / len(previous_10) if len(previous_10) > 0 else 0
+    
+    if recent_accuracy > prev_accuracy:
+        trend = 'improving'
+        projected = min(1.0, recent_accuracy + 0.1)
+    elif recent_accuracy < prev_accuracy:
+        trend = 'declining'
+        projected = max(0.0, recent_accuracy - 0.1)
+    else:
+        trend = 'stable'
+        projected = recent_accuracy
+    
+    return {'trend': trend, 'projected_accuracy': round(projected * 100, 1)}
+
+# Enhanced Learning Insights functions
+def behavioral_pattern_analysis(pred_df, df):
+    """Analyze behavioral patterns in predictions vs results"""
+    patterns = {}
+    
+    if len(pred_df) == 0:
+        return patterns
+    
+    # Time-based patterns
+    pred_df['prediction_hour'] = pd.to_datetime(pred_df['prediction_date']).dt.hour
+    hourly_success = pred_df.groupby('prediction_hour')['hit_status'].apply(lambda x: x.str.contains('HIT', na=False).sum())
+    
+    patterns['best_prediction_hours'] = hourly_success.nlargest(3).to_dict()
+    
+    # Provider-specific learning
+    if 'provider' in pred_df.columns:
+        provider_success = pred_df.groupby('provider')['hit_status'].apply(lambda x: x.str.contains('HIT', na=False).sum())
+        patterns['provider_learning'] = provider_success.to_dict()
+    
+    return patterns
+
+def meta_learning_insights(pred_df):
+    """Generate meta-learning insights"""
+    insights = []
+    
+    if len(pred_df) < 5:
+        insights.append("Need more prediction data for meta-learning analysis")
+        return insights
+    
+    # Confidence calibration
+    high_conf = pred_df[pred_df.get('confidence', 0) > 80]
+    if len(high_conf) > 0:
+        high_conf_accuracy = len(high_conf[high_conf['hit_status'].str.contains('HIT', na=False)]) / len(high_conf)
+        if high_conf_accuracy > 0.7:
+            insights.append("✅ High confidence predictions are well-calibrated")
+        else:
+            insights.append("⚠️ High confidence predictions may be overconfident")
+    
+    # Method consistency
+    if 'predictor_methods' in pred_df.columns:
+        method_counts = pred_df['predictor_methods'].value_counts()
+        if len(method_counts) > 1:
+            insights.append(f"📊 Using {len(method_counts)} different prediction methods")
+    
+    return insights
+
+# Enhanced AI Dashboard functions
+def real_time_performance_metrics(df):
+    """Calculate real-time performance metrics"""
+    metrics = {}
+    
+    if len(df) == 0:
+        return metrics
+    
+    # Recent activity metrics
+    recent_24h = df[df['date_parsed'] >= (df['date_parsed'].max() - pd.Timedelta(hours=24))]
+    metrics['draws_24h'] = len(recent_24h)
+    
+    # Number diversity
+    all_nums = []
+    for col in ['1st_real', '2nd_real', '3rd_real']:
+        all_nums.extend([n for n in df[col].tail(100).astype(str) if n.isdigit() and len(n) == 4])
+    
+    metrics['diversity_score'] = len(set(all_nums)) / len(all_nums) if all_nums else 0
+    metrics['entropy'] = -sum((all_nums.count(n)/len(all_nums)) * np.log2(all_nums.count(n)/len(all_nums)) for n in set(all_nums)) if all_nums else 0
+    
+    return metrics
+
+def predictive_model_ensemble(df):
+    """Create ensemble of predictive models"""
+    ensemble = {}
+    
+    # Model 1: Frequency-based
+    all_nums = []
+    for col in ['1st_real', '2nd_real', '3rd_real']:
+        all_nums.extend([n for n in df[col].tail(200).astype(str) if n.isdigit() and len(n) == 4])
+    
+    freq_model = Counter(all_nums).most_common(5)
+    ensemble['frequency'] = [{'number': num, 'score': count/len(all_nums)} for num, count in freq_model]
+    
+    # Model 2: Trend-based
+    if len(df) >= 10:
+        recent_trend = df.tail(10)
+        trend_nums = []
+        for col in ['1st_real', '2nd_real', '3rd_real']:
+            trend_nums.extend([n for n in recent_trend[col].astype(str) if n.isdigit() and len(n) == 4])
+        
+        trend_model = Counter(trend_nums).most_common(5)
+        ensemble['trend'] = [{'number': num, 'score': count/len(trend_nums)} for num, count in trend_model]
+    
+    return ensemble
+
+@bp.route('/adaptive-learning')
+def adaptive_learning():
+    """Show the adaptive learning system in action"""
+    try:
+        df = load_csv_data()
+        
+        try:
+            from utils.adaptive_learner import AdaptiveLearner
+            learner = AdaptiveLearner()
+            has_learner = True
+        except ImportError:
+            has_learner = False
+        
+        provider = request.args.get('provider', 'all')
+        if provider != 'all':
+            df = df[df['provider_key'] == provider]
+        
+        adv = advanced_predictor(df, provider, 200)[:10]
+        smart = smart_auto_weight_predictor(df, provider, 300)[:10]
+        ml = ml_predictor(df, 500)[:10]
+        
+        if has_learner:
+            adaptive_preds = learner.get_adaptive_predictions(adv, smart, ml)
+            insights = learner.get_learning_insights()
+            recommendations = learner.get_recommendations()
+            weights = learner.learning_data['method_weights']
+        else:
+            # Fallback
+            adaptive_preds = adv[:5]
+            insights = []
+            recommendations = ['Install libraries: pip install watchdog scikit-learn']
+            weights = {'advanced': 0.25, 'smart': 0.25, 'ml': 0.25, 'pattern': 0.25}
+        
+        return render_template('adaptive_learning.html',
+                             adaptive_predictions=adaptive_preds,
+                             insights=insights,
+                             recommendations=recommendations,
+                             weights=weights)
+    except Exception as e:
+        logger.error(f"Adaptive learning error: {e}")
+        return f"Error: {str(e)}", 500
+
+@bp.route('/learning-dashboard')
+def learning_dashboard():
+    """AI Learning Dashboard with feedback analysis"""
+    from utils.feedback_learner import FeedbackLearner
+    import json
+    
+    learner = FeedbackLearner()
+    learner.load_learning_data()
+    
+    # Load prediction tracking
+    completed = get_prediction_ledger().frame(TRACKING, TRACKING_COLUMNS, exclude_status='pending')
+    
+    # Calculate stats
+    stats = {
+        'total_predictions': len(completed),
+        'exact_matches': len(completed[completed['hit_status'] == 'EXACT']),
+        'three_digit_matches': len(completed[completed['hit_status'] == '3-DIGIT']),
+        'overall_accuracy': 0
+    }
+    
+    if len(completed) > 0:
+        weighted_score = (
+            stats['exact_matches'] * 100 +
+            stats['three_digit_matches'] * 75
+        )
+        stats['overall_accuracy'] = weighted_score / len(completed)
+    
+    # Get method performance
+    methods = learner.get_best_methods(top_n=10)
+    
+    # Recent predictions
+    recent_predictions = completed.tail(10).to_dict('records') if not completed.empty else []
+    
+    return render_template('learning_dashboard.html',
+                         stats=stats,
+                         methods=methods,
+                         recent_predictions=recent_predictions)
+
+@bp.route('/evaluate_now')
+def evaluate_now():
+    """Trigger evaluation of pending predictions"""
+    try:
+        import subprocess
+        subprocess.Popen(['python', 'auto_evaluate.py'])
+        return redirect('/learning-dashboard')
+    except Exception as e:
+        return f"Error: {str(e)}", 500
+
+def auto_evaluate_predictions(pred_df, df):
+    """Auto-evaluate pending predictions against actual results (updates pred_df and the ledger)"""
+    evaluated = evaluate_predictions(pred_df[pred_df['hit_status'] == 'pending'], df)
+    if evaluated.empty:
+        return 0
+    for col in evaluated.columns:
+        values = pred_df[col].astype(object) if col in pred_df.columns else pd.Series(None, index=pred_df.index, dtype=object)
+        values.loc[evaluated.index] = evaluated[col].astype(object)
+        pred_df[col] = values.infer_objects()
+    get_prediction_ledger().update_many(TRACKING, evaluated.to_dict('index'))
+    return len(evaluated)
+
+def generate_ai_insights(completed_df):
+    """Generate AI-powered insights from prediction data"""
+    if len(completed_df) < 5:
+        return ["Need more data for AI analysis"]
+    
+    insights = []
+    
+    # Pattern recognition
+    hit_patterns = completed_df[completed_df['hit_status'].str.contains('HIT', na=False)]
+    if len(hit_patterns) > 0:
+        # Time-based patterns
+        hit_patterns['hour'] = pd.to_datetime(hit_patterns['prediction_date']).dt.hour
+        best_hours = hit_patterns['hour'].value_counts().head(2)
+        if len(best_hours) > 0:
+            insights.append(f"🕐 Best prediction times: {', '.join([f'{h}:00' for h in best_hours.index])}")
+        
+        # Method effectiveness
+        if 'predictor_methods' in hit_patterns.columns:
+            methods = hit_patterns['predictor_methods'].str.split(',').explode().value_counts().head(3)
+            if len(methods) > 0:
+                insights.append(f"🎯 Most effective methods: {', '.join(methods.index[:2])}")
+    
+    # Confidence correlation
+    if 'confidence' in completed_df.columns:
+        high_conf = completed_df[completed_df['confidence'] > 70]
+        if len(high_conf) > 0:
+            high_conf_accuracy = len(high_conf[high_conf['hit_status'].str.contains('HIT', na=False)]) / len(high_conf)
+            insights.append(f"📊 High confidence accuracy: {high_conf_accuracy:.1%}")
+    
+    return insights
+
+def analyze_prediction_trends(completed_df):
+    """Analyze trends in prediction accuracy over time"""
+    if len(completed_df) < 10:
+        return {'trend': 'insufficient_data', 'recent_performance': 0}
+    
+    completed_df['date'] = pd.to_datetime(completed_df['prediction_date']).dt.date
+    daily_accuracy = completed_df.groupby('date').apply(
+        lambda x: len(x[x['hit_status'].str.contains('HIT', na=False)]) / len(x)
+    ).rolling(window=7).mean()
+    
+    if len(daily_accuracy) >= 2:
+        trend = 'improving' if daily_accuracy.iloc[-1] > daily_accuracy.iloc[-2] else 'declining'
+        recent_perf = daily_accuracy.iloc[-1] if not pd.isna(daily_accuracy.iloc[-1]) else 0
+    else:
+        trend = 'stable'
+        recent_perf = 0
+    
+    return {'trend': trend, 'recent_performance': round(recent_perf * 100, 1)}
+
+def analyze_confidence_calibration(completed_df):
+    """Analyze how well confidence scores match actual results"""
+    if 'confidence' not in completed_df.columns or len(completed_df) < 5:
+        return {'calibrated': False, 'overconfident': 0, 'underconfident': 0}
+    
+    bins = [0, 50, 70, 85, 100]
+    labels = ['Low', 'Medium', 'High', 'Very High']
+    completed_df['conf_bin'] = pd.cut(completed_df['confidence'], bins=bins, labels=labels)
+    
+    calibration = {}
+    for bin_name in labels:
+        bin_data = completed_df[completed_df['conf_bin'] == bin_name]
+        if len(bin_data) > 0:
+            actual_accuracy = len(bin_data[bin_data['hit_status'].str.contains('HIT', na=False)]) / len(bin_data)
+            calibration[bin_name] = round(actual_accuracy * 100, 1)
+    
+    return {'calibrated': True, 'by_confidence': calibration}
+
+def get_auto_learning_stats(completed_df):
+    """Get auto-learning system statistics"""
+    if len(completed_df) == 0:
+        return {'enabled': False, 'total_learned': 0, 'accuracy_improvement': 0}
+    
+    # Calculate improvement over time
+    if len(completed_df) >= 20:
+        first_half = completed_df.head(len(completed_df)//2)
+        second_half = completed_df.tail(len(completed_df)//2)
+        
+        first_accuracy = len(first_half[first_half['hit_status'].str.contains('HIT', na=False)]) / len(first_half)
+        second_accuracy = len(second_half[second_half['hit_status'].str.contains('HIT', na=False)]) / len(second_half)
+        
+        improvement = (second_accuracy - first_accuracy) * 100
+    else:
+        improvement = 0
+    
+    return {
+        'enabled': True,
+        'total_learned': len(completed_df),
+        'accuracy_improvement': round(improvement, 1)
+    }
+
+def create_demo_predictions(df):
+    """Create demo predictions from historical data"""
+    
+    # Get last 20 draws for demo
+    demo_data = []
+    recent_draws = df.tail(20)
+    
+    for i in range(len(recent_draws) - 1):
+        current_row = recent_draws.iloc[i]
+        next_row = recent_draws.iloc[i + 1]
+        
+        # Simulate predictions using current algorithms
+        adv_preds = advanced_predictor(df.head(len(df) - 20 + i), lookback=100)
+        predicted_numbers = [num for num, _, _ in adv_preds[:5]]
+        
+        # Check hits against next draw
+        actual_numbers = [str(next_row['number_1st']), str(next_row['number_2nd']), str(next_row['number_3rd'])]
+        hits = [p for p in predicted_numbers if p in actual_numbers]
+        
+        demo_entry = {
+            "prediction_date": (current_row['date_parsed'] + pd.Timedelta(hours=12)).strftime("%Y-%m-%d %H:%M:%S"),
+            "draw_date": next_row['date_parsed'].strftime("%Y-%m-%d"),
+            "provider": next_row['provider'],
+            "predicted_numbers": str(predicted_numbers),
+            "predictor_methods": "advanced,smart,ml",
+            "confidence": min(85, 60 + len(hits) * 10),
+            "actual_1st": str(next_row['number_1st']),
+            "actual_2nd": str(next_row['number_2nd']),
+            "actual_3rd": str(next_row['number_3rd']),
+            "hit_status": f"HIT ({len(hits)} matches)" if hits else "MISS",
+            "accuracy_score": len(hits) * 20 if hits else 0
+        }
+        demo_data.append(demo_entry)
+    
+    # Save demo data
+    return get_prediction_ledger().append_many(TRACKING, demo_data)
@@ -0,0 +1,100 @@
+"""
+Past Results Routes
+Draw results by date
+"""
+import logging
+
+import pandas as pd
+from flask import render_template, request
+
+from blueprints import FeatureFamily
+from blueprints.shared import load_csv_data
+
+logger = logging.getLogger(__name__)
+
+bp = FeatureFamily('past_results', __name__)
+
+@bp.route('/past-results')
+def past_results():
+    """Display past results - 4D lottery data with special and consolation prizes"""
+    df = load_csv_data()
+    selected_date = request.args.get('date', '').strip()
+    selected_day = request.args.get('day', '').strip()
+    selected_month = request.args.get('month', '').strip()
+
+    if selected_date:
+        try:
+            date_obj = pd.to_datetime(selected_date).date()
+            filtered = df[df['date_parsed'].dt.date == date_obj]
+            if filtered.empty:
+                filtered = df.tail(100)
+        except Exception as e:
+            logger.error(f"Date parsing error: {e}")
+            filtered = df.tail(100)
+    elif selected_day:
+        day_map = {'Monday': 0, 'Tuesday': 1, 'Wednesday': 2, 'Thursday': 3, 'Friday': 4, 'Saturday': 5, 'Sunday': 6}
+        day_num = day_map.get(selected_day, -1)
+        if day_num >= 0:
+            filtered = df[df['date_parsed'].dt.dayofweek == day_num].tail(100)
+        else:
+            filtered = df.tail(100)
+    elif selected_month:
+        try:
+            month_num = int(selected_month)
+            filtered = df[df['date_parsed'].dt.month == month_num].tail(100)
+        except:
+            filtered = df.tail(100)
+    else:
+        filtered = df.tail(100)
+
+    # Extract results with special and consolation
+    results = []
+    seen = set()
+    
+    for idx, row in filtered.iterrows():
+        if pd.notna(row.get('date_parsed')):
+            provider = str(row.get('provider_key', 'UNKNOWN')).upper()
+            
+            if not provider or provider == 'UNKNOWN' or len(provider) < 2:
+                continue
+            
+            # Extract numbers
+            first = str(row.get('number_1st', '')).strip()
+            second = str(row.get('number_2nd', '')).strip()
+            third = str(row.get('number_3rd', '')).strip()
+            
+            # Skip if no main prizes
+            if not (first or second or third):
+                continue
+            
+            # Extract special and consolation - handle both string and empty cases
+            special_str = str(row.get('special', '')).strip()
+            consolation_str = str(row.get('consolation', '')).strip()
+            
+            # Split and filter valid 4D numbers
+            special_list = [n for n in special_str.split() if n and n != 'nan' and len(n) == 4 and n.isdigit()]
+            consolation_list = [n for n in consolation_str.split() if n and n != 'nan' and len(n) == 4 and n.isdigit()]
+            
+            # Create unique key
+            date_str = row['date_parsed'].strftime('%d-%m-%Y')
+            unique_key = f"{date_str}_{provider}_{first}_{second}_{third}"
+            
+            if unique_key in seen:
+                continue
+            seen.add(unique_key)
+            
+            results.append({
+                'date': date_str,
+                'provider': provider,
+                'first': first if first and first != 'nan' else '-',
+                'second': second if second and second != 'nan' else '-',
+                'third': third if third and third != 'nan' else '-',
+                'special': special_list[:10],
+                'consolation': consolation_list[:10],
+                'total_numbers': row.get('total_4d_found', 0)
+            })
+    
+    results.sort(key=lambda x: x['date'], reverse=True)
+    logger.info(f"Displaying {len(results)} 4D results")
+
+    return render_template('past_results.html', results=results, date=selected_date)
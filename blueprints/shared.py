@@ -0,0 +1,435 @@
+"""
+Shared Route Helpers
+Dataset loading, the dashboard predictors with their precompute/ensemble wiring, HTTP validators and the tracking ledger
+"""
+import hashlib
+import logging
+from collections import Counter
+from datetime import datetime, timezone
+
+import numpy as np
+from flask import Response, request
+
+from utils.dataset_manager import get_dataset_manager, dataset_version, frame_origin
+from utils.stats_store import get_stats_store, weighted_linear_fit, NUMBER_DIGITS
+from utils.precompute import get_precompute_scheduler
+from utils.ensemble import get_ensemble_executor
+from utils.model_registry import get_model_registry, frame_provider
+from utils.number_scoring import number_codes, hot_digit_scores, pair_scores, transition_scores, top_k
+from utils.metrics import timed
+
+logger = logging.getLogger(__name__)
+
+try:
+    from utils.pattern_finder import find_all_4digit_patterns
+    from utils.pattern_stats import compute_pattern_frequencies, compute_cell_heatmap
+    from utils.ai_predictor import predict_top_5
+    from utils.app_grid import generate_reverse_grid, generate_4x4_grid
+    from utils.pattern_memory import learn_pattern_transitions
+    from utils.pattern_predictor import predict_from_today_grid
+except ImportError as e:
+    logger.error(f"Import error: {e}")
+    # Fallback implementations
+    def find_all_4digit_patterns(grid): return []
+    def compute_pattern_frequencies(draws): return []
+    def compute_cell_heatmap(draws): return {}
+    def predict_top_5(draws, mode="combined"): return {"combined": []}
+    def generate_reverse_grid(number): return [[0]*4 for _ in range(4)]
+    def generate_4x4_grid(number): return [[int(d) for d in number] for _ in range(4)]
+    def learn_pattern_transitions(draws): return {}
+    def predict_from_today_grid(number, transitions): return []
+
+# ---------------- CSV LOADER ---------------- #
+@timed('load_csv_data', phase='load')
+def load_csv_data():
+    """
+    Load CSV with canonical normalization applied once.
+    All downstream code uses normalized columns.
+    The normalized frame is held by the process-wide DatasetManager and is
+    only re-parsed when the CSV changes; each caller gets its own copy.
+    """
+    df = get_dataset_manager().get_frame()
+    if not df.empty:
+        logger.debug(f"Sample:\n{df[['date_parsed', 'provider_key', 'number_1st', 'number_2nd', 'number_3rd']].head(3)}")
+    return df
+
+def normalize_prediction_dict(result_dict):
+    if not isinstance(result_dict, dict):
+        return []
+    preferred_order = ["classifier", "combined", "grid", "reverse", "missing", "reverse_missing", "fallback"]
+    chosen = None
+    for k in preferred_order:
+        if k in result_dict and isinstance(result_dict[k], list) and result_dict[k]:
+            chosen = result_dict[k]
+            break
+    if chosen is None:
+        for v in result_dict.values():
+            if isinstance(v, list) and v:
+                chosen = v
+                break
+    if not chosen:
+        return []
+    out = []
+    for item in chosen:
+        if isinstance(item, (list, tuple)):
+            if len(item) >= 3:
+                num, score, reason = item[0], item[1], item[2]
+            elif len(item) == 2:
+                num, score = item
+                reason = "no-reason"
+            else:
+                num = item[0]
+                score = 0
+                reason = "raw"
+        else:
+            num = str(item)
+            score = 0
+            reason = "raw"
+        try:
+            score = float(score)
+        except Exception:
+            score = 0.0
+        out.append((str(num), score, str(reason)))
+    return out[:5]
+
+# ---------------- ADVANCED PREDICTOR ---------------- #
+def compute_provider_bias(df, provider):
+    if not provider or provider == "all":
+        return 1.0
+    stats = get_stats_store().stats_for(df, provider)
+    if len(stats) < 2:
+        return 1.0
+    return 1.0 + (stats.repeat_rate() * 0.5)
+
+@timed('predictor.advanced')
+def advanced_predictor(df, provider=None, lookback=200):
+    # Newest numbers first (1st prizes, then 2nd, then 3rd) from the stats store
+    recent_numbers = get_stats_store().stats_for(df).recent_numbers(lookback)
+    codes = number_codes(recent_numbers)
+    if not len(codes): return []
+
+    # Every 0000-9999 number scored at once
+    hot = hot_digit_scores(codes)
+    pair = pair_scores(codes)
+    trans = transition_scores(codes) * 0.5
+    scores = hot + pair + trans
+    provider_multiplier = 1.0
+    if provider and provider != "all":
+        provider_multiplier = compute_provider_bias(df, provider)
+        scores *= provider_multiplier
+
+    top = top_k(scores, 5)
+    top_score = scores[top[0]]
+    normalized = []
+    for code in top:
+        reasons = [f"hot={hot[code]:.2f}"]
+        if pair[code]:
+            reasons.append(f"pair+{pair[code]:.2f}")
+        if trans[code]:
+            reasons.append(f"trans+{trans[code]:.2f}")
+        if provider and provider != "all":
+            reasons.append(f"prov*{provider_multiplier:.2f}")
+        norm = (scores[code] / top_score) if top_score else 0.0
+        normalized.append((f"{code:04d}", float(norm), "+".join(reasons)))
+    return normalized
+
+# --- Trained models live in the model registry (hot LRU + joblib artifacts, keyed on dataset version) ---
+
+
+# ------------------------------------------------------------
+# 1️⃣ AUTO WEIGHT TUNING - finds best balance between hot, pair, transitions
+# ------------------------------------------------------------
+@timed('predictor.smart')
+def smart_auto_weight_predictor(df, provider=None, lookback=300):
+    """
+    Automatically tunes weight between 'hot digits', 'pairs', and 'transitions'
+    based on correlation to next-draw winners.
+    Easy & light but smarter than static scoring.
+    """
+    # Use cached weights if the underlying draws haven't changed
+    store = get_stats_store()
+    stats = store.stats_for(df)
+    registry = get_model_registry()
+    model_version = store.cache_key(stats)
+    cached_model = registry.get('smart_auto_weight', stats.scope, lookback, model_version)
+    if cached_model is not None:
+        w_hot, w_pair, w_trans, digit_counts, pair_counts, transitions, all_numbers = cached_model
+    else:
+        # Newest numbers first (1st prizes, then 2nd, then 3rd)
+        training_numbers = stats.recent_numbers(lookback)
+        if not training_numbers: return []
+        all_numbers = stats.recent_numbers(150)
+        digit_counts = Counter(stats.digits)
+        pair_counts = Counter([n[i:i+2] for n in training_numbers for i in range(3)])
+        # learn_pattern_transitions keys on grid digits, so a 4D number never
+        # matched and the transition feature was always 0; it is kept as such
+        transitions = {}
+
+        # Each neighbour pair of the sequence is one sample: features of the
+        # newer number, target = how many digits repeated next draw. Samples
+        # are grouped per number so fitting never walks the history.
+        counts, repeated = stats.successor_moments()
+        if counts.sum() < 5:
+            w_hot, w_pair, w_trans = 0.4, 0.3, 0.3 # Fallback weights
+        else:
+            digit_vec = np.array([digit_counts.get(str(d), 0) for d in range(10)], dtype=np.int64)
+            pair_vec = np.array([pair_counts.get(f"{p:02d}", 0) for p in range(100)], dtype=np.int64)
+            hot_scores = digit_vec[NUMBER_DIGITS].sum(axis=1)
+            pair_scores = pair_vec[NUMBER_DIGITS[:, :3] * 10 + NUMBER_DIGITS[:, 1:]].sum(axis=1)
+            features = np.column_stack([hot_scores, pair_scores, np.zeros_like(hot_scores)])
+
+            # learn ideal weights automatically (same fit as StandardScaler + LinearRegression)
+            w_hot, w_pair, w_trans = weighted_linear_fit(features, counts, repeated)
+
+        # Register the learned weights and scoring tables (saved only for maintained scopes)
+        registry.put('smart_auto_weight', (w_hot, w_pair, w_trans, digit_counts, pair_counts, transitions, all_numbers),
+                     stats.scope, lookback, model_version, persist=stats.key is None)
+
+
+    # Predict next based on learned weights
+    candidate_pool = set(all_numbers) if all_numbers else set()
+    if not candidate_pool:
+        return []
+    
+    scored = []
+    for num in candidate_pool:
+        hot_score = sum(digit_counts.get(d, 0) for d in num)
+        pair_score = sum(pair_counts.get(num[j:j+2], 0) for j in range(3))
+        trans_score = float(transitions.get(num, 0)) if transitions.get(num, 0) else 0
+        total = (
+            w_hot * hot_score
+            + w_pair * pair_score
+            + w_trans * trans_score
+        )
+        scored.append((num, total, f"auto-w({w_hot:.2f},{w_pair:.2f},{w_trans:.2f})"))
+
+    if not scored:
+        return []
+    
+    scored.sort(key=lambda x: x[1], reverse=True)
+    top_5 = [(num, round(score, 3), reason) for num, score, reason in scored[:5]]
+    return top_5
+
+
+# ------------------------------------------------------------
+# 2️⃣ MACHINE LEARNING ADD-ON - learns direct number patterns
+# ------------------------------------------------------------
+@timed('predictor.ml')
+def ml_predictor(df, lookback=500):
+    """
+    Learns from all past draws using Linear Regression.
+    Converts each 4D number into digit features and trains model to predict next draw.
+    High accuracy potential.
+    """
+    prize_cols = ["number_1st", "number_2nd", "number_3rd"]
+    # Use cached model if available and data hasn't changed significantly
+    registry = get_model_registry()
+    model_version = (dataset_version(), df.shape, str(df['date_parsed'].max()))
+    cached_model = registry.get('ml_predictor', frame_provider(df), lookback, model_version)
+    if cached_model is not None:
+        model, scaler, numbers = cached_model
+    else:
+        numbers = []
+        for col in prize_cols:
+            if col in df.columns:
+                numbers += [n for n in df[col].dropna() if n and len(n) == 4]
+        if len(numbers) < 20:
+            return []
+
+        # Build training data from newest numbers
+        X, y = [], []
+        for i in range(len(numbers) - 1):
+            curr = [int(d) for d in numbers[i]]
+            next_num = [int(d) for d in numbers[i + 1]]
+            X.append(curr)
+            y.append(sum(next_num) / 4)  # simple numeric target (avg of next draw digits)
+
+        from sklearn.linear_model import LinearRegression
+        from sklearn.preprocessing import StandardScaler
+
+        scaler = StandardScaler()
+        X_scaled = scaler.fit_transform(X)
+        model = LinearRegression()
+        model.fit(X_scaled, y)
+        # Register the trained model and scaler (saved only for the dataset's own frames)
+        registry.put('ml_predictor', (model, scaler, numbers), frame_provider(df), lookback, model_version,
+                     metadata={'samples': len(y)}, persist=frame_origin(df) is not None)
+
+    # Predict next best numbers by scoring possible combos
+    recent = numbers[:10]
+    if not recent:
+        return [] # Not enough data to generate candidates
+
+    candidate_pool = set()
+    for n in recent:
+        for d in range(10):
+            for pos in range(4):
+                new_num = list(n)
+                new_num[pos] = str(d)
+                candidate_pool.add("".join(new_num))
+
+    # One transform + predict over every candidate
+    candidates = list(candidate_pool)
+    x_scaled = scaler.transform(NUMBER_DIGITS[[int(num) for num in candidates]])
+    pred_scores = model.predict(x_scaled)
+    scored = [(num, float(pred_score), "ML-learned") for num, pred_score in zip(candidates, pred_scores)]
+
+    scored.sort(key=lambda x: x[1], reverse=True)
+    top_5 = [(num, round(score, 3), reason) for num, score, reason in scored[:5]]
+    return top_5
+
+
+# ---------------- PRECOMPUTED DASHBOARD PREDICTIONS ---------------- #
+# Registered predictors must be module-level functions: cold calls run in the ensemble pool
+def _ml_precompute(df, provider, lookback):
+    return ml_predictor(df, lookback)
+
+
+@timed('predictor.pattern')
+def pattern_predictor(df, provider=None, lookback=None):
+    """Grid-pattern predictions from the 1st prize of the frame's last row"""
+    if df.empty:
+        return []
+    last_draw = df.iloc[-1]
+    last_draw_number = str(last_draw['1st_real'])
+    if len(last_draw_number) != 4 or not last_draw_number.isdigit():
+        return []
+    grid = generate_4x4_grid(last_draw_number)
+    raw = predict_top_5([{'date': str(last_draw['date_parsed'].date()), 'grid': grid}], mode="combined")
+    return normalize_prediction_dict(raw)[:5]
+
+
+precompute = get_precompute_scheduler()
+precompute.register('advanced', advanced_predictor)
+precompute.register('smart', smart_auto_weight_predictor)
+precompute.register('ml', _ml_precompute, uses_provider=False)
+precompute.register('pattern', pattern_predictor, uses_provider=False)
+
+DASHBOARD_LOOKBACKS = (200, 300, 500)
+ULTIMATE_LOOKBACKS = (100, 100, 100)
+
+# Cold predictor calls of one page run in parallel; a call past its timeout
+# (seconds) leaves its column empty and is finished by the precompute worker
+ensemble = get_ensemble_executor()
+ENSEMBLE_TIMEOUTS = {'advanced': 10, 'smart': 20, 'ml': 30, 'pattern': 10, 'markov': 20, 'power': 60}
+
+
+def _dashboard_prediction_keys(df):
+    """Provider x predictor results the dashboard routes ask for by default"""
+    scopes = ['all'] + sorted(p for p in df['provider_key'].dropna().unique() if p and str(p).strip())
+    keys = []
+    for scope in scopes:
+        for lookbacks in (DASHBOARD_LOOKBACKS, ULTIMATE_LOOKBACKS):
+            for name, lookback in zip(('advanced', 'smart', 'ml'), lookbacks):
+                keys.append(precompute.key(name, scope, '', scope, lookback))
+    # Unfiltered, no provider bias (/ai-dashboard, /consensus-predictor)
+    for name, lookback in zip(('advanced', 'smart', 'ml'), DASHBOARD_LOOKBACKS):
+        keys.append(precompute.key(name, 'all', '', None, lookback))
+    return keys
+
+
+# Families whose pages are served from the precompute cache: the ensemble
+# pool, the precompute worker and its warm keys are only needed with one of them
+PRECOMPUTE_FAMILIES = ('predictors', 'pattern', 'exports')
+
+
+def uses_precompute(families):
+    """Whether any of ``families`` (registered family names) reads the dashboard predictions"""
+    return any(name in PRECOMPUTE_FAMILIES for name in families)
+
+
+def warm_dashboard_predictions():
+    """Have the precompute worker keep the dashboard predictions current (call once)"""
+    precompute.warm(_dashboard_prediction_keys)
+
+
+def ensemble_predictions(keys):
+    """Results for several PredictionKeys: cached, else computed in parallel in the ensemble pool"""
+    return precompute.get_many(keys, ensemble, ENSEMBLE_TIMEOUTS)
+
+
+def dashboard_predictions(scope='all', month='', provider=None, lookbacks=DASHBOARD_LOOKBACKS):
+    """
+    (advanced, smart, ml) predictions over a provider/month scope, served from
+    the precompute cache. Same results as calling the predictors on the
+    filtered frame; a stale result is served while a newer draw is absorbed.
+    """
+    return tuple(ensemble_predictions([precompute.key(name, scope, month, provider, lookback)
+                                       for name, lookback in zip(('advanced', 'smart', 'ml'), lookbacks)]))
+
+
+# Predictors only the JSON API serves
+@timed('predictor.markov')
+def _markov_api_predictor(df, provider, lookback):
+    from utils.markov_predictor import markov_chain_predictor
+    return markov_chain_predictor(df, lookback)
+
+
+@timed('predictor.power')
+def _power_api_predictor(df, provider, lookback):
+    from utils.power_predictor import enhanced_predictor
+    return enhanced_predictor(df, provider, lookback)
+
+
+precompute.register('markov', _markov_api_predictor, uses_provider=False)
+precompute.register('power', _power_api_predictor)
+
+
+def dataset_validators(*parts, version=None):
+    """
+    (ETag, Last-Modified) for a response that only changes with the dataset
+    version it was built from (default: the current one). Last-Modified is
+    only known for the current version; a body of an older one gets None.
+    """
+    manager = get_dataset_manager()
+    current = manager.version
+    version = current if version is None else version
+    etag = hashlib.sha1(repr((version,) + parts).encode()).hexdigest()[:24]
+    modified = manager.modified_at if version == current else None
+    last_modified = datetime.fromtimestamp(int(modified), tz=timezone.utc) if modified else None
+    return etag, last_modified
+
+
+def with_validators(response, etag, last_modified):
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified
+    response.cache_control.no_cache = True  # clients must revalidate, which is a cheap 304
+    return response
+
+
+def not_modified(etag, last_modified):
+    """A 304 response if the client's If-None-Match / If-Modified-Since still hold, else None"""
+    if request.if_none_match:
+        fresh = request.if_none_match.contains(etag)
+    else:
+        since = request.if_modified_since
+        fresh = bool(last_modified and since and last_modified <= since)
+    return with_validators(Response(status=304), etag, last_modified) if fresh else None
+
+
+# Tracked predictions live in the prediction ledger (source 'tracking'), formerly prediction_tracking.csv
+TRACKING = 'tracking'
+TRACKING_COLUMNS = ['prediction_date', 'draw_date', 'provider', 'predicted_numbers', 'predictor_methods', 'confidence',
+                    'prediction_source', 'model_version', 'data_points_used',
+                    'actual_1st', 'actual_2nd', 'actual_3rd', 'hit_status', 'accuracy_score']
+
+
+def tracking_entry(draw_date, provider, predicted_numbers, methods, confidence, source='manual', data_points=0):
+    """Enhanced prediction entry with metadata, pending evaluation"""
+    return {
+        "prediction_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "draw_date": draw_date,
+        "provider": provider,
+        "predicted_numbers": predicted_numbers,
+        "predictor_methods": methods,
+        "confidence": confidence,
+        "prediction_source": source,
+        "model_version": "v2.0",
+        "data_points_used": data_points,
+        "actual_1st": "",
+        "actual_2nd": "",
+        "actual_3rd": "",
+        "hit_status": "pending",
+        "accuracy_score": 0
+    }
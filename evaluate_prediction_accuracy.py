@@ -1,55 +1,28 @@
 # evaluate_prediction_accuracy.py
 
-import pandas as pd
-from utils.ai_predictor import predict_top_5
-from app import generate_4x4_grid, load_csv_data
+from utils.backtest import run_backtest
 
-def evaluate_predictions():
-    df = load_csv_data()
-    df = df[df['1st_real'].str.len() == 4]
-    df = df[df['1st_real'].str.isdigit()]
-    df = df.sort_values('date_parsed').reset_index(drop=True)
+def evaluate_predictions(workers=None):
+    print("🔎 Evaluating AI predictions vs actual next-draw results...\n")
 
-    total = 0
-    hits = 0
+    # Walk-forward replay: each draw is predicted from earlier-dated draws only
+    records, summary = run_backtest(['pattern'], window=1, workers=workers, output=None)
 
-    print("🔎 Evaluating AI predictions vs actual next-day results...\n")
-
-    for i in range(len(df) - 1):
-        today = df.iloc[i]
-        tomorrow = df.iloc[i + 1]
-
-        number = today['1st_real']
-        if not number.isdigit() or len(number) != 4:
-            continue
-
-        # Format draw data for ai_predictor
-        draw_data = [{
-            "number": number,
-            "grid": generate_4x4_grid(number),
-            "date": today['date_parsed'].strftime('%Y-%m-%d')
-        }]
-        predicted = [x[0] for x in predict_top_5(draw_data)["combined"]]
-
-        actuals = [
-            str(tomorrow.get('1st_real', '')),
-            str(tomorrow.get('2nd_real', '')),
-            str(tomorrow.get('3rd_real', ''))
-        ]
-
-        hit = any(p in actuals for p in predicted)
-        result = "✅ HIT" if hit else "❌ MISS"
-        print(f"[{today['date_parsed'].date()}] Predicted: {predicted} | Actual: {actuals} => {result}")
-
-        total += 1
-        if hit:
-            hits += 1
+    for row in records.itertuples(index=False):
+        result = "✅ HIT" if row[records.columns.get_loc('hit@5')] else "❌ MISS"
+        print(f"[{row.date.date()}] {row.provider} | Predicted: {row.predicted.split()[:5]} => {result}")
 
+    overall = summary[summary['provider'] == 'all'].iloc[0] if not summary.empty else None
+    total = int(overall['draws']) if overall is not None else 0
+    hits = int(records['hit@5'].sum()) if total else 0
     accuracy = (hits / total) * 100 if total else 0
     print("\n📊 Prediction Evaluation Summary")
-    print(f"   → Total Evaluated Days: {total}")
+    print(f"   → Total Evaluated Draws: {total}")
     print(f"   → Total Hits: {hits}")
     print(f"   → Accuracy: {accuracy:.2f}%")
+    if overall is not None:
+        print(f"   → 3-Digit Hits: {overall['three_digit']:.2f}% | Box Hits: {overall['box']:.2f}%")
+        print("\n" + summary.to_string(index=False))
 
 if __name__ == "__main__":
     evaluate_predictions()
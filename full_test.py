@@ -110,13 +110,13 @@ def test_csv_parsing():
 def test_helper_functions():
     print("\nTesting helper functions...")
     try:
-        from app import (
-            calculate_enhanced_consensus,
+        from app import load_csv_data
+        from blueprints.predictors import calculate_enhanced_consensus
+        from blueprints.pattern import (
             analyze_cross_correlations, 
             advanced_pattern_mining,
             calculate_weighted_frequency,
-            analyze_provider_bias,
-            load_csv_data
+            analyze_provider_bias
         )
         
         df = load_csv_data()
@@ -1,45 +1,38 @@
 # generate_grid_training_data.py
 
+import numpy as np
 import pandas as pd
-from utils.pattern_finder import extract_extended_features
-from utils.app_grid import generate_4x4_grid
+from utils.pattern_finder import extract_extended_features_batch
+from utils.app_grid import generate_4x4_grids
 import os
 
 # Load 4D result history
 df = pd.read_csv("4d_results_history.csv", on_bad_lines='skip')
 
-# Extract '1st_real' column reliably
-def extract_1st_number(row):
-    import re
-    for col in ['1st', '2nd', '3rd']:
-        match = re.search(r'1st(?: Prize)?[^\d]{0,10}(\d{4})', str(row.get(col, '')))
-        if match:
-            return match.group(1)
-    return ''
+# Extract '1st_real' column reliably: first match in 1st, then 2nd, then 3rd
+number = pd.Series('', index=df.index, dtype=object)
+for col in ['3rd', '2nd', '1st']:
+    if col in df.columns:
+        found = df[col].map(str).str.extract(r'1st(?: Prize)?[^\d]{0,10}(\d{4})', expand=False)
+        number = found.astype(object).where(found.notna(), number)
 
-df['number'] = df.apply(extract_1st_number, axis=1)
+df['number'] = number
 df['date'] = pd.to_datetime(df.iloc[:, 0], errors='coerce')
 df = df.dropna(subset=['number', 'date'])
 df = df[df['number'].str.len() == 4]
 
-rows = []
+# Grid features of every draw but the last, one batch
+current = df.iloc[:-1]
+features, means = extract_extended_features_batch(generate_4x4_grids(current['number'].to_numpy()))
 
-for i in range(len(df) - 1):
-    current = df.iloc[i]
-    next_row = df.iloc[i + 1]
-    
-    grid = generate_4x4_grid(current['number'])
-    features = extract_extended_features(grid)
+# Hit: the draw's number appears in the next draw's 1st/2nd/3rd text
+targets = [df[col].map(str).iloc[1:].tolist() if col in df.columns else [''] * len(current)
+           for col in ['1st', '2nd', '3rd']]
+is_hit = [any(n in t for t in texts) for n, texts in zip(current['number'].tolist(), zip(*targets))]
 
-    target_numbers = [str(next_row.get(col, '')) for col in ['1st', '2nd', '3rd']]
-    is_hit = any(current['number'] in t for t in target_numbers)
-
-    rows.append({
-        'date': current['date'],
-        **{f'cell_{i}': val for i, val in enumerate(features)},
-        'hit': int(is_hit)
-    })
-
-out_df = pd.DataFrame(rows)
+out_df = pd.DataFrame(features, columns=[f'cell_{i}' for i in range(features.shape[1])])
+out_df[f'cell_{features.shape[1]}'] = means
+out_df.insert(0, 'date', current['date'].to_numpy())
+out_df['hit'] = np.array(is_hit, dtype=int)
 out_df.to_csv("grid_hit_training_data.csv", index=False)
 print(f"✅ Extracted {len(out_df)} rows to 'grid_hit_training_data.csv'")
@@ -0,0 +1,61 @@
+"""
+Production serving mode (pre-fork, POSIX only)
+
+    gunicorn -c gunicorn.conf.py app:app
+
+The master parses the results CSV once and publishes the canonical draw
+history as a memory-mapped segment (see utils/shared_dataset.py); workers
+map that segment instead of each parsing their own copy. The master keeps
+watching the CSV and publishes a new segment when a draw lands, and
+``kill -HUP <master pid>`` forces a re-read + publish before the workers
+are gracefully restarted.
+
+Environment: PORT (8000), WEB_CONCURRENCY (CPU count), GUNICORN_TIMEOUT (120),
+DATASET_SEGMENT_DIR (/dev/shm/smart-4d-segments), SEGMENT_POLL_SECONDS (5),
+ENSEMBLE_WORKERS (2 predictor processes per worker), WARMUP_PLUGINS (1: import
+the lazily loaded predictors in the background after a worker's first request),
+FEATURE_FAMILIES (all: comma-separated route families to serve, see blueprints/),
+PROFILE_SLOW_REQUESTS (off: dump sampled stacks of requests slower than this many
+seconds, see utils/sampling_profiler.py). /metrics reports the worker that serves it.
+"""
+import multiprocessing
+import os
+
+from utils.ensemble import WORKERS_ENV as ENSEMBLE_WORKERS_ENV
+from utils.shared_dataset import SEGMENT_DIR_ENV, SegmentPublisher, default_segment_dir
+from utils.startup import WARMUP_ENV
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+# Heavy routes are CPU bound: one worker per core, threads for slow I/O
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+threads = 2
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '120'))
+# Workers import the app themselves, after the segment exists
+preload_app = False
+
+# Inherited by the forked workers: their dataset manager follows the segment
+os.environ.setdefault(SEGMENT_DIR_ENV, default_segment_dir())
+# Each worker fans cold predictor calls out to its own pool: keep it small
+os.environ.setdefault(ENSEMBLE_WORKERS_ENV, '2')
+# Workers boot without the heavy predictor imports and load them once serving
+os.environ.setdefault(WARMUP_ENV, '1')
+
+
+# The publisher lives on the arbiter: a HUP re-executes this file
+def on_starting(server):
+    server.segment_publisher = SegmentPublisher(
+        os.environ[SEGMENT_DIR_ENV], interval=float(os.environ.get('SEGMENT_POLL_SECONDS', '5'))).start()
+    server.log.info(f"Dataset segment published in {server.segment_publisher.segment_dir}")
+
+
+def on_reload(server):
+    publisher = getattr(server, 'segment_publisher', None)
+    if publisher is not None:
+        publisher.reload()
+        server.log.info("Dataset segment republished on reload signal")
+
+
+def on_exit(server):
+    publisher = getattr(server, 'segment_publisher', None)
+    if publisher is not None:
+        publisher.stop()
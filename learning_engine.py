@@ -11,7 +11,10 @@ import os
 import xgboost as xgb
 from datetime import datetime
 from collections import defaultdict, Counter
+from utils.model_registry import get_model_registry, content_digest
 
+MODEL_NAME = 'learning_engine'
+# Pre-registry pickles, still loaded if no registered model exists
 MODEL_FILE = 'master_model.pkl'
 SCALER_FILE = 'master_scaler.pkl'
 CSV_FILE = 'master_predictions.csv'
@@ -144,6 +147,10 @@ def extract_ml_features(row, df=None):
 
     return features
 
+def training_version(df):
+    """Version of the training data: the learned rows of the predictions file"""
+    return content_digest(df[df['learned'] == True].itertuples(index=False))
+
 def train_model():
     """Train ML model from learned data using XGBoost"""
     if not os.path.exists(CSV_FILE):
@@ -185,11 +192,9 @@ def train_model():
     )
     model.fit(X_scaled, y)
 
-    # Save model
-    with open(MODEL_FILE, 'wb') as f:
-        pickle.dump(model, f)
-    with open(SCALER_FILE, 'wb') as f:
-        pickle.dump(scaler, f)
+    # Register model (versioned on the learned predictions it was fitted on)
+    get_model_registry().put(MODEL_NAME, (model, scaler), version=training_version(df),
+                             metadata={'samples': len(X)})
 
     # Calculate accuracy
     accuracy = model.score(X_scaled, y)
@@ -197,15 +202,35 @@ def train_model():
 
     return model, scaler
 
+def load_trained_model():
+    """(model, scaler) registered for the current learned predictions, kept in memory after the first load, or None"""
+    if not os.path.exists(CSV_FILE):
+        return None
+    registry = get_model_registry()
+    version = training_version(pd.read_csv(CSV_FILE))
+    registered = registry.get(MODEL_NAME, version=version)
+    if registered is not None:
+        return registered
+    # Pickled by older versions: migrated once, later learned rows retrain
+    if not registry.entries(MODEL_NAME) and os.path.exists(MODEL_FILE) and os.path.exists(SCALER_FILE):
+        with open(MODEL_FILE, 'rb') as f:
+            model = pickle.load(f)
+        with open(SCALER_FILE, 'rb') as f:
+            scaler = pickle.load(f)
+        # Migrate into the registry so later loads come from memory / joblib
+        registry.put(MODEL_NAME, (model, scaler), version=version, metadata={'source': MODEL_FILE})
+        return model, scaler
+    return None
+
+def has_trained_model():
+    return load_trained_model() is not None
+
 def predict_with_model(features, df=None):
     """Use trained model to predict"""
-    if not os.path.exists(MODEL_FILE):
+    trained = load_trained_model()
+    if trained is None:
         return None
-
-    with open(MODEL_FILE, 'rb') as f:
-        model = pickle.load(f)
-    with open(SCALER_FILE, 'rb') as f:
-        scaler = pickle.load(f)
+    model, scaler = trained
 
     # Extract full features including advanced ones
     if df is not None:
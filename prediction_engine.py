@@ -8,34 +8,26 @@ import numpy as np
 from datetime import datetime, timedelta
 from collections import Counter
 import os
-import functools
-import time
-from learning_engine import predict_with_model, extract_ml_features
+from learning_engine import predict_with_model, extract_ml_features, has_trained_model
+from utils.dataset_manager import get_dataset_manager, dataset_version
+from utils.cache import cached
 
 # Global cache for expensive operations
-_data_cache = {}
 _freq_cache = {}
 _module_cache = {}
 
-def cached_data_operation(func):
-    """Decorator for caching data operations"""
-    @functools.wraps(func)
-    def wrapper(*args, **kwargs):
-        cache_key = f"{func.__name__}_{hash(str(args) + str(kwargs))}"
-        if cache_key in _data_cache:
-            cached_time, cached_result = _data_cache[cache_key]
-            if time.time() - cached_time < 300:  # 5 minute cache
-                return cached_result
-        result = func(*args, **kwargs)
-        _data_cache[cache_key] = (time.time(), result)
-        return result
-    return wrapper
+def cached_data_operation(func=None, key=None):
+    """Decorator for caching data operations (bounded LRU, 5 minute TTL)"""
+    def decorator(f):
+        return cached(maxsize=64, ttl=300, key=key, name=f"data.{f.__name__}")(f)
+    return decorator(func) if func is not None else decorator
 
-@cached_data_operation
+@cached_data_operation(key=lambda: dataset_version())
 def load_data():
     """Load historical data - removes duplicates"""
-    df = pd.read_csv('4d_results_history.csv')
-    df['date_parsed'] = pd.to_datetime(df.iloc[:, 0], errors='coerce')
+    df = get_dataset_manager().get_frame()
+    if df.empty:
+        return df
     df = df.dropna(subset=['date_parsed']).sort_values('date_parsed')
     # Remove duplicate rows based on date and provider
     if 'provider' in df.columns:
@@ -235,7 +227,7 @@ def ensemble_predict(module_results, df=None):
     # Top 6 unique numbers by ML-boosted votes
     top_6 = [n for n, _ in sorted(ml_boosted.items(), key=lambda x: x[1], reverse=True)][:6]
     avg_conf = total_conf / len(module_results) if module_results else 0
-    pattern_source = '+'.join(sources) + ('+ML' if df is not None and os.path.exists('master_model.pkl') else '')
+    pattern_source = '+'.join(sources) + ('+ML' if df is not None and has_trained_model() else '')
 
     return top_6, avg_conf, pattern_source
 
@@ -6,6 +6,12 @@ import pandas as pd
 import re
 from datetime import datetime, timedelta
 import time
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.ingest import ingest_rows
 
 def scrape_single_date(driver, date_str):
     try:
@@ -185,10 +191,6 @@ def save_to_csv(results, filename='4d_results_history.csv'):
         print("No results!")
         return
     
-    df = pd.DataFrame(results)
-    try:
-        df.to_csv(filename, mode='a', index=False, header=False)
-        print(f"\nSaved {len(df)} to {filename}")
-    except:
-        df.to_csv(filename, index=False, header=False)
-        print(f"\nCreated {filename}")
+    rows = pd.DataFrame(results).fillna('').values.tolist()
+    written = ingest_rows(rows, filename)
+    print(f"\nSaved {len(written)} to {filename} ({len(rows) - len(written)} duplicates skipped)")
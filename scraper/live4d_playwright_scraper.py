@@ -1,27 +1,24 @@
 import os
-import csv
+import sys
 import time
-import pandas as pd
 from datetime import datetime, timedelta
 from playwright.sync_api import sync_playwright
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.ingest import ingest_rows, get_dedup_index
+
 CSV_PATH = 'data/4d_results_history.csv'
 START_DATE = datetime(2025, 7, 17)
 END_DATE = datetime.now()
 
-# === Ensure CSV Exists ===
-os.makedirs(os.path.dirname(CSV_PATH), exist_ok=True)
-if not os.path.exists(CSV_PATH):
-    with open(CSV_PATH, 'w', newline='', encoding='utf-8') as f:
-        csv.writer(f).writerow([
-            "date", "provider", "game_title", "draw_info",
-            "1st", "2nd", "3rd", "special", "consolation", "extra_info", "note"
-        ])
+CSV_HEADER = [
+    "date", "provider", "game_title", "draw_info",
+    "1st", "2nd", "3rd", "special", "consolation", "extra_info", "note"
+]
 
-existing = set()
-if os.path.exists(CSV_PATH):
-    df = pd.read_csv(CSV_PATH)
-    existing = set(df['date'].dropna().unique())
+# === Already-scraped dates come from the persistent dedup index, not a full CSV read ===
+existing = get_dedup_index(CSV_PATH).dates() if os.path.exists(CSV_PATH) else set()
 
 # === Start Playwright ===
 with sync_playwright() as p:
@@ -102,9 +99,8 @@ with sync_playwright() as p:
 
             # Save to CSV
             if rows:
-                with open(CSV_PATH, 'a', newline='', encoding='utf-8') as f:
-                    csv.writer(f).writerows(rows)
-                print(f"💾 Saved {len(rows)} rows for {date_str}")
+                written = ingest_rows(rows, CSV_PATH, header=CSV_HEADER)
+                print(f"💾 Saved {len(written)} rows for {date_str}")
             else:
                 print(f"⚠️ No rows to save for {date_str}")
 
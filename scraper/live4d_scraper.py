@@ -1,8 +1,12 @@
 import requests
 from bs4 import BeautifulSoup
-import csv
 from datetime import datetime
 import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.ingest import ingest_rows
 
 # === CONFIG ===
 CSV_PATH = "data/4d_results_history.csv"  # Change path as needed
@@ -62,26 +66,9 @@ def update_csv(new_rows):
         return
 
     try:
-        # ✅ Create folder if not exists
-        os.makedirs(os.path.dirname(CSV_PATH), exist_ok=True)
-
-        # ✅ Avoid duplicate row (based on draw date + provider)
-        existing = set()
-        if os.path.exists(CSV_PATH):
-            with open(CSV_PATH, "r", encoding="utf-8") as f:
-                reader = csv.reader(f)
-                for row in reader:
-                    existing.add((row[0], row[1]))  # (date, provider)
-
-        with open(CSV_PATH, "a", newline='', encoding="utf-8") as f:
-            writer = csv.writer(f)
-            new_count = 0
-            for row in new_rows:
-                if (row[0], row[1]) not in existing:
-                    writer.writerow(row)
-                    new_count += 1
-
-        print(f"✅ Appended {new_count} new rows to: {CSV_PATH}")
+        # ✅ Avoid duplicate row (based on draw date + provider) via the persistent key index
+        written = ingest_rows(new_rows, CSV_PATH)
+        print(f"✅ Appended {len(written)} new rows to: {CSV_PATH}")
 
     except Exception as e:
         print("❌ CSV update failed:", e)
@@ -1,20 +1,17 @@
 import streamlit as st
 import pandas as pd
-import re
+from utils.dataset_manager import get_dataset_manager
 
 st.set_page_config(page_title="4D Results Viewer", layout="centered")
 st.title("📅 4D Results by Date")
 
-# Load CSV
-df = pd.read_csv("4d_results_history.csv")
+# Load canonical data (memory-mapped snapshot when it is newer than the CSV)
+df = get_dataset_manager().get_frame()
+if df.empty:
+    df = pd.DataFrame(columns=["date_parsed"])
 
-# ✅ Step 1: Extract actual date from 'draw_info' column using regex
-def extract_date(info):
-    match = re.search(r"(\d{2}-\d{2}-\d{4})", str(info))
-    return match.group(1) if match else None
-
-df["extracted_date"] = df["draw_info"].apply(extract_date)
-df["extracted_date"] = pd.to_datetime(df["extracted_date"], format="%d-%m-%Y", errors="coerce")
+# ✅ Step 1: Draw date comes from the normalized date column
+df["extracted_date"] = pd.to_datetime(df["date_parsed"])
 df = df.dropna(subset=["extracted_date"])
 df["only_date"] = df["extracted_date"].dt.date
 
@@ -0,0 +1,58 @@
+"""
+Shared fixtures: small synthetic results CSVs in the scraper's layout
+(date, provider URL, draw info, draw no, draw text, prize text, special, consolation)
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PROVIDERS = ('magnum', 'damacai', 'toto')
+HEADER = 'date,provider,draw_info,1st,2nd,3rd,special,consolation\n'
+
+
+def result_lines(rows, seed=0, start='2020-01-01'):
+    """``rows`` CSV lines of random draws, one provider per line in turn"""
+    rng = np.random.default_rng(seed)
+    day = pd.Timestamp(start)
+    lines = []
+    for i in range(rows):
+        provider = PROVIDERS[i % len(PROVIDERS)]
+        if i % len(PROVIDERS) == 0:
+            day += pd.Timedelta(days=1)
+        numbers = [f"{n:04d}" for n in rng.integers(0, 10000, 23)]
+        prize = (f"1st Prize 首獎 {numbers[0]} | 2nd Prize 二獎 {numbers[1]} | "
+                 f"3rd Prize 三獎 {numbers[2]} | ")
+        special = ' '.join(numbers[3:13])
+        consolation = ' '.join(numbers[13:23])
+        lines.append(f"{day:%Y-%m-%d},https://www.live4d2u.net/images/{provider},4D Jackpot,"
+                     f"{1000 + i}/20,Draw No,{prize},{special},{consolation}\n")
+    return lines
+
+
+def write_results_csv(path, rows=90, seed=0, start='2020-01-01'):
+    with open(path, 'w', encoding='utf-8') as fh:
+        fh.write(HEADER)
+        fh.writelines(result_lines(rows, seed, start))
+    return str(path)
+
+
+@pytest.fixture
+def results_csv(tmp_path):
+    return write_results_csv(tmp_path / '4d_results_history.csv')
+
+
+@pytest.fixture(autouse=True)
+def isolated_cwd(tmp_path, monkeypatch):
+    """Each test runs in its own directory with fresh process-wide singletons"""
+    from utils.dataset_manager import get_dataset_manager
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv('DATASET_SEGMENT_DIR', raising=False)
+    get_dataset_manager.reset()
+    yield
+    get_dataset_manager.reset()
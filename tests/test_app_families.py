@@ -0,0 +1,33 @@
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from test_ingest import REPO
+
+
+def background_state(families):
+    """Pool, precompute worker and warm keys after one request to an app serving ``families``"""
+    script = textwrap.dedent(f'''
+        import json, sys
+        sys.path.insert(0, {REPO!r})
+        import app
+        app.app.test_client().get('/metrics')
+        print(json.dumps([app.ensemble.stats()['running'], app.precompute.running, len(app.precompute._warm)]))
+    ''')
+    env = dict(os.environ, FEATURE_FAMILIES=families)
+    env.pop('WARMUP_PLUGINS', None)
+    result = subprocess.run([sys.executable, '-c', script], env=env, capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr[-2000:]
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize('families, expected', [
+    ('past_results,lottery_types', [False, False, 0]),
+    ('learning,exports', [True, True, 1]),
+])
+def test_background_work_follows_the_registered_families(results_csv, families, expected):
+    assert background_state(families) == expected
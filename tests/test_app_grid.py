@@ -0,0 +1,30 @@
+import numpy as np
+
+from utils.app_grid import (generate_4x4_grid, generate_4x4_grids, generate_reverse_grid, generate_reverse_grids,
+                            number_digits)
+
+# Every digit in every position, plus the reverse grid's stop at 0 in row 4
+EDGE_NUMBERS = ['0000', '9999', '0123', '4567', '8901', '5555', '6789', '7', '42']
+
+
+def numbers():
+    rng = np.random.default_rng(11)
+    return EDGE_NUMBERS + [f'{n:04d}' for n in rng.integers(0, 10000, 500)]
+
+
+def test_batch_grids_match_scalar_grids():
+    strings = numbers()
+    codes = np.array([int(s) for s in strings], dtype=np.uint16)
+    for batch, scalar in ((generate_4x4_grids, generate_4x4_grid), (generate_reverse_grids, generate_reverse_grid)):
+        expected = np.array([scalar(s) for s in strings])
+        # The same grids from codes, 4-digit strings and digit rows
+        for source in (codes, [s.zfill(4) for s in strings], number_digits(codes)):
+            grids = batch(source)
+            assert grids.shape == (len(strings), 4, 4) and grids.dtype == np.uint8
+            assert np.array_equal(grids, expected)
+
+
+def test_empty_batch():
+    empty = np.array([], dtype=np.uint16)
+    assert generate_4x4_grids(empty).shape == (0, 4, 4)
+    assert generate_reverse_grids(empty).shape == (0, 4, 4)
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from utils import backtest
+from utils.dataset_manager import DatasetManager
+
+
+@pytest.fixture
+def seen(monkeypatch):
+    """A 'spy' predictor that records the history each target is given and predicts its newest 1st prize"""
+    histories = []
+
+    def spy(history, provider):
+        histories.append((history['date_parsed'].tolist(), history['provider_key'].tolist(), provider))
+        return [history['number_1st'].iloc[0]]
+
+    monkeypatch.setitem(backtest.PREDICTORS, 'spy', spy)
+    return histories
+
+
+@pytest.fixture
+def frame(results_csv):
+    return DatasetManager([results_csv], use_snapshot=False).get_frame(copy=False)
+
+
+def test_each_target_sees_only_earlier_draws(frame, seen):
+    positions = backtest.select_targets(frame, min_history=1)
+    records = backtest.replay(frame, 'spy', positions)
+    dates, providers = frame['date_parsed'], frame['provider_key']
+    assert len(records) == len(seen) == len(positions)
+    for pos, record, (history_dates, _, provider) in zip(positions, records, seen):
+        target = dates.iloc[pos]
+        assert record['date'] == target and provider == providers.iloc[pos]
+        # Strictly before: the draws of the target's own date are not in its history
+        assert all(d < target for d in history_dates)
+        assert len(history_dates) == record['history'] == (dates < target).sum()
+        assert history_dates == sorted(history_dates, reverse=True)
+
+
+def test_window_and_per_provider_history(frame, seen):
+    positions = backtest.select_targets(frame, min_history=1)
+    records = backtest.replay(frame, 'spy', positions, window=7, per_provider=True)
+    dates, providers = frame['date_parsed'], frame['provider_key']
+    for pos, record, (history_dates, history_providers, provider) in zip(positions, records, seen):
+        earlier = dates[(dates < dates.iloc[pos]) & (providers == provider)]
+        assert set(history_providers) <= {provider}
+        assert history_dates == earlier.iloc[:7].tolist() and record['history'] == min(7, len(earlier))
+
+
+def test_target_selection_boundaries(frame):
+    dates = frame['date_parsed']
+    # 90 draws, 3 per day over 30 days: a draw has 3 * (day - 1) earlier ones
+    positions = backtest.select_targets(frame, min_history=30)
+    assert len(positions) == 90 - 30
+    assert dates.iloc[positions].min() == dates.min() + np.timedelta64(10, 'D')
+    assert list(dates.iloc[positions]) == sorted(dates.iloc[positions])
+
+    start, end = dates.min() + np.timedelta64(12, 'D'), dates.min() + np.timedelta64(19, 'D')
+    window = backtest.select_targets(frame, start=start, end=end, min_history=0)
+    assert len(window) == 8 * 3
+    assert dates.iloc[window].min() == start and dates.iloc[window].max() == end
+
+    strided = backtest.select_targets(frame, min_history=0, stride=4, limit=5)
+    all_targets = backtest.select_targets(frame, min_history=0)
+    assert list(strided) == list(all_targets[::4][-5:])
+
+    magnum = backtest.select_targets(frame, providers=['Magnum 4D'], min_history=0)
+    assert len(magnum) == 30 and set(frame['provider_key'].iloc[magnum]) == {'Magnum 4D'}
+
+
+def test_folds_split_targets_into_contiguous_chunks():
+    positions = np.arange(10)[::-1]
+    folds = backtest._folds(positions, 4)
+    assert [len(fold) for fold in folds] == [3, 3, 2, 2]
+    assert np.array_equal(np.concatenate(folds), positions)
+    assert len(backtest._folds(positions[:2], 4)) == 2
+
+
+def test_workers_replay_the_same_windows(results_csv, seen):
+    serial, _ = backtest.run_backtest(['spy'], results_csv, workers=1, output=None)
+    pooled, summary = backtest.run_backtest(['spy'], results_csv, workers=2, output=None)
+    assert len(serial) == 90 - 30
+    columns = ['provider', 'date', 'history', 'hit@1', 'predicted']
+    assert serial[columns].astype(str).equals(pooled[columns].astype(str))
+    assert summary.set_index('provider').loc['all', 'draws'] == len(serial)
@@ -0,0 +1,53 @@
+import pandas as pd
+
+from utils.cache import LRUCache, cached, structural_key
+
+
+def frame(numbers):
+    return pd.DataFrame({'date_parsed': pd.date_range('2024-01-01', periods=len(numbers)),
+                         'provider_key': 'magnum', 'number_1st': numbers})
+
+
+def test_lru_evicts_least_recent_and_counts():
+    cache = LRUCache(maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+    assert 'b' not in cache and cache.get('a') == 1 and cache.get('c') == 3
+    assert cache.get('b') is None
+    assert cache.stats()['evictions'] == 1 and cache.misses == 1
+
+
+def test_ttl_expires(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('utils.cache.time.time', lambda: now[0])
+    cache = LRUCache(ttl=10)
+    cache.set('k', 'v')
+    now[0] += 5
+    assert cache.get('k') == 'v'
+    now[0] += 10
+    assert cache.get('k') is None
+
+
+def test_same_shape_and_endpoints_do_not_collide():
+    a = frame(['0001', '1111', '9999'])
+    b = frame(['0001', '2222', '9999'])
+    assert structural_key(a) != structural_key(b)
+    assert structural_key(a) == structural_key(a.copy())
+
+
+def test_cached_returns_private_copies():
+    calls = []
+
+    @cached(maxsize=4)
+    def summarize(df):
+        calls.append(1)
+        return {'numbers': df['number_1st'].tolist()}
+
+    a = frame(['0001', '1111', '9999'])
+    first = summarize(a)
+    first['numbers'].append('mutated')
+    assert summarize(a) == {'numbers': ['0001', '1111', '9999']}
+    assert summarize(frame(['0001', '2222', '9999']))['numbers'][1] == '2222'
+    assert len(calls) == 2
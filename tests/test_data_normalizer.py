@@ -0,0 +1,63 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from conftest import HEADER, result_lines
+from utils.data_normalizer import DataNormalizer, normalize_dataframe
+
+
+def reference_numbers(frame):
+    """The per-row extraction normalize_dataframe used before it was vectorized"""
+    rows = []
+    for _, row in frame.iterrows():
+        prize_text = str(row.iloc[5]) if len(row) > 5 else ''
+        special_text = str(row.iloc[6]) if len(row) > 6 else ''
+        consolation_text = str(row.iloc[7]) if len(row) > 7 else ''
+        prizes = [re.search(rf'{label}[^0-9]*(\d{{4}})', prize_text, re.IGNORECASE)
+                  for label in ('1st', '2nd', '3rd')]
+        prizes = [m.group(1) if m else None for m in prizes]
+        special = re.findall(r'\b\d{4}\b', special_text)[:10]
+        consolation = re.findall(r'\b\d{4}\b', consolation_text)[:10]
+        rows.append({'number_1st': prizes[0], 'number_2nd': prizes[1], 'number_3rd': prizes[2],
+                     'special': ' '.join(special), 'consolation': ' '.join(consolation),
+                     'total_4d_found': sum(p is not None for p in prizes) + len(special) + len(consolation)})
+    return pd.DataFrame(rows, index=frame.index)
+
+
+def raw_frame(tmp_path):
+    path = tmp_path / 'raw.csv'
+    with open(path, 'w', encoding='utf-8') as fh:
+        fh.write(HEADER)
+        fh.writelines(result_lines(60, seed=3))
+        # Edge cases: masked numbers, unlabeled prizes, bad date, unknown provider, non-4D game
+        fh.write('2021-05-01,https://www.live4d2u.net/images/magnum,4D Jackpot,1/21,Draw No,'
+                 '1st Prize 1234 | 3rd Prize 99999 | ,---- 0001 **** 12345 0002,\n')
+        fh.write('2021-05-01,https://www.live4d2u.net/images/damacai,4D Jackpot,2/21,Draw No,'
+                 'no prizes here,,\n')
+        fh.write('not a date,https://www.live4d2u.net/images/toto,4D Jackpot,3/21,Draw No,'
+                 '1st Prize 4321 | ,,\n')
+        fh.write('2021-05-02,,4D Jackpot,4/21,Draw No,1st Prize 5555 | ,,\n')
+        fh.write('2021-05-02,https://www.live4d2u.net/images/toto,Toto 5D,5/21,Draw No,1st Prize 6666 | ,,\n')
+    return pd.read_csv(path, index_col=False)
+
+
+def test_vectorized_extraction_matches_row_loop(tmp_path):
+    raw = raw_frame(tmp_path)
+    normalized = normalize_dataframe(raw)
+    assert 'toto 5d' not in set(normalized['lottery_type'])
+
+    expected = reference_numbers(normalized[raw.columns])
+    for column in expected.columns:
+        assert normalized[column].tolist() == expected[column].tolist(), column
+
+    expected_providers = [DataNormalizer.normalize_provider(p) for p in raw.loc[normalized.index, 'provider']]
+    assert normalized['provider_key'].tolist() == expected_providers
+
+
+def test_validity_needs_date_provider_and_a_prize(tmp_path):
+    normalized = normalize_dataframe(raw_frame(tmp_path))
+    invalid = normalized[~normalized['is_valid']]
+    assert set(invalid['1st']) == {'2/21', '3/21', '4/21'}
+    assert normalized['is_valid'].sum() == 61
+    assert np.issubdtype(normalized['date_parsed'].dtype, np.datetime64)
@@ -0,0 +1,48 @@
+import os
+
+from conftest import write_results_csv
+from utils.dataset_manager import DatasetManager
+from utils.singleton import process_singleton
+
+
+def test_reloads_only_when_content_changes(results_csv):
+    manager = DatasetManager([results_csv], use_snapshot=False)
+    frame = manager.get_frame(copy=False)
+    version = manager.version
+    assert len(frame) == 90 and manager.loads == 1
+
+    # Touched, same content: same frame, same version
+    st = os.stat(results_csv)
+    os.utime(results_csv, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+    assert manager.get_frame(copy=False) is frame
+    assert manager.version == version and manager.loads == 1
+
+    write_results_csv(results_csv, rows=60, seed=1)
+    assert len(manager.get_frame()) == 60
+    assert manager.version != version and manager.loads == 2
+
+
+def test_frame_is_newest_first_with_legacy_aliases(results_csv):
+    frame = DatasetManager([results_csv], use_snapshot=False).get_frame()
+    assert frame['date_parsed'].is_monotonic_decreasing
+    assert (frame['1st_real'] == frame['number_1st']).all()
+    assert (frame['provider'] == frame['provider_key']).all()
+
+
+def test_missing_file_gives_empty_frame(tmp_path):
+    manager = DatasetManager([str(tmp_path / 'missing.csv')], use_snapshot=False)
+    assert manager.get_frame().empty and manager.version is None
+
+
+def test_process_singleton_builds_once_and_resets():
+    built = []
+
+    @process_singleton
+    def get_thing():
+        built.append(object())
+        return built[-1]
+
+    assert get_thing.peek() is None
+    assert get_thing() is get_thing() is built[0]
+    get_thing.reset()
+    assert get_thing() is built[1]
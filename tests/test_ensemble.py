@@ -0,0 +1,93 @@
+import os
+import threading
+import time
+
+import pytest
+
+from utils.ensemble import EnsembleExecutor
+
+
+# Module-level, so the spawned workers can unpickle them
+def double(value):
+    return value * 2
+
+
+def fail():
+    raise ValueError('predictor failed')
+
+
+def sleep_for(seconds, pid_file=None):
+    if pid_file:
+        with open(pid_file, 'w') as fh:
+            fh.write(str(os.getpid()))
+    time.sleep(seconds)
+    return seconds
+
+
+def gone(pid):
+    """The process exited (a zombie not yet waited for counts as exited)"""
+    try:
+        with open(f'/proc/{pid}/stat') as fh:
+            return fh.read().rsplit(')', 1)[1].split()[0] == 'Z'
+    except OSError:
+        return True
+
+
+def wait_for(condition, timeout=10):
+    deadline = time.time() + timeout
+    while not condition():
+        if time.time() > deadline:
+            return False
+        time.sleep(0.05)
+    return True
+
+
+@pytest.fixture
+def executor():
+    executor = EnsembleExecutor(workers=3).start()
+    yield executor
+    executor.stop()
+
+
+def test_a_slow_or_failing_call_only_fails_its_own_label(executor, tmp_path):
+    pid_file = str(tmp_path / 'slow.pid')
+    calls = {'slow': (sleep_for, (60, pid_file)), 'boom': (fail, ()), 'ok': (double, (21,))}
+    began = time.perf_counter()
+    outcomes = executor.run(calls, timeouts={'slow': 1.0})
+    assert time.perf_counter() - began < 30
+    assert list(outcomes) == ['slow', 'boom', 'ok']
+    assert [outcome.status for outcome in outcomes.values()] == ['timeout', 'error', 'ok']
+    assert outcomes['ok'].result == 42 and outcomes['slow'].result is None and outcomes['boom'].result is None
+    assert executor.stats()['timeouts'] == 1 and executor.stats()['errors'] == 1
+
+    # The worker stuck on the timed-out call is killed, not left holding a slot
+    assert wait_for(lambda: os.path.exists(pid_file))
+    assert wait_for(lambda: gone(int(open(pid_file).read())))
+    assert executor.stats()['recycled'] == 1
+    assert executor.run({'again': (double, (2,))})['again'].result == 4
+
+
+def test_retiring_a_pool_lets_other_batches_finish(executor, tmp_path):
+    other = {}
+    started = threading.Event()
+
+    def other_batch():
+        started.set()
+        other.update(executor.run({'long': (sleep_for, (3,))}, timeouts={'long': 30}))
+
+    thread = threading.Thread(target=other_batch)
+    thread.start()
+    started.wait(5)
+    time.sleep(0.2)
+    assert executor.run({'slow': (sleep_for, (60,))}, timeouts={'slow': 1.0})['slow'].status == 'timeout'
+    thread.join(30)
+    assert other['long'].status == 'ok' and other['long'].result == 3
+
+
+def test_inline_mode_isolates_errors():
+    executor = EnsembleExecutor(workers=0)
+    outcomes = executor.run({'boom': (fail, ()), 'ok': (double, (4,))})
+    assert outcomes['boom'].status == 'error' and outcomes['boom'].result is None
+    assert outcomes['ok'].status == 'ok' and outcomes['ok'].result == 8
+    assert executor.stats() == {'workers': 0, 'running': False, 'calls': 2, 'timeouts': 0, 'errors': 1,
+                                'recycled': 0}
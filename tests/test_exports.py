@@ -0,0 +1,131 @@
+import io
+import json
+
+import pandas as pd
+import pytest
+from flask import Flask
+
+from blueprints import register_families
+from blueprints.shared import TRACKING, tracking_entry
+from utils.dataset_manager import get_dataset_manager
+from utils.exports import BackgroundWriter, encode_chunks, filter_draws, get_background_writer
+from utils.prediction_ledger import get_prediction_ledger
+
+
+@pytest.fixture
+def client():
+    get_prediction_ledger.reset()
+    get_background_writer.reset()
+    app = Flask(__name__)
+    register_families(app, ['exports'])
+    yield app.test_client()
+    get_background_writer().drain()
+    get_prediction_ledger.reset()
+    get_background_writer.reset()
+
+
+@pytest.fixture
+def reports(monkeypatch):
+    """Accuracy reports the background writer was asked for, by file name"""
+    written = []
+    monkeypatch.setattr('blueprints.exports.write_accuracy_report', lambda path: written.append(path))
+    return written
+
+
+def track(day, provider, hit_status='pending'):
+    entry = tracking_entry(f'2025-09-{day:02d} (Saturday)', provider, f'{day:04d}', 'advanced', 80)
+    entry['hit_status'] = hit_status
+    return get_prediction_ledger().append(TRACKING, entry)
+
+
+def read_csv(response):
+    return pd.read_csv(io.StringIO(response.get_data(as_text=True)), dtype=str, keep_default_na=False)
+
+
+def read_ndjson(response):
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+@pytest.mark.parametrize('query', ['format=xlsx', 'start=2025-13-01', 'end=yesterday'])
+def test_malformed_accuracy_requests_are_rejected_before_the_ledger_is_read(client, query):
+    response = client.get(f'/export/accuracy?{query}')
+    assert response.status_code == 400
+    track(20, 'magnum')
+    assert client.get(f'/export/accuracy?{query}').status_code == 400
+
+
+def test_accuracy_export_of_an_empty_ledger(client, reports):
+    assert client.get('/export/accuracy').status_code == 404
+    assert client.get('/export/accuracy?format=ndjson&provider=toto').status_code == 404
+    assert reports == []
+
+
+def test_accuracy_export_streams_the_filtered_ledger(client, reports):
+    for day, provider, status in ((20, 'magnum', 'HIT 1'), (21, 'toto', 'pending'), (22, 'magnum', 'MISS'),
+                                  (23, 'magnum', 'pending')):
+        track(day, provider, status)
+
+    response = client.get('/export/accuracy')
+    assert response.status_code == 200 and response.mimetype == 'text/csv'
+    assert 'attachment;filename=accuracy_' in response.headers['Content-Disposition']
+    rows = read_csv(response)
+    assert rows['predicted_numbers'].tolist() == ['0020', '0021', '0022', '0023']
+    assert rows['hit_status'].tolist() == ['HIT 1', 'pending', 'MISS', 'pending']
+
+    response = client.get('/export/accuracy?format=ndjson&provider=magnum&start=2025-09-21&end=2025-09-22')
+    assert response.mimetype == 'application/x-ndjson'
+    assert [(r['provider'], r['predicted_numbers']) for r in read_ndjson(response)] == [('magnum', '0022')]
+    # A filter that matches nothing still downloads, as a header-only CSV
+    assert read_csv(client.get('/export/accuracy?provider=damacai')).empty
+
+
+def test_accuracy_report_is_written_once_per_ledger_revision(client, reports):
+    track(20, 'magnum', 'HIT 1')
+    for _ in range(3):
+        assert client.get('/export/accuracy').status_code == 200
+    get_background_writer().drain()
+    assert len(reports) == 1 and reports[0].startswith('accuracy_report_')
+
+    track(21, 'toto', 'MISS')
+    client.get('/export/accuracy?format=ndjson')
+    get_background_writer().drain()
+    assert len(reports) == 2
+
+
+def test_statistics_export_counts_the_filtered_draws(client, results_csv):
+    start, end = '2020-01-05', '2020-01-14'
+    response = client.get(f'/export/statistics?format=ndjson&provider=Magnum 4D&start={start}&end={end}')
+    assert response.status_code == 200
+    draws = filter_draws(get_dataset_manager().get_frame(), 'Magnum 4D', pd.Timestamp(start), pd.Timestamp(end))
+    numbers = [n for col in ('1st_real', '2nd_real', '3rd_real') for n in draws[col]]
+    records = read_ndjson(response)
+    assert sum(r['frequency'] for r in records) == len(numbers) == 3 * 10
+    assert {r['number'] for r in records} == set(numbers)
+    assert client.get('/export/statistics?format=pdf').status_code == 400
+
+
+def test_encoders_write_one_header_across_chunks():
+    chunks = [pd.DataFrame({'a': [1, 2], 'b': ['x', 'y']}), pd.DataFrame({'a': [3], 'b': ['z']})]
+    text = ''.join(encode_chunks(iter(chunks), 'csv'))
+    assert text.splitlines() == ['a,b', '1,x', '2,y', '3,z']
+    lines = ''.join(encode_chunks(iter(chunks), 'ndjson')).splitlines()
+    assert [json.loads(line)['a'] for line in lines] == [1, 2, 3]
+    assert ''.join(encode_chunks(iter([]), 'csv', ['a', 'b'])).splitlines() == ['a,b']
+    assert ''.join(encode_chunks(iter([]), 'ndjson', ['a', 'b'])) == ''
+
+
+def test_background_writer_runs_each_key_once_even_after_a_failure():
+    writer = BackgroundWriter()
+    runs = []
+
+    def job(name):
+        runs.append(name)
+        if name == 'bad':
+            raise OSError('disk full')
+        return name
+
+    assert writer.submit(('a', 1), job, 'good') and not writer.submit(('a', 1), job, 'good')
+    assert writer.submit(('b', 1), job, 'bad') and not writer.submit(('b', 1), job, 'bad')
+    assert writer.submit(('a', 2), job, 'good')
+    writer.drain()
+    assert runs == ['good', 'bad', 'good'] and writer.written == 2 and writer.failed == 1
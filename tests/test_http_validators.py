@@ -0,0 +1,62 @@
+import pytest
+from flask import Flask, jsonify
+
+from conftest import write_results_csv
+from blueprints.shared import dataset_validators, not_modified, with_validators
+from utils.dataset_manager import get_dataset_manager
+from utils.precompute import PrecomputeScheduler
+
+
+@pytest.fixture
+def client(results_csv):
+    """A route shaped like /api/v1/predictions/<predictor> over a scheduler of its own"""
+    calls = []
+    scheduler = PrecomputeScheduler(get_dataset_manager())
+    scheduler.register('first', lambda df, provider, lookback: calls.append(1) or [(df['number_1st'].iloc[0], 1.0)])
+    app = Flask(__name__)
+
+    @app.route('/predictions')
+    def predictions():
+        version, results = scheduler.get('first')
+        etag, last_modified = dataset_validators('predictions', version=version)
+        cached = not_modified(etag, last_modified)
+        if cached is not None:
+            return cached
+        return with_validators(jsonify({'dataset_version': version, 'number': results[0][0]}), etag, last_modified)
+
+    client = app.test_client()
+    client.scheduler, client.calls = scheduler, calls
+    return client
+
+
+def test_etag_follows_the_version_of_the_cached_result(client, results_csv):
+    first = client.get('/predictions')
+    etag, version = first.headers['ETag'], first.get_json()['dataset_version']
+    assert first.status_code == 200 and version == get_dataset_manager().version
+    assert first.headers.get('Last-Modified')
+    assert client.get('/predictions', headers={'If-None-Match': etag}).status_code == 304
+
+    # New data: the cached result is stale but still served, under its own validators
+    write_results_csv(results_csv, rows=60, seed=1)
+    stale = client.get('/predictions')
+    assert get_dataset_manager().version != version
+    assert stale.headers['ETag'] == etag and stale.get_json() == first.get_json()
+    assert 'Last-Modified' not in stale.headers
+    assert client.get('/predictions', headers={'If-None-Match': etag}).status_code == 304
+    assert len(client.calls) == 1
+
+    # Once recomputed, the same client validator gets the new body
+    assert client.scheduler.refresh() == 1
+    fresh = client.get('/predictions', headers={'If-None-Match': etag})
+    assert fresh.status_code == 200 and fresh.headers['ETag'] != etag
+    assert fresh.get_json()['dataset_version'] == get_dataset_manager().version
+    assert fresh.headers.get('Last-Modified')
+
+
+def test_without_the_worker_a_stale_result_can_be_recomputed(client, results_csv):
+    version, _ = client.scheduler.get('first')
+    write_results_csv(results_csv, rows=60, seed=1)
+    assert not client.scheduler.running
+    assert client.scheduler.get('first')[0] == version
+    fresh, _ = client.scheduler.get('first', stale=False)
+    assert fresh == get_dataset_manager().version != version and len(client.calls) == 2
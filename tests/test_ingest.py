@@ -0,0 +1,100 @@
+import csv
+import hashlib
+import os
+import subprocess
+import sys
+import textwrap
+import time
+
+import pandas as pd
+
+from conftest import result_lines
+from utils.dataset_manager import DatasetManager, read_canonical_csv
+from utils.file_lock import file_lock
+from utils.ingest import DedupIndex, ingest_rows
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def rows_of(lines):
+    return [row for row in csv.reader(lines)]
+
+
+def same_day_rows(start, rows=6, seed=7):
+    """Rows dated like existing history but from other providers (no dedup collisions)"""
+    lines = result_lines(rows, seed=seed, start=start)
+    for old, new in (('magnum', 'singapore'), ('damacai', 'sandakan'), ('toto', 'perdana')):
+        lines = [line.replace(f'/images/{old},', f'/images/{new},') for line in lines]
+    return rows_of(lines)
+
+
+def test_ingest_skips_known_and_repeated_keys(results_csv):
+    new = rows_of(result_lines(6, seed=7, start='2030-01-01'))
+    assert len(ingest_rows(new + new[:2], results_csv)) == 6
+    assert ingest_rows(new, results_csv) == []
+    # An existing (date, provider) key is skipped even with other numbers
+    existing = rows_of(result_lines(1, seed=8))
+    assert ingest_rows(existing, results_csv) == []
+    assert len(pd.read_csv(results_csv, index_col=False)) == 96
+
+
+def test_dedup_index_persists_and_follows_other_writers(results_csv):
+    DedupIndex(results_csv)
+    with open(results_csv, 'a', encoding='utf-8') as fh:
+        fh.writelines(result_lines(3, seed=9, start='2031-01-01'))
+    index = DedupIndex(results_csv)
+    assert ('2031-01-02', 'https://www.live4d2u.net/images/toto') in index
+    assert len(index.keys - {('date', 'provider')}) == 93
+
+
+def test_manager_merges_only_the_appended_tail(results_csv):
+    manager = DatasetManager([results_csv], use_snapshot=False)
+    manager.get_frame()
+    events = []
+    manager.add_listener(lambda event, frame: events.append((event, len(frame))))
+
+    # New dates and dates already in the history
+    ingest_rows(rows_of(result_lines(6, seed=7, start='2030-01-01')) + same_day_rows('2020-01-10'), results_csv)
+    merged = manager.get_frame()
+
+    assert (manager.loads, manager.appends) == (1, 1)
+    assert events == [('append', 12)]
+    with open(results_csv, 'rb') as fh:
+        assert manager.version == hashlib.sha1(fh.read()).hexdigest()
+    reparsed = read_canonical_csv(results_csv)
+    assert list(merged.dtypes.astype(str)) == list(reparsed.dtypes.astype(str))
+    assert merged.equals(reparsed)
+
+
+def test_rewritten_history_is_reloaded(results_csv):
+    manager = DatasetManager([results_csv], use_snapshot=False)
+    manager.get_frame()
+    with open(results_csv, encoding='utf-8') as fh:
+        lines = fh.readlines()
+    with open(results_csv, 'w', encoding='utf-8') as fh:
+        fh.writelines(lines[:1] + lines[2:] + result_lines(3, seed=5, start='2030-01-01'))
+    assert len(manager.get_frame()) == 92
+    assert (manager.loads, manager.appends) == (2, 0)
+
+
+def test_file_lock_excludes_other_processes(tmp_path):
+    target = str(tmp_path / 'data.csv')
+    marker = tmp_path / 'held'
+    child = subprocess.Popen([sys.executable, '-c', textwrap.dedent(f'''
+        import sys, time, pathlib
+        sys.path.insert(0, {REPO!r})
+        from utils.file_lock import file_lock
+        with file_lock({target!r}):
+            pathlib.Path({str(marker)!r}).touch()
+            time.sleep(0.5)
+    ''')])
+    try:
+        deadline = time.time() + 10
+        while not marker.exists() and time.time() < deadline:
+            time.sleep(0.01)
+        started = time.perf_counter()
+        with file_lock(target):
+            waited = time.perf_counter() - started
+    finally:
+        child.wait()
+    assert waited > 0.2
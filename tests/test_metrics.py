@@ -0,0 +1,189 @@
+import json
+import os
+import re
+import subprocess
+import sys
+import textwrap
+import time
+
+import pytest
+
+from test_ingest import REPO
+from utils.metrics import PHASES, MetricsRegistry
+from utils.sampling_profiler import SamplingProfiler, _process_profiler, get_sampling_profiler
+
+SAMPLE_LINE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{(?:[a-zA-Z_][a-zA-Z0-9_]*="(?:[^"\\]|\\.)*",?)*\})? '
+                         r'(-?[0-9.e+-]+|\+Inf|-Inf|NaN)$')
+LABEL = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"')
+
+
+def parse_prometheus(text):
+    """
+    Prometheus text format (0.0.4) -> {metric family: {'type', 'samples': [(name, labels, value)]}};
+    fails on a malformed line, a sample before its family's TYPE, or a histogram whose buckets are not cumulative
+    """
+    assert text.endswith('\n')
+    families, kind = {}, None
+    for line in text.splitlines():
+        if line.startswith('# HELP '):
+            continue
+        if line.startswith('# TYPE '):
+            _, _, name, kind = line.split(' ')
+            assert name not in families and kind in ('counter', 'gauge', 'histogram')
+            families[name] = {'type': kind, 'samples': []}
+            continue
+        match = SAMPLE_LINE.match(line)
+        assert match, f'malformed line: {line!r}'
+        name, labels, value = match.group(1), dict(LABEL.findall(match.group(2) or '')), float(match.group(3))
+        family = next(f for f in families if name == f or name in (f'{f}_bucket', f'{f}_sum', f'{f}_count'))
+        families[family]['samples'].append((name, labels, value))
+
+    for name, family in families.items():
+        if family['type'] != 'histogram':
+            continue
+        series = {}
+        for sample, labels, value in family['samples']:
+            key = tuple(sorted((k, v) for k, v in labels.items() if k != 'le'))
+            series.setdefault(key, {'buckets': [], 'count': None})
+            if sample.endswith('_bucket'):
+                series[key]['buckets'].append((float(labels['le']), value))
+            elif sample.endswith('_count'):
+                series[key]['count'] = value
+        for parts in series.values():
+            bounds, counts = zip(*parts['buckets'])
+            assert list(bounds) == sorted(bounds) and bounds[-1] == float('inf')
+            assert list(counts) == sorted(counts) and counts[-1] == parts['count']
+    return families
+
+
+def phase_seconds(families, endpoint):
+    """{phase: (count, sum)} of one endpoint's request_phase_seconds series"""
+    samples = families['smart4d_request_phase_seconds']['samples']
+    out = {}
+    for name, labels, value in samples:
+        if labels['endpoint'] == endpoint and not name.endswith('_bucket'):
+            count, total = out.get(labels['phase'], (0, 0.0))
+            out[labels['phase']] = (value, total) if name.endswith('_count') else (count, value)
+    return out
+
+
+def test_request_phases_render_as_prometheus_text():
+    registry = MetricsRegistry()
+    registry.begin_request()
+    section = registry.start_section('load_csv_data', phase='load')
+    # A phased section inside another one is not charged twice
+    inner = registry.start_section('dataset.read_csv', phase='load')
+    time.sleep(0.01)
+    registry.end_section(inner)
+    registry.end_section(section)
+    render = registry.start_section('render.page.html', phase='render')
+    registry.end_section(render)
+    phases = registry.request_phases()
+    assert list(phases) == list(PHASES) and phases['load'] >= 0.01
+    registry.end_request('family.page', family='family', status=200)
+    registry.inc('odd_label_total', help='Escaping', note='a "quoted"\\ value\nover two lines')
+
+    families = parse_prometheus(registry.render())
+    assert families['smart4d_request_phase_seconds']['type'] == 'histogram'
+    recorded = phase_seconds(families, 'family.page')
+    assert sorted(recorded) == sorted(PHASES) and all(count == 1 for count, _ in recorded.values())
+    assert recorded['load'][1] == pytest.approx(phases['load'], abs=0.005)
+    durations = {labels['function'] for _, labels, _ in families['smart4d_function_duration_seconds']['samples']}
+    assert durations == {'load_csv_data', 'dataset.read_csv', 'render.page.html'}
+    (_, labels, value), = families['smart4d_requests_total']['samples']
+    assert labels['status'] == '200' and labels['process'] == str(os.getpid()) and value == 1
+    (_, labels, _), = families['smart4d_odd_label_total']['samples']
+    assert labels['note'] == 'a \\"quoted\\"\\\\ value\\nover two lines'
+
+
+def test_sections_outside_a_request_only_time_the_function():
+    registry = MetricsRegistry()
+    registry.end_section(registry.start_section('background', phase='load'))
+    assert registry.request_phases() is None and registry.end_request('none') is None
+    assert 'request_phase_seconds' not in registry.render()
+
+
+def app_request(path, **env):
+    """Server-Timing header of one request, then the /metrics scrape, from an app in a fresh process"""
+    script = textwrap.dedent(f'''
+        import json, sys, threading
+        sys.path.insert(0, {REPO!r})
+        import app
+        client = app.app.test_client()
+        response = client.get({path!r})
+        scrape = client.get('/metrics')
+        print(json.dumps({{'status': response.status_code, 'timing': response.headers.get('Server-Timing'),
+                           'content_type': scrape.content_type, 'metrics': scrape.get_data(as_text=True),
+                           'profiler': app.profiler is not None,
+                           'threads': [t.name for t in threading.enumerate()]}}))
+    ''')
+    environment = dict(os.environ, FEATURE_FAMILIES='past_results', **env)
+    for name in ('WARMUP_PLUGINS', 'PROFILE_SLOW_REQUESTS'):
+        if name not in env:
+            environment.pop(name, None)
+    result = subprocess.run([sys.executable, '-c', script], env=environment, capture_output=True, text=True,
+                            timeout=120)
+    assert result.returncode == 0, result.stderr[-2000:]
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_metrics_endpoint_and_server_timing(results_csv):
+    served = app_request('/past-results')
+    assert served['status'] == 200
+    timings = dict(part.split(';dur=') for part in served['timing'].split(', '))
+    assert list(timings) == list(PHASES) and all(float(ms) >= 0 for ms in timings.values())
+    assert float(timings['load']) > 0 and float(timings['render']) > 0
+
+    assert served['content_type'].startswith('text/plain; version=0.0.4')
+    families = parse_prometheus(served['metrics'])
+    recorded = phase_seconds(families, 'past_results.past_results')
+    assert sorted(recorded) == sorted(PHASES) and all(count == 1 for count, _ in recorded.values())
+    functions = {labels['function'] for _, labels, _ in families['smart4d_function_duration_seconds']['samples']}
+    assert {'load_csv_data', 'render.past_results.html'} <= functions
+
+    # Profiling is off: no profiler, no sampling thread, no profile counter
+    assert not served['profiler'] and 'sampling-profiler' not in served['threads']
+    assert 'smart4d_slow_request_profiles_total' not in families
+
+
+def test_profiler_runs_only_when_configured(results_csv, tmp_path):
+    served = app_request('/past-results', PROFILE_SLOW_REQUESTS='0.000001', PROFILE_DIR=str(tmp_path / 'profiles'))
+    assert served['profiler'] and 'sampling-profiler' in served['threads']
+    (_, _, dumped), = parse_prometheus(served['metrics'])['smart4d_slow_request_profiles_total']['samples']
+    # The scrape reports the profiles written before it (the page's); its own is written after
+    profiles = sorted(os.listdir(tmp_path / 'profiles'))
+    assert dumped == 1 and '-past_results.past_results-' in profiles[0]
+
+
+@pytest.mark.parametrize('value', [None, '', '0'])
+def test_profiler_is_none_unless_a_threshold_is_set(monkeypatch, value):
+    if value is None:
+        monkeypatch.delenv('PROFILE_SLOW_REQUESTS', raising=False)
+    else:
+        monkeypatch.setenv('PROFILE_SLOW_REQUESTS', value)
+    assert get_sampling_profiler() is None
+
+
+def test_configured_profiler_is_process_wide(monkeypatch):
+    monkeypatch.setenv('PROFILE_SLOW_REQUESTS', '0.5')
+    _process_profiler.reset()
+    try:
+        profiler = get_sampling_profiler()
+        assert isinstance(profiler, SamplingProfiler) and profiler.threshold == 0.5
+        assert get_sampling_profiler() is profiler
+    finally:
+        _process_profiler.reset()
+
+
+def test_only_slow_requests_are_dumped(tmp_path):
+    profiler = SamplingProfiler(threshold=0.05, directory=str(tmp_path), interval=0.001)
+    token = profiler.begin()
+    time.sleep(0.06)
+    assert profiler.end(token, 0.01, 'fast') is None
+    token = profiler.begin()
+    time.sleep(0.06)
+    path = profiler.end(token, 0.06, 'family/slow page')
+    assert os.path.basename(path).endswith('-family_slow_page-60ms.folded') and profiler.dumped == 1
+    stacks = open(path, encoding='utf-8').read().splitlines()
+    assert stacks and all(re.match(r'^.+ \d+$', line) for line in stacks)
+    assert any('test_only_slow_requests_are_dumped' in line for line in stacks)
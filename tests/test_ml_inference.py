@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from utils.dataset_manager import get_dataset_manager
+from utils.power_predictor import PowerPredictor
+
+ALL_NUMBERS = [f'{n:04d}' for n in range(10000)]
+
+
+def synthetic_history(seed=3, size=400):
+    rng = np.random.default_rng(seed)
+    pool = [f'{n:04d}' for n in rng.integers(0, 10000, 120)]
+    # Repeats within 10 draws, so both classes of the training target occur
+    return [pool[i] for i in rng.integers(0, len(pool), size)]
+
+
+def test_feature_matrix_matches_per_number_features():
+    expected = np.array([PowerPredictor().extract_features(n) for n in ALL_NUMBERS], dtype=np.float64)
+    assert np.allclose(PowerPredictor.extract_feature_matrix(ALL_NUMBERS), expected)
+
+
+def reference_power_predictions(predictor, candidates, history):
+    """The per-candidate loop predict_with_confidence replaced"""
+    predictions = []
+    for number in candidates:
+        features_scaled = predictor.scaler.transform([predictor.extract_features(number)])
+        confidences = [predictor.models[name].predict_proba(features_scaled)[0][1]
+                       for name in ('random_forest', 'gradient_boost')]
+        boost = history[-100:].count(number) / 100
+        predictions.append((number, min(np.mean(confidences) + boost * 0.2, 1.0), 'PowerML'))
+    predictions.sort(key=lambda x: x[1], reverse=True)
+    return predictions[:20]
+
+
+def test_power_predictor_batches_match_per_row_inference():
+    history = synthetic_history()
+    predictor = PowerPredictor()
+    assert predictor.train_models(history)
+
+    # Training saw the same rows as the per-number feature loop
+    rows = [predictor.extract_features(n) for n in history[:-1]]
+    assert np.allclose(predictor.scaler.mean_, np.mean(rows, axis=0))
+
+    candidates = list(dict.fromkeys(history[-200:])) + ['123', None]
+    predictions = predictor.predict_with_confidence(candidates, history)
+    expected = reference_power_predictions(predictor, candidates[:-2], history)
+    assert [n for n, _, _ in predictions] == [n for n, _, _ in expected]
+    assert [c for _, c, _ in predictions] == pytest.approx([c for _, c, _ in expected])
+
+
+def reference_ml_predictions(df, lookback=500):
+    """ml_predictor with one scaler.transform + model.predict per candidate"""
+    from sklearn.linear_model import LinearRegression
+    from sklearn.preprocessing import StandardScaler
+
+    numbers = [n for col in ('number_1st', 'number_2nd', 'number_3rd') for n in df[col].dropna() if n and len(n) == 4]
+    X = [[int(d) for d in numbers[i]] for i in range(len(numbers) - 1)]
+    y = [sum(int(d) for d in numbers[i + 1]) / 4 for i in range(len(numbers) - 1)]
+    scaler = StandardScaler()
+    model = LinearRegression().fit(scaler.fit_transform(X), y)
+    candidates = {n[:pos] + str(d) + n[pos + 1:] for n in numbers[:10] for d in range(10) for pos in range(4)}
+    scored = [(num, float(model.predict(scaler.transform([[int(d) for d in num]]))[0])) for num in candidates]
+    scored.sort(key=lambda x: x[1], reverse=True)
+    return scored[:5]
+
+
+def test_ml_predictor_batch_matches_per_row_inference(results_csv):
+    from blueprints.shared import ml_predictor
+
+    df = get_dataset_manager().get_frame()
+    expected = reference_ml_predictions(df)
+    predictions = ml_predictor(df)
+    assert [n for n, _, _ in predictions] == [n for n, _ in expected]
+    assert [s for _, s, _ in predictions] == pytest.approx([round(s, 3) for _, s in expected])
+    assert {reason for _, _, reason in predictions} == {'ML-learned'}
+    # Served again from the registered model, with the same answer
+    assert ml_predictor(df) == predictions
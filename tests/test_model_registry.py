@@ -0,0 +1,43 @@
+import os
+
+from utils.model_registry import ModelRegistry, ARTIFACT_SUFFIX
+
+
+def artifacts(root):
+    return [f for _, _, files in os.walk(root) for f in files if f.endswith(ARTIFACT_SUFFIX)]
+
+
+def test_put_saves_in_the_background_and_loads_by_version(tmp_path):
+    registry = ModelRegistry(root=str(tmp_path))
+    registry.put('model', {'weights': [1, 2]}, 'Magnum 4D', 300, version='v1')
+    registry.flush()
+    assert registry.saves == 1 and len(artifacts(tmp_path)) == 1
+
+    restarted = ModelRegistry(root=str(tmp_path))
+    assert restarted.get('model', 'Magnum 4D', 300, version='v1') == {'weights': [1, 2]}
+    assert restarted.loads == 1
+    # Another dataset version is a miss, not the newest artifact on disk
+    assert restarted.get('model', 'Magnum 4D', 300, version='v2') is None
+
+
+def test_unpersisted_models_stay_in_memory(tmp_path):
+    registry = ModelRegistry(root=str(tmp_path))
+    registry.put('model', 'window model', version='v1', persist=False)
+    registry.flush()
+    assert registry.get('model', version='v1') == 'window model'
+    assert registry.saves == 0 and not artifacts(tmp_path)
+
+    registry = ModelRegistry(root=str(tmp_path), persist=False)
+    registry.put('model', 'scratch', version='v1')
+    registry.put('model', 'canonical', version='v2', persist=True)
+    registry.flush()
+    assert registry.saves == 1 and len(artifacts(tmp_path)) == 1
+
+
+def test_prunes_to_the_newest_artifacts(tmp_path):
+    registry = ModelRegistry(root=str(tmp_path), keep=2)
+    for version in ('v1', 'v2', 'v3'):
+        registry.put('model', version, version=version)
+    registry.flush()
+    assert len(artifacts(tmp_path)) == 2
+    assert len(registry.entries('model')) == 2
@@ -0,0 +1,36 @@
+from collections import Counter
+
+import numpy as np
+
+from utils.app_grid import generate_4x4_grids, generate_reverse_grids
+from utils.extra_patterns import detect_extra_patterns
+from utils.month_replay import extra_kind_counts, pattern_kind_frequencies
+from utils.pattern_finder import find_all_4digit_patterns
+from utils.pattern_stats import compute_pattern_frequencies
+
+
+def sample_grids():
+    rng = np.random.default_rng(7)
+    numbers = rng.integers(0, 10000, 300)
+    # Random digits too, so that every rule (palindromes, progressions, all sum bands) gets hit
+    return np.concatenate([generate_4x4_grids(numbers), generate_reverse_grids(numbers),
+                           rng.integers(0, 10, (300, 4, 4)), np.zeros((1, 4, 4), dtype=np.int64)])
+
+
+def test_extra_kind_counts_match_the_detectors():
+    grids = sample_grids()
+    counts = extra_kind_counts(grids)
+    seen = Counter()
+    for n, grid in enumerate(grids.astype(np.int64).tolist()):
+        expected = Counter(kind for kind, _, _, _ in detect_extra_patterns(grid))
+        seen.update(expected)
+        assert {kind: int(c[n]) for kind, (c, _) in counts.items() if c[n]} == dict(expected)
+    assert set(seen) == set(counts)
+
+
+def test_pattern_kind_frequencies_match_the_per_draw_count():
+    grids = sample_grids()
+    draws = [{'patterns': find_all_4digit_patterns(grid) + detect_extra_patterns(grid)}
+             for grid in grids.astype(np.int64).tolist()]
+    assert pattern_kind_frequencies(grids) == compute_pattern_frequencies(draws)
+    assert pattern_kind_frequencies(grids[:0]) == []
@@ -0,0 +1,110 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from utils.number_scoring import hot_digit_scores, number_codes, pair_scores, top_k, transition_scores
+
+ALL_NUMBERS = [f'{n:04d}' for n in range(10000)]
+
+
+def reference_scores(recent_numbers):
+    """
+    The per-candidate loop advanced_predictor used to run, over every number:
+    hot digits relative to the hottest, 0.06 per occurrence of each adjacent
+    pair, and the share of the newest number's successors (in draw order)
+    that were the candidate.
+    """
+    digit_counts = Counter(''.join(recent_numbers))
+    max_digit_freq = max(digit_counts.values())
+    pair_counts = Counter(num[i:i + 2] for num in recent_numbers for i in range(3))
+    chain = recent_numbers[::-1]
+    successors = Counter(nxt for prev, nxt in zip(chain, chain[1:]) if prev == chain[-1])
+    followed = sum(successors.values())
+    hot, pair, trans = {}, {}, {}
+    for num in ALL_NUMBERS:
+        hot[num] = sum(digit_counts.get(d, 0) / max_digit_freq for d in num)
+        pair[num] = sum(pair_counts.get(num[i:i + 2], 0) for i in range(3)) * 0.06
+        trans[num] = successors[num] / followed if followed else 0.0
+    return hot, pair, trans
+
+
+def reference_top(scores, k=5):
+    """Best first, equal scores by number"""
+    return sorted(scores, key=lambda num: (-round(scores[num], 9), num))[:k]
+
+
+def history(seed, size=300, newest_repeats=True):
+    rng = np.random.default_rng(seed)
+    # A small pool, so numbers, pairs and successors repeat
+    pool = [f'{n:04d}' for n in rng.integers(0, 10000, 40)]
+    numbers = [pool[i] for i in rng.integers(0, len(pool), size)]
+    if not newest_repeats:
+        numbers[0] = next(n for n in ALL_NUMBERS if n not in numbers)
+    return numbers
+
+
+@pytest.mark.parametrize('newest_repeats', [True, False])
+def test_scores_match_the_per_candidate_loop(newest_repeats):
+    recent = history(5, newest_repeats=newest_repeats)
+    codes = number_codes(recent + ['12a4', None, '123'])
+    assert len(codes) == len(recent)
+    hot, pair, trans = reference_scores(recent)
+    for vectorized, expected in ((hot_digit_scores(codes), hot), (pair_scores(codes), pair),
+                                 (transition_scores(codes), trans)):
+        assert vectorized == pytest.approx([expected[num] for num in ALL_NUMBERS])
+    if not newest_repeats:
+        # Nothing ever followed the newest number: no transition term at all
+        assert not transition_scores(codes).any()
+    else:
+        assert transition_scores(codes).sum() == pytest.approx(1.0)
+
+
+def test_top_k_breaks_ties_by_number():
+    rng = np.random.default_rng(2)
+    scores = rng.integers(0, 4, 10000).astype(np.float64)
+    by_number = dict(zip(ALL_NUMBERS, scores))
+    for k in (1, 5, 50):
+        assert [f'{code:04d}' for code in top_k(scores, k)] == reference_top(by_number, k)
+    assert list(top_k(np.array([1.0, 3.0, 3.0]), 10)) == [1, 2, 0]
+    assert len(top_k(scores, 0)) == 0
+
+
+def test_equal_hot_scores_tie_exactly():
+    # 1-4 are the hottest digits: every number made only of them has the top
+    # score, whatever the order of its digits, and the lowest numbers win
+    codes = number_codes(['1234', '4321', '2143', '5678', '5600'])
+    hot = hot_digit_scores(codes)
+    assert len(set(hot[[1111, 1234, 4321, 2143, 4444]].tolist())) == 1
+    assert [f'{c:04d}' for c in top_k(hot, 5)] == ['1111', '1112', '1113', '1114', '1121']
+    # Digit frequencies that are not exact binary fractions still tie exactly
+    hot = hot_digit_scores(np.random.default_rng(1).integers(0, 10000, 200))
+    permutations = [1100, 1010, 1001, 110, 101, 11]
+    assert len(set(hot[permutations].tolist())) == 1
+    only_these = np.where(np.isin(np.arange(10000), permutations), hot, 0)
+    assert list(top_k(only_these, 3)) == [11, 101, 110]
+
+
+@pytest.mark.parametrize('provider', [None, 'Magnum 4D'])
+@pytest.mark.parametrize('seed', [0, 4])
+def test_advanced_predictor_matches_the_per_candidate_loop(results_csv, provider, seed):
+    from conftest import write_results_csv
+    from blueprints.shared import advanced_predictor, compute_provider_bias
+    from utils.dataset_manager import get_dataset_manager
+    from utils.stats_store import get_stats_store
+
+    write_results_csv(results_csv, rows=240, seed=seed)
+    df = get_dataset_manager().get_frame()
+    recent = get_stats_store().stats_for(df).recent_numbers(200)
+    hot, pair, trans = reference_scores(recent)
+    multiplier = compute_provider_bias(df, provider)
+    scores = {num: (hot[num] + pair[num] + trans[num] * 0.5) * multiplier for num in ALL_NUMBERS}
+    expected = reference_top(scores)
+
+    predictions = advanced_predictor(df, provider=provider, lookback=200)
+    assert [num for num, _, _ in predictions] == expected
+    assert [score for _, score, _ in predictions] == pytest.approx([scores[n] / scores[expected[0]] for n in expected])
+    for num, _, reason in predictions:
+        assert reason.startswith(f'hot={hot[num]:.2f}')
+        assert ('trans+' in reason) == bool(trans[num])
+        assert reason.endswith(f'prov*{multiplier:.2f}') == bool(provider)
@@ -0,0 +1,57 @@
+from collections import Counter
+
+import numpy as np
+
+from utils.app_grid import generate_4x4_grid, generate_reverse_grid
+from utils.pattern_finder import count_patterns, find_all_4digit_patterns
+
+
+def reference_patterns(grid):
+    """The recursive enumeration find_all_4digit_patterns replaced"""
+    patterns = []
+
+    def kind_of(path):
+        if all(x == path[0][0] for x, y in path):
+            return 'row'
+        if all(y == path[0][1] for x, y in path):
+            return 'col'
+        if all(x == y for x, y in path):
+            return 'diag_main'
+        if all(x + y == 3 for x, y in path):
+            return 'diag_anti'
+        return 'other'
+
+    def collect(r, c, path):
+        if len(path) == 4:
+            patterns.append((kind_of(path), 0, ''.join(str(grid[x][y]) for x, y in path), path))
+            return
+        for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1), (1, 1), (1, -1), (-1, 1), (-1, -1)]:
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < 4 and 0 <= nc < 4 and (nr, nc) not in path:
+                collect(nr, nc, path + [(nr, nc)])
+
+    for i in range(4):
+        for j in range(4):
+            collect(i, j, [(i, j)])
+    return patterns
+
+
+def test_matches_recursive_enumeration():
+    for number in ('0000', '1234', '9087', '5555'):
+        for grid in (generate_4x4_grid(number), generate_reverse_grid(number)):
+            assert find_all_4digit_patterns(grid) == reference_patterns(grid)
+
+
+def test_returned_paths_are_private_copies():
+    grid = generate_4x4_grid('1234')
+    first = find_all_4digit_patterns(grid)
+    first[0][3].append((9, 9))
+    first[1][3].clear()
+    assert find_all_4digit_patterns(grid) == reference_patterns(grid)
+
+
+def test_count_patterns_batch_matches_scalar():
+    rng = np.random.default_rng(0)
+    grids = [generate_4x4_grid(f'{n:04d}') for n in rng.integers(0, 10000, 20)]
+    expected = Counter(p for grid in grids for _, _, p, _ in reference_patterns(grid))
+    assert count_patterns(grids) == expected
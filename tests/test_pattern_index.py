@@ -0,0 +1,67 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+import numpy as np
+import pytest
+
+from test_ingest import REPO
+from utils.app_grid import generate_4x4_grid, generate_reverse_grid
+from utils.pattern_finder import find_all_4digit_patterns, find_missing_digits, search_pattern_in_grid
+from utils.pattern_index import PatternIndex, _load_index_arrays, build_index_arrays, is_number_grid
+
+
+@pytest.fixture(scope='module')
+def index():
+    return PatternIndex(build_index_arrays())
+
+
+NUMBERS = ['0000', '0123', '4455', '9087', '7777', '1212']
+
+
+def test_lookups_match_scanning_the_grid(index):
+    for number in NUMBERS:
+        for direction, make_grid in (('forward', generate_4x4_grid), ('reverse', generate_reverse_grid)):
+            grid = make_grid(number)
+            scanned = {p for _, _, p, _ in find_all_4digit_patterns(grid)}
+            assert index.patterns(number, direction) == scanned
+            assert index.missing_digits(number, direction) == find_missing_digits(grid)
+
+
+def test_search_matches_scan():
+    rng = np.random.default_rng(1)
+    for number in NUMBERS:
+        grid = generate_4x4_grid(number)
+        patterns = find_all_4digit_patterns(grid)
+        targets = {patterns[i][2] for i in rng.integers(0, len(patterns), 5)} | {'0000', '12'}
+        for target in targets:
+            assert search_pattern_in_grid(grid, target) == [c for _, _, p, c in patterns if p == target]
+    # Non-digit grids fall back to joining the cell text
+    grid = [['a', 'b', 'c', 'd']] * 4
+    assert search_pattern_in_grid(grid, 'abcd')
+
+
+def test_is_number_grid():
+    assert is_number_grid(generate_4x4_grid('0123'), '0123')
+    assert is_number_grid(generate_reverse_grid('0123'), '0123', 'reverse')
+    assert not is_number_grid(generate_4x4_grid('0123'), '0124')
+    assert not is_number_grid([['x']], '0123')
+
+
+def test_workers_building_at_once_leave_one_complete_index(tmp_path, index):
+    index_dir = str(tmp_path / 'index')
+    script = textwrap.dedent(f'''
+        import sys
+        sys.path.insert(0, {REPO!r})
+        from utils.pattern_index import build_pattern_index
+        build_pattern_index({index_dir!r})
+    ''')
+    children = [subprocess.Popen([sys.executable, '-c', script]) for _ in range(3)]
+    assert all(child.wait(timeout=120) == 0 for child in children)
+
+    assert sorted(os.listdir(index_dir)) == sorted(['meta.json'] + [f'{name}.npy' for name in index._arrays])
+    loaded = PatternIndex(_load_index_arrays(index_dir))
+    for number in NUMBERS:
+        assert loaded.patterns(number) == index.patterns(number)
+        assert loaded.missing_digits(number, 'reverse') == index.missing_digits(number, 'reverse')
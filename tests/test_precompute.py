@@ -0,0 +1,116 @@
+import threading
+import time
+
+import pytest
+
+from conftest import write_results_csv
+from utils.dataset_manager import get_dataset_manager
+from utils.ensemble import Outcome
+from utils.precompute import PrecomputeScheduler, compute_detached
+
+
+def wait_for(condition, timeout=10):
+    deadline = time.time() + timeout
+    while not condition():
+        if time.time() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def newest_first(df, provider, lookback):
+    return [(df['number_1st'].iloc[0], 1.0)]
+
+
+@pytest.fixture
+def scheduler(results_csv):
+    scheduler = PrecomputeScheduler(get_dataset_manager(), poll_interval=60)
+    yield scheduler
+    scheduler.stop()
+
+
+def test_stale_result_is_served_while_a_refresh_runs(scheduler, results_csv):
+    entered, release = threading.Event(), threading.Event()
+
+    def slow(df, provider, lookback):
+        if calls:
+            entered.set()
+            release.wait(10)
+        calls.append(df['number_1st'].iloc[0])
+        return [(calls[-1], 1.0)]
+
+    calls = []
+    scheduler.register('slow', slow)
+    old_version, old = scheduler.get('slow', provider='a')
+
+    write_results_csv(results_csv, rows=60, seed=1)
+    refresher = threading.Thread(target=scheduler.refresh)
+    refresher.start()
+    assert entered.wait(10)
+    # Mid-refresh: the old result, under its own version, without computing again
+    assert scheduler.get('slow', provider='a') == (old_version, old)
+    assert len(calls) == 1
+    release.set()
+    refresher.join(10)
+
+    new_version, new = scheduler.get('slow', provider='a')
+    assert new_version == get_dataset_manager().version != old_version
+    assert new == [(calls[-1], 1.0)] and len(calls) == 2
+
+
+def test_a_version_bump_wakes_the_worker_to_recompute(scheduler, results_csv):
+    calls = []
+
+    def first(df, provider, lookback):
+        calls.append(provider)
+        return newest_first(df, provider, lookback)
+
+    scheduler.register('first', first)
+    scheduler.warm(lambda frame: [scheduler.key('first', provider='warm')])
+    scheduler.start()
+    key = scheduler.key('first', provider='warm')
+    assert wait_for(lambda: scheduler.results.peek(key) is not None)
+    version = scheduler.results.peek(key)[0]
+    assert version == get_dataset_manager().version and scheduler.running
+
+    write_results_csv(results_csv, rows=60, seed=1)
+    get_dataset_manager().refresh()  # the reload event wakes the worker, not its 60s poll
+    assert wait_for(lambda: scheduler.results.peek(key)[0] == get_dataset_manager().version)
+    assert scheduler.results.peek(key)[1] == newest_first(get_dataset_manager().get_frame(), None, 0)
+    assert calls == ['warm', 'warm']
+
+
+class RecordingExecutor:
+    """EnsembleExecutor stand-in: runs each call here and records what it was asked for"""
+
+    def __init__(self, fail=()):
+        self.batches = []
+        self.fail = fail
+
+    def run(self, calls, timeouts=None):
+        self.batches.append((sorted(calls), dict(timeouts or {})))
+        return {key: Outcome('error', None, 0.0) if key.provider in self.fail
+                else Outcome('ok', func(*args), 0.0) for key, (func, args) in calls.items()}
+
+
+def test_get_many_sends_only_cold_keys_to_the_executor(scheduler):
+    scheduler.register('first', newest_first)
+    warm_key, cold_key, failing_key = (scheduler.key('first', provider=p) for p in ('a', 'b', 'c'))
+    _, warm = scheduler.get('first', provider='a')
+    executor = RecordingExecutor(fail=('c',))
+
+    results = scheduler.get_many([warm_key, cold_key, failing_key, cold_key], executor, {'first': 5})
+    assert executor.batches == [(sorted([cold_key, failing_key]), {cold_key: 5, failing_key: 5})]
+    assert results == [warm, warm, [], warm]
+    # The executor's result is cached under the version it was computed on; the failed key is not
+    assert scheduler.results.peek(cold_key) == (get_dataset_manager().version, warm)
+    assert scheduler.results.peek(failing_key) is None
+
+    scheduler.get_many([cold_key], executor)
+    assert len(executor.batches) == 1
+
+
+def test_compute_detached_reads_the_process_dataset(results_csv):
+    version, result = compute_detached(newest_first, 'all', '', None, 200)
+    assert version == get_dataset_manager().version
+    assert result == newest_first(get_dataset_manager().get_frame(), None, 200)
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+from utils.prediction_evaluator import evaluate_predictions
+
+PRIZES = ('1st_real', '2nd_real', '3rd_real')
+
+
+def results_frame(rows):
+    """(date, provider, 1st, 2nd, 3rd) tuples -> the canonical columns the evaluator reads"""
+    df = pd.DataFrame(rows, columns=['date', 'provider_key'] + list(PRIZES))
+    df['date_parsed'] = pd.to_datetime(df['date'])
+    return df
+
+
+def expected_hits(predicted, actuals):
+    """Scalar reference: exact, 3-digit (three shared distinct digits) and box hits of each predicted number"""
+    exact = three = box = 0
+    for number in predicted:
+        valid = [a for a in actuals if isinstance(a, str) and len(a) == 4 and a.isdigit()]
+        exact += number in actuals
+        three += any(len(set(number) & set(a)) == 3 for a in valid)
+        box += any(sorted(number) == sorted(a) for a in valid)
+    return exact, three, box
+
+
+def test_hits_match_a_scalar_reference():
+    rng = np.random.default_rng(3)
+    days = pd.date_range('2025-01-01', periods=20).strftime('%Y-%m-%d')
+    rows = [(day, provider, *(f'{n:04d}' for n in rng.integers(0, 10000, 3)))
+            for day in days for provider in ('magnum', 'toto')]
+    df = results_frame(rows)
+    actual = {(r[0], r[1]): r[2:] for r in rows}
+
+    pending = []
+    for i in range(200):
+        day, provider = days[i % 20], ('magnum', 'toto')[i % 2]
+        prizes = actual[(day, provider)]
+        # Mix in exact hits, permutations (box) and one-digit changes (3-digit)
+        numbers = [f'{n:04d}' for n in rng.integers(0, 10000, 4)]
+        numbers.append(prizes[0] if i % 3 == 0 else prizes[1][::-1])
+        numbers.append(prizes[2][:3] + str((int(prizes[2][3]) + 1) % 10))
+        pending.append({'draw_date': f'{day} (Wednesday)', 'provider': f' {provider.upper()} ',
+                        'predicted_numbers': ','.join(numbers)})
+    pending = pd.DataFrame(pending, index=pd.RangeIndex(100, 300))
+
+    result = evaluate_predictions(pending, df)
+    assert list(result.index) == list(pending.index)
+    for row_id, row in pending.iterrows():
+        day, provider = row['draw_date'].split(' ')[0], row['provider'].strip().lower()
+        predicted = row['predicted_numbers'].split(',')
+        exact, three, box = expected_hits(predicted, actual[(day, provider)])
+        got = result.loc[row_id]
+        assert (got['exact_hits'], got['three_digit_hits'], got['box_hits']) == (exact, three, box)
+        assert tuple(got[['actual_1st', 'actual_2nd', 'actual_3rd']]) == actual[(day, provider)]
+        if exact:
+            assert got['hit_status'] == f'HIT ({exact} matches)'
+            assert got['accuracy_score'] == exact * 100 / len(predicted)
+        else:
+            assert got['hit_status'] == 'MISS' and got['accuracy_score'] == 0
+
+
+def test_unmatched_predictions_are_left_out_and_first_result_wins():
+    df = results_frame([('2025-01-02', 'magnum', '1234', '5678', None),
+                        ('2025-01-02', 'magnum', '9999', '0000', '1111')])
+    pending = pd.DataFrame({'draw_date': ['2025-01-02', '2025-01-03', 'soon', '2025-01-02'],
+                            'provider': ['magnum', 'magnum', 'magnum', 'toto'],
+                            'predicted_numbers': ['1234 4321 9999', '1234', '1234', '1234']})
+    result = evaluate_predictions(pending, df)
+    assert list(result.index) == [0]
+    assert result.loc[0, 'exact_hits'] == 1 and result.loc[0, 'box_hits'] == 2
+    assert result.loc[0, 'hit_status'] == 'HIT (1 matches)'
+    assert evaluate_predictions(pending.iloc[0:0], df).empty
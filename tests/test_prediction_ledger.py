@@ -0,0 +1,77 @@
+import json
+import subprocess
+import sys
+import textwrap
+import threading
+
+import pandas as pd
+
+from test_ingest import REPO
+from utils.prediction_ledger import PredictionLedger
+
+
+def tracking_record(i, hit_status='pending'):
+    return {'prediction_date': '2025-09-20 10:00:00', 'draw_date': f'2025-09-{20 + i % 5} (Saturday)',
+            'provider': 'magnum', 'predicted_numbers': f'{i:04d},{i + 1:04d}', 'hit_status': hit_status}
+
+
+def test_legacy_files_are_imported_once(tmp_path):
+    pd.DataFrame([tracking_record(0), tracking_record(1, 'HIT'), tracking_record(2)]).to_csv(
+        'prediction_tracking.csv', index=False)
+    with open('predictions_history.json', 'w', encoding='utf-8') as fh:
+        json.dump([{'target_date': '2025-09-21', 'provider': 'toto', 'checked': 'True'}], fh)
+
+    ledger = PredictionLedger(str(tmp_path / 'ledger.db'))
+    rows = ledger.rows('tracking')
+    assert [r['predicted_numbers'] for _, r in rows] == ['0000,0001', '0001,0002', '0002,0003']
+    assert ledger.count('tracking', status='pending') == 2
+    assert [r['hit_status'] for _, r in ledger.rows('tracking', draw_date='2025-09-21')] == ['HIT']
+    assert ledger.count('history', status='checked') == 1
+
+    # A restart (or another process) does not import the files again
+    ledger.append('tracking', tracking_record(3))
+    restarted = PredictionLedger(str(tmp_path / 'ledger.db'))
+    assert restarted.count('tracking') == 4 and restarted.count('history') == 1
+
+
+def test_updates_keep_the_status_index_in_sync(tmp_path):
+    ledger = PredictionLedger(str(tmp_path / 'ledger.db'))
+    ids = [ledger.append('tracking', tracking_record(i)) for i in range(3)]
+    revision = ledger.revision()
+    assert ledger.update_many('tracking', {ids[1]: {'hit_status': 'MISS'}, 999: {'hit_status': 'HIT'}}) == 1
+    assert ledger.revision() == revision + 1
+    assert [i for i, _ in ledger.rows('tracking', status='pending')] == [ids[0], ids[2]]
+    assert list(ledger.frame('tracking', exclude_status='pending').index) == [ids[1]]
+
+
+def test_concurrent_appends_from_threads_and_processes(tmp_path):
+    path = str(tmp_path / 'ledger.db')
+    PredictionLedger(path).count('tracking')  # schema and (empty) legacy import in place
+    script = textwrap.dedent(f'''
+        import sys
+        sys.path.insert(0, {REPO!r})
+        from utils.prediction_ledger import PredictionLedger
+        ledger = PredictionLedger({path!r})
+        for i in range(50):
+            ledger.append('tracking', {{'draw_date': '2025-09-20', 'provider': 'proc' + sys.argv[1], 'n': i}})
+    ''')
+    children = [subprocess.Popen([sys.executable, '-c', script, str(k)]) for k in range(3)]
+
+    ledger = PredictionLedger(path)
+
+    def append(k):
+        for i in range(50):
+            ledger.append('tracking', {'draw_date': '2025-09-20', 'provider': f'thread{k}', 'n': i})
+
+    threads = [threading.Thread(target=append, args=(k,)) for k in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(child.wait(timeout=60) == 0 for child in children)
+
+    rows = ledger.rows('tracking')
+    assert len(rows) == 300 and len({i for i, _ in rows}) == 300
+    for writer in [f'proc{k}' for k in range(3)] + [f'thread{k}' for k in range(3)]:
+        # Each writer's records are all there, in the order it wrote them
+        assert [r['n'] for _, r in ledger.rows('tracking', provider=writer)] == list(range(50))
@@ -0,0 +1,85 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from utils.dataset_manager import DatasetManager
+from utils.precompute import PrecomputeScheduler
+from utils.shared_dataset import SegmentDatasetManager, SharedPrecompute, publish_segment
+from utils.snapshot import NUMBER_COLUMNS
+from utils.transition_engine import encode_numbers
+
+
+def published(results_csv, segment_dir):
+    source = DatasetManager([results_csv], use_snapshot=False)
+    frame = source.get_frame(copy=False)
+    publish_segment(frame, source.version, str(segment_dir))
+    return source, frame
+
+
+def test_segment_frame_equals_the_csv_frame(results_csv, tmp_path):
+    # One draw without a 3rd prize, so a missing number goes through the segment too
+    lines = open(results_csv, encoding='utf-8').readlines()
+    lines[-1] = re.sub(r'3rd Prize 三獎 \d{4} \| ', '', lines[-1])
+    with open(results_csv, 'w', encoding='utf-8') as fh:
+        fh.writelines(lines)
+    source, expected = published(results_csv, tmp_path / 'segments')
+    worker = SegmentDatasetManager(str(tmp_path / 'segments'))
+    frame = worker.get_frame(copy=False)
+    assert worker.version == source.version and worker.segment
+
+    assert list(frame.columns) == list(expected.columns)
+    assert frame.dtypes.to_dict() == expected.dtypes.to_dict()
+    pd.testing.assert_frame_equal(frame, expected)
+    missing = expected['number_3rd'].isna()
+    assert missing.sum() == 1 and frame['number_3rd'].isna().equals(missing)
+    assert frame.loc[missing, 'number_3rd'].iloc[0] is expected.loc[missing, 'number_3rd'].iloc[0]
+    for col in NUMBER_COLUMNS:
+        assert np.array_equal(encode_numbers(frame[col]), encode_numbers(expected[col].tolist()))
+
+
+def test_counts_list_only_numbers_and_providers_in_the_data(results_csv, tmp_path):
+    _, expected = published(results_csv, tmp_path / 'segments')
+    frame = SegmentDatasetManager(str(tmp_path / 'segments')).get_frame()
+    counts = frame['number_1st'].value_counts()
+    assert len(counts) == frame['number_1st'].nunique() and (counts > 0).all()
+    assert counts.sort_index().equals(expected['number_1st'].value_counts().sort_index())
+    assert frame.groupby('provider_key').size().to_dict() == expected.groupby('provider_key').size().to_dict()
+    assert frame['number_1st'].str.isdigit().all()
+    assert pd.concat([frame.iloc[:5], frame.iloc[5:]])['number_1st'].tolist() == expected['number_1st'].tolist()
+
+
+def scheduler(manager, shared, calls):
+    def predictor(df, provider, lookback):
+        calls.append(provider)
+        return [(df['number_1st'].iloc[0], 1.0)]
+
+    precompute = PrecomputeScheduler(manager, shared=shared)
+    precompute.register('first', predictor)
+    precompute.warm(lambda frame: [precompute.key('first', 'all', '', p) for p in ('a', 'b')])
+    return precompute
+
+
+def test_only_the_elected_worker_computes_the_warm_keys(results_csv, tmp_path):
+    segment_dir = str(tmp_path / 'segments')
+    published(results_csv, segment_dir)
+    leader_calls, follower_calls = [], []
+    leader = scheduler(SegmentDatasetManager(segment_dir), SharedPrecompute(segment_dir), leader_calls)
+    follower = scheduler(SegmentDatasetManager(segment_dir), SharedPrecompute(segment_dir), follower_calls)
+
+    # The first worker to try holds the warm lock; nothing is published yet,
+    # so the other one waits instead of computing
+    assert leader.shared.elect()
+    assert follower.refresh() == 0 and follower._adopting
+
+    assert leader.refresh() == 2 and leader.shared.leader
+    assert not follower.shared.elect()
+    assert follower.refresh() == 0 and not follower._adopting
+    assert sorted(leader_calls) == ['a', 'b'] and follower_calls == []
+    key = follower.key('first', 'all', '', 'a')
+    assert follower.results.peek(key) == leader.results.peek(key)
+
+    # Keys only the follower asked for are still its own to compute
+    follower.get('first', 'all', '', 'c')
+    assert follower_calls == ['c']
+    leader.shared._lock.release()
@@ -0,0 +1,34 @@
+import pandas as pd
+import pytest
+
+from utils.dataset_manager import DatasetManager, read_canonical_csv
+from utils.snapshot import HAS_ARROW, decode_numbers, encode_numbers, read_snapshot, snapshot_path_for, write_snapshot
+
+pytestmark = pytest.mark.skipif(not HAS_ARROW, reason='pyarrow not installed')
+
+
+def test_round_trip_equals_csv_frame(results_csv, tmp_path):
+    parsed = read_canonical_csv(results_csv)
+    path = str(tmp_path / 'history.snapshot.feather')
+    write_snapshot(parsed, path, source_version='abc')
+    loaded, version = read_snapshot(path)
+
+    assert version == 'abc'
+    assert list(loaded.dtypes.astype(str)) == list(parsed.dtypes.astype(str))
+    assert loaded.equals(parsed)
+    # Plain str providers: no unobserved categories in counts
+    assert not isinstance(loaded['provider_key'].dtype, pd.CategoricalDtype)
+    assert loaded['provider_key'].value_counts().index.tolist() == parsed['provider_key'].value_counts().index.tolist()
+
+
+def test_manager_serves_snapshot_when_fresh(results_csv):
+    parsed = DatasetManager([results_csv]).get_frame()
+    manager = DatasetManager([results_csv])
+    assert manager.get_frame().equals(parsed)
+    assert manager.version is not None
+    assert read_snapshot(snapshot_path_for(results_csv))[1] == manager.version
+
+
+def test_number_codes_round_trip():
+    values = ['0000', '0123', None, '9999']
+    assert decode_numbers(encode_numbers(values)).tolist() == values
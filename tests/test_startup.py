@@ -0,0 +1,45 @@
+import threading
+
+from utils.dataset_manager import get_dataset_manager
+from utils.precompute import PrecomputeScheduler
+from utils.startup import IMPORT_LOCK, WarmUp
+
+
+def test_warm_up_and_scheduler_take_turns_on_imports(results_csv):
+    held, release = threading.Event(), threading.Event()
+    order = []
+
+    def importing(df, provider, lookback):
+        order.append('compute')
+        return [('0000', 1.0)]
+
+    scheduler = PrecomputeScheduler(get_dataset_manager())
+    scheduler.register('slow', importing)
+    scheduler.warm(lambda frame: [scheduler.key('slow', provider='a')])
+
+    def warm_up_import():
+        with IMPORT_LOCK:
+            held.set()
+            release.wait(5)
+            order.append('import')
+
+    importer = threading.Thread(target=warm_up_import)
+    importer.start()
+    held.wait(5)
+    refresher = threading.Thread(target=scheduler.refresh)
+    refresher.start()
+    refresher.join(0.2)
+    assert refresher.is_alive() and order == []
+    release.set()
+    importer.join(5)
+    refresher.join(5)
+    assert order == ['import', 'compute']
+
+
+def test_import_failures_are_skipped_not_retried():
+    warm_up = WarmUp().start(['json', 'utils.no_such_module'], delay=0)
+    assert warm_up.done.wait(10)
+    assert list(warm_up.seconds) == ['json'] and list(warm_up.failed) == ['utils.no_such_module']
+    # ... and the warm-up thread let go of the lock
+    assert IMPORT_LOCK.acquire(blocking=False)
+    IMPORT_LOCK.release()
@@ -0,0 +1,61 @@
+import numpy as np
+
+from conftest import result_lines, write_results_csv
+from test_ingest import rows_of, same_day_rows
+from utils.dataset_manager import DatasetManager, provider_slice
+from utils.ingest import ingest_rows
+from utils.stats_store import DrawStats, StatsStore
+
+
+def snapshot(stats):
+    return {'dates': list(stats.dates), 'prizes': [list(p) for p in stats.prizes],
+            'numbers': dict(stats.numbers), 'digits': dict(stats.digits),
+            'digit_pairs': dict(stats.digit_pairs), 'transitions': [dict(t) for t in stats.transitions],
+            'successors': stats.successors.tolist(), 'overlap': stats.successor_overlap.tolist(),
+            'repeats': list(stats.repeats), 'pairs': sorted(stats.number_pairs(None)),
+            'recent': stats.recent_numbers(100)}
+
+
+def test_appended_rows_match_a_rebuild(results_csv):
+    manager = DatasetManager([results_csv], use_snapshot=False)
+    store = StatsStore(manager)
+    new_rows = rows_of(result_lines(9, seed=11, start='2030-01-01')) + same_day_rows('2020-01-05', rows=9)
+    ingest_rows(new_rows, results_csv)
+    manager.refresh()
+    assert manager.appends == 1
+
+    rebuilt = StatsStore(DatasetManager([results_csv], use_snapshot=False))
+    assert store.providers() == rebuilt.providers()
+    for scope in ['all'] + store.providers():
+        assert snapshot(store.scope(scope)) == snapshot(rebuilt.scope(scope)), scope
+
+
+def test_canonical_frames_use_maintained_scopes(results_csv):
+    manager = DatasetManager([results_csv], use_snapshot=False)
+    store = StatsStore(manager)
+    frame = manager.get_frame()
+    assert store.stats_for(frame) is store.scope('all')
+    magnum, toto = 'Magnum 4D', 'Sports Toto'
+    assert magnum in store.providers() and toto in store.providers()
+    assert store.stats_for(frame, magnum) is store.scope(magnum)
+    assert store.stats_for(provider_slice(frame, toto)) is store.scope(toto)
+    # Frames from before a reload are not the current scopes
+    stale = manager.get_frame()
+    write_results_csv(results_csv, rows=60, seed=2)
+    assert store.stats_for(stale) is not store.scope('all')
+
+
+def test_other_frames_are_counted_from_their_rows(results_csv):
+    manager = DatasetManager([results_csv], use_snapshot=False)
+    store = StatsStore(manager)
+    frame = manager.get_frame()
+    # Same shape and endpoints as the canonical frame, different middle row
+    edited = frame.copy()
+    edited.loc[len(edited) // 2, 'number_1st'] = '0000'
+    stats = store.stats_for(edited)
+    assert stats is not store.scope('all')
+    assert snapshot(stats) == snapshot(DrawStats.from_frame(edited))
+    # A plain provider filter is not the maintained scope, but counts the same
+    filtered = frame[frame['provider_key'] == 'Da Ma Cai']
+    assert store.stats_for(filtered) is not store.scope('Da Ma Cai')
+    assert np.array_equal(store.stats_for(filtered).successors, store.scope('Da Ma Cai').successors)
@@ -0,0 +1,99 @@
+from collections import defaultdict
+
+import numpy as np
+import pytest
+
+from utils.day_to_day_learner import learn_day_to_day_patterns, predict_tomorrow
+from utils.markov_chain_predictor import build_markov_chain, predict_from_markov
+from utils.transition_engine import TransitionEngine
+
+
+def dict_markov(draws):
+    """The nested-dict chain build_markov_chain used to return"""
+    transitions = defaultdict(lambda: defaultdict(int))
+    for current, nxt in zip(draws, draws[1:]):
+        current, nxt = str(current), str(nxt)
+        if len(current) == 4 and len(nxt) == 4 and current.isdigit() and nxt.isdigit():
+            transitions[current][nxt] += 1
+    return transitions
+
+
+def dict_day_to_day(draws):
+    """The nested dicts learn_day_to_day_patterns used to return"""
+    digits = defaultdict(lambda: defaultdict(lambda: defaultdict(int)))
+    sequences = defaultdict(lambda: defaultdict(int))
+    for current, nxt in zip(draws, draws[1:]):
+        current, nxt = str(current.get('number', '')), str(nxt.get('number', ''))
+        if len(current) == 4 and len(nxt) == 4:
+            for pos in range(4):
+                digits[current[pos]][pos][nxt[pos]] += 1
+            sequences[current][nxt] += 1
+    return digits, sequences
+
+
+def plain(nested):
+    return {k: plain(v) if isinstance(v, dict) else v for k, v in nested.items()}
+
+
+def draws(n=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    # A small alphabet so numbers repeat and have several followers
+    pool = [f"{v:04d}" for v in rng.integers(0, 10000, 60)]
+    numbers = [pool[i] for i in rng.integers(0, len(pool), n)]
+    numbers[100] = '123'  # gaps break the chain
+    numbers[500] = ''
+    return numbers
+
+
+def test_markov_chain_matches_dict_chain():
+    numbers = draws()
+    engine, reference = build_markov_chain(numbers), dict_markov(numbers)
+    assert engine.as_dict() == plain(reference)
+    assert len(engine) == len(reference)
+    assert sorted(engine) == sorted(reference)
+    for number in list(reference)[:10]:
+        assert number in engine
+        assert engine[number] == dict(reference[number])
+        assert engine.get(number, {}) == dict(reference[number])
+        # Followers with their confidences, most frequent first (capped at 23)
+        predicted = predict_from_markov(number, engine, numbers)
+        total = sum(reference[number].values())
+        assert len(predicted) == min(23, len(reference[number]))
+        assert [c for _, c, _ in predicted] == sorted((c for _, c, _ in predicted), reverse=True)
+        for n, confidence, _ in predicted:
+            assert confidence == pytest.approx(100 * reference[number][n] / total)
+    assert '9999' not in engine or '9999' in reference
+    assert engine.get('abcd', {}) == {}
+
+
+def test_extend_matches_one_pass_build():
+    numbers = draws(seed=1)
+    engine = TransitionEngine()
+    for lo in range(0, len(numbers), 700):
+        engine.extend(numbers[lo:lo + 700])
+    assert engine.as_dict() == plain(dict_markov(numbers))
+    assert np.array_equal(engine.digits, TransitionEngine.from_draws(numbers).digits)
+
+
+def test_day_to_day_matches_dict_patterns():
+    history = [{'number': n} for n in draws(seed=2)]
+    patterns = learn_day_to_day_patterns(history)
+    digits, sequences = dict_day_to_day(history)
+    assert patterns['sequence_patterns'] == plain(sequences)
+    assert patterns.get('digit_transitions', {}) == plain(digits)
+    assert len(patterns.get('digit_transitions', {})) == len(digits)
+    recent = [d['number'] for d in history[-20:]]
+    assert predict_tomorrow([history[-1]['number']], patterns, recent)
+
+
+def test_placeholders_break_the_chain():
+    engine = build_markov_chain(['1234', '----', '5678', '1234', '5678'])
+    assert engine.as_dict() == {'5678': {'1234': 1}, '1234': {'5678': 1}}
+
+
+def test_empty_chains_are_falsy_engines():
+    for chain in (build_markov_chain([]), build_markov_chain(['1234']), learn_day_to_day_patterns([])):
+        assert isinstance(chain, TransitionEngine)
+        assert not chain
+        assert chain.get('1234', {}) == {}
+        assert chain['sequence_patterns'] == {} and chain['digit_transitions'] == {}
@@ -1,29 +1,19 @@
 from collections import defaultdict, Counter
-from utils.pattern_finder import find_all_4digit_patterns
+from utils.pattern_finder import pattern_values, count_patterns
+from utils.pattern_index import get_pattern_index, is_number_grid
 from utils.app_grid import generate_reverse_grid, generate_4x4_grid
 from scoring_modules import apply_weekend_bias, apply_grid_hotspot
 import datetime
+import heapq
 import re
-import functools
-import time
+from utils.cache import cached
 
 # Cache for expensive pattern operations
-_pattern_cache = {}
 _grid_cache = {}
 
 def cached_pattern_operation(func):
-    """Decorator for caching pattern operations"""
-    @functools.wraps(func)
-    def wrapper(*args, **kwargs):
-        cache_key = f"{func.__name__}_{hash(str(args) + str(kwargs))}"
-        if cache_key in _pattern_cache:
-            cached_time, cached_result = _pattern_cache[cache_key]
-            if time.time() - cached_time < 600:  # 10 minute cache for patterns
-                return cached_result
-        result = func(*args, **kwargs)
-        _pattern_cache[cache_key] = (time.time(), result)
-        return result
-    return wrapper
+    """Decorator for caching pattern operations (bounded LRU, 10 minute TTL; a month's replay fits)"""
+    return cached(maxsize=2048, ttl=600, name=f"ai_predictor.{func.__name__}")(func)
 
 @cached_pattern_operation
 def predict_top_5(draws, mode="combined", provider=None):
@@ -54,12 +44,20 @@ def predict_top_5(draws, mode="combined", provider=None):
     results = defaultdict(float)
     reason_map = defaultdict(set)
 
-    # Grid + reverse patterns
-    grid_patterns = find_all_4digit_patterns(grid)
-    reverse_patterns = find_all_4digit_patterns(reverse_grid)
-
-    unique_grid = set(p for _, _, p, _ in grid_patterns)
-    unique_reverse = set(p for _, _, p, _ in reverse_patterns)
+    # Grid + reverse patterns (precomputed index unless a custom grid was passed)
+    index = get_pattern_index()
+    if is_number_grid(grid, number):
+        unique_grid = index.patterns(number)
+        missing_digits = index.missing_digits(number)
+    else:
+        unique_grid = set(pattern_values(grid))
+        missing_digits = find_missing_digits(grid)
+    if is_number_grid(reverse_grid, number, "reverse"):
+        unique_reverse = index.patterns(number, "reverse")
+        missing_digits_reverse = index.missing_digits(number, "reverse")
+    else:
+        unique_reverse = set(pattern_values(reverse_grid))
+        missing_digits_reverse = find_missing_digits(reverse_grid)
 
     for p in unique_grid:
         if len(p) == 4 and p.isdigit():
@@ -72,14 +70,12 @@ def predict_top_5(draws, mode="combined", provider=None):
             reason_map[p].add("reverse")
 
     # Missing digits
-    missing_digits = find_missing_digits(grid)
     for md in missing_digits:
         cand = str(int(md) * 4).zfill(4)
         if len(cand) == 4 and cand.isdigit():
             results[cand] += 0.25
             reason_map[cand].add("missing")
 
-    missing_digits_reverse = find_missing_digits(reverse_grid)
     for md in missing_digits_reverse:
         cand = str(int(md) * 4).zfill(4)
         if len(cand) == 4 and cand.isdigit():
@@ -87,14 +83,8 @@ def predict_top_5(draws, mode="combined", provider=None):
             reason_map[cand].add("reverse_missing")
 
     # Frequency scoring
-    freq_counter = defaultdict(int)
-    for d in draws[:-1]:
-        if "grid" in d:
-            for _, _, p, _ in find_all_4digit_patterns(d["grid"]):
-                freq_counter[p] += 1
-        if "reverse_grid" in d:
-            for _, _, p, _ in find_all_4digit_patterns(d["reverse_grid"]):
-                freq_counter[p] += 1
+    freq_counter = count_patterns([d["grid"] for d in draws[:-1] if "grid" in d])
+    freq_counter.update(count_patterns([d["reverse_grid"] for d in draws[:-1] if "reverse_grid" in d]))
 
     for cand in results:
         if freq_counter[cand] > 0:
@@ -146,16 +136,11 @@ def predict_top_5(draws, mode="combined", provider=None):
                     results[cand] *= 1.03
                     reason_map[cand].add(f"provpattern-{prov_key}")
 
-    # Format final predictions
-    formatted = []
-    for cand, score in results.items():
-        if len(cand) == 4 and cand.isdigit():
-            capped = min(score, 1.0)
-            confidence = round(capped * 100, 2)
-            reason = "+".join(sorted(reason_map[cand]))
-            formatted.append((cand, confidence, reason))
-
-    sorted_preds = sorted(formatted, key=lambda x: -x[1])[:5]
+    # Format final predictions (reasons only for the top 5; nsmallest keeps sorted()'s tie order)
+    confidences = [(cand, round(min(score, 1.0) * 100, 2))
+                   for cand, score in results.items() if len(cand) == 4 and cand.isdigit()]
+    sorted_preds = [(cand, confidence, "+".join(sorted(reason_map[cand])))
+                    for cand, confidence in heapq.nsmallest(5, confidences, key=lambda x: -x[1])]
 
     return {
         "combined": sorted_preds,
@@ -1,5 +1,14 @@
 # utils/app_grid.py
 
+import numpy as np
+
+_POWERS = np.array([1000, 100, 10, 1])
+# Offset of each row from the number's digits (mod 10); row 2 is the
+# formula map 0->5, 1->6, ... 9->4
+_FORWARD_OFFSETS = np.array([0, 5, 6, 7])[:, None]
+_REVERSE_OFFSETS = np.array([0, 5, 4, 3])[:, None]
+
+
 def _to_str4(number_str):
     """Ensure input is string of length 4 (pad if needed)."""
     s = str(number_str)
@@ -7,34 +16,52 @@ def _to_str4(number_str):
         s = s.zfill(4)
     return s
 
-def generate_4x4_grid(number_str):
+
+def number_digits(numbers):
     """
-    Main grid (+1 progression)
-    Row1 = original number (unchanged)
-    Row2 = formula_map applied
-    Row3 = Row2 + 1 (wraparound %10)
-    Row4 = Row3 + 1 (wraparound %10)
+    (N,) numbers -> (N, 4) digits. Accepts ints 0-9999 (e.g. uint16),
+    4-digit strings, or an (N, 4) digit array (returned as is).
     """
-    number_str = _to_str4(number_str)
+    arr = np.asarray(numbers)
+    if arr.ndim == 2:
+        return arr.astype(np.int64)
+    if arr.dtype.kind not in 'iu':
+        arr = arr.astype(str).astype(np.int64)
+    return (arr.astype(np.int64)[:, None] // _POWERS) % 10
+
+
+def _forward_rows(digits):
+    """(..., k) digits -> (..., 4, k): the number, then the formula map, +1, +2"""
+    return (digits[..., None, :] + _FORWARD_OFFSETS) % 10
+
+
+def _reverse_rows(digits):
+    """(..., k) digits -> (..., 4, k): the number, the formula map, -1 (wrapping), -1 (stopping at 0)"""
+    rows = (digits[..., None, :] + _REVERSE_OFFSETS) % 10
+    rows[..., 3, :] = np.where(rows[..., 2, :] == 0, 0, rows[..., 3, :])
+    return rows
 
-    formula_map = {
-        '0': 5, '1': 6, '2': 7, '3': 8, '4': 9,
-        '5': 0, '6': 1, '7': 2, '8': 3, '9': 4
-    }
 
-    # Row1: original number (fresh list)
-    row1 = [int(d) for d in number_str]
+def generate_4x4_grids(numbers):
+    """Forward grids of N numbers (see number_digits) as one (N, 4, 4) uint8 array"""
+    return _forward_rows(number_digits(numbers)).astype(np.uint8)
 
-    # Row2: formula map fully applied (fresh list)
-    row2 = [formula_map[d] for d in number_str]
 
-    # Row3: row2 + 1 (wraparound) -> create new list from row2 values (do not mutate row2)
-    row3 = [ (x + 1) % 10 for x in row2 ]
+def generate_reverse_grids(numbers):
+    """Reverse grids of N numbers (see number_digits) as one (N, 4, 4) uint8 array"""
+    return _reverse_rows(number_digits(numbers)).astype(np.uint8)
 
-    # Row4: row3 + 1 (wraparound)
-    row4 = [ (x + 1) % 10 for x in row3 ]
 
-    return [row1, row2, row3, row4]
+def generate_4x4_grid(number_str):
+    """
+    Main grid (+1 progression)
+    Row1 = original number (unchanged)
+    Row2 = formula_map applied
+    Row3 = Row2 + 1 (wraparound %10)
+    Row4 = Row3 + 1 (wraparound %10)
+    """
+    digits = np.array([int(d) for d in _to_str4(number_str)])
+    return _forward_rows(digits).tolist()
 
 
 def generate_reverse_grid(number_str):
@@ -45,23 +72,5 @@ def generate_reverse_grid(number_str):
     Row3 = Row2 - 1 (wraparound %10)
     Row4 = Row3 - 1 (saturate at 0, no wraparound)
     """
-    number_str = _to_str4(number_str)
-
-    formula_map = {
-        '0': 5, '1': 6, '2': 7, '3': 8, '4': 9,
-        '5': 0, '6': 1, '7': 2, '8': 3, '9': 4
-    }
-
-    # Row1: ALWAYS a fresh list of original digits
-    row1 = [int(d) for d in number_str]
-
-    # Row2: formula map (fresh list)
-    row2 = [formula_map[d] for d in number_str]
-
-    # Row3: row2 -1 with wraparound (fresh list)
-    row3 = [ (x - 1) % 10 for x in row2 ]
-
-    # Row4: row3 -1 but saturate at 0 (fresh list)
-    row4 = [ (x - 1) if x > 0 else 0 for x in row3 ]
-
-    return [row1, row2, row3, row4]
+    digits = np.array([int(d) for d in _to_str4(number_str)])
+    return _reverse_rows(digits).tolist()
@@ -0,0 +1,325 @@
+"""
+Walk-Forward Backtest
+Replays the draw history through any predictor with strict no-lookahead windows
+"""
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+PRIZE_COLUMNS = ['number_1st', 'number_2nd', 'number_3rd']
+DEFAULT_KS = (1, 5, 10)
+DEFAULT_OUTPUT = 'backtest_results.csv.gz'
+
+
+# ---- predictors: predictor(history, provider) -> [number or (number, score, ...)] ----
+# ``history`` is a newest-first canonical frame holding only draws dated
+# strictly before the target draw. Imports are local so workers only load
+# what they run.
+
+def _advanced(history, provider):
+    from blueprints.shared import advanced_predictor
+    return advanced_predictor(history, provider=provider)
+
+
+def _smart(history, provider):
+    from blueprints.shared import smart_auto_weight_predictor
+    return smart_auto_weight_predictor(history, provider=provider)
+
+
+def _ml(history, provider):
+    from blueprints.shared import ml_predictor
+    return ml_predictor(history)
+
+
+def _markov(history, provider):
+    from utils.markov_predictor import markov_chain_predictor
+    return markov_chain_predictor(history)
+
+
+def _xgboost(history, provider):
+    from utils.xgboost_predictor import xgboost_predictor
+    return xgboost_predictor(history)
+
+
+def _association(history, provider):
+    from utils.association_rules import association_rules_predictor
+    return association_rules_predictor(history)
+
+
+def _cycle(history, provider):
+    from utils.cycle_predictor import predict_next_cycle_numbers
+    # Adds a day_of_week column to the frame it is given
+    return predict_next_cycle_numbers(history.copy(), provider)
+
+
+def _power(history, provider):
+    from utils.power_predictor import enhanced_predictor
+    return enhanced_predictor(history, provider=provider)
+
+
+def _lstm(history, provider):
+    from utils.lstm_predictor import lstm_predictor
+    return lstm_predictor(history)
+
+
+def _pattern(history, provider):
+    from utils.ai_predictor import predict_top_5
+    from utils.app_grid import generate_4x4_grid
+    last = history.iloc[0]
+    number = last['number_1st']
+    draw = [{'number': number, 'grid': generate_4x4_grid(number),
+             'date': last['date_parsed'].strftime('%Y-%m-%d')}]
+    return predict_top_5(draw).get('combined', [])
+
+
+PREDICTORS = {
+    'advanced': _advanced,
+    'smart': _smart,
+    'ml': _ml,
+    'markov': _markov,
+    'xgboost': _xgboost,
+    'association': _association,
+    'cycle': _cycle,
+    'power': _power,
+    'lstm': _lstm,
+    'pattern': _pattern,
+}
+
+
+def normalize_predictions(predictions):
+    """Predictor output -> unique 4-digit strings, best first"""
+    out, seen = [], set()
+    for item in predictions or []:
+        if isinstance(item, dict):
+            item = item.get('number')
+        elif isinstance(item, (list, tuple)):
+            item = item[0] if item else None
+        number = str(item).strip() if item is not None else ''
+        if len(number) == 4 and number.isdigit() and number not in seen:
+            seen.add(number)
+            out.append(number)
+    return out
+
+
+# ---- scoring ----
+
+def score_draw(predicted, actuals, ks=DEFAULT_KS):
+    """
+    Hits of one prediction list against a draw's 1st/2nd/3rd prizes.
+
+    - ``hit@k``: one of the top k predictions is an exact winner
+    - ``three_digit``: a top-max(k) prediction shares 3 distinct digits with a winner
+    - ``box``: a top-max(k) prediction is a permutation of a winner (exact included)
+    """
+    winners = [a for a in actuals if isinstance(a, str) and len(a) == 4]
+    top = predicted[:max(ks)]
+    row = {f'hit@{k}': int(any(p in winners for p in predicted[:k])) for k in ks}
+    row['three_digit'] = int(any(len(set(p) & set(a)) == 3 for p in top for a in winners))
+    boxes = {''.join(sorted(a)) for a in winners}
+    row['box'] = int(any(''.join(sorted(p)) in boxes for p in top))
+    return row
+
+
+def summarize(records, ks=DEFAULT_KS):
+    """Per predictor x provider hit rates (%), plus an 'all' row per predictor"""
+    if records.empty:
+        return pd.DataFrame()
+    metrics = [f'hit@{k}' for k in ks] + ['three_digit', 'box']
+    overall = records.assign(provider='all')
+    frame = pd.concat([records.astype({'provider': str}), overall], ignore_index=True)
+    grouped = frame.groupby(['predictor', 'provider'], sort=True)
+    summary = (grouped[metrics].mean() * 100).round(2)
+    summary.insert(0, 'draws', grouped.size())
+    summary['errors'] = grouped['error'].sum()
+    return summary.reset_index()
+
+
+# ---- walk-forward replay ----
+
+def history_positions(dates):
+    """
+    For a newest-first date array, the first row position dated strictly
+    before each row: ``frame.iloc[start:]`` is then that row's history.
+    """
+    keys = -np.asarray(dates, dtype='datetime64[ns]').astype(np.int64)
+    return np.searchsorted(keys, keys, side='right')
+
+
+def select_targets(df, providers=None, start=None, end=None, stride=1, limit=None, min_history=30):
+    """Row positions (newest-first frame) to replay, oldest target first"""
+    dates = df['date_parsed']
+    mask = pd.Series(True, index=df.index)
+    if providers:
+        mask &= df['provider_key'].isin(providers)
+    if start is not None:
+        mask &= dates >= pd.Timestamp(start)
+    if end is not None:
+        mask &= dates <= pd.Timestamp(end)
+    starts = history_positions(dates)
+    mask &= (len(df) - starts) >= min_history
+    positions = np.flatnonzero(mask.to_numpy())[::-1][::max(int(stride), 1)]
+    if limit:
+        positions = positions[-int(limit):]
+    return positions
+
+
+_worker_frame = None
+_worker_starts = None
+
+
+def _init_worker(csv_path, version):
+    global _worker_frame, _worker_starts
+    logging.basicConfig(level=logging.WARNING)
+    from utils.dataset_manager import DatasetManager
+    from utils.model_registry import get_model_registry
+    # Models of backtest windows are never reused: keep them in memory only
+    get_model_registry().persist = False
+    manager = DatasetManager([csv_path])
+    frame = manager.get_frame(copy=False)
+    if version and manager.version != version:
+        raise RuntimeError(f"Dataset changed under the backtest ({csv_path})")
+    _worker_frame = frame
+    _worker_starts = history_positions(frame['date_parsed'])
+
+
+def _run_fold(name, positions, window, per_provider, ks):
+    return replay(_worker_frame, name, positions, window=window, per_provider=per_provider,
+                  ks=ks, starts=_worker_starts)
+
+
+def replay(df, name, positions, window=None, per_provider=False, ks=DEFAULT_KS, starts=None):
+    """
+    Run one predictor over the given target rows of a newest-first canonical
+    frame. Each target sees only rows dated strictly before it (the latest
+    ``window`` of them, optionally only its own provider's). Returns a list
+    of per-draw records.
+    """
+    predictor = PREDICTORS[name]
+    starts = history_positions(df['date_parsed']) if starts is None else starts
+    providers = df['provider_key'].to_numpy()
+    records = []
+    for pos in positions:
+        pos = int(pos)
+        target = df.iloc[pos]
+        history = df.iloc[starts[pos]:]
+        if per_provider:
+            history = history[providers[starts[pos]:] == providers[pos]]
+        if window:
+            history = history.iloc[:window]
+
+        error = 0
+        began = time.perf_counter()
+        try:
+            predicted = normalize_predictions(predictor(history, target['provider_key']))
+        except Exception as e:
+            logger.warning(f"{name} failed on {target['date_parsed'].date()}: {e}")
+            predicted, error = [], 1
+        record = {
+            'predictor': name,
+            'provider': target['provider_key'],
+            'date': target['date_parsed'],
+            'history': len(history),
+        }
+        record.update(score_draw(predicted, [target[c] for c in PRIZE_COLUMNS], ks))
+        record['error'] = error
+        record['ms'] = round((time.perf_counter() - began) * 1000, 1)
+        record['predicted'] = ' '.join(predicted[:max(ks)])
+        records.append(record)
+    return records
+
+
+def _folds(positions, n_folds):
+    """Contiguous chunks of target positions (chronological)"""
+    return [chunk for chunk in np.array_split(positions, max(n_folds, 1)) if len(chunk)]
+
+
+def run_backtest(predictors=None, csv_path=None, providers=None, start=None, end=None,
+                 window=1000, per_provider=False, stride=1, limit=None, ks=DEFAULT_KS,
+                 workers=None, folds_per_worker=4, output=DEFAULT_OUTPUT):
+    """
+    Walk-forward backtest of the named predictors (default: all).
+
+    Targets are split into contiguous folds that run in a process pool; each
+    worker loads the dataset once (snapshot mmap when available). Returns
+    (records, summary) and writes the per-draw records to ``output``.
+    """
+    from utils.dataset_manager import DatasetManager, DEFAULT_CSV_PATHS
+
+    names = list(predictors or PREDICTORS)
+    unknown = [n for n in names if n not in PREDICTORS]
+    if unknown:
+        raise ValueError(f"Unknown predictors: {unknown} (choose from {sorted(PREDICTORS)})")
+
+    manager = DatasetManager([csv_path] if csv_path else DEFAULT_CSV_PATHS)
+    df = manager.get_frame(copy=False)
+    if df.empty:
+        raise RuntimeError("No draw history to backtest")
+    positions = select_targets(df, providers, start, end, stride, limit)
+    ks = tuple(sorted(set(int(k) for k in ks)))
+    workers = os.cpu_count() or 1 if workers is None else workers
+    logger.info(f"Backtesting {names} on {len(positions)} draws from {manager.path} ({workers} workers)")
+
+    records = []
+    if workers <= 1:
+        starts = history_positions(df['date_parsed'])
+        for name in names:
+            records.extend(replay(df, name, positions, window, per_provider, ks, starts))
+    else:
+        folds = _folds(positions, workers * folds_per_worker)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(os.path.abspath(manager.path), manager.version)) as pool:
+            futures = [pool.submit(_run_fold, name, fold, window, per_provider, ks)
+                       for name in names for fold in folds]
+            for future in futures:
+                records.extend(future.result())
+
+    records = pd.DataFrame(records)
+    if not records.empty:
+        records = records.astype({'predictor': 'category', 'provider': 'category'})
+        flags = [f'hit@{k}' for k in ks] + ['three_digit', 'box', 'error']
+        records[flags] = records[flags].astype(np.uint8)
+    summary = summarize(records, ks)
+    if output and not records.empty:
+        write_results(records, output)
+    return records, summary
+
+
+def write_results(records, output):
+    """Per-draw records as Feather (.feather, needs pyarrow) or compressed CSV"""
+    if output.endswith('.feather'):
+        records.reset_index(drop=True).to_feather(output, compression='zstd')
+    else:
+        records.to_csv(output, index=False, compression='infer')
+    logger.info(f"Backtest results written: {output} ({len(records)} rows)")
+    return output
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Walk-forward backtest of the 4D predictors')
+    parser.add_argument('predictors', nargs='*', help=f'predictors to run (default: all of {", ".join(PREDICTORS)})')
+    parser.add_argument('--csv', help='results CSV (default: the app\'s CSV search paths)')
+    parser.add_argument('--provider', action='append', dest='providers', help='only score this provider (repeatable)')
+    parser.add_argument('--start', help='first target date (YYYY-MM-DD)')
+    parser.add_argument('--end', help='last target date (YYYY-MM-DD)')
+    parser.add_argument('--window', type=int, default=1000, help='max history rows per target (0 = all)')
+    parser.add_argument('--per-provider', action='store_true', help='history from the target\'s provider only')
+    parser.add_argument('--stride', type=int, default=1, help='score every n-th draw')
+    parser.add_argument('--limit', type=int, help='score only the latest n targets')
+    parser.add_argument('--k', type=int, nargs='+', default=list(DEFAULT_KS), help='hit@k cut-offs')
+    parser.add_argument('--workers', type=int, help='worker processes (default: CPU count, 1 = in-process)')
+    parser.add_argument('--out', default=DEFAULT_OUTPUT, help='per-draw results file (.csv.gz or .feather)')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    _, summary = run_backtest(args.predictors, args.csv, args.providers, args.start, args.end,
+                              args.window or None, args.per_provider, args.stride, args.limit,
+                              args.k, args.workers, output=args.out)
+    print(summary.to_string(index=False))
@@ -0,0 +1,204 @@
+"""
+Shared Caching Utility
+Bounded, thread-safe LRU cache with TTL, hit/miss counters and structural keys
+"""
+import copy
+import functools
+import hashlib
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+_MISSING = object()
+_registry = {}
+_registry_lock = threading.Lock()
+
+# Columns hashed (with the index) into a frame's content digest
+DIGEST_COLUMNS = ('date_parsed', 'number_1st')
+# id(frame) -> (weakref to the frame, digest)
+_digests = {}
+
+
+class LRUCache:
+    """
+    Thread-safe LRU cache.
+
+    - ``maxsize`` bounds the number of entries (least recently used is evicted)
+    - ``ttl`` (seconds, optional) expires entries on read
+    - ``hits`` / ``misses`` / ``evictions`` are kept for monitoring
+    Named caches are registered so their stats can be reported together.
+    """
+
+    def __init__(self, maxsize=128, ttl=None, name=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.name = name
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if name:
+            with _registry_lock:
+                _registry[name] = self
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING:
+                stored_at, value = entry
+                if self.ttl is None or time.time() - stored_at < self.ttl:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def peek(self, key, default=None):
+        """Read without touching recency, expiry or hit/miss counters"""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            return default if entry is _MISSING else entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.time(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def __contains__(self, key):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            return entry is not _MISSING and (self.ttl is None or time.time() - entry[0] < self.ttl)
+
+    def __len__(self):
+        return len(self._data)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+def cache_stats():
+    """Stats of every named cache, keyed by name"""
+    with _registry_lock:
+        caches = dict(_registry)
+    return {name: cache.stats() for name, cache in caches.items()}
+
+
+def _frame_digest(df):
+    """
+    Order-sensitive hash of a frame's index, dates and first prizes, so two
+    filtered frames of the same shape and endpoints do not share a key.
+    Memoized per frame object (until it is garbage collected): a frame
+    mutated in place after its first lookup keeps its first digest.
+    """
+    entry = _digests.get(id(df))
+    if entry is not None and entry[0]() is df:
+        return entry[1]
+    columns = [col for col in DIGEST_COLUMNS if col in df.columns]
+    try:
+        hashed = pd.util.hash_pandas_object(df[columns], index=True) if columns \
+            else pd.util.hash_pandas_object(df.index)
+    except TypeError:
+        # Unhashable cells (lists, dicts): hash their text instead
+        hashed = pd.util.hash_pandas_object(df[columns].astype(str), index=True)
+    digest = hashlib.sha1(np.ascontiguousarray(hashed.to_numpy()).tobytes()).hexdigest()[:16]
+    key = id(df)
+    _digests[key] = (weakref.ref(df, lambda _, key=key: _digests.pop(key, None)), digest)
+    return digest
+
+
+def _frame_key(df):
+    """Dataset version + shape + content digest instead of str(DataFrame)"""
+    from utils.dataset_manager import dataset_version
+
+    if df.empty:
+        return ('df', dataset_version(), df.shape)
+    return ('df', dataset_version(), df.shape, _frame_digest(df))
+
+
+def _grid_key(grid):
+    return None if grid is None else tuple(tuple(row) for row in grid)
+
+
+def _draws_key(draws):
+    """
+    Draw lists are keyed by their (number, date, grids) sequence, not their
+    text; callers may pass a grid without its number.
+    """
+    return ('draws', len(draws), hash(tuple((d.get('number'), str(d.get('date')), _grid_key(d.get('grid')),
+                                             _grid_key(d.get('reverse_grid'))) for d in draws)))
+
+
+def structural_key(*args, **kwargs):
+    """
+    Hashable key for a call. DataFrames and lists of draw dicts get compact
+    structural keys; other arguments are used as-is (or via repr if unhashable).
+    """
+    def part(value):
+        if isinstance(value, pd.DataFrame):
+            return _frame_key(value)
+        if isinstance(value, list) and value and all(isinstance(v, dict) for v in value):
+            return _draws_key(value)
+        try:
+            hash(value)
+            return value
+        except TypeError:
+            return ('repr', repr(value))
+
+    return (tuple(part(a) for a in args), tuple(sorted((k, part(v)) for k, v in kwargs.items())))
+
+
+def private_copy(value):
+    """Copy of a mutable cached value, so callers cannot change what the cache holds"""
+    if isinstance(value, (pd.DataFrame, pd.Series, np.ndarray)):
+        return value.copy()
+    if isinstance(value, (dict, list, set, tuple)):
+        return copy.deepcopy(value)
+    return value
+
+
+def cached(maxsize=128, ttl=None, key=None, name=None):
+    """
+    Decorator backed by an LRUCache. ``key(*args, **kwargs)`` builds the cache
+    key (default: structural_key). The cache is exposed as ``func.cache``.
+    Callers get a private copy of mutable results (see private_copy).
+    """
+    key_func = key or structural_key
+
+    def decorator(func):
+        cache = LRUCache(maxsize=maxsize, ttl=ttl, name=name or func.__qualname__)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache_key = key_func(*args, **kwargs)
+            result = cache.get(cache_key, _MISSING)
+            if result is _MISSING:
+                result = func(*args, **kwargs)
+                cache.set(cache_key, result)
+            return private_copy(result)
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
@@ -3,12 +3,62 @@ Canonical Data Normalization Layer
 Single source of truth for all data cleaning and validation
 """
 import re
+import numpy as np
 import pandas as pd
 from typing import Optional, Dict, Any
 import logging
 
+from utils.metrics import timed
+
 logger = logging.getLogger(__name__)
 
+# Precompiled patterns shared by the scalar and column-wise paths
+_URL_PROVIDER_RE = re.compile(r'/images/([a-z0-9]+)')
+_URL_SCHEME_RE = re.compile(r'https?://')
+_WWW_RE = re.compile(r'www\.')
+_LIVE4D_HOST_RE = re.compile(r'live4d2u\.net/?')
+_IMAGES_RE = re.compile(r'/images/')
+_NON_ALNUM_RE = re.compile(r'[^a-z0-9]')
+
+# Column-wise extraction patterns (Series.str.* accepts inline flags)
+_FIRST_PRIZE_PAT = r'(?i)1st[^0-9]*(\d{4})'
+_SECOND_PRIZE_PAT = r'(?i)2nd[^0-9]*(\d{4})'
+_THIRD_PRIZE_PAT = r'(?i)3rd[^0-9]*(\d{4})'
+_NUMBER_4D_PAT = r'\b\d{4}\b'
+
+# Map URL paths to display names (EXACT mapping)
+PROVIDER_MAP = {
+    'toto': 'Sports Toto',
+    'sportstoto': 'Sports Toto',
+    'stc': 'Sports Toto',
+    'stc4d': 'Sports Toto',
+    'damacai': 'Da Ma Cai',
+    'dmc': 'Da Ma Cai',
+    'pmp': 'Da Ma Cai',
+    'magnum': 'Magnum 4D',
+    'magnum4d': 'Magnum 4D',
+    'magnumlife': 'Magnum 4D',
+    'jackpotgold': 'Magnum 4D',
+    'gdlotto': 'GD Lotto',
+    'gd': 'GD Lotto',
+    'granddragon4d': 'GD Lotto',
+    'granddragon': 'GD Lotto',
+    'sabah88': 'Sabah 88 4D',
+    'sabah884d': 'Sabah 88 4D',
+    'sabah88lotto': 'Sabah 88 Lotto',
+    'sandakan': 'Sandakan 4D',
+    'sandakan4d': 'Sandakan 4D',
+    'cashsweep': 'Cash Sweep 4D',
+    'cashsweep4d': 'Cash Sweep 4D',
+    'singapore': 'Singapore 4D',
+    'singapore4d': 'Singapore 4D',
+    'perdana': 'Perdana',
+    'perdanalottery4d': 'Perdana',
+    'harihari': 'Hari Hari',
+    'luckyharihari4d': 'Hari Hari',
+    'luckyharihari': 'Hari Hari'
+}
+
 
 class DataNormalizer:
     """Universal data normalizer for 4D lottery data"""
@@ -26,52 +76,19 @@ class DataNormalizer:
         normalized = str(raw_provider).lower().strip()
         
         # Extract provider from URL path (e.g., /images/singapore -> singapore)
-        url_match = re.search(r'/images/([a-z0-9]+)', normalized)
+        url_match = _URL_PROVIDER_RE.search(normalized)
         if url_match:
             normalized = url_match.group(1)
         else:
             # Remove URLs and domains if present
-            normalized = re.sub(r'https?://', '', normalized)
-            normalized = re.sub(r'www\.', '', normalized)
-            normalized = re.sub(r'live4d2u\.net/?', '', normalized)
-            normalized = re.sub(r'/images/', '', normalized)
+            normalized = _URL_SCHEME_RE.sub('', normalized)
+            normalized = _WWW_RE.sub('', normalized)
+            normalized = _LIVE4D_HOST_RE.sub('', normalized)
+            normalized = _IMAGES_RE.sub('', normalized)
             # Keep only alphanumeric characters
-            normalized = re.sub(r'[^a-z0-9]', '', normalized)
+            normalized = _NON_ALNUM_RE.sub('', normalized)
         
-        # Map URL paths to display names (EXACT mapping)
-        provider_map = {
-            'toto': 'Sports Toto',
-            'sportstoto': 'Sports Toto',
-            'stc': 'Sports Toto',
-            'stc4d': 'Sports Toto',
-            'damacai': 'Da Ma Cai',
-            'dmc': 'Da Ma Cai',
-            'pmp': 'Da Ma Cai',
-            'magnum': 'Magnum 4D',
-            'magnum4d': 'Magnum 4D',
-            'magnumlife': 'Magnum 4D',
-            'jackpotgold': 'Magnum 4D',
-            'gdlotto': 'GD Lotto',
-            'gd': 'GD Lotto',
-            'granddragon4d': 'GD Lotto',
-            'granddragon': 'GD Lotto',
-            'sabah88': 'Sabah 88 4D',
-            'sabah884d': 'Sabah 88 4D',
-            'sabah88lotto': 'Sabah 88 Lotto',
-            'sandakan': 'Sandakan 4D',
-            'sandakan4d': 'Sandakan 4D',
-            'cashsweep': 'Cash Sweep 4D',
-            'cashsweep4d': 'Cash Sweep 4D',
-            'singapore': 'Singapore 4D',
-            'singapore4d': 'Singapore 4D',
-            'perdana': 'Perdana',
-            'perdanalottery4d': 'Perdana',
-            'harihari': 'Hari Hari',
-            'luckyharihari4d': 'Hari Hari',
-            'luckyharihari': 'Hari Hari'
-        }
-        
-        return provider_map.get(normalized, normalized.title())
+        return PROVIDER_MAP.get(normalized, normalized.title())
     
     @staticmethod
     def normalize_4d_number(raw_number: Any) -> Optional[str]:
@@ -191,6 +208,57 @@ class DataNormalizer:
         return has_date and has_provider and has_number
 
 
+def normalize_provider_column(raw: pd.Series) -> pd.Series:
+    """
+    Column-wise normalize_provider: each distinct raw value is normalized
+    once and broadcast back, so cost scales with unique providers, not rows.
+    """
+    codes, uniques = pd.factorize(raw, use_na_sentinel=True)
+    lookup = np.array([DataNormalizer.normalize_provider(u) for u in uniques] + ['unknown'], dtype=object)
+    # NaN gets sentinel -1, which indexes the trailing 'unknown'
+    return pd.Series(lookup[codes], index=raw.index).astype(str)
+
+
+def _text_column(df: pd.DataFrame, position: int) -> pd.Series:
+    """str() of the column at a position, or '' when the frame is narrower"""
+    if df.shape[1] > position:
+        return df.iloc[:, position].astype(str)
+    return pd.Series('', index=df.index, dtype=object).astype(str)
+
+
+def _unique_texts(text: pd.Series):
+    """Factorize a text column; scraped history repeats the same text many times"""
+    codes, uniques = pd.factorize(text, use_na_sentinel=False)
+    return codes, pd.Series(uniques, dtype=text.dtype)
+
+
+def _broadcast(values: pd.Series, codes: np.ndarray, index: pd.Index) -> pd.Series:
+    return pd.Series(values.to_numpy(dtype=object)[codes], index=index)
+
+
+def _extract_prizes(prize_text: pd.Series) -> Dict[str, pd.Series]:
+    """1st/2nd/3rd prize (first match, like re.search) or None"""
+    codes, uniques = _unique_texts(prize_text)
+    prizes = {}
+    for key, pat in (('number_1st', _FIRST_PRIZE_PAT),
+                     ('number_2nd', _SECOND_PRIZE_PAT),
+                     ('number_3rd', _THIRD_PRIZE_PAT)):
+        extracted = uniques.str.extract(pat, expand=False)
+        extracted = extracted.astype(object).where(extracted.notna(), None)
+        prizes[key] = _broadcast(extracted, codes, prize_text.index)
+    return prizes
+
+
+def _join_4d_numbers(text: pd.Series, limit: int = 10):
+    """All standalone 4-digit numbers (first `limit`) joined by spaces, plus their count"""
+    codes, uniques = _unique_texts(text)
+    found = uniques.str.findall(_NUMBER_4D_PAT).str[:limit]
+    joined = found.str.join(' ').fillna('')
+    counts = found.str.len().fillna(0).astype(int)
+    return _broadcast(joined, codes, text.index), counts.to_numpy()[codes]
+
+
+@timed('normalize_dataframe', phase='load')
 def normalize_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     """
     Parse CSV by EXACT column positions - no guessing
@@ -211,7 +279,7 @@ def normalize_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     df['date_parsed'] = pd.to_datetime(df.iloc[:, 0], errors='coerce')
     
     # Get provider from column 1 (URL) - this is the TRUE provider
-    df['provider_key'] = df.iloc[:, 1].apply(DataNormalizer.normalize_provider)
+    df['provider_key'] = normalize_provider_column(df.iloc[:, 1])
     
     # 🎯 FILTER: Skip non-4D lottery types (5D, 6D, Lotto, etc.)
     df['lottery_type'] = df.iloc[:, 2].astype(str).str.lower()
@@ -220,46 +288,27 @@ def normalize_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     df = df[df['is_4d_only']].copy()
     logger.info(f"Filtered to 4D-only: {len(df)} rows (excluded 5D/6D/Lotto)")
     
-    # Extract numbers
-    extracted_data = []
+    # Extract numbers column-wise. Positions are taken after the helper
+    # columns above were appended, exactly as the old per-row loop did.
+    prize_text = _text_column(df, 5)
+    special_text = _text_column(df, 6)
+    consolation_text = _text_column(df, 7)
     
-    for idx, row in df.iterrows():
-        # Column 5: prize_text (1st/2nd/3rd prizes)
-        prize_text = str(row.iloc[5]) if len(row) > 5 else ''
-        # Column 6: special
-        special_text = str(row.iloc[6]) if len(row) > 6 else ''
-        # Column 7: consolation
-        consolation_text = str(row.iloc[7]) if len(row) > 7 else ''
-        
-        # Extract 1st, 2nd, 3rd from prize_text
-        first = re.search(r'1st[^0-9]*(\d{4})', prize_text, re.IGNORECASE)
-        second = re.search(r'2nd[^0-9]*(\d{4})', prize_text, re.IGNORECASE)
-        third = re.search(r'3rd[^0-9]*(\d{4})', prize_text, re.IGNORECASE)
-        
-        first_num = first.group(1) if first else None
-        second_num = second.group(1) if second else None
-        third_num = third.group(1) if third else None
-        
-        # Extract special (all 4D numbers)
-        special_4d = re.findall(r'\b\d{4}\b', special_text)
-        special_nums = [n for n in special_4d if n != '----' and n != '****'][:10]
-        
-        # Extract consolation (all 4D numbers)
-        consolation_4d = re.findall(r'\b\d{4}\b', consolation_text)
-        consolation_nums = [n for n in consolation_4d if n != '----' and n != '****'][:10]
-        
-        extracted_data.append({
-            'number_1st': first_num,
-            'number_2nd': second_num,
-            'number_3rd': third_num,
-            'special': ' '.join(special_nums) if special_nums else '',
-            'consolation': ' '.join(consolation_nums) if consolation_nums else '',
-            'total_4d_found': len([n for n in [first_num, second_num, third_num] if n]) + len(special_nums) + len(consolation_nums)
-        })
+    # 1st, 2nd, 3rd from prize_text
+    prizes = _extract_prizes(prize_text)
+    
+    # Special / consolation: all standalone 4D numbers, max 10 each
+    special, special_count = _join_4d_numbers(special_text)
+    consolation, consolation_count = _join_4d_numbers(consolation_text)
+    
+    prize_count = sum(s.notna().to_numpy().astype(int) for s in prizes.values())
     
     # Add extracted columns
-    for key in ['number_1st', 'number_2nd', 'number_3rd', 'special', 'consolation', 'total_4d_found']:
-        df[key] = [d[key] for d in extracted_data]
+    for key, values in prizes.items():
+        df[key] = values.tolist()
+    df['special'] = special.tolist()
+    df['consolation'] = consolation.tolist()
+    df['total_4d_found'] = (prize_count + special_count + consolation_count).tolist()
     
     # Validate: must have date + provider + at least one 4D number
     df['is_valid'] = (
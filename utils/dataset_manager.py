@@ -0,0 +1,310 @@
+"""
+Canonical Dataset Manager
+Process-wide, invalidation-aware cache of the normalized draw history
+"""
+import hashlib
+import io
+import logging
+import os
+import threading
+import warnings
+import weakref
+
+import pandas as pd
+
+from utils.data_normalizer import normalize_dataframe
+from utils.file_lock import file_lock
+from utils.metrics import timed
+from utils.singleton import process_singleton
+from utils.snapshot import read_snapshot, snapshot_path_for, is_fresh, write_snapshot
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CSV_PATHS = ['4d_results_history.csv', 'utils/4d_results_history.csv']
+ALL_PROVIDERS = 'all'
+
+# id(frame) -> (weakref, dataset version, provider or 'all') of frames a manager handed out
+_origins = {}
+
+def _file_digest(path, chunk_size=1 << 20):
+    """SHA-1 of a file's content, read in chunks"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _tag_frame(df, version, scope=ALL_PROVIDERS):
+    key = id(df)
+    _origins[key] = (weakref.ref(df, lambda _, key=key: _origins.pop(key, None)), version, scope)
+    return df
+
+
+def frame_origin(df):
+    """
+    (version, scope) when ``df`` is a canonical frame a DatasetManager handed
+    out (scope 'all') or a provider_slice of one, else None. Identity-based:
+    frames derived any other way, or changed in place, are not recognised.
+    """
+    entry = _origins.get(id(df))
+    if entry is None or entry[0]() is not df:
+        return None
+    return entry[1], entry[2]
+
+
+def provider_slice(df, provider):
+    """Rows of one provider, keeping the canonical origin of ``df`` (see frame_origin)"""
+    part = df[df['provider_key'] == provider]
+    origin = frame_origin(df)
+    if origin is not None and origin[1] == ALL_PROVIDERS:
+        _tag_frame(part, origin[0], provider)
+    return part
+
+
+def build_canonical_frame(raw_df):
+    """
+    Apply the canonical pipeline to a raw results frame:
+    normalize, keep valid rows, newest first, add legacy aliases.
+    Rows of one date keep their file order (stable sort), so merging an
+    appended tail gives exactly the frame a full reparse would.
+    """
+    df = normalize_dataframe(raw_df)
+    df = df[df['is_valid']].copy()
+    df = df.sort_values('date_parsed', ascending=False, kind='mergesort').reset_index(drop=True)
+
+    # Many routes expect '1st_real', '2nd_real', '3rd_real' columns
+    df['1st_real'] = df['number_1st']
+    df['2nd_real'] = df['number_2nd']
+    df['3rd_real'] = df['number_3rd']
+    df['provider'] = df['provider_key']
+    return df
+
+
+def read_csv_bytes(path):
+    """Whole content of a results CSV, read under its file lock so no append is half-written"""
+    with file_lock(path):
+        with open(path, 'rb') as fh:
+            return fh.read()
+
+
+@timed('dataset.read_csv', phase='load')
+def read_canonical_csv(path, data=None):
+    """Parse a results CSV (or its already-read bytes) and build the canonical frame (the slow path)"""
+    with warnings.catch_warnings():
+        warnings.filterwarnings('ignore', category=pd.errors.ParserWarning)
+        raw = pd.read_csv(path if data is None else io.BytesIO(data), index_col=False, on_bad_lines='skip')
+    if raw.empty:
+        return pd.DataFrame()
+    logger.info(f"Loaded CSV from: {path} ({len(raw)} rows)")
+    return build_canonical_frame(raw)
+
+
+class DatasetManager:
+    """
+    Holds the normalized DataFrame in memory and reloads it only when
+    the backing CSV changes.
+
+    A cheap ``os.stat`` (mtime + size) is checked on every access; the
+    content hash is only recomputed when the stat changes, so touching
+    the file without changing its content keeps the cached frame.
+    ``version`` is the content hash (SHA-1 of the file, the same in every
+    process) and is what model caches and ETags key on.
+
+    When the file only grew (the bytes already loaded hash to the current
+    version) just the appended tail is parsed, normalized and merged, and
+    listeners get an 'append' event with those rows.
+
+    When a columnar snapshot newer than the CSV (and compiled from the
+    same content) exists it is memory-mapped instead of parsing the CSV;
+    otherwise the CSV is parsed and the snapshot is (re)written.
+    """
+
+    def __init__(self, csv_paths=None, use_snapshot=True):
+        self.csv_paths = list(csv_paths or DEFAULT_CSV_PATHS)
+        self.use_snapshot = use_snapshot
+        self._lock = threading.RLock()
+        self._df = None
+        self._path = None
+        self._stat = None
+        self._version = None
+        self._size = 0
+        self._modified = None
+        self._listeners = []
+        self.loads = 0
+        self.appends = 0
+
+    def _resolve_path(self):
+        for csv_path in self.csv_paths:
+            if os.path.exists(csv_path) and os.path.getsize(csv_path) > 0:
+                return csv_path
+        return None
+
+    def _read(self, path, version, data):
+        if not self.use_snapshot:
+            return read_canonical_csv(path, data)
+
+        snapshot_path = snapshot_path_for(path)
+        if is_fresh(snapshot_path, path):
+            df, source_version = read_snapshot(snapshot_path)
+            if df is not None and source_version == version:
+                logger.info(f"Loaded snapshot: {snapshot_path} ({len(df)} rows)")
+                return df
+
+        df = read_canonical_csv(path, data)
+        self._write_snapshot(path, df, version)
+        return df
+
+    def _write_snapshot(self, path, df, version):
+        if not self.use_snapshot:
+            return
+        snapshot_path = snapshot_path_for(path)
+        try:
+            write_snapshot(df, snapshot_path, source_version=version)
+        except Exception as e:
+            logger.warning(f"Snapshot write failed ({snapshot_path}): {e}")
+
+    def _parse_tail(self, tail):
+        """Canonical rows of CSV lines appended after the loaded content"""
+        # Raw CSV columns are the ones normalize_dataframe found before it
+        # appended date_parsed (some, e.g. 'special', are overwritten in place)
+        raw_columns = list(self._df.columns[:self._df.columns.get_loc('date_parsed')])
+        with warnings.catch_warnings():
+            warnings.filterwarnings('ignore', category=pd.errors.ParserWarning)
+            raw = pd.read_csv(io.BytesIO(tail), header=None, names=raw_columns, index_col=False,
+                              on_bad_lines='skip', dtype=str)
+        for col in raw_columns:
+            if pd.api.types.is_numeric_dtype(self._df[col].dtype):
+                raw[col] = pd.to_numeric(raw[col], errors='coerce')
+        return build_canonical_frame(raw) if not raw.empty else raw
+
+    def refresh(self):
+        """Reload (or merge the appended tail) if the backing file changed. Returns True when it did."""
+        with self._lock:
+            path = self._resolve_path()
+            if path is None:
+                if self._df is None:
+                    logger.error("No valid CSV file found")
+                return False
+
+            st = os.stat(path)
+            stat_key = (st.st_mtime_ns, st.st_size)
+            if self._df is not None and path == self._path and stat_key == self._stat:
+                return False
+
+            data = read_csv_bytes(path)
+            st = os.stat(path)
+            stat_key = (st.st_mtime_ns, len(data))
+            view = memoryview(data)
+            # One pass: hash what is already loaded, check it, then the rest
+            loaded = self._size if self._df is not None and path == self._path and 0 < self._size < len(data) else 0
+            hasher = hashlib.sha1(view[:loaded])
+            grew = loaded and hasher.hexdigest() == self._version
+            hasher.update(view[loaded:])
+            version = hasher.hexdigest()
+            if self._df is not None and version == self._version:
+                # Touched but unchanged content
+                self._path, self._stat = path, stat_key
+                return False
+
+            tail = bytes(view[loaded:])
+            if grew and tail.endswith(b'\n') and (data[loaded - 1:loaded] == b'\n' or tail[:1] in (b'\r', b'\n')):
+                try:
+                    return self._merge_tail(path, tail, version, stat_key, st)
+                except Exception as e:
+                    logger.warning(f"Appended rows not merged ({e}); reloading {path}")
+
+            try:
+                df = self._read(path, version, data)
+            except Exception as e:
+                logger.error(f"CSV loading error: {e}")
+                return False
+
+            self._df = df
+            self._path, self._stat, self._version, self._size = path, stat_key, version, len(data)
+            self._modified = st.st_mtime
+            self.loads += 1
+            self._notify('reload', df)
+            if not df.empty:
+                logger.info(f"Canonical data ready: {len(df)} rows | version {version[:12]} | "
+                            f"Providers: {df['provider_key'].unique()[:5].tolist()}")
+            return True
+
+    def _merge_tail(self, path, tail, version, stat_key, st):
+        new_rows = self._parse_tail(tail)
+        if not new_rows.empty:
+            # Earlier file rows first, as in a full parse
+            merged = pd.concat([self._df, new_rows], ignore_index=True)
+            self._df = merged.sort_values('date_parsed', ascending=False, kind='mergesort').reset_index(drop=True)
+        self._stat, self._version, self._size = stat_key, version, self._size + len(tail)
+        self._modified = st.st_mtime
+        self.appends += 1
+        logger.info(f"Appended {len(new_rows)} canonical rows | version {version[:12]}")
+        if not new_rows.empty:
+            self._notify('append', new_rows)
+        self._write_snapshot(path, self._df, version)
+        return True
+
+    def get_frame(self, copy=True):
+        """Current canonical frame (a private copy unless copy=False)"""
+        self.refresh()
+        with self._lock:
+            if self._df is None:
+                return pd.DataFrame()
+            return _tag_frame(self._df.copy() if copy else self._df, self._version)
+
+    @property
+    def version(self):
+        """Content-hash token of the loaded dataset (None before first load)"""
+        self.refresh()
+        return self._version
+
+    @property
+    def modified_at(self):
+        """mtime (epoch seconds) of the file the current version was read from"""
+        self.refresh()
+        return self._modified
+
+    @property
+    def path(self):
+        """CSV the current frame was loaded from"""
+        return self._path
+
+    def add_listener(self, callback):
+        """
+        Register ``callback(event, frame)``; event is 'reload' with the full
+        canonical frame, or 'append' with only the newly merged rows.
+        """
+        with self._lock:
+            self._listeners.append(callback)
+
+    def _notify(self, event, frame):
+        for callback in list(self._listeners):
+            try:
+                callback(event, frame)
+            except Exception as e:
+                logger.warning(f"Dataset listener failed on {event}: {e}")
+
+    def invalidate(self):
+        """Force the next access to reload from disk"""
+        with self._lock:
+            self._stat = None
+            self._version = None
+
+
+@process_singleton
+def get_dataset_manager():
+    """
+    Process-wide DatasetManager singleton. With DATASET_SEGMENT_DIR set
+    (multi-process serving) it follows the published shared segment instead.
+    """
+    segment_dir = os.environ.get('DATASET_SEGMENT_DIR')
+    if segment_dir:
+        from utils.shared_dataset import SegmentDatasetManager
+        return SegmentDatasetManager(segment_dir)
+    return DatasetManager()
+
+
+def dataset_version():
+    """Version token of the process-wide dataset"""
+    return get_dataset_manager().version
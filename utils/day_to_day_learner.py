@@ -3,33 +3,18 @@ Day-to-Day Pattern Learning Module
 """
 from collections import defaultdict, Counter
 
+from utils.transition_engine import TransitionEngine
+
 def learn_day_to_day_patterns(draws):
     """
     Learn day-to-day patterns from historical draws
+    (dicts with a 'number', plain numbers, or a results frame's 1st prizes)
     """
-    if not draws or len(draws) < 2:
-        return {}
-
-    patterns = {
-        'digit_transitions': defaultdict(lambda: defaultdict(lambda: defaultdict(int))),
-        'sequence_patterns': defaultdict(lambda: defaultdict(int))
-    }
-
-    for i in range(len(draws) - 1):
-        current_num = str(draws[i].get('number', ''))
-        next_num = str(draws[i + 1].get('number', ''))
-
-        if len(current_num) == 4 and len(next_num) == 4:
-            # Learn digit transitions
-            for pos in range(4):
-                current_digit = current_num[pos]
-                next_digit = next_num[pos]
-                patterns['digit_transitions'][current_digit][pos][next_digit] += 1
+    if draws is None or len(draws) < 2:
+        return TransitionEngine()
 
-            # Learn sequence patterns
-            patterns['sequence_patterns'][current_num][next_num] += 1
-
-    return patterns
+    # Digit transitions per position and number-to-number sequence counts
+    return TransitionEngine.from_draws(draws)
 
 def predict_tomorrow(today_nums, patterns, recent_nums):
     """
@@ -47,34 +32,28 @@ def predict_tomorrow(today_nums, patterns, recent_nums):
         return []
 
     # Method 1: Direct sequence patterns
-    if today_num in patterns['sequence_patterns']:
-        next_candidates = patterns['sequence_patterns'][today_num]
-        total_occurrences = sum(next_candidates.values())
-
-        for next_num, count in next_candidates.items():
-            confidence = count / total_occurrences
-            predictions.append((next_num, confidence, "sequence_pattern"))
+    next_candidates = patterns.followers(today_num)
+    total_occurrences = sum(count for _, count in next_candidates)
+    for next_num, count in next_candidates:
+        confidence = count / total_occurrences
+        predictions.append((next_num, confidence, "sequence_pattern"))
 
-    # Method 2: Digit transition patterns
+    # Method 2: Digit transition patterns (next-digit probabilities per position)
     transition_predictions = defaultdict(float)
+    digit_probabilities = patterns.digit_probabilities(today_num)
 
     for pos in range(4):
-        current_digit = today_num[pos]
-        if current_digit in patterns['digit_transitions'] and pos in patterns['digit_transitions'][current_digit]:
-            transitions = patterns['digit_transitions'][current_digit][pos]
-            total_transitions = sum(transitions.values())
-
-            for next_digit, count in transitions.items():
-                transition_confidence = count / total_transitions
-
-                # Build candidate numbers by replacing digit at position
-                for base_num in [today_num] + recent_nums[-5:]:  # Use today + last 5 as base
-                    if len(str(base_num)) == 4:
-                        candidate = list(str(base_num))
-                        candidate[pos] = next_digit
-                        candidate_num = ''.join(candidate)
-
-                        transition_predictions[candidate_num] += transition_confidence
+        for next_digit in digit_probabilities[pos].nonzero()[0]:
+            transition_confidence = digit_probabilities[pos, next_digit]
+
+            # Build candidate numbers by replacing digit at position
+            for base_num in [today_num] + recent_nums[-5:]:  # Use today + last 5 as base
+                if len(str(base_num)) == 4:
+                    candidate = list(str(base_num))
+                    candidate[pos] = str(next_digit)
+                    candidate_num = ''.join(candidate)
+
+                    transition_predictions[candidate_num] += transition_confidence
 
     # Convert transition predictions to list
     for candidate, confidence in transition_predictions.items():
@@ -0,0 +1,198 @@
+"""
+Ensemble Executor
+Independent predictor calls fanned out over a process pool, with per-call timeouts
+"""
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import CancelledError, ProcessPoolExecutor, TimeoutError as FutureTimeout, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from utils.singleton import process_singleton
+
+logger = logging.getLogger(__name__)
+
+WORKERS_ENV = 'ENSEMBLE_WORKERS'
+DEFAULT_TIMEOUT = 30.0
+
+# status: 'ok', 'timeout' or 'error'; result is None unless ok
+Outcome = namedtuple('Outcome', 'status result seconds')
+
+
+def default_workers():
+    """ENSEMBLE_WORKERS, else up to 4 processes (0 runs calls in-process)"""
+    value = os.environ.get(WORKERS_ENV)
+    if value is not None and value.strip().isdigit():
+        return int(value)
+    return min(4, os.cpu_count() or 1)
+
+
+def _init_worker(preload):
+    """Load the shared dataset (the segment mmap under the pre-fork server) before the first call"""
+    logging.basicConfig(level=logging.WARNING)
+    from utils.dataset_manager import get_dataset_manager
+    get_dataset_manager().get_frame(copy=False)
+
+
+def _ready():
+    return os.getpid()
+
+
+class EnsembleExecutor:
+    """
+    Runs a batch of independent calls ``{label: (func, args)}`` in a process
+    pool and waits for each one at most its own timeout: a slow or failing
+    call gives that label a 'timeout'/'error' outcome instead of holding up or
+    failing the batch. Functions must be picklable (module-level); workers
+    are spawned, so they do not inherit the server's threads or locks.
+
+    A call that timed out would keep its worker busy until it finishes, so
+    after a timeout the pool is retired: later calls go to a fresh pool, and
+    the old pool's processes are killed once the calls other batches still
+    have on it are done (or have had a full timeout). The pool is also
+    rebuilt if a worker dies.
+    """
+
+    def __init__(self, workers=None, timeout=DEFAULT_TIMEOUT):
+        self.workers = default_workers() if workers is None else workers
+        self.timeout = timeout
+        self.calls = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.recycled = 0
+        self._pool = None
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def start(self, preload=()):
+        """
+        Spawn the workers in the background (idempotent). ``preload``: objects
+        unpickled in every worker up front, e.g. the predictor functions, so
+        their modules are imported before the first request needs them.
+        """
+        if self.workers <= 0:
+            return self
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context('spawn'),
+                                                 initializer=_init_worker, initargs=(tuple(preload),))
+                for _ in range(self.workers):
+                    self._pool.submit(_ready)
+                logger.info(f"Ensemble pool started ({self.workers} workers)")
+        return self
+
+    def _reset(self, pool):
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+            self._inflight.pop(pool, None)
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, pool, func, args):
+        future = pool.submit(func, *args)
+        with self._lock:
+            self._inflight.setdefault(pool, set()).add(future)
+        future.add_done_callback(lambda f: self._done(pool, f))
+        return future
+
+    def _done(self, pool, future):
+        with self._lock:
+            self._inflight.get(pool, set()).discard(future)
+
+    def _retire(self, pool, stuck):
+        """Send no more calls to ``pool``; kill its workers in the background once its other calls are done"""
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+                self.recycled += 1
+            others = self._inflight.pop(pool, set()) - set(stuck)
+        processes = list((pool._processes or {}).values())
+        pool.shutdown(wait=False)
+
+        def reap():
+            wait(others, timeout=self.timeout)
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+
+        threading.Thread(target=reap, name='ensemble-reaper', daemon=True).start()
+
+    def run(self, calls, timeouts=None):
+        """``{label: (func, args)}`` -> ``{label: Outcome}``; ``timeouts``: {label: seconds}"""
+        timeouts = timeouts or {}
+        self.calls += len(calls)
+        if self.workers <= 0:
+            return {label: self._run_inline(func, args) for label, (func, args) in calls.items()}
+
+        pool = self.start()._pool
+        began = time.perf_counter()
+        outcomes = {}
+        futures = {}
+        try:
+            for label, (func, args) in calls.items():
+                futures[label] = self._submit(pool, func, args)
+        except (BrokenProcessPool, RuntimeError) as e:
+            logger.warning(f"Ensemble pool unavailable: {e}")
+            self._reset(pool)
+            for future in futures.values():
+                future.cancel()
+            self.errors += len(calls)
+            return {label: Outcome('error', None, 0.0) for label in calls}
+
+        broken = False
+        stuck = []
+        for label in sorted(futures, key=lambda label: timeouts.get(label, self.timeout)):
+            remaining = began + timeouts.get(label, self.timeout) - time.perf_counter()
+            try:
+                result = futures[label].result(timeout=max(remaining, 0))
+                outcomes[label] = Outcome('ok', result, time.perf_counter() - began)
+            except FutureTimeout:
+                if not futures[label].cancel():
+                    stuck.append(futures[label])
+                self.timeouts += 1
+                outcomes[label] = Outcome('timeout', None, time.perf_counter() - began)
+                logger.warning(f"Ensemble call {label} timed out after {timeouts.get(label, self.timeout)}s")
+            except (BrokenProcessPool, CancelledError) as e:
+                broken = True
+                self.errors += 1
+                outcomes[label] = Outcome('error', None, time.perf_counter() - began)
+                logger.warning(f"Ensemble call {label} lost its worker: {e}")
+            except Exception as e:
+                self.errors += 1
+                outcomes[label] = Outcome('error', None, time.perf_counter() - began)
+                logger.warning(f"Ensemble call {label} failed: {e}")
+        if broken:
+            self._reset(pool)
+        elif stuck:
+            self._retire(pool, stuck)
+        return {label: outcomes[label] for label in calls}
+
+    def _run_inline(self, func, args):
+        began = time.perf_counter()
+        try:
+            return Outcome('ok', func(*args), time.perf_counter() - began)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Ensemble call {getattr(func, '__name__', func)} failed: {e}")
+            return Outcome('error', None, time.perf_counter() - began)
+
+    def stats(self):
+        return {'workers': self.workers, 'running': self._pool is not None, 'calls': self.calls,
+                'timeouts': self.timeouts, 'errors': self.errors, 'recycled': self.recycled}
+
+    def stop(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+            self._inflight.clear()
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+@process_singleton
+def get_ensemble_executor():
+    """Process-wide EnsembleExecutor"""
+    return EnsembleExecutor()
@@ -0,0 +1,134 @@
+"""
+Streaming Exports
+CSV / NDJSON encoders over chunked frames, and background writes of report files
+"""
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from utils.singleton import process_singleton
+
+logger = logging.getLogger(__name__)
+
+# format -> (mimetype, file extension)
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+}
+CHUNK_ROWS = 2000
+
+
+def parse_day(value):
+    """'YYYY-MM-DD' -> Timestamp; '' -> None; raises ValueError when unparseable"""
+    if not value:
+        return None
+    day = pd.to_datetime(value, format='%Y-%m-%d', errors='coerce')
+    if pd.isna(day):
+        raise ValueError(f"Invalid date '{value}' (expected YYYY-MM-DD)")
+    return day
+
+
+def filter_draws(df, provider='all', start=None, end=None):
+    """Canonical draw rows of one provider between two days (inclusive)"""
+    if provider and provider != 'all':
+        df = df[df['provider_key'] == provider]
+    if start is not None:
+        df = df[df['date_parsed'] >= start]
+    if end is not None:
+        df = df[df['date_parsed'] < end + pd.Timedelta(days=1)]
+    return df
+
+
+def frame_chunks(df, chunk_rows=CHUNK_ROWS):
+    """A frame as consecutive row slices (views, not copies)"""
+    for begin in range(0, max(len(df), 1), chunk_rows):
+        yield df.iloc[begin:begin + chunk_rows]
+
+
+def record_chunks(records, columns, chunk_rows=CHUNK_ROWS):
+    """An iterable of dicts as DataFrames of ``chunk_rows`` rows, consumed lazily"""
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= chunk_rows:
+            yield pd.DataFrame(batch, columns=columns)
+            batch = []
+    if batch:
+        yield pd.DataFrame(batch, columns=columns)
+
+
+def csv_chunks(path, chunk_rows=CHUNK_ROWS):
+    """A CSV file as string-typed DataFrame chunks: values stream through exactly as recorded"""
+    return pd.read_csv(path, dtype=str, keep_default_na=False, chunksize=chunk_rows)
+
+
+def encode_chunks(chunks, fmt='csv', columns=None):
+    """
+    Text of each DataFrame chunk in ``fmt``. CSV gets one header (written
+    even when there are no rows if ``columns`` is known); NDJSON is one JSON
+    object per line with ISO dates.
+    """
+    header = True
+    for chunk in chunks:
+        if fmt == 'ndjson':
+            if len(chunk):
+                yield chunk.to_json(orient='records', lines=True, date_format='iso', force_ascii=False)
+            continue
+        if header or len(chunk):
+            yield chunk.to_csv(index=False, header=header)
+            header = False
+    if fmt == 'csv' and header and columns:
+        yield pd.DataFrame(columns=columns).to_csv(index=False)
+
+
+class BackgroundWriter:
+    """
+    Single thread that writes report files off the request path. A job is
+    keyed (e.g. by the source file's mtime/size): a key seen before is not
+    written again, whether its write succeeded or not.
+    """
+
+    def __init__(self, name='export-writer'):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+        self._keys = set()
+        self._lock = threading.Lock()
+        self.written = 0
+        self.failed = 0
+
+    def submit(self, key, func, *args):
+        """Queue ``func(*args)`` unless ``key`` was seen; returns whether it was queued"""
+        with self._lock:
+            if key in self._keys:
+                return False
+            self._keys.add(key)
+        self._executor.submit(self._run, key, func, args)
+        return True
+
+    def drain(self):
+        """Block until every job queued so far has run"""
+        self._executor.submit(lambda: None).result()
+
+    def _run(self, key, func, args):
+        try:
+            path = func(*args)
+            self.written += 1
+            if path:
+                logger.info(f"Report written: {path}")
+        except Exception as e:
+            self.failed += 1
+            logger.warning(f"Report not written ({key}): {e}")
+
+
+def file_key(path):
+    """Identity of a file's current contents for BackgroundWriter keys"""
+    st = os.stat(path)
+    return (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+
+@process_singleton
+def get_background_writer():
+    """Process-wide BackgroundWriter"""
+    return BackgroundWriter()
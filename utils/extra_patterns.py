@@ -0,0 +1,146 @@
+"""
+Extra Grid Patterns
+Rules of the non king-move patterns the pattern analyzer layers on a 4x4 grid, and the per-grid detectors
+
+The rule table (sequences, primes, ratio, sum bands, detection order) is
+shared by detect_extra_patterns and the batch replay in utils/month_replay.py.
+"""
+
+# Sequences whose 3-digit windows are looked for along each row
+FIBONACCI = (0, 1, 1, 2, 3, 5, 8)
+HARMONIC = (1, 2, 3, 5, 8)  # Simplified harmonic-like sequence
+WINDOW = 3
+# A row with at least MIN_PRIMES prime digits is a prime cluster
+PRIMES = (2, 3, 5, 7)
+MIN_PRIMES = 2
+# Neighbouring digits a/b within PHI_TOLERANCE of the golden ratio
+PHI = 1.618
+PHI_TOLERANCE = 0.3
+# Row digit sum -> band: the first whose upper limit holds (None: no limit)
+SUM_BANDS = ((10, 'low_sum'), (25, 'mid_sum'), (None, 'high_sum'))
+SUM_LIMITS = tuple(limit for limit, _ in SUM_BANDS if limit is not None)
+SUM_KINDS = tuple(kind for _, kind in SUM_BANDS)
+# Kinds in detection order ('sum' is one of SUM_KINDS per row)
+EXTRA_KINDS = ('fibonacci', 'prime_cluster', 'sum', 'golden_ratio', 'harmonic',
+               'mirror_symmetry', 'diagonal_mirror', 'arithmetic_prog')
+
+
+def windows(sequence, width=WINDOW):
+    """Consecutive ``width``-long runs of a sequence, as lists"""
+    return [list(sequence[i:i + width]) for i in range(len(sequence) - width + 1)]
+
+
+def sum_band(row_sum):
+    return next(kind for limit, kind in SUM_BANDS if limit is None or row_sum <= limit)
+
+
+def detect_fibonacci_patterns(grid):
+    """Detect Fibonacci sequences in 4D grid"""
+    fib_windows = windows(FIBONACCI)
+    patterns = []
+
+    for i, row in enumerate(grid):
+        for j in range(len(row) - 2):
+            seq = [int(str(row[j+k])[0]) for k in range(3) if str(row[j+k]).isdigit()]
+            if len(seq) == 3 and seq in fib_windows:
+                patterns.append(('fibonacci', f'row_{i}', ''.join(map(str, seq)), [(i, j+k) for k in range(3)]))
+    return patterns
+
+
+def detect_prime_clusters(grid):
+    """Detect prime number clustering"""
+    patterns = []
+
+    for i, row in enumerate(grid):
+        prime_positions = []
+        for j, cell in enumerate(row):
+            if str(cell).isdigit() and int(str(cell)[0]) in PRIMES:
+                prime_positions.append((i, j))
+
+        if len(prime_positions) >= MIN_PRIMES:
+            prime_nums = ''.join([str(grid[pos[0]][pos[1]]) for pos in prime_positions])
+            patterns.append(('prime_cluster', f'row_{i}', prime_nums[:4], prime_positions[:4]))
+    return patterns
+
+
+def detect_sum_patterns(grid):
+    """Detect sum range patterns (low/mid/high)"""
+    patterns = []
+
+    for i, row in enumerate(grid):
+        row_sum = sum([int(str(cell)) for cell in row if str(cell).isdigit()])
+        patterns.append((sum_band(row_sum), f'row_{i}', str(row_sum), [(i, j) for j in range(len(row))]))
+    return patterns
+
+
+def detect_golden_ratio_patterns(grid):
+    """🎯 ADVANCED: Detect golden ratio (1.618) patterns in grid"""
+    patterns = []
+
+    for i, row in enumerate(grid):
+        for j in range(len(row) - 1):
+            if str(row[j]).isdigit() and str(row[j+1]).isdigit():
+                val1, val2 = int(str(row[j])[0]), int(str(row[j+1])[0])
+                if val2 > 0 and abs((val1 / val2) - PHI) < PHI_TOLERANCE:
+                    patterns.append(('golden_ratio', f'row_{i}', f'{val1}/{val2}', [(i, j), (i, j+1)]))
+    return patterns
+
+
+def detect_harmonic_sequences(grid):
+    """🎯 ADVANCED: Detect harmonic number sequences (1, 1/2, 1/3, 1/4...)"""
+    harmonic_windows = windows(HARMONIC)
+    patterns = []
+
+    for i, row in enumerate(grid):
+        row_digits = [int(str(cell)[0]) for cell in row if str(cell).isdigit()]
+        for start in range(len(row_digits) - 2):
+            seq = row_digits[start:start+3]
+            if seq in harmonic_windows:
+                patterns.append(('harmonic', f'row_{i}', ''.join(map(str, seq)), [(i, start+k) for k in range(3)]))
+    return patterns
+
+
+def detect_mirror_symmetry(grid):
+    """🎯 ADVANCED: Detect mirror/palindrome patterns"""
+    patterns = []
+
+    for i, row in enumerate(grid):
+        row_str = ''.join([str(cell) for cell in row if str(cell).isdigit()])
+        if len(row_str) >= 2 and row_str == row_str[::-1]:
+            patterns.append(('mirror_symmetry', f'row_{i}', row_str, [(i, j) for j in range(len(row))]))
+
+    # Check diagonal symmetry
+    for i in range(len(grid) - 1):
+        for j in range(len(grid[i]) - 1):
+            if str(grid[i][j]).isdigit() and str(grid[i+1][j+1]).isdigit():
+                if str(grid[i][j])[0] == str(grid[i+1][j+1])[0]:
+                    patterns.append(('diagonal_mirror', f'pos_{i}_{j}', str(grid[i][j]), [(i, j), (i+1, j+1)]))
+    return patterns
+
+
+def detect_arithmetic_progressions(grid):
+    """🎯 ADVANCED: Detect arithmetic progressions (e.g., 2,4,6,8 or 1,3,5,7)"""
+    patterns = []
+
+    for i, row in enumerate(grid):
+        row_digits = [int(str(cell)[0]) for cell in row if str(cell).isdigit()]
+        for start in range(len(row_digits) - 2):
+            seq = row_digits[start:start+3]
+            diff1 = seq[1] - seq[0]
+            diff2 = seq[2] - seq[1]
+            if diff1 == diff2 and diff1 != 0:
+                patterns.append(('arithmetic_prog', f'row_{i}', f'{seq[0]},{seq[1]},{seq[2]}', [(i, start+k) for k in range(3)]))
+    return patterns
+
+
+# In EXTRA_KINDS order (mirror symmetry also reports diagonal mirrors)
+DETECTORS = (detect_fibonacci_patterns, detect_prime_clusters, detect_sum_patterns, detect_golden_ratio_patterns,
+             detect_harmonic_sequences, detect_mirror_symmetry, detect_arithmetic_progressions)
+
+
+def detect_extra_patterns(grid):
+    """Non king-move patterns layered on top of find_all_4digit_patterns"""
+    patterns = []
+    for detector in DETECTORS:
+        patterns.extend(detector(grid))
+    return patterns
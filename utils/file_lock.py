@@ -0,0 +1,90 @@
+"""
+File Locks
+Exclusive locks shared by threads and processes (scrapers, app workers) on one data file
+
+    with file_lock('4d_results_history.csv'):
+        ...  # append rows / read a consistent copy
+
+The lock is an advisory lock on ``<path>.lock`` (fcntl on POSIX, msvcrt on
+Windows); it only orders writers and readers that take it. ``acquire(blocking=False)``
+/ ``release()`` hold it outside a ``with`` block, e.g. to elect one process
+for a job; a process's locks go away with it.
+"""
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+LOCK_SUFFIX = '.lock'
+
+_thread_locks = {}
+_thread_locks_guard = threading.Lock()
+
+
+def _thread_lock(key):
+    with _thread_locks_guard:
+        return _thread_locks.setdefault(key, threading.Lock())
+
+
+class file_lock:
+    """Exclusive lock on ``path`` across threads and processes (a context manager, or acquire/release)"""
+
+    def __init__(self, path):
+        self.lock_path = os.path.abspath(path) + LOCK_SUFFIX
+        self._thread_lock = _thread_lock(self.lock_path)
+        self._fd = None
+
+    def acquire(self, blocking=True):
+        """Take the lock; with blocking=False return False instead of waiting for another holder"""
+        # flock is per open file, so threads of one process queue on a thread lock first
+        if not self._thread_lock.acquire(blocking):
+            return False
+        try:
+            directory = os.path.dirname(self.lock_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(self._fd, msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+        except BlockingIOError:
+            self._release()
+            return False
+        except OSError:
+            # msvcrt reports a held lock as a plain OSError
+            self._release()
+            if blocking or fcntl is not None:
+                raise
+            return False
+        except BaseException:
+            self._release()
+            raise
+        return True
+
+    def release(self):
+        self._release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self._release()
+
+    def _release(self):
+        try:
+            if self._fd is not None:
+                if fcntl is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
+                else:
+                    os.lseek(self._fd, 0, os.SEEK_SET)
+                    msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+                os.close(self._fd)
+        finally:
+            self._fd = None
+            self._thread_lock.release()
@@ -1,28 +1,22 @@
 """
 Frequency Analysis Module - Hot/Cold Numbers, Odd/Even Analysis
 """
-from collections import Counter
+from utils.stats_store import get_stats_store
 
 def analyze_frequency(df, provider='all'):
     """Full frequency analysis from REAL CSV data"""
-    if provider != 'all':
-        df = df[df['provider'] == provider]
-    all_nums = []
-    for col in ['1st_real', '2nd_real', '3rd_real']:
-        nums = df[col].astype(str).tolist()
-        all_nums.extend([n for n in nums if len(n) == 4 and n.isdigit()])
+    freq = get_stats_store().stats_for(df, provider).counts()
     
-    if not all_nums:
+    if not freq:
         return {'hot_numbers': [], 'cold_numbers': [], 'odd_pct': 0, 'even_pct': 0, 'chart_data': [], 'top_4_prediction': [], 'total_draws': 0}
     
-    freq = Counter(all_nums)
     hot_numbers = freq.most_common(10)
     cold_numbers = sorted(freq.items(), key=lambda x: x[1])[:10]
     
     # Odd/Even analysis
-    odd_count = sum(1 for n in all_nums if int(n) % 2 == 1)
-    even_count = len(all_nums) - odd_count
-    total = len(all_nums)
+    total = sum(freq.values())
+    odd_count = sum(count for n, count in freq.items() if int(n) % 2 == 1)
+    even_count = total - odd_count
     odd_pct = (odd_count / total * 100) if total > 0 else 0
     even_pct = (even_count / total * 100) if total > 0 else 0
     
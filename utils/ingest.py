@@ -0,0 +1,179 @@
+"""
+Incremental Result Ingestion
+Append-only path for new draw rows: persistent dedup index, appends under a cross-process lock
+"""
+import csv
+import io
+import logging
+import os
+
+from utils.file_lock import file_lock
+
+logger = logging.getLogger(__name__)
+
+KEYS_SUFFIX = '.keys'
+OFFSET_MARKER = '#offset'
+
+
+def dedup_key(row):
+    """(draw date, provider) - the same key live4d_scraper always used"""
+    return (str(row[0]).strip(), str(row[1]).strip()) if len(row) > 1 else None
+
+
+class DedupIndex:
+    """
+    Persistent set of (date, provider) keys for a results CSV.
+
+    Stored next to the CSV as ``<csv>.keys``: an append-only file of
+    tab-separated keys plus ``#offset`` lines recording how many CSV bytes
+    are covered. Rows appended by other writers are picked up by scanning
+    only the CSV tail past that offset; a shrunk CSV triggers a one-off
+    full rebuild.
+    """
+
+    def __init__(self, csv_path):
+        self.csv_path = csv_path
+        self.keys_path = csv_path + KEYS_SUFFIX
+        self.keys = set()
+        self.offset = 0
+        self._load()
+        self.sync()
+
+    def _load(self):
+        try:
+            with open(self.keys_path, encoding='utf-8') as fh:
+                for line in fh:
+                    first, _, second = line.rstrip('\n').partition('\t')
+                    if first == OFFSET_MARKER:
+                        self.offset = int(second)
+                    else:
+                        self.keys.add((first, second))
+        except (OSError, ValueError):
+            self.keys, self.offset = set(), 0
+
+    def _append(self, keys):
+        with open(self.keys_path, 'a', encoding='utf-8') as fh:
+            for date, provider in keys:
+                fh.write(f'{date}\t{provider}\n')
+            fh.write(f'{OFFSET_MARKER}\t{self.offset}\n')
+
+    def _rewrite(self):
+        tmp_path = f"{self.keys_path}.tmp{os.getpid()}"
+        with open(tmp_path, 'w', encoding='utf-8') as fh:
+            for date, provider in self.keys:
+                fh.write(f'{date}\t{provider}\n')
+            fh.write(f'{OFFSET_MARKER}\t{self.offset}\n')
+        os.replace(tmp_path, self.keys_path)
+
+    def sync(self):
+        """Absorb rows appended to the CSV since the index was last saved"""
+        size = os.path.getsize(self.csv_path) if os.path.exists(self.csv_path) else 0
+        if size == self.offset:
+            return
+        rebuild = size < self.offset
+        if rebuild:
+            logger.info(f"{self.csv_path} shrank - rebuilding dedup index")
+            self.keys, self.offset = set(), 0
+        with open(self.csv_path, 'rb') as fh:
+            fh.seek(self.offset)
+            tail = fh.read()
+        added = self._keys_in_csv_text(tail) - self.keys
+        self.keys |= added
+        self.offset = size
+        if rebuild:
+            self._rewrite()
+        else:
+            self._append(added)
+
+    @staticmethod
+    def _keys_in_csv_text(data):
+        rows = csv.reader(io.StringIO(data.decode('utf-8', errors='replace')))
+        return {key for key in map(dedup_key, rows) if key}
+
+    def __contains__(self, key):
+        return key in self.keys
+
+    def dates(self):
+        return {date for date, _ in self.keys}
+
+    def record(self, rows, new_offset):
+        added = {key for key in map(dedup_key, rows) if key} - self.keys
+        self.keys |= added
+        self.offset = new_offset
+        self._append(added)
+
+
+_indexes = {}
+
+
+def get_dedup_index(csv_path):
+    """Shared DedupIndex per CSV (synced on every call, under the CSV's file lock)"""
+    with file_lock(csv_path):
+        return _dedup_index(csv_path)
+
+
+def _dedup_index(csv_path):
+    key = os.path.abspath(csv_path)
+    index = _indexes.get(key)
+    if index is None:
+        index = _indexes[key] = DedupIndex(csv_path)
+    else:
+        index.sync()
+    return index
+
+
+def ingest_rows(rows, csv_path, header=None):
+    """
+    Append new result rows to ``csv_path``, skipping (date, provider) keys
+    already present.
+
+    Cost scales with the number of new rows: the dedup index is persistent
+    and only the CSV tail is scanned. The CSV and its ``.keys`` file are
+    written under the CSV's file lock, which DatasetManager also takes to
+    read, so every process sees whole rows; the app's manager then merges
+    just the appended tail. ``header`` is written if the CSV is new.
+    Returns the list of rows actually written.
+    """
+    if not rows:
+        return []
+
+    with file_lock(csv_path):
+        directory = os.path.dirname(csv_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if header and not os.path.exists(csv_path):
+            with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+                csv.writer(f).writerow(header)
+
+        index = _dedup_index(csv_path)
+        fresh, seen = [], set()
+        for row in rows:
+            key = dedup_key(row)
+            if key is None or key in index or key in seen:
+                continue
+            seen.add(key)
+            fresh.append([('' if v is None else v) for v in row])
+        if not fresh:
+            return []
+
+        buf = io.StringIO()
+        csv.writer(buf).writerows(fresh)
+        data = buf.getvalue().encode('utf-8')
+        if _needs_newline(csv_path):
+            data = b'\r\n' + data
+        with open(csv_path, 'ab') as f:
+            f.write(data)
+        index.record(fresh, os.path.getsize(csv_path))
+
+    logger.info(f"Ingested {len(fresh)} new rows into {csv_path}")
+    return fresh
+
+
+def _needs_newline(csv_path):
+    """True when the CSV's last line is unterminated"""
+    if not os.path.exists(csv_path) or os.path.getsize(csv_path) == 0:
+        return False
+    with open(csv_path, 'rb') as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) != b'\n'
+
@@ -4,7 +4,8 @@ Learns sequences from historical draws
 """
 import numpy as np
 import pandas as pd
-from collections import Counter
+
+from utils.transition_engine import TransitionEngine, NUM_STATES
 
 def lstm_predictor(df, lookback=100):
     """
@@ -16,7 +17,7 @@ def lstm_predictor(df, lookback=100):
         all_numbers = []
         for col in ['number_1st', 'number_2nd', 'number_3rd']:
             if col in df.columns:
-                all_numbers.extend([n for n in df[col].dropna() if n and len(str(n)) == 4])
+                all_numbers.extend([n for n in df[col].dropna().tolist() if n and len(str(n)) == 4])
         
         if len(all_numbers) < 20:
             return []
@@ -25,20 +26,15 @@ def lstm_predictor(df, lookback=100):
         recent = all_numbers[-lookback:]
         
         # Sequence learning: what follows what
-        sequences = {}
-        for i in range(len(recent) - 1):
-            curr = recent[i]
-            next_num = recent[i + 1]
-            if curr not in sequences:
-                sequences[curr] = []
-            sequences[curr].append(next_num)
+        transitions = TransitionEngine.from_draws(recent).matrix.tocoo()
         
-        # Score candidates based on sequence strength
-        candidates = {}
-        for num, followers in sequences.items():
-            for follower in followers:
-                weight = followers.count(follower) / len(followers)
-                candidates[follower] = candidates.get(follower, 0) + weight
+        # Score candidates based on sequence strength: every time a follower
+        # occurred it adds its share of the source's followers, so the score
+        # is sum over sources of count^2 / out-degree
+        out_degree = np.bincount(transitions.row, weights=transitions.data, minlength=NUM_STATES)
+        strength = np.bincount(transitions.col, weights=transitions.data ** 2 / out_degree[transitions.row],
+                               minlength=NUM_STATES)
+        candidates = {f'{code:04d}': strength[code] for code in np.flatnonzero(strength)}
         
         # Add recency bias (recent numbers weighted more)
         for i, num in enumerate(recent[-20:]):
@@ -2,7 +2,9 @@
 Pure Markov Chain Predictor - Uses ONLY CSV data transitions
 No fake predictions - only real numbers that actually followed in history
 """
-from collections import defaultdict, Counter
+from collections import Counter
+
+from utils.transition_engine import TransitionEngine
 
 def build_markov_chain(historical_draws):
     """
@@ -10,18 +12,9 @@ def build_markov_chain(historical_draws):
     Shows: What number followed each number in history
     """
     if not historical_draws or len(historical_draws) < 2:
-        return {}
-    
-    transitions = defaultdict(lambda: defaultdict(int))
-    
-    for i in range(len(historical_draws) - 1):
-        current = str(historical_draws[i])
-        next_num = str(historical_draws[i + 1])
-        
-        if len(current) == 4 and len(next_num) == 4 and current.isdigit() and next_num.isdigit():
-            transitions[current][next_num] += 1
+        return TransitionEngine()
     
-    return transitions
+    return TransitionEngine.from_draws(historical_draws)
 
 def predict_from_markov(today_number, transitions, all_historical):
     """
@@ -35,13 +28,11 @@ def predict_from_markov(today_number, transitions, all_historical):
         return []
     
     # Direct lookup: What followed this number before?
-    if today_str in transitions:
-        next_candidates = transitions[today_str]
-        total_occurrences = sum(next_candidates.values())
-        
-        for next_num, count in sorted(next_candidates.items(), key=lambda x: x[1], reverse=True):
-            confidence = (count / total_occurrences) * 100
-            predictions.append((next_num, confidence, f"Followed {count}x"))
+    next_candidates = transitions.followers(today_str)
+    total_occurrences = sum(count for _, count in next_candidates)
+    for next_num, count in next_candidates:
+        confidence = (count / total_occurrences) * 100
+        predictions.append((next_num, confidence, f"Followed {count}x"))
     
     # Fallback: If today's number never appeared, use most frequent numbers
     if not predictions and all_historical:
@@ -56,30 +47,4 @@ def get_markov_statistics(transitions):
     """
     Get statistics about the Markov chain
     """
-    stats = {
-        'unique_numbers': len(transitions),
-        'total_transitions': sum(sum(v.values()) for v in transitions.values()),
-        'avg_transitions_per_number': 0,
-        'most_connected': None,
-        'least_connected': None
-    }
-    
-    if transitions:
-        transition_counts = [len(v) for v in transitions.values()]
-        stats['avg_transitions_per_number'] = sum(transition_counts) / len(transition_counts)
-        
-        # Most connected (has most different followers)
-        most_connected_num = max(transitions.items(), key=lambda x: len(x[1]))
-        stats['most_connected'] = {
-            'number': most_connected_num[0],
-            'followers': len(most_connected_num[1])
-        }
-        
-        # Least connected
-        least_connected_num = min(transitions.items(), key=lambda x: len(x[1]))
-        stats['least_connected'] = {
-            'number': least_connected_num[0],
-            'followers': len(least_connected_num[1])
-        }
-    
-    return stats
+    return transitions.statistics()
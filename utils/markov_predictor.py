@@ -2,7 +2,7 @@
 Markov Chain Predictor
 Predicts next state based on current state transitions
 """
-from collections import defaultdict, Counter
+from utils.transition_engine import TransitionEngine
 
 def markov_chain_predictor(df, lookback=200):
     """
@@ -14,7 +14,7 @@ def markov_chain_predictor(df, lookback=200):
         all_numbers = []
         for col in ['number_1st', 'number_2nd', 'number_3rd']:
             if col in df.columns:
-                all_numbers.extend([n for n in df[col].dropna() if n and len(str(n)) == 4])
+                all_numbers.extend([n for n in df[col].dropna().tolist() if n and len(str(n)) == 4])
         
         if len(all_numbers) < 10:
             return []
@@ -22,38 +22,23 @@ def markov_chain_predictor(df, lookback=200):
         recent = all_numbers[-lookback:]
         
         # Build transition matrix
-        transitions = defaultdict(lambda: Counter())
-        
-        for i in range(len(recent) - 1):
-            current_state = recent[i]
-            next_state = recent[i + 1]
-            transitions[current_state][next_state] += 1
+        engine = TransitionEngine.from_draws(recent)
         
         # Get current state (last drawn number)
         current = recent[-1] if recent else None
         
-        if not current or current not in transitions:
+        if not current or current not in engine:
             # Fallback: use most common transitions
-            all_transitions = Counter()
-            for state_transitions in transitions.values():
-                all_transitions.update(state_transitions)
-            
-            predictions = []
-            for num, count in all_transitions.most_common(5):
-                prob = count / sum(all_transitions.values())
-                predictions.append((num, prob, 'Markov-fallback'))
-            return predictions
+            targets = engine.target_counts()
+            total = targets.sum()
+            if not total:
+                return []
+            top = sorted(targets.nonzero()[0], key=lambda code: (-targets[code], code))[:5]
+            return [(f'{code:04d}', targets[code] / total, 'Markov-fallback') for code in top]
         
         # Calculate transition probabilities from current state
-        next_states = transitions[current]
-        total = sum(next_states.values())
-        
-        predictions = []
-        for num, count in next_states.most_common(5):
-            probability = count / total
-            predictions.append((num, probability, f'Markov-from-{current}'))
-        
-        return predictions
+        return [(num, probability, f'Markov-from-{current}')
+                for num, probability in engine.top_k([current], 5)[0]]
     
     except Exception as e:
         return []
@@ -68,37 +53,22 @@ def markov_multi_step(df, steps=3, lookback=200):
         all_numbers = []
         for col in ['number_1st', 'number_2nd', 'number_3rd']:
             if col in df.columns:
-                all_numbers.extend([n for n in df[col].dropna() if n and len(str(n)) == 4])
+                all_numbers.extend([n for n in df[col].dropna().tolist() if n and len(str(n)) == 4])
         
         if len(all_numbers) < 10:
             return []
         
         recent = all_numbers[-lookback:]
         
-        # Build multi-step transitions
-        transitions = defaultdict(lambda: Counter())
-        
-        for i in range(len(recent) - steps):
-            state_sequence = tuple(recent[i:i+steps])
-            next_state = recent[i + steps]
-            transitions[state_sequence][next_state] += 1
-        
-        # Get current state sequence
-        current_sequence = tuple(recent[-steps:]) if len(recent) >= steps else None
+        # Where the chain leads ``steps`` draws after the current state (matrix power)
+        engine = TransitionEngine.from_draws(recent)
+        current = recent[-1] if recent else None
+        predictions = engine.top_k([current], 5, steps=steps)[0] if current else []
         
-        if not current_sequence or current_sequence not in transitions:
+        if not predictions:
             return markov_chain_predictor(df, lookback)
         
-        # Predict from current sequence
-        next_states = transitions[current_sequence]
-        total = sum(next_states.values())
-        
-        predictions = []
-        for num, count in next_states.most_common(5):
-            probability = count / total
-            predictions.append((num, probability, f'Markov-{steps}step'))
-        
-        return predictions
+        return [(num, probability, f'Markov-{steps}step') for num, probability in predictions]
     
     except Exception as e:
         return []
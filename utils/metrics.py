@@ -0,0 +1,293 @@
+"""
+Metrics
+Function timings, per-request load/compute/render breakdowns and counters, exported in Prometheus text format
+
+    @timed('load_csv_data', phase='load')
+    def load_csv_data(): ...
+
+    with timing('report.write'):
+        ...
+
+Each process keeps its own registry: under the pre-fork server a scrape
+of /metrics reports the worker that served it (``process`` label).
+"""
+import functools
+import math
+import os
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+from utils.singleton import process_singleton
+
+PREFIX = 'smart4d'
+# Time inside a request is split into these phases: 'load' and 'render' are
+# the outermost timed sections marked with that phase, 'compute' is the rest
+PHASES = ('load', 'compute', 'render')
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# One exported value: kind is 'counter' or 'gauge'
+Sample = namedtuple('Sample', 'name kind help labels value')
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus semantics) that also keeps the maximum"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def cumulative(self):
+        total, out = 0, []
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            out.append((bound, total))
+        return out
+
+
+class _RequestState:
+    """Phase accounting of the request running on this thread"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = {}
+        self.open_phase = None
+
+
+class _Section:
+    __slots__ = ('name', 'phase', 'started', 'attributed')
+
+    def __init__(self, name, phase):
+        self.name = name
+        self.phase = phase
+        self.attributed = False
+        self.started = None
+
+
+class MetricsRegistry:
+    """
+    Process-wide store of histograms and counters, keyed by (name, labels).
+    Collectors (callables returning Samples) report other subsystems'
+    counters at scrape time, so they cost nothing between scrapes.
+    """
+
+    def __init__(self):
+        self._histograms = {}
+        self._counters = {}
+        self._help = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    # ---- raw metrics ----
+    def observe(self, name, seconds, help='', **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+                self._help.setdefault(name, help)
+            histogram.observe(seconds)
+
+    def inc(self, name, value=1, help='', **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+            self._help.setdefault(name, help)
+
+    def add_collector(self, collector):
+        self._collectors.append(collector)
+
+    # ---- timed sections ----
+    def start_section(self, name, phase=None):
+        section = _Section(name, phase)
+        state = getattr(self._local, 'request', None)
+        if phase and state is not None and state.open_phase is None:
+            # Outermost phased section of the request: its time goes to the phase
+            state.open_phase = section
+            section.attributed = True
+        section.started = time.perf_counter()
+        return section
+
+    def end_section(self, section, failed=False):
+        seconds = time.perf_counter() - section.started
+        self.observe('function_duration_seconds', seconds, help='Wall time of timed functions and sections',
+                     function=section.name)
+        if failed:
+            self.inc('function_errors_total', help='Exceptions raised through timed functions',
+                     function=section.name)
+        state = getattr(self._local, 'request', None)
+        if section.attributed and state is not None and state.open_phase is section:
+            state.phases[section.phase] = state.phases.get(section.phase, 0.0) + seconds
+            state.open_phase = None
+        return seconds
+
+    # ---- requests ----
+    def begin_request(self):
+        self._local.request = _RequestState()
+
+    def request_phases(self):
+        """{phase: seconds} of this thread's request so far, or None outside a request"""
+        state = getattr(self._local, 'request', None)
+        if state is None:
+            return None
+        total = time.perf_counter() - state.started
+        phases = {phase: state.phases.get(phase, 0.0) for phase in PHASES if phase != 'compute'}
+        phases['compute'] = max(0.0, total - sum(phases.values()))
+        return {phase: phases[phase] for phase in PHASES}
+
+    def end_request(self, endpoint, family='', status=200):
+        phases = self.request_phases()
+        if phases is None:
+            return None
+        self._local.request = None
+        total = sum(phases.values())
+        self.observe('request_duration_seconds', total, help='Wall time of requests (streamed bodies included)',
+                     endpoint=endpoint, family=family)
+        for phase, seconds in phases.items():
+            self.observe('request_phase_seconds', seconds, help='Request time by phase (load / compute / render)',
+                         endpoint=endpoint, phase=phase)
+        self.inc('requests_total', help='Requests by endpoint and status', endpoint=endpoint, family=family,
+                 status=str(status))
+        return phases
+
+    def request_summary(self, family=None):
+        """{endpoint: {requests, errors, total_seconds, mean_ms, max_ms}} of one family (or all)"""
+        summary = {}
+        with self._lock:
+            for (name, labels), histogram in self._histograms.items():
+                labels = dict(labels)
+                if name != 'request_duration_seconds' or (family is not None and labels['family'] != family):
+                    continue
+                summary[labels['endpoint']] = {
+                    'requests': histogram.count, 'errors': 0, 'total_seconds': round(histogram.sum, 4),
+                    'mean_ms': round(histogram.sum / histogram.count * 1000, 2) if histogram.count else 0.0,
+                    'max_ms': round(histogram.max * 1000, 2)}
+            for (name, labels), value in self._counters.items():
+                labels = dict(labels)
+                if name == 'requests_total' and labels['endpoint'] in summary and labels['status'].startswith('5'):
+                    summary[labels['endpoint']]['errors'] += value
+        return summary
+
+    # ---- export ----
+    def collect(self):
+        """Samples of every collector; one that fails is skipped for this scrape"""
+        samples = []
+        for collector in list(self._collectors):
+            try:
+                samples.extend(collector())
+            except Exception as e:
+                samples.append(Sample('collector_failed', 'gauge', 'Collectors that failed this scrape',
+                                      {'collector': getattr(collector, '__name__', repr(collector)),
+                                       'error': type(e).__name__}, 1))
+        return samples
+
+    def render(self):
+        """Everything in the Prometheus text exposition format (version 0.0.4)"""
+        process = {'process': str(os.getpid())}
+        lines = []
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+            helps = dict(self._help)
+        seen = set()
+
+        def header(name, kind, help_text):
+            if name not in seen:
+                seen.add(name)
+                lines.append(f"# HELP {PREFIX}_{name} {help_text or name}")
+                lines.append(f"# TYPE {PREFIX}_{name} {kind}")
+
+        for (name, labels), histogram in histograms:
+            header(name, 'histogram', helps.get(name))
+            labels = dict(labels, **process)
+            for bound, count in histogram.cumulative():
+                lines.append(f"{PREFIX}_{name}_bucket{_labels(labels, le=_number(bound))} {count}")
+            lines.append(f"{PREFIX}_{name}_bucket{_labels(labels, le='+Inf')} {histogram.count}")
+            lines.append(f"{PREFIX}_{name}_sum{_labels(labels)} {_number(histogram.sum)}")
+            lines.append(f"{PREFIX}_{name}_count{_labels(labels)} {histogram.count}")
+        for (name, labels), value in counters:
+            header(name, 'counter', helps.get(name))
+            lines.append(f"{PREFIX}_{name}{_labels(dict(labels, **process))} {_number(value)}")
+        for sample in sorted(self.collect(), key=lambda s: s.name):
+            header(sample.name, sample.kind, sample.help)
+            lines.append(f"{PREFIX}_{sample.name}{_labels(dict(sample.labels, **process))} {_number(sample.value)}")
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(labels, **extra):
+    labels = dict(labels, **extra)
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + '}'
+
+
+def _number(value):
+    value = float(value)
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(int(value)) if value.is_integer() else repr(value)
+
+
+@process_singleton
+def get_metrics():
+    """Process-wide MetricsRegistry"""
+    return MetricsRegistry()
+
+
+@contextmanager
+def timing(name, phase=None):
+    """
+    Time a section as ``name``; ``phase`` ('load' or 'render') charges it
+    to the current request's breakdown.
+    """
+    registry = get_metrics()
+    section = registry.start_section(name, phase)
+    failed = True
+    try:
+        yield
+        failed = False
+    finally:
+        registry.end_section(section, failed=failed)
+
+
+def timed(name=None, phase=None):
+    """
+    Decorator form of ``timing`` (without the generator overhead, for hot
+    functions); ``name`` defaults to the function's qualified name.
+    """
+    def decorator(func):
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            registry = get_metrics()
+            section = registry.start_section(label, phase)
+            failed = True
+            try:
+                result = func(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                registry.end_section(section, failed=failed)
+
+        return wrapper
+
+    return decorator
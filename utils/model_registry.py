@@ -0,0 +1,194 @@
+"""
+Model Registry
+Versioned joblib artifacts for trained predictors, with an in-memory LRU of hot models
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import namedtuple
+
+import joblib
+
+from utils.cache import LRUCache
+from utils.exports import BackgroundWriter
+from utils.singleton import process_singleton
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROOT = os.path.join('models', 'registry')
+ARTIFACT_SUFFIX = '.joblib'
+METADATA_SUFFIX = '.json'
+
+ModelKey = namedtuple('ModelKey', 'name provider lookback version')
+
+
+def version_token(version):
+    """Short, file-name-safe token for a version (a content hash, or any hashable with a stable repr)"""
+    if isinstance(version, str) and re.fullmatch(r'[0-9a-f]{8,64}', version):
+        return version[:20]
+    return hashlib.sha1(repr(version).encode()).hexdigest()[:20]
+
+
+def content_digest(values):
+    """Version token of a training sequence (e.g. the numbers a model was fitted on)"""
+    return hashlib.sha1('\n'.join(map(str, values)).encode()).hexdigest()
+
+
+def frame_provider(df):
+    """Provider a frame is restricted to, or 'all'"""
+    if df.empty or 'provider_key' not in df.columns:
+        return 'all'
+    providers = df['provider_key'].dropna().unique()
+    return str(providers[0]) if len(providers) == 1 else 'all'
+
+
+def _slug(value):
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', str(value)).strip('_') or 'none'
+
+
+class ModelRegistry:
+    """
+    Trained models keyed by (predictor name, provider, lookback, version).
+
+    ``version`` is normally the dataset version, or any token identifying the
+    training data. Artifacts live under
+    ``<root>/<name>/<provider>/lb<lookback>/<token>.joblib`` with a JSON
+    metadata file next to them, so a restart or another worker process loads
+    the model instead of retraining it. Loaded models stay in an LRU; only
+    the newest ``keep`` artifacts per (name, provider, lookback) are kept.
+
+    Artifacts are written by a background thread, never on the caller's
+    path; models of ad-hoc frames (filtered views, backtest windows) should
+    be registered with ``persist=False`` so only reusable ones reach disk.
+    """
+
+    def __init__(self, root=DEFAULT_ROOT, maxsize=32, keep=5, persist=True):
+        self.root = root
+        self.keep = keep
+        self.persist = persist
+        self.hot = LRUCache(maxsize=maxsize, name='models.registry')
+        self.loads = 0
+        self.saves = 0
+        self._lock = threading.Lock()
+        self._writer = BackgroundWriter(name='model-writer')
+
+    def key(self, name, provider='all', lookback=None, version=None):
+        if version is None:
+            from utils.dataset_manager import dataset_version
+            version = dataset_version()
+        return ModelKey(name, str(provider or 'all'), lookback, version_token(version))
+
+    def _dir(self, key):
+        lookback = 'lb-' if key.lookback is None else f'lb{key.lookback}'
+        return os.path.join(self.root, _slug(key.name), _slug(key.provider), lookback)
+
+    def path(self, key):
+        """Artifact path (without suffix)"""
+        return os.path.join(self._dir(key), key.version)
+
+    def get(self, name, provider='all', lookback=None, version=None):
+        """The model for this key from memory or disk, or None"""
+        key = self.key(name, provider, lookback, version)
+        model = self.hot.get(key)
+        if model is not None or not self.persist:
+            return model
+        return self._load(key, self.path(key) + ARTIFACT_SUFFIX)
+
+    def _load(self, key, artifact):
+        if not os.path.exists(artifact):
+            return None
+        try:
+            model = joblib.load(artifact)
+        except Exception as e:
+            logger.warning(f"Model artifact unreadable ({artifact}): {e}")
+            return None
+        self.loads += 1
+        self.hot.set(key, model)
+        logger.info(f"Loaded model {key.name}/{key.provider}/lb{key.lookback} ({key.version})")
+        return model
+
+    def put(self, name, model, provider='all', lookback=None, version=None, metadata=None, persist=None):
+        """
+        Register a trained model: kept in memory, and queued for saving unless
+        ``persist`` (default: the registry's setting) is False
+        """
+        key = self.key(name, provider, lookback, version)
+        self.hot.set(key, model)
+        if not (self.persist if persist is None else persist):
+            return key
+        info = {
+            'name': name, 'provider': key.provider, 'lookback': lookback,
+            'version': key.version, 'saved_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        }
+        info.update(metadata or {})
+        self._writer.submit((self.root, key), self._save, key, model, info)
+        return key
+
+    def flush(self):
+        """Wait for queued artifact writes"""
+        self._writer.drain()
+
+    def _save(self, key, model, info):
+        base = self.path(key)
+        try:
+            os.makedirs(os.path.dirname(base), exist_ok=True)
+            tmp_path = f"{base}.tmp{os.getpid()}"
+            joblib.dump(model, tmp_path)
+            os.replace(tmp_path, base + ARTIFACT_SUFFIX)
+            with open(base + METADATA_SUFFIX, 'w', encoding='utf-8') as fh:
+                json.dump(info, fh, default=str)
+            self.saves += 1
+            self._prune(os.path.dirname(base))
+        except Exception as e:
+            logger.warning(f"Model artifact not saved ({base}): {e}")
+
+    def get_or_train(self, name, train, provider='all', lookback=None, version=None, metadata=None, persist=None):
+        """Registered model, or ``train()`` and register its result (None is not registered)"""
+        model = self.get(name, provider, lookback, version)
+        if model is None:
+            model = train()
+            if model is not None:
+                self.put(name, model, provider, lookback, version, metadata, persist)
+        return model
+
+    def entries(self, name=None):
+        """Metadata of every saved artifact (optionally of one predictor)"""
+        base = os.path.join(self.root, _slug(name)) if name else self.root
+        found = []
+        for dirpath, _, files in os.walk(base):
+            for filename in sorted(files):
+                if filename.endswith(METADATA_SUFFIX):
+                    try:
+                        with open(os.path.join(dirpath, filename), encoding='utf-8') as fh:
+                            found.append(json.load(fh))
+                    except (OSError, ValueError):
+                        continue
+        return found
+
+    @staticmethod
+    def _artifacts(directory):
+        """Artifacts in a key directory, oldest first"""
+        try:
+            paths = [os.path.join(directory, f) for f in os.listdir(directory) if f.endswith(ARTIFACT_SUFFIX)]
+        except OSError:
+            return []
+        return sorted(paths, key=os.path.getmtime)
+
+    def _prune(self, directory):
+        with self._lock:
+            for artifact in self._artifacts(directory)[:-self.keep]:
+                for path in (artifact, artifact[:-len(ARTIFACT_SUFFIX)] + METADATA_SUFFIX):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+
+
+@process_singleton
+def get_model_registry():
+    """Process-wide ModelRegistry"""
+    return ModelRegistry()
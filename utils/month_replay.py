@@ -0,0 +1,254 @@
+"""
+Month Replay
+Pattern-analyzer replay of a month's draws in one batch: grids as (N, 4, 4) arrays, hits as array set operations
+"""
+from collections import defaultdict
+
+import numpy as np
+
+from utils.app_grid import generate_4x4_grids, generate_reverse_grids
+from utils.extra_patterns import (EXTRA_KINDS, FIBONACCI, HARMONIC, MIN_PRIMES, PHI, PHI_TOLERANCE, PRIMES,
+                                  SUM_KINDS, SUM_LIMITS, WINDOW, windows)
+from utils.pattern_finder import PATH_COORDS, PATH_KINDS, pattern_codes_batch
+from utils.prediction_evaluator import digit_masks, number_codes_of
+
+PRIZES = (('1st', 'number_1st'), ('2nd', 'number_2nd'), ('3rd', 'number_3rd'))
+
+_POWERS = np.array([1000, 100, 10, 1])
+_POPCOUNT = np.array([bin(mask).count('1') for mask in range(1 << 10)], dtype=np.int8)
+# Bitmask of digits -> the digits as sorted strings
+_MASK_DIGITS = [[str(d) for d in range(10) if mask >> d & 1] for mask in range(1 << 10)]
+_ALL_DIGITS = (1 << 10) - 1
+
+# FeedbackLearner.evaluate_prediction: best digit match -> (match_type, score)
+_MATCH_TYPES = {4: ('EXACT', 100), 3: ('3-DIGIT', 75), 2: ('2-DIGIT', 50)}
+
+# The detect_extra_patterns rule table as arrays over digit grids
+_FIBONACCI = np.array(windows(FIBONACCI))
+_HARMONIC = np.array(windows(HARMONIC))
+_PRIMES = np.array(PRIMES)
+_SUM_LIMITS = np.array(SUM_LIMITS)
+
+# Pattern kinds of one grid in find_4digit_patterns order: the king-move
+# kinds, then the extra detectors (sum kinds are per row)
+_PATH_KIND_COUNTS = {}
+for _kind in PATH_KINDS:
+    _PATH_KIND_COUNTS[_kind] = _PATH_KIND_COUNTS.get(_kind, 0) + 1
+_PATH_KIND_RANKS = {kind: PATH_KINDS.index(kind) for kind in _PATH_KIND_COUNTS}
+
+
+def _row_windows(grids, width):
+    """(N, 4, 4) -> (N, 4, 5 - width, width) sliding windows along each row"""
+    return np.lib.stride_tricks.sliding_window_view(grids, width, axis=2)
+
+
+def _window_matches(windows, targets):
+    return (windows[..., None, :] == targets).all(axis=-1).any(axis=-1)
+
+
+def _grid_masks(grids):
+    return np.bitwise_or.reduce(1 << grids.reshape(len(grids), -1).astype(np.int64), axis=1)
+
+
+def extra_kind_counts(grids):
+    """
+    Per-grid counts of each detect_extra_patterns kind for digit grids, in
+    detection order: {kind: (counts (N,), rank within a grid's patterns (N,))}.
+    """
+    grids = grids.astype(np.int64)
+    rows = np.arange(grids.shape[1])
+    triples = _row_windows(grids, WINDOW)
+    pairs = _row_windows(grids, 2)
+    is_prime = np.isin(grids, _PRIMES)
+    row_sums = grids.sum(axis=2)
+
+    found = {
+        'fibonacci': _window_matches(triples, _FIBONACCI).sum(axis=(1, 2)),
+        'prime_cluster': (is_prime.sum(axis=2) >= MIN_PRIMES).sum(axis=1),
+        'golden_ratio': ((pairs[..., 1] > 0)
+                         & (np.abs(pairs[..., 0] / np.maximum(pairs[..., 1], 1) - PHI) < PHI_TOLERANCE)).sum(axis=(1, 2)),
+        'harmonic': _window_matches(triples, _HARMONIC).sum(axis=(1, 2)),
+        'mirror_symmetry': ((grids[:, :, 0] == grids[:, :, 3]) & (grids[:, :, 1] == grids[:, :, 2])).sum(axis=1),
+        'diagonal_mirror': (grids[:, :-1, :-1] == grids[:, 1:, 1:]).sum(axis=(1, 2)),
+        'arithmetic_prog': ((triples[..., 1] - triples[..., 0] == triples[..., 2] - triples[..., 1])
+                            & (triples[..., 1] != triples[..., 0])).sum(axis=(1, 2)),
+    }
+    base = len(PATH_KINDS)
+    counts = {}
+    for position, kind in enumerate(EXTRA_KINDS):
+        rank = base + position * len(rows)
+        if kind != 'sum':
+            counts[kind] = (found[kind], np.full(len(grids), rank))
+            continue
+        bands = np.searchsorted(_SUM_LIMITS, row_sums, side='left')
+        for band, sum_kind in enumerate(SUM_KINDS):
+            in_band = bands == band
+            first_row = np.where(in_band.any(axis=1), in_band.argmax(axis=1), 0)
+            counts[sum_kind] = (in_band.sum(axis=1), rank + first_row)
+    return counts
+
+
+def pattern_kind_frequencies(grids):
+    """compute_pattern_frequencies over find_4digit_patterns of many digit grids: [(kind, count)]"""
+    if not len(grids):
+        return []
+    per_kind = {kind: (np.full(len(grids), count), np.full(len(grids), _PATH_KIND_RANKS[kind]))
+                for kind, count in _PATH_KIND_COUNTS.items()}
+    per_kind.update(extra_kind_counts(grids))
+    totals = []
+    for kind, (counts, ranks) in per_kind.items():
+        present = np.flatnonzero(counts)
+        if len(present):
+            first = present[0]
+            totals.append((int(counts.sum()), (first, int(ranks[first])), kind))
+    # Ties keep the order in which kinds first appear, as the per-draw count did
+    totals.sort(key=lambda item: (-item[0], item[1]))
+    return [(kind, total) for total, _, kind in totals]
+
+
+def highlight_paths(grids, target_codes):
+    """
+    highlight_coords_for_patterns of every grid against its targets:
+    (N, 4, 4) grids, (N, T) target codes (-1 = none) -> list of coord lists.
+    Besides king-move paths, only the 4-digit extras can equal a target: a
+    row that is all primes and a palindromic row.
+    """
+    targets = target_codes[:, None, :]
+    path_hits = (pattern_codes_batch(grids).astype(np.int64)[:, :, None] == targets).any(axis=2)
+    row_codes = (grids.astype(np.int64) @ _POWERS)[:, :, None]
+    row_hits = (row_codes == targets).any(axis=2)
+    prime_rows = row_hits & np.isin(grids, _PRIMES).all(axis=2)
+    mirror_rows = row_hits & (grids[:, :, 0] == grids[:, :, 3]) & (grids[:, :, 1] == grids[:, :, 2])
+
+    row_coords = [[(r, c) for c in range(grids.shape[2])] for r in range(grids.shape[1])]
+    highlights = []
+    for paths, primes, mirrors in zip(path_hits, prime_rows, mirror_rows):
+        coords = [xy for p in np.flatnonzero(paths).tolist() for xy in PATH_COORDS[p]]
+        for rows in (primes, mirrors):
+            coords.extend(xy for r in np.flatnonzero(rows).tolist() for xy in row_coords[r])
+        highlights.append(coords)
+    return highlights
+
+
+def best_digit_matches(predicted, actual):
+    """
+    FeedbackLearner.count_matching_digits, best over every (prediction,
+    actual) pair of a row: (N, P), (N, A) codes (-1 = none) -> (N,).
+    """
+    pred = predicted[:, :, None]
+    act = actual[:, None, :]
+    valid = (pred >= 0) & (act >= 0)
+    pred_digits = (np.maximum(pred, 0)[..., None] // _POWERS) % 10
+    act_digits = (np.maximum(act, 0)[..., None] // _POWERS) % 10
+    positional = (pred_digits == act_digits).sum(axis=-1)
+    pred_masks = digit_masks(np.maximum(predicted, 0).ravel()).reshape(predicted.shape)[:, :, None]
+    act_masks = digit_masks(np.maximum(actual, 0).ravel()).reshape(actual.shape)[:, None, :]
+    shared = _POPCOUNT[pred_masks & act_masks]
+    matches = np.where(valid, np.maximum(positional, shared), 0)
+    return matches.max(axis=(1, 2), initial=0)
+
+
+class MonthReplay:
+    """
+    What the pattern analyzer shows for a month: for each draw but the last
+    and each valid prize, its grids and missing digits, the patterns that
+    the next draw hit, a prediction and how it scored.
+
+    ``month_draws`` is sorted and indexed 0..N-1; ``predict(grid, day)``
+    returns normalized (number, score, reason) predictions for one draw and
+    is called once per distinct (number, day).
+    """
+
+    def __init__(self, month_draws, predict):
+        self.draws = []
+        self.matches = []
+        self.pattern_frequencies = []
+        self.last_predictions = []
+        self.module_hits = defaultdict(int)
+        self.module_attempts = defaultdict(int)
+        self.module_provider_stats = defaultdict(lambda: defaultdict(lambda: {"hits": 0, "attempts": 0}))
+        self.module_daily_stats = defaultdict(lambda: defaultdict(lambda: {"hits": 0, "attempts": 0}))
+        if len(month_draws) < 2:
+            return
+
+        numbers = np.array([[str(value) for value in month_draws[col]] for _, col in PRIZES], dtype=object).T
+        codes = number_codes_of(numbers.ravel()).reshape(numbers.shape)
+        rows, prizes = np.nonzero(codes[:-1] >= 0)
+        if not len(rows):
+            return
+        item_codes = codes[rows, prizes]
+        target_codes = codes[rows + 1]
+        forward, reverse = generate_4x4_grids(item_codes), generate_reverse_grids(item_codes)
+
+        self.pattern_frequencies = pattern_kind_frequencies(forward)
+        highlights = highlight_paths(forward, target_codes)
+        reverse_highlights = highlight_paths(reverse, target_codes)
+        missing = _ALL_DIGITS & ~_grid_masks(forward)
+        missing_reverse = _ALL_DIGITS & ~_grid_masks(reverse)
+
+        days = [d.date() for d in month_draws['date_parsed']]
+        providers = month_draws['provider'].tolist()
+        grids = forward.astype(np.int64).tolist()
+        reverse_grids = reverse.astype(np.int64).tolist()
+
+        predictions = {}
+        for item, (row, code) in enumerate(zip(rows.tolist(), item_codes.tolist())):
+            key = (code, days[row])
+            if key not in predictions:
+                predictions[key] = predict(grids[item], str(days[row]))
+        item_predictions = [predictions[(code, days[row])] for row, code in zip(rows.tolist(), item_codes.tolist())]
+
+        predicted = np.full((len(rows), max(len(p) for p in item_predictions) or 1), -1, dtype=np.int64)
+        for item, preds in enumerate(item_predictions):
+            predicted[item, :len(preds)] = number_codes_of([pred for pred, _, _ in preds])
+        best = best_digit_matches(predicted, target_codes)
+        hit = (predicted[:, :, None] == target_codes[:, None, :]).any(axis=2) & (predicted >= 0)
+        three = (_POPCOUNT[digit_masks(np.maximum(predicted, 0).ravel()).reshape(predicted.shape)
+                           & digit_masks(item_codes)[:, None]] == 3) & (predicted >= 0)
+
+        past = defaultdict(list)
+        for item, (row, prize) in enumerate(zip(rows.tolist(), prizes.tolist())):
+            prize_type, _ = PRIZES[prize]
+            number = numbers[row, prize]
+            day, provider = days[row], providers[row]
+            preds = item_predictions[item]
+            targets = [n for n in numbers[row + 1].tolist() if n.isdigit()]
+            self.matches.append(_MATCH_TYPES.get(int(best[item]), ('MISS', 0)))
+
+            comparison = []
+            three_digit_hits = []
+            for slot, (pred, score, reason) in enumerate(preds):
+                is_hit = bool(hit[item, slot])
+                comparison.append({"number": pred, "score": score, "reason": reason,
+                                   "hit": "✅" if is_hit else "❌"})
+                for m in reason.split("+"):
+                    self.module_attempts[m] += 1
+                    self.module_provider_stats[provider][m]["attempts"] += 1
+                    self.module_daily_stats[day][m]["attempts"] += 1
+                    if is_hit:
+                        self.module_hits[m] += 1
+                        self.module_provider_stats[provider][m]["hits"] += 1
+                        self.module_daily_stats[day][m]["hits"] += 1
+                if three[item, slot]:
+                    shared = ''.join(sorted(set(pred) & set(number)))
+                    three_digit_hits.append((pred, score, f"matched 3 digits: {shared}"))
+
+            self.draws.append({
+                'date': day,
+                'provider': provider,
+                'prize_type': prize_type,
+                'number': number,
+                'grid': grids[item],
+                'reverse_grid': reverse_grids[item],
+                'next_targets': targets,
+                'highlight': highlights[item],
+                'reverse_highlight': reverse_highlights[item],
+                'missing_digits': list(_MASK_DIGITS[missing[item]]),
+                'missing_digits_reverse': list(_MASK_DIGITS[missing_reverse[item]]),
+                'past_2_predictions': past[prize_type][-2:],
+                'provider_predictions': {provider: preds},
+                'prediction_comparison': comparison,
+                'three_digit_hits': three_digit_hits,
+            })
+            past[prize_type].append(preds)
+        self.last_predictions = item_predictions[-1]
@@ -0,0 +1,58 @@
+"""
+Number Scoring
+Vectorized scores over the whole 0000-9999 space, held as a (10000, 4) digit array
+"""
+import numpy as np
+
+from utils.stats_store import NUMBER_DIGITS
+from utils.transition_engine import encode_numbers, MISSING
+
+# Codes (00-99) of each number's three adjacent digit pairs, (10000, 3)
+ADJACENT_PAIRS = NUMBER_DIGITS[:, :3] * 10 + NUMBER_DIGITS[:, 1:]
+
+
+def number_codes(numbers):
+    """4-digit strings -> int64 ids, invalid ones dropped"""
+    codes = encode_numbers(numbers)
+    return codes[codes != MISSING].astype(np.int64)
+
+
+def hot_digit_scores(codes):
+    """
+    Sum over a number's digits of each digit's frequency relative to the
+    hottest digit. Counts are summed before dividing, so permutations of one
+    number score exactly alike and top_k ranks them by number.
+    """
+    counts = np.bincount(NUMBER_DIGITS[codes].ravel(), minlength=10)
+    top = counts.max() if len(codes) else 0
+    totals = counts[NUMBER_DIGITS].sum(axis=1).astype(np.float64)
+    return totals / top if top else totals
+
+
+def pair_scores(codes, weight=0.06):
+    """``weight`` x how often each of a number's adjacent digit pairs occurred"""
+    counts = np.bincount(ADJACENT_PAIRS[codes].ravel(), minlength=100)
+    return weight * counts[ADJACENT_PAIRS].sum(axis=1)
+
+
+def transition_scores(codes):
+    """
+    Probability of each number following the newest one, learnt from the
+    (newest-first) sequence read in draw order - one row of the
+    TransitionEngine probability matrix, without building it.
+    """
+    chain = codes[::-1]
+    followed = chain[:-1] == chain[-1]
+    if not followed.any():
+        return np.zeros(len(NUMBER_DIGITS))
+    return np.bincount(chain[1:][followed], minlength=len(NUMBER_DIGITS)) / followed.sum()
+
+
+def top_k(scores, k=5):
+    """Indices of the k highest scores, best first (ties by number)"""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.array([], dtype=np.int64)
+    threshold = scores[np.argpartition(-scores, k - 1)[:k]].min()
+    candidates = np.flatnonzero(scores >= threshold)
+    return candidates[np.lexsort((candidates, -scores[candidates]))][:k]
@@ -1,43 +1,122 @@
 # utils/pattern_finder.py
 
-from utils.app_grid import generate_4x4_grid, generate_reverse_grid
+from collections import Counter
 
+import numpy as np
+
+from utils.app_grid import generate_reverse_grid, generate_4x4_grids, generate_reverse_grids
+from utils.metrics import timed
+
+GRID_ROWS, GRID_COLS = 4, 4
+PATTERN_LENGTH = 4
+_KING_MOVES = [
+    (-1, 0), (1, 0), (0, -1), (0, 1),
+    (1, 1), (1, -1), (-1, 1), (-1, -1)
+]
+_PLACE_VALUES = np.array([1000, 100, 10, 1], dtype=np.uint16)
+_NUMBER_STRINGS = np.array([f'{i:04d}' for i in range(10000)])
+
+
+def _kind_of_pattern(path):
+    if all(x == path[0][0] for x, y in path):
+        return 'row'
+    if all(y == path[0][1] for x, y in path):
+        return 'col'
+    if all(x == y for x, y in path):
+        return 'diag_main'
+    if all(x + y == 3 for x, y in path):
+        return 'diag_anti'
+    return 'other'
 
-def find_all_4digit_patterns(grid):
-    rows, cols = 4, 4
-    patterns = []
-
-    def kind_of_pattern(path):
-        if all(x == path[0][0] for x, y in path):
-            return 'row'
-        if all(y == path[0][1] for x, y in path):
-            return 'col'
-        if all(x == y for x, y in path):
-            return 'diag_main'
-        if all(x + y == 3 for x, y in path):
-            return 'diag_anti'
-        return 'other'
+
+def _enumerate_paths():
+    """Every 4-cell king-move path without revisits, in DFS order"""
+    paths = []
 
     def collect(r, c, path):
-        if len(path) == 4:
-            kind = kind_of_pattern(path)
-            patterns.append(
-                (kind, 0, ''.join(str(grid[x][y]) for x, y in path), path)
-            )
+        if len(path) == PATTERN_LENGTH:
+            paths.append(path)
             return
-        for dr, dc in [
-            (-1, 0), (1, 0), (0, -1), (0, 1),
-            (1, 1), (1, -1), (-1, 1), (-1, -1)
-        ]:
+        for dr, dc in _KING_MOVES:
             nr, nc = r + dr, c + dc
-            if 0 <= nr < rows and 0 <= nc < cols and (nr, nc) not in path:
+            if 0 <= nr < GRID_ROWS and 0 <= nc < GRID_COLS and (nr, nc) not in path:
                 collect(nr, nc, path + [(nr, nc)])
 
-    for i in range(rows):
-        for j in range(cols):
+    for i in range(GRID_ROWS):
+        for j in range(GRID_COLS):
             collect(i, j, [(i, j)])
-
-    return patterns
+    return paths
+
+
+# Path geometry is identical for every grid, so it is enumerated once:
+# PATH_COORDS[p] is the coordinate tuple, PATH_INDEX[p] the flat cell indices.
+# Shared by every call, so immutable; callers get list copies
+PATH_COORDS = tuple(tuple(path) for path in _enumerate_paths())
+PATH_KINDS = tuple(_kind_of_pattern(path) for path in PATH_COORDS)
+PATH_INDEX = np.array([[r * GRID_COLS + c for r, c in path] for path in PATH_COORDS], dtype=np.intp)
+NUM_PATHS = len(PATH_COORDS)
+
+
+def _as_digit_grids(grids):
+    """(N, 4, 4) / (4, 4) digit array, or None if any cell is not a single digit"""
+    try:
+        arr = np.asarray(grids, dtype=np.int64)
+    except (TypeError, ValueError):
+        return None
+    if arr.shape[-2:] != (GRID_ROWS, GRID_COLS) or arr.min(initial=0) < 0 or arr.max(initial=0) > 9:
+        return None
+    return arr
+
+
+def pattern_codes_batch(grids):
+    """
+    Pattern values for many grids in one gather.
+    grids: (N, 4, 4) digit array -> (N, P) uint16, e.g. 1678 for '1678'
+    """
+    arr = np.asarray(grids, dtype=np.uint16).reshape(-1, GRID_ROWS * GRID_COLS)
+    return arr[:, PATH_INDEX] @ _PLACE_VALUES
+
+
+def pattern_strings_batch(grids):
+    """(N, 4, 4) digit grids -> (N, P) array of 4-char pattern strings"""
+    return _NUMBER_STRINGS[pattern_codes_batch(grids)]
+
+
+def find_patterns_batch(numbers, reverse=False):
+    """(N, P) pattern strings for N numbers' normal (or reverse) grids"""
+    make_grids = generate_reverse_grids if reverse else generate_4x4_grids
+    return pattern_strings_batch(make_grids(numbers))
+
+
+def count_patterns(grids):
+    """Counter of pattern strings over many grids (one gather for digit grids)"""
+    counts = Counter()
+    if not grids:
+        return counts
+    digits = _as_digit_grids(grids)
+    if digits is not None and digits.ndim == 3:
+        values, freq = np.unique(pattern_codes_batch(digits), return_counts=True)
+        counts.update(dict(zip(_NUMBER_STRINGS[values].tolist(), freq.tolist())))
+    else:
+        for grid in grids:
+            counts.update(p for _, _, p, _ in find_all_4digit_patterns(grid))
+    return counts
+
+
+def pattern_values(grid):
+    """Pattern strings of one grid in path order, without building the pattern tuples"""
+    digits = _as_digit_grids(grid)
+    if digits is not None and digits.shape == (GRID_ROWS, GRID_COLS):
+        return pattern_strings_batch(digits)[0].tolist()
+    # Non-digit cells: fall back to joining the cell text
+    cells = [str(grid[r][c]) for r in range(GRID_ROWS) for c in range(GRID_COLS)]
+    return [''.join(cells[i] for i in idx) for idx in PATH_INDEX.tolist()]
+
+
+@timed('find_all_4digit_patterns')
+def find_all_4digit_patterns(grid):
+    values = pattern_values(grid)
+    return [(kind, 0, value, list(path)) for kind, value, path in zip(PATH_KINDS, values, PATH_COORDS)]
 
 
 def extract_pattern_flags(grid):
@@ -61,6 +140,19 @@ def extract_extended_features(grid):
     return grid_vals + digit_counts + [num_unique, num_repeats, sum_digits, mean_digits]
 
 
+def extract_extended_features_batch(grids):
+    """
+    extract_extended_features of N digit grids: (N, 4, 4) -> (N, 29) int
+    features (cells, digit counts, unique, repeats, sum) and (N,) means.
+    """
+    flat = np.asarray(grids, dtype=np.int64).reshape(-1, GRID_ROWS * GRID_COLS)
+    digit_counts = (flat[:, :, None] == np.arange(10)).sum(axis=1)
+    num_unique = (digit_counts > 0).sum(axis=1)
+    sum_digits = flat.sum(axis=1)
+    features = np.column_stack([flat, digit_counts, num_unique, flat.shape[1] - num_unique, sum_digits])
+    return features, sum_digits / 16
+
+
 def find_missing_digits(grid):
     all_digits = set(map(str, range(10)))
     used_digits = set(str(cell) for row in grid for cell in row)
@@ -80,11 +172,15 @@ def highlight_coords_for_patterns(patterns, targets):
 
 
 def search_pattern_in_grid(grid, pattern):
-    matches = []
-    for kind, idx, p, coords in find_4digit_patterns(grid):
-        if pattern == p:
-            matches.append(coords)
-    return matches
+    """Coordinate paths spelling ``pattern`` in a grid: one gather over the path table"""
+    pattern = str(pattern)
+    digits = _as_digit_grids(grid)
+    if digits is not None and digits.shape == (GRID_ROWS, GRID_COLS) and len(pattern) == PATTERN_LENGTH \
+            and pattern.isdigit():
+        hits = np.flatnonzero(pattern_codes_batch(digits)[0] == int(pattern)).tolist()
+    else:
+        hits = [i for i, value in enumerate(pattern_values(grid)) if value == pattern]
+    return [list(PATH_COORDS[i]) for i in hits]
 
 
 # ✅ Reverse grid helpers
@@ -0,0 +1,159 @@
+"""
+Full 4D Pattern Index
+Grid / reverse-grid patterns and missing digits for all 10,000 numbers, built once
+"""
+import json
+import logging
+import os
+
+import numpy as np
+
+from utils.app_grid import generate_4x4_grid, generate_reverse_grid, generate_4x4_grids, generate_reverse_grids
+from utils.pattern_finder import pattern_codes_batch
+from utils.singleton import process_singleton
+
+logger = logging.getLogger(__name__)
+
+INDEX_FORMAT_VERSION = 2
+DEFAULT_INDEX_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'pattern_index')
+NUM_NUMBERS = 10000
+DIRECTIONS = ('forward', 'reverse')
+
+_GRID_BUILDERS = {'forward': generate_4x4_grid, 'reverse': generate_reverse_grid}
+_BATCH_GRID_BUILDERS = {'forward': generate_4x4_grids, 'reverse': generate_reverse_grids}
+
+
+def _all_grids(direction):
+    return _BATCH_GRID_BUILDERS[direction](np.arange(NUM_NUMBERS, dtype=np.uint16)).astype(np.uint16)
+
+
+def _csr_unique_rows(codes):
+    """Sorted unique values per row as (indptr, values)"""
+    ordered = np.sort(codes, axis=1)
+    keep = np.ones_like(ordered, dtype=bool)
+    keep[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+    indptr = np.zeros(len(codes) + 1, dtype=np.int64)
+    np.cumsum(keep.sum(axis=1), out=indptr[1:])
+    return indptr, ordered[keep].astype(np.uint16)
+
+
+def _missing_masks(grids):
+    """Bitmask of digits 0-9 absent from each grid"""
+    flat = grids.reshape(len(grids), -1).astype(np.int64)
+    present = np.zeros(len(grids), dtype=np.uint16)
+    for d in range(10):
+        present |= (flat == d).any(axis=1).astype(np.uint16) << d
+    return (~present & 0x3FF).astype(np.uint16)
+
+
+def build_index_arrays():
+    """Compute every array of the index in memory"""
+    arrays = {}
+    for direction in DIRECTIONS:
+        grids = _all_grids(direction)
+        indptr, values = _csr_unique_rows(pattern_codes_batch(grids))
+        arrays[f'{direction}_indptr'] = indptr
+        arrays[f'{direction}_codes'] = values
+        arrays[f'{direction}_missing'] = _missing_masks(grids)
+    return arrays
+
+
+def build_pattern_index(index_dir=DEFAULT_INDEX_DIR):
+    """
+    Build the index and write it as one .npy per array (memory-mappable).
+    Workers may build it at the same time on a cold start: each writes its
+    own temp files and replaces the targets atomically, meta.json last, so a
+    reader sees either no index or a complete one.
+    """
+    arrays = build_index_arrays()
+    os.makedirs(index_dir, exist_ok=True)
+    suffix = f'tmp{os.getpid()}'
+    for name, arr in arrays.items():
+        tmp_path = os.path.join(index_dir, f'{name}.{suffix}.npy')
+        np.save(tmp_path, arr)
+        os.replace(tmp_path, os.path.join(index_dir, f'{name}.npy'))
+    meta_path = os.path.join(index_dir, 'meta.json')
+    with open(f'{meta_path}.{suffix}', 'w') as fh:
+        json.dump({'format': INDEX_FORMAT_VERSION, 'arrays': sorted(arrays)}, fh)
+    os.replace(f'{meta_path}.{suffix}', meta_path)
+    logger.info(f"Pattern index built: {index_dir}")
+    return arrays
+
+
+def _load_index_arrays(index_dir):
+    meta_path = os.path.join(index_dir, 'meta.json')
+    try:
+        with open(meta_path) as fh:
+            meta = json.load(fh)
+        if meta.get('format') != INDEX_FORMAT_VERSION:
+            return None
+        return {name: np.load(os.path.join(index_dir, f'{name}.npy'), mmap_mode='r')
+                for name in meta['arrays']}
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _to_code(number):
+    """'0123' / 123 -> 123, or None if not a 4D number"""
+    s = str(number).strip()
+    if not s.isdigit() or len(s) > 4:
+        return None
+    return int(s)
+
+
+def is_number_grid(grid, number, direction='forward'):
+    """Whether ``grid`` is the (direction) grid of ``number``, i.e. the index applies to it"""
+    try:
+        return [[int(cell) for cell in row] for row in grid] == _GRID_BUILDERS[direction](str(number))
+    except (TypeError, ValueError):
+        return False
+
+
+class PatternIndex:
+    """
+    O(1)-style lookups over the precomputed index.
+
+    Every query takes a 4D number (str or int) and a direction,
+    'forward' for generate_4x4_grid or 'reverse' for generate_reverse_grid.
+    """
+
+    def __init__(self, arrays):
+        self._arrays = arrays
+
+    def pattern_codes(self, number, direction='forward'):
+        """Sorted unique pattern codes of a number's grid"""
+        code = _to_code(number)
+        if code is None:
+            return np.empty(0, dtype=np.uint16)
+        indptr = self._arrays[f'{direction}_indptr']
+        return self._arrays[f'{direction}_codes'][indptr[code]:indptr[code + 1]]
+
+    def patterns(self, number, direction='forward'):
+        """Set of 4-digit pattern strings of a number's grid"""
+        return {f'{c:04d}' for c in self.pattern_codes(number, direction).tolist()}
+
+    def missing_digits(self, number, direction='forward'):
+        """Digits (as strings, sorted) absent from a number's grid"""
+        code = _to_code(number)
+        if code is None:
+            return []
+        mask = int(self._arrays[f'{direction}_missing'][code])
+        return [str(d) for d in range(10) if mask >> d & 1]
+
+
+@process_singleton
+def get_pattern_index(index_dir=DEFAULT_INDEX_DIR):
+    """Process-wide PatternIndex: memory-mapped from disk, built on first use"""
+    arrays = _load_index_arrays(index_dir)
+    if arrays is None:
+        try:
+            arrays = build_pattern_index(index_dir)
+        except OSError as e:
+            logger.warning(f"Pattern index not saved ({e}); using in-memory build")
+            arrays = build_index_arrays()
+    return PatternIndex(arrays)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    build_pattern_index()
@@ -1,4 +1,4 @@
-from utils.app_grid import generate_4x4_grid
+from utils.app_grid import generate_4x4_grid, generate_4x4_grids
 
 def convert_to_grid(number):
     return [digit for row in generate_4x4_grid(number) for digit in row]
@@ -12,12 +12,13 @@ def find_missing_digits(grid):
 
 def learn_pattern_transitions(past_draws):
     transitions = {}
+    if len(past_draws) < 2:
+        return transitions
 
-    for i in range(len(past_draws) - 1):
-        today = past_draws[i]
-        tomorrow = past_draws[i + 1]
+    # All grids but the last draw's in one batch, flattened like convert_to_grid
+    grids = generate_4x4_grids([d["number"] for d in past_draws[:-1]]).reshape(len(past_draws) - 1, -1).tolist()
 
-        today_grid = convert_to_grid(today["number"])
+    for today_grid, tomorrow in zip(grids, past_draws[1:]):
         today_patterns = detect_patterns(today_grid)
         today_missing = find_missing_digits(today_grid)
 
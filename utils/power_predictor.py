@@ -9,6 +9,8 @@ from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
 from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import train_test_split
 import warnings
+from utils.dataset_manager import frame_origin
+from utils.model_registry import get_model_registry, content_digest
 warnings.filterwarnings('ignore')
 
 class PowerPredictor:
@@ -74,26 +76,45 @@ class PowerPredictor:
         
         return list(features.values())
     
+    @staticmethod
+    def extract_feature_matrix(numbers):
+        """
+        extract_features for many numbers at once: (len(numbers), 31) array,
+        same column order. Every entry must be a 4-digit string.
+        """
+        values = np.array([int(n) for n in numbers], dtype=np.int64)
+        digits = (values[:, None] // np.array([1000, 100, 10, 1])) % 10
+        diffs = np.abs(np.diff(digits, axis=1))
+        steps = np.diff(digits, axis=1)
+        odd = (digits % 2 == 1).sum(axis=1)
+        high = (digits >= 5).sum(axis=1)
+        sorted_digits = np.sort(digits, axis=1)
+        unique = 1 + (np.diff(sorted_digits, axis=1) != 0).sum(axis=1)
+        columns = [
+            digits.sum(axis=1), digits.prod(axis=1), digits.mean(axis=1), digits.std(axis=1),
+            digits[:, 0], digits[:, 1], digits[:, 2], digits[:, 3],
+            digits[:, 0] * 10 + digits[:, 1], digits[:, 1] * 10 + digits[:, 2], digits[:, 2] * 10 + digits[:, 3],
+            odd, 4 - odd,
+            high, 4 - high,
+            (steps >= 0).all(axis=1), (steps <= 0).all(axis=1), unique < 4, unique == 4,
+            values % 2 == 0, values % 3 == 0, values % 5 == 0, values % 7 == 0,
+            values < 2500, (values >= 2500) & (values < 5000), (values >= 5000) & (values < 7500), values >= 7500,
+            diffs[:, 0], diffs[:, 1], diffs[:, 2], diffs.max(axis=1),
+        ]
+        return np.column_stack(columns).astype(np.float64)
+    
     def train_models(self, historical_numbers, lookback=500):
         """Train multiple ML models on historical data"""
         if len(historical_numbers) < 50:
             return False
             
         # Prepare training data
-        X, y = [], []
-        for i in range(len(historical_numbers) - 1):
-            features = self.extract_features(historical_numbers[i])
-            if features:
-                X.append(features)
-                # Target: will this number appear in next 10 draws?
-                next_10 = historical_numbers[i+1:i+11]
-                y.append(1 if historical_numbers[i] in next_10 else 0)
-        
-        if len(X) < 20:
+        valid = [i for i, n in enumerate(historical_numbers[:-1]) if isinstance(n, str) and len(n) == 4]
+        if len(valid) < 20:
             return False
-            
-        X = np.array(X)
-        y = np.array(y)
+        X = self.extract_feature_matrix([historical_numbers[i] for i in valid])
+        # Target: will this number appear in next 10 draws?
+        y = np.array([int(historical_numbers[i] in historical_numbers[i+1:i+11]) for i in valid])
         
         # Scale features
         X_scaled = self.scaler.fit_transform(X)
@@ -126,34 +147,30 @@ class PowerPredictor:
         if not self.models:
             self.train_models(historical_numbers)
         
-        predictions = []
+        candidates = [n for n in candidate_numbers if isinstance(n, str) and len(n) == 4]
+        if not candidates:
+            return []
         
-        for number in candidate_numbers:
-            features = self.extract_features(number)
-            if not features:
-                continue
-                
-            features_scaled = self.scaler.transform([features])
-            
-            # Get predictions from all models
-            confidences = []
-            
-            if 'random_forest' in self.models:
-                rf_prob = self.models['random_forest'].predict_proba(features_scaled)[0][1]
-                confidences.append(rf_prob)
-            
-            if 'gradient_boost' in self.models:
-                gb_prob = self.models['gradient_boost'].predict_proba(features_scaled)[0][1]
-                confidences.append(gb_prob)
-            
-            # Average confidence
-            avg_confidence = np.mean(confidences) if confidences else 0.5
-            
-            # Boost confidence based on frequency
-            freq_boost = historical_numbers[-100:].count(number) / 100
-            final_confidence = min(avg_confidence + freq_boost * 0.2, 1.0)
-            
-            predictions.append((number, final_confidence, 'PowerML'))
+        # One feature matrix, one predict_proba per model
+        features_scaled = self.scaler.transform(self.extract_feature_matrix(candidates))
+        confidences = []
+        
+        if 'random_forest' in self.models:
+            confidences.append(self.models['random_forest'].predict_proba(features_scaled)[:, 1])
+        
+        if 'gradient_boost' in self.models:
+            confidences.append(self.models['gradient_boost'].predict_proba(features_scaled)[:, 1])
+        
+        # Average confidence
+        avg_confidence = np.mean(confidences, axis=0) if confidences else np.full(len(candidates), 0.5)
+        
+        # Boost confidence based on frequency in the last 100 draws
+        recent = [int(n) for n in historical_numbers[-100:] if isinstance(n, str) and len(n) == 4 and n.isdigit()]
+        recent_counts = np.bincount(recent, minlength=10000)
+        freq_boost = recent_counts[[int(n) for n in candidates]] / 100
+        final_confidence = np.minimum(avg_confidence + freq_boost * 0.2, 1.0)
+        
+        predictions = [(number, float(conf), 'PowerML') for number, conf in zip(candidates, final_confidence)]
         
         # Sort by confidence
         predictions.sort(key=lambda x: x[1], reverse=True)
@@ -197,8 +214,17 @@ def enhanced_predictor(df, provider='all', lookback=300):
     # Get candidate pool (unique numbers from recent history)
     candidate_pool = list(set(recent_numbers[-200:]))
     
-    # Initialize PowerPredictor
+    # Initialize PowerPredictor, reusing registered models for the same training numbers
     predictor = PowerPredictor()
+    registry = get_model_registry()
+    model_version = content_digest(recent_numbers)
+    state = registry.get('power_predictor', provider, lookback, model_version)
+    if state is not None:
+        predictor.models, predictor.scaler = state['models'], state['scaler']
+    elif predictor.train_models(recent_numbers):
+        registry.put('power_predictor', {'models': predictor.models, 'scaler': predictor.scaler},
+                     provider, lookback, model_version, metadata={'samples': len(recent_numbers) - 1},
+                     persist=frame_origin(df) is not None)
     
     # Get predictions with confidence
     predictions = predictor.predict_with_confidence(candidate_pool, recent_numbers)
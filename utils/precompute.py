@@ -0,0 +1,285 @@
+"""
+Prediction Precompute Scheduler
+Background recomputation of dashboard predictions when the dataset version changes
+"""
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from utils.cache import LRUCache
+from utils.dataset_manager import frame_origin, provider_slice
+from utils.metrics import get_metrics
+from utils.singleton import process_singleton
+from utils.startup import IMPORT_LOCK
+from utils.stats_store import month_bounds
+
+logger = logging.getLogger(__name__)
+
+# scope: provider whose rows the predictor sees ('all' = every provider)
+# month: 'YYYY-MM' filter ('' = whole history)
+# provider: the provider argument passed to the predictor (bias), None if unused
+PredictionKey = namedtuple('PredictionKey', 'predictor scope month provider lookback')
+
+# How often a worker looks for warm results another worker has yet to publish
+ADOPT_RETRY_SECONDS = 1.0
+
+
+def select_frame(df, scope='all', month=''):
+    """The rows a route filtered by provider and 'YYYY-MM' month would pass"""
+    if df.empty:
+        return df
+    if scope and scope != 'all':
+        df = provider_slice(df, scope)
+    if month:
+        bounds = month_bounds(month)
+        if bounds is None:
+            return df.iloc[0:0]
+        dates = df['date_parsed']
+        df = df[(dates >= bounds[0]) & (dates < bounds[1])]
+    return df
+
+
+def compute_detached(func, scope, month, provider, lookback):
+    """A predictor call in another process, on that process's view of the dataset -> (version, result)"""
+    from utils.dataset_manager import get_dataset_manager
+    manager = get_dataset_manager()
+    frame = manager.get_frame(copy=False)
+    return manager.version, func(select_frame(frame, scope, month), provider, lookback) or []
+
+
+class PrecomputeScheduler:
+    """
+    Result cache for predictor calls keyed by PredictionKey, kept warm by a
+    background thread.
+
+    Each entry remembers the dataset version it was computed on. ``get``
+    returns it with the cached result, even when that version is stale, and wakes the
+    worker to recompute it (stale-while-revalidate); only a cold key is
+    computed inside the request. The worker recomputes the warm keys plus
+    every key requested recently whenever the version changes: it is woken
+    by dataset reload/append events and polls the manager otherwise.
+
+    With ``shared`` (a SharedPrecompute, for workers on one dataset segment)
+    only the elected worker computes the warm keys; the others adopt its
+    published results and compute just their own requested keys.
+    """
+
+    def __init__(self, manager, maxsize=512, poll_interval=60, shared=None):
+        self.manager = manager
+        self.shared = shared
+        self._adopting = False
+        self.results = LRUCache(maxsize=maxsize, name='precompute.results')
+        self.poll_interval = poll_interval
+        self.predictors = {}
+        self._uses_provider = {}
+        self._warm = []
+        self._requested = OrderedDict()
+        self._max_requested = maxsize
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self.runs = 0
+        self.last_run = None
+        manager.add_listener(self._on_dataset_event)
+
+    def register(self, name, func, uses_provider=True):
+        """``func(df, provider, lookback)``; uses_provider=False shares results across providers"""
+        self.predictors[name] = func
+        self._uses_provider[name] = uses_provider
+
+    def warm(self, keys_for):
+        """``keys_for(frame)`` -> PredictionKeys to precompute on every new version"""
+        self._warm.append(keys_for)
+
+    def key(self, predictor, scope='all', month='', provider=None, lookback=200):
+        month = '' if month in (None, 'all') else month
+        if not self._uses_provider.get(predictor, True):
+            provider = None
+        return PredictionKey(predictor, scope or 'all', month, provider, lookback)
+
+    def _touch(self, key):
+        with self._lock:
+            self._requested[key] = True
+            self._requested.move_to_end(key)
+            while len(self._requested) > self._max_requested:
+                self._requested.popitem(last=False)
+
+    def _cached(self, key):
+        """(version computed on, result) of a cached key, or None"""
+        entry = self.results.get(key)
+        if entry is None:
+            return None
+        computed_on, result = entry
+        if computed_on != self.manager.version:
+            self._wake.set()
+        return computed_on, list(result)
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive() and not self._stop.is_set()
+
+    def get(self, predictor, scope='all', month='', provider=None, lookback=200, stale=True):
+        """
+        (dataset version the result was computed on, result): stale until the
+        worker catches up. ``stale=False`` recomputes an outdated result here.
+        """
+        key = self.key(predictor, scope, month, provider, lookback)
+        self._touch(key)
+        cached = self._cached(key)
+        if cached is not None and (stale or cached[0] == self.manager.version):
+            return cached
+        frame, version = self._current()
+        return version, list(self.compute(key, frame, version))
+
+    def get_many(self, keys, executor=None, timeouts=None):
+        """
+        Results for several keys, like ``get``, but the cold ones are computed
+        in parallel on ``executor`` (an EnsembleExecutor). ``timeouts``:
+        {predictor: seconds}. A cold key that fails or times out yields [] for
+        this request and is left to the background worker.
+        """
+        results = {}
+        for key in keys:
+            self._touch(key)
+            cached = self._cached(key)
+            results[key] = None if cached is None else cached[1]
+        cold = [key for key in dict.fromkeys(keys) if results[key] is None]
+        if cold and executor is None:
+            for key in cold:
+                results[key] = list(self.compute(key))
+        elif cold:
+            timeouts = timeouts or {}
+            calls = {key: (compute_detached, (self.predictors[key.predictor], key.scope, key.month,
+                                              key.provider, key.lookback)) for key in cold}
+            limits = {key: timeouts[key.predictor] for key in cold if key.predictor in timeouts}
+            for key, outcome in executor.run(calls, limits).items():
+                # The call ran in another process: its own timings stay there
+                get_metrics().observe('ensemble_call_seconds', outcome.seconds, predictor=key.predictor,
+                                      status=outcome.status, help='Cold predictor calls in the ensemble pool')
+                if outcome.status == 'ok':
+                    version, result = outcome.result
+                    self.results.set(key, (version, result))
+                    results[key] = list(result)
+                else:
+                    results[key] = []
+                    self._wake.set()
+        return [results[key] for key in keys]
+
+    def _current(self):
+        """(canonical frame, the version it was read at): the manager may move on in between"""
+        frame = self.manager.get_frame(copy=False)
+        origin = frame_origin(frame)
+        return frame, origin[0] if origin is not None else self.manager.version
+
+    def compute(self, key, frame=None, version=None):
+        if frame is None:
+            frame, version = self._current()
+        version = version or self.manager.version
+        df = select_frame(frame, key.scope, key.month)
+        result = self.predictors[key.predictor](df, key.provider, key.lookback) or []
+        self.results.set(key, (version, result))
+        return result
+
+    def refresh(self):
+        """Recompute every warm/requested key whose result predates the current version"""
+        version = self.manager.version
+        frame = self.manager.get_frame(copy=False)
+        if version is None or frame.empty:
+            return 0
+        with self._lock:
+            requested = list(self._requested)
+        warm = [key for keys_for in self._warm for key in keys_for(frame)]
+        if warm and self.shared is not None and not self.shared.elect():
+            # Another worker computes the warm keys: use its results once published
+            covered = self._adopt(version, warm)
+            keys, warm = [key for key in requested if key not in covered], []
+        else:
+            keys = requested + warm
+
+        began, done = time.perf_counter(), 0
+        for key in dict.fromkeys(keys):
+            entry = self.results.peek(key)
+            if entry is not None and entry[0] == version:
+                continue
+            try:
+                # Predictors import models and their packages on first use
+                with IMPORT_LOCK:
+                    self.compute(key, frame, version)
+                done += 1
+            except Exception as e:
+                logger.warning(f"Precompute failed for {key}: {e}")
+        if warm and self.shared is not None and not os.path.exists(self.shared.path(version)):
+            self._publish(version, warm)
+        if done:
+            self.runs += 1
+            self.last_run = {'version': version, 'computed': done,
+                             'seconds': round(time.perf_counter() - began, 3)}
+            logger.info(f"Precomputed {done} predictions in {self.last_run['seconds']}s | version {version[:12]}")
+        return done
+
+    def _adopt(self, version, warm):
+        """Load the warm results published for ``version``; returns the keys they cover"""
+        published = self.shared.load(version)
+        self._adopting = published is None
+        if published is None:
+            return set(warm)
+        for key, result in published.items():
+            entry = self.results.peek(key)
+            if entry is None or entry[0] != version:
+                self.results.set(key, (version, result))
+        return set(published)
+
+    def _publish(self, version, warm):
+        results = {}
+        for key in dict.fromkeys(warm):
+            entry = self.results.peek(key)
+            if entry is not None and entry[0] == version:
+                results[key] = entry[1]
+        try:
+            self.shared.publish(version, results)
+        except OSError as e:
+            logger.warning(f"Precomputed predictions not published: {e}")
+
+    def _on_dataset_event(self, event, frame):
+        self._wake.set()
+
+    def _run(self):
+        self._wake.set()
+        while not self._stop.is_set():
+            self._wake.wait(ADOPT_RETRY_SECONDS if self._adopting else self.poll_interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"Precompute run failed: {e}")
+
+    def start(self):
+        """Start the background worker (idempotent)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name='precompute', daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+
+@process_singleton
+def get_precompute_scheduler():
+    """Process-wide PrecomputeScheduler on the shared dataset manager"""
+    from utils.dataset_manager import get_dataset_manager
+    manager = get_dataset_manager()
+    shared = None
+    if getattr(manager, 'segment_dir', None):
+        from utils.shared_dataset import SharedPrecompute
+        shared = SharedPrecompute(manager.segment_dir)
+    return PrecomputeScheduler(manager, shared=shared)
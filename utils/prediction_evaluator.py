@@ -0,0 +1,111 @@
+"""
+Prediction Evaluator
+Set-based scoring of tracked predictions against draw results (exact, 3-digit and box hits)
+"""
+import numpy as np
+import pandas as pd
+
+PRIZE_COLUMNS = ('1st_real', '2nd_real', '3rd_real')
+ACTUAL_FIELDS = ('actual_1st', 'actual_2nd', 'actual_3rd')
+EVALUATION_COLUMNS = list(ACTUAL_FIELDS) + ['hit_status', 'accuracy_score',
+                                            'exact_hits', 'three_digit_hits', 'box_hits']
+
+_POWERS = np.array([1000, 100, 10, 1])
+_POPCOUNT = np.array([bin(mask).count('1') for mask in range(1 << 10)], dtype=np.int8)
+
+
+def _digits(codes):
+    """(n,) numbers 0-9999 -> (n, 4) digits"""
+    return (codes[:, None] // _POWERS) % 10
+
+
+def digit_masks(codes):
+    """Bitmask of the distinct digits of each number"""
+    return np.bitwise_or.reduce(1 << _digits(codes), axis=1)
+
+
+def box_keys(codes):
+    """Same key for every permutation of a number (its digits sorted)"""
+    return np.sort(_digits(codes), axis=1) @ _POWERS
+
+
+def number_codes_of(values):
+    """4-digit strings -> ints, anything else -> -1"""
+    values = pd.Series(values, dtype=object).astype(str).str.strip()
+    valid = values.str.fullmatch(r'\d{4}').to_numpy(dtype=bool)
+    codes = np.full(len(values), -1, dtype=np.int64)
+    codes[valid] = values[valid].astype(np.int64).to_numpy()
+    return codes
+
+
+def draw_results(df):
+    """First result row per (draw day, provider), in frame order, as the trackers match them"""
+    results = pd.DataFrame({'day': df['date_parsed'].dt.normalize(), 'provider_key': df['provider_key']})
+    for col in PRIZE_COLUMNS:
+        results[col] = df[col].to_numpy()
+    return results.dropna(subset=['day']).drop_duplicates(['day', 'provider_key'], keep='first')
+
+
+def predicted_table(predicted_numbers):
+    """Normalized (row, number) table of every 4-digit number in each prediction, in order"""
+    found = predicted_numbers.astype(str).str.findall(r'\d{4}').explode().dropna()
+    return pd.DataFrame({'row': found.index, 'number': found.to_numpy(dtype=str)})
+
+
+def evaluate_predictions(pending, df):
+    """
+    Score pending predictions (draw_date, provider, predicted_numbers; any
+    index) against the canonical results frame in one merge.
+
+    A prediction matches the first result with the same draw day
+    ('YYYY-MM-DD', anything after a space ignored) and provider key. Returns
+    the matched rows only, indexed like ``pending``: the actual prizes,
+    hit_status 'HIT (n matches)' / 'MISS', accuracy_score (exact hits as % of
+    the predicted numbers) and the exact, 3-digit (three shared distinct
+    digits) and box (same digits in any order) hit counts.
+    """
+    if pending.empty or df.empty:
+        return pd.DataFrame(columns=EVALUATION_COLUMNS)
+
+    keys = pd.DataFrame({
+        'row': pending.index,
+        'day': pd.to_datetime(pending['draw_date'].astype(str).str.split(' ').str[0],
+                              format='mixed', errors='coerce').to_numpy(),
+        'provider_key': pending['provider'].astype(str).str.strip().str.lower().to_numpy(),
+    })
+    matched = keys.dropna(subset=['day']).merge(draw_results(df), on=['day', 'provider_key'], how='inner')
+    if matched.empty:
+        return pd.DataFrame(columns=EVALUATION_COLUMNS)
+    matched = matched.set_index('row')
+
+    predicted = predicted_table(pending.loc[matched.index, 'predicted_numbers'])
+    codes = predicted['number'].astype(np.int64).to_numpy()
+    masks, boxes = digit_masks(codes), box_keys(codes)
+    position = matched.index.get_indexer(predicted['row'])
+
+    exact = np.zeros(len(predicted), dtype=bool)
+    three = np.zeros(len(predicted), dtype=bool)
+    box = np.zeros(len(predicted), dtype=bool)
+    for col in PRIZE_COLUMNS:
+        actual = matched[col].astype(str).to_numpy()[position]
+        exact |= predicted['number'].to_numpy() == actual
+        actual_codes = number_codes_of(actual)
+        valid = actual_codes >= 0
+        safe = np.where(valid, actual_codes, 0)
+        three |= valid & (_POPCOUNT[masks & digit_masks(safe)] == 3)
+        box |= valid & (boxes == box_keys(safe))
+
+    counts = pd.DataFrame({'row': predicted['row'], 'predicted': 1, 'exact_hits': exact,
+                           'three_digit_hits': three, 'box_hits': box}).groupby('row', sort=False).sum()
+    counts = counts.reindex(matched.index, fill_value=0).astype(np.int64)
+
+    hits = counts['exact_hits'].to_numpy()
+    result = pd.DataFrame(index=matched.index)
+    for field, col in zip(ACTUAL_FIELDS, PRIZE_COLUMNS):
+        result[field] = matched[col]
+    result['hit_status'] = np.where(hits > 0, 'HIT (' + counts['exact_hits'].astype(str) + ' matches)', 'MISS')
+    result['accuracy_score'] = np.where(hits > 0, hits * 100 / np.maximum(counts['predicted'].to_numpy(), 1), 0)
+    for col in ('exact_hits', 'three_digit_hits', 'box_hits'):
+        result[col] = counts[col]
+    result.index.name = pending.index.name
+    return result
@@ -0,0 +1,273 @@
+"""
+Prediction Ledger
+One SQLite store for every prediction tracker: appends, indexed lookups and concurrent writers
+"""
+import json
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from utils.singleton import process_singleton
+
+logger = logging.getLogger(__name__)
+
+LEDGER_PATH_ENV = 'PREDICTION_LEDGER_PATH'
+DEFAULT_PATH = 'prediction_ledger.db'
+
+
+def _truthy(value):
+    return value is True or str(value).strip().lower() in ('true', '1', 'yes')
+
+
+# How each tracker's records are indexed, and the file it used to rewrite on every save
+# status(record) is recomputed on every write, so lookups by status stay in sync
+LedgerSource = namedtuple('LedgerSource', 'legacy_file date_field provider_field status')
+
+SOURCES = {
+    # app.py /save-prediction, /save-smart-prediction, /accuracy-dashboard
+    'tracking': LedgerSource('prediction_tracking.csv', 'draw_date', 'provider',
+                             lambda record: str(record.get('hit_status') or 'pending')),
+    # utils/prediction_tracker.py
+    'history': LedgerSource('predictions_history.json', 'target_date', 'provider',
+                            lambda record: 'checked' if _truthy(record.get('checked')) else 'pending'),
+    # auto_predictor.py
+    'daily': LedgerSource('daily_predictions.csv', 'draw_date', None,
+                          lambda record: 'learned' if _truthy(record.get('learned')) else 'pending'),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS predictions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT NOT NULL,
+    draw_date TEXT,
+    provider TEXT,
+    status TEXT NOT NULL,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_predictions_draw ON predictions (source, draw_date, provider);
+CREATE INDEX IF NOT EXISTS idx_predictions_status ON predictions (source, status);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+def draw_day(value):
+    """'YYYY-MM-DD' prefix of a draw date as trackers store it ('2025-09-23 (Tuesday)'), else None"""
+    match = re.match(r'\s*(\d{4}-\d{2}-\d{2})', str(value or ''))
+    return match.group(1) if match else None
+
+
+def _plain(value):
+    """JSON-safe scalar (numpy scalars unwrapped, NaN/NaT -> None)"""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if value is pd.NaT:
+        return None
+    if isinstance(value, (pd.Timestamp, np.datetime64)):
+        return str(value)
+    return value
+
+
+def _clean(record):
+    return {str(key): (_plain(value) if not isinstance(value, (list, dict)) else value)
+            for key, value in record.items()}
+
+
+class PredictionLedger:
+    """
+    Append-only table of prediction records, one row per saved prediction.
+
+    Every tracker writes its own ``source`` (see SOURCES); the record is kept
+    as JSON next to indexed draw_date / provider / status columns, so saving
+    a prediction is one INSERT and evaluating one is one UPDATE, instead of
+    rewriting a whole CSV/JSON file. SQLite in WAL mode serializes writers
+    across threads and processes. On first use of a source its legacy file,
+    if any, is imported once (the file itself is left untouched).
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.environ.get(LEDGER_PATH_ENV) or DEFAULT_PATH
+        self._local = threading.local()
+        self._ready = set()
+        self._lock = threading.Lock()
+
+    # ---------------- connection ---------------- #
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.executescript(SCHEMA)
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    @contextmanager
+    def _write(self):
+        """One write transaction (takes the database write lock up front) that bumps the revision"""
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+            conn.execute("INSERT INTO meta (key, value) VALUES ('revision', 1) "
+                         "ON CONFLICT(key) DO UPDATE SET value = value + 1")
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+    def _source(self, source):
+        if source not in SOURCES:
+            raise ValueError(f"Unknown ledger source '{source}' (choose from {sorted(SOURCES)})")
+        if source not in self._ready:
+            with self._lock:
+                if source not in self._ready:
+                    self._import_legacy(source)
+                    self._ready.add(source)
+        return SOURCES[source]
+
+    def _import_legacy(self, source):
+        spec = SOURCES[source]
+        marker = f'imported:{source}'
+        if self._conn().execute('SELECT 1 FROM meta WHERE key = ?', (marker,)).fetchone():
+            return
+        with self._write() as conn:
+            if conn.execute('SELECT 1 FROM meta WHERE key = ?', (marker,)).fetchone():
+                return
+            records = []
+            if spec.legacy_file and os.path.exists(spec.legacy_file):
+                try:
+                    if spec.legacy_file.endswith('.json'):
+                        with open(spec.legacy_file, encoding='utf-8') as fh:
+                            records = json.load(fh)
+                    else:
+                        records = pd.read_csv(spec.legacy_file, on_bad_lines='skip').to_dict('records')
+                except (OSError, ValueError, pd.errors.ParserError) as e:
+                    logger.warning(f"Legacy {source} file not imported ({spec.legacy_file}): {e}")
+                    records = []
+            conn.executemany('INSERT INTO predictions (source, draw_date, provider, status, record) VALUES (?, ?, ?, ?, ?)',
+                             [self._row(source, record) for record in records])
+            conn.execute('INSERT INTO meta (key, value) VALUES (?, ?)', (marker, str(len(records))))
+        if records:
+            logger.info(f"Imported {len(records)} {source} predictions from {spec.legacy_file} into {self.path}")
+
+    @staticmethod
+    def _row(source, record):
+        spec = SOURCES[source]
+        record = _clean(record)
+        provider = record.get(spec.provider_field) if spec.provider_field else None
+        return (source, draw_day(record.get(spec.date_field)), None if provider is None else str(provider),
+                spec.status(record), json.dumps(record, default=str))
+
+    # ---------------- writes ---------------- #
+    def append(self, source, record):
+        """Add one record; returns its id"""
+        self._source(source)
+        with self._write() as conn:
+            cursor = conn.execute('INSERT INTO predictions (source, draw_date, provider, status, record) '
+                                  'VALUES (?, ?, ?, ?, ?)', self._row(source, record))
+        return cursor.lastrowid
+
+    def append_many(self, source, records):
+        self._source(source)
+        rows = [self._row(source, record) for record in records]
+        with self._write() as conn:
+            conn.executemany('INSERT INTO predictions (source, draw_date, provider, status, record) '
+                             'VALUES (?, ?, ?, ?, ?)', rows)
+        return len(rows)
+
+    def update_many(self, source, changes):
+        """``{id: {field: value}}`` merged into the stored records; returns the number updated"""
+        self._source(source)
+        if not changes:
+            return 0
+        updated = 0
+        with self._write() as conn:
+            for record_id, fields in changes.items():
+                found = conn.execute('SELECT record FROM predictions WHERE id = ? AND source = ?',
+                                     (int(record_id), source)).fetchone()
+                if found is None:
+                    continue
+                record = json.loads(found[0])
+                record.update(fields)
+                _, draw_date, provider, status, payload = self._row(source, record)
+                conn.execute('UPDATE predictions SET draw_date = ?, provider = ?, status = ?, record = ? WHERE id = ?',
+                             (draw_date, provider, status, payload, int(record_id)))
+                updated += 1
+        return updated
+
+    def update(self, source, record_id, fields):
+        return self.update_many(source, {record_id: fields})
+
+    # ---------------- reads ---------------- #
+    def _query(self, source, status=None, exclude_status=None, draw_date=None, provider=None):
+        self._source(source)
+        sql, params = 'SELECT id, record FROM predictions WHERE source = ?', [source]
+        if status is not None:
+            sql += ' AND status = ?'
+            params.append(status)
+        if exclude_status is not None:
+            sql += ' AND status != ?'
+            params.append(exclude_status)
+        if draw_date is not None:
+            sql += ' AND draw_date = ?'
+            params.append(draw_day(draw_date))
+        if provider is not None:
+            sql += ' AND provider = ?'
+            params.append(str(provider))
+        return self._conn().execute(sql + ' ORDER BY id', params)
+
+    def rows(self, source, **filters):
+        """[(id, record)] in insertion order; filters: status, exclude_status, draw_date, provider"""
+        return [(record_id, json.loads(payload)) for record_id, payload in self._query(source, **filters)]
+
+    def frame(self, source, columns=None, **filters):
+        """Records as a DataFrame indexed by ledger id (``columns`` only shape an empty result)"""
+        return self._frame(self.rows(source, **filters), columns)
+
+    @staticmethod
+    def _frame(rows, columns=None):
+        if not rows:
+            return pd.DataFrame(columns=columns or [], index=pd.Index([], name='id', dtype='int64'))
+        ids, records = zip(*rows)
+        return pd.DataFrame.from_records(list(records), index=pd.Index(ids, name='id'))
+
+    def iter_frames(self, source, chunk_rows=2000, **filters):
+        """The same records as ``frame``, ``chunk_rows`` at a time"""
+        cursor = self._query(source, **filters)
+        while True:
+            batch = cursor.fetchmany(chunk_rows)
+            if not batch:
+                break
+            yield self._frame([(record_id, json.loads(payload)) for record_id, payload in batch])
+
+    def count(self, source, status=None):
+        self._source(source)
+        if status is None:
+            found = self._conn().execute('SELECT COUNT(*) FROM predictions WHERE source = ?', (source,))
+        else:
+            found = self._conn().execute('SELECT COUNT(*) FROM predictions WHERE source = ? AND status = ?',
+                                         (source, status))
+        return found.fetchone()[0]
+
+    def revision(self):
+        """Increases with every committed write (any process)"""
+        found = self._conn().execute("SELECT value FROM meta WHERE key = 'revision'").fetchone()
+        return int(found[0]) if found else 0
+
+
+@process_singleton
+def get_prediction_ledger():
+    """Process-wide PredictionLedger"""
+    return PredictionLedger()
@@ -1,19 +1,14 @@
-import json
-import os
 from datetime import datetime, timedelta
 from collections import Counter
 
-PREDICTIONS_FILE = 'predictions_history.json'
+from utils.prediction_ledger import get_prediction_ledger
+
+# Ledger source of these predictions (formerly predictions_history.json)
+LEDGER_SOURCE = 'history'
 
 def save_predictions(date, provider, predictions, method='combined'):
     """Save today's predictions for tomorrow's draw"""
-    if os.path.exists(PREDICTIONS_FILE):
-        with open(PREDICTIONS_FILE, 'r') as f:
-            data = json.load(f)
-    else:
-        data = []
-    
-    data.append({
+    get_prediction_ledger().append(LEDGER_SOURCE, {
         'prediction_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
         'target_date': date,
         'provider': provider,
@@ -21,25 +16,14 @@ def save_predictions(date, provider, predictions, method='combined'):
         'method': method,
         'checked': False
     })
-    
-    with open(PREDICTIONS_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
 
 def check_predictions(df):
     """Check all unchecked predictions against actual results"""
-    if not os.path.exists(PREDICTIONS_FILE):
-        return []
-    
-    with open(PREDICTIONS_FILE, 'r') as f:
-        data = json.load(f)
-    
+    ledger = get_prediction_ledger()
     results = []
-    updated = False
+    checked = {}
     
-    for pred in data:
-        if pred['checked']:
-            continue
-        
+    for record_id, pred in ledger.rows(LEDGER_SOURCE, status='pending'):
         target_date = pred['target_date']
         provider = pred['provider']
         
@@ -89,24 +73,16 @@ def check_predictions(df):
             'method': pred['method']
         })
         
-        pred['checked'] = True
-        updated = True
+        checked[record_id] = {'checked': True}
     
-    if updated:
-        with open(PREDICTIONS_FILE, 'w') as f:
-            json.dump(data, f, indent=2)
+    ledger.update_many(LEDGER_SOURCE, checked)
     
     return results
 
 def get_accuracy_stats():
     """Get overall accuracy statistics"""
-    if not os.path.exists(PREDICTIONS_FILE):
-        return None
-    
-    with open(PREDICTIONS_FILE, 'r') as f:
-        data = json.load(f)
-    
-    checked = [p for p in data if p.get('checked', False)]
+    ledger = get_prediction_ledger()
+    checked = [p for _, p in ledger.rows(LEDGER_SOURCE, status='checked')]
     if not checked:
         return None
     
@@ -118,7 +94,7 @@ def get_accuracy_stats():
         'total_predictions': len(checked),
         'total_numbers': total_predictions,
         'checked': len(checked),
-        'unchecked': len([p for p in data if not p.get('checked', False)])
+        'unchecked': ledger.count(LEDGER_SOURCE, status='pending')
     }
 
 def generate_smart_predictions(df, provider='all', top_n=10):
@@ -6,6 +6,8 @@ from datetime import datetime, timedelta
 from collections import Counter
 import numpy as np
 
+from utils.stats_store import get_stats_store
+
 class RealtimeEngine:
     def __init__(self, df):
         self.df = df
@@ -47,12 +49,7 @@ class RealtimeEngine:
     
     def get_number_pairs(self, top_n=20):
         """Analyze frequently occurring number pairs"""
-        all_nums = [n for col in ['1st_real', '2nd_real', '3rd_real'] 
-                    for n in self.df[col].astype(str) if n.isdigit() and len(n) == 4]
-        pairs = []
-        for i in range(len(all_nums)-1):
-            pairs.append(f"{all_nums[i]}-{all_nums[i+1]}")
-        return Counter(pairs).most_common(top_n)
+        return get_stats_store().stats_for(self.df).number_pairs(top_n)
     
     def calculate_trend_score(self, number, days=30):
         """Calculate trending score for a number"""
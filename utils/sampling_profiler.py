@@ -0,0 +1,128 @@
+"""
+Sampling Profiler
+Samples the stacks of in-flight requests and dumps folded (flamegraph-ready) stacks of the slow ones
+
+Off unless PROFILE_SLOW_REQUESTS is set to a threshold in seconds:
+
+    PROFILE_SLOW_REQUESTS=0.5 python app.py
+    flamegraph.pl profiles/20261017-101500-pattern.pattern_analyzer-812ms.folded > pattern.svg
+
+The ``.folded`` files (``frame;frame;frame count`` per line) also load in
+speedscope. PROFILE_DIR (profiles) and PROFILE_INTERVAL (0.005 s) tune it.
+"""
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+
+from utils.singleton import process_singleton
+
+logger = logging.getLogger(__name__)
+
+PROFILE_ENV = 'PROFILE_SLOW_REQUESTS'
+PROFILE_DIR_ENV = 'PROFILE_DIR'
+PROFILE_INTERVAL_ENV = 'PROFILE_INTERVAL'
+DEFAULT_DIR = 'profiles'
+DEFAULT_INTERVAL = 0.005
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    # Parent directory too: flask/app.py and app.py are different frames
+    path = '/'.join(code.co_filename.replace('\\', '/').split('/')[-2:])
+    return f"{code.co_name} ({path}:{code.co_firstlineno})"
+
+
+def fold_stack(frame):
+    """Root-first 'a;b;c' stack of a frame"""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ';'.join(reversed(labels))
+
+
+class SamplingProfiler:
+    """
+    One background thread samples the stack of every registered thread
+    each ``interval`` seconds while at least one is registered; ``end``
+    writes the folded samples when the request took ``threshold`` seconds
+    or more. Sampling holds the GIL briefly per tick, so it is meant to be
+    switched on while chasing slow pages, not left on.
+    """
+
+    def __init__(self, threshold, directory=DEFAULT_DIR, interval=DEFAULT_INTERVAL):
+        self.threshold = threshold
+        self.directory = directory
+        self.interval = interval
+        self.dumped = 0
+        self._active = {}
+        self._lock = threading.Lock()
+        self._busy = threading.Event()
+        self._thread = None
+
+    def begin(self):
+        """Start sampling the calling thread; returns the token for ``end``"""
+        samples = Counter()
+        ident = threading.get_ident()
+        with self._lock:
+            self._active[ident] = samples
+            self._busy.set()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+                self._thread.start()
+        return ident, samples
+
+    def end(self, token, seconds, label):
+        """Stop sampling; returns the dump path if the request was slow, else None"""
+        ident, samples = token
+        with self._lock:
+            if self._active.get(ident) is samples:
+                del self._active[ident]
+            if not self._active:
+                self._busy.clear()
+        if seconds < self.threshold or not samples:
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        name = re.sub(r'[^\w.-]+', '_', label or 'request')
+        path = os.path.join(self.directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{name}-{int(seconds * 1000)}ms.folded")
+        with open(path, 'w', encoding='utf-8') as fh:
+            for stack, count in samples.most_common():
+                fh.write(f"{stack} {count}\n")
+        self.dumped += 1
+        logger.info(f"Slow request {label} ({seconds:.2f}s): {sum(samples.values())} samples in {path}")
+        return path
+
+    def _run(self):
+        while True:
+            self._busy.wait()
+            time.sleep(self.interval)
+            frames = sys._current_frames()
+            with self._lock:
+                active = list(self._active.items())
+            for ident, samples in active:
+                frame = frames.get(ident)
+                if frame is not None:
+                    samples[fold_stack(frame)] += 1
+            del frames
+
+    def stats(self):
+        return {'threshold': self.threshold, 'interval': self.interval, 'dumped': self.dumped,
+                'sampling': len(self._active)}
+
+
+@process_singleton
+def _process_profiler(threshold):
+    return SamplingProfiler(threshold, os.environ.get(PROFILE_DIR_ENV, DEFAULT_DIR),
+                            float(os.environ.get(PROFILE_INTERVAL_ENV, DEFAULT_INTERVAL)))
+
+
+def get_sampling_profiler():
+    """Process-wide SamplingProfiler, or None unless PROFILE_SLOW_REQUESTS is set"""
+    threshold = os.environ.get(PROFILE_ENV, '').strip()
+    if not threshold or float(threshold) <= 0:
+        return None
+    return _process_profiler(float(threshold))
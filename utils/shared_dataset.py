@@ -0,0 +1,240 @@
+"""
+Shared Dataset Segments
+Canonical draw history published as memory-mapped segments for pre-fork WSGI workers
+"""
+import json
+import logging
+import os
+import pickle
+import tempfile
+import threading
+import time
+
+from utils.dataset_manager import DatasetManager
+from utils.file_lock import file_lock
+from utils.snapshot import read_snapshot, write_snapshot
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_DIR_ENV = 'DATASET_SEGMENT_DIR'
+POINTER_FILE = 'CURRENT'
+SEGMENT_SUFFIX = '.segment.feather'
+RESULTS_SUFFIX = '.precompute.pickle'
+WARM_LOCK = 'warm'
+
+
+def default_segment_dir():
+    """tmpfs (/dev/shm) when available, so segments live in shared memory"""
+    base = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+    return os.path.join(base, 'smart-4d-segments')
+
+
+def publish_segment(df, version, segment_dir, source=None, keep=3):
+    """
+    Write the canonical frame as a segment (the typed snapshot layout:
+    numbers as uint16, dates as timestamps, providers dictionary-coded) and
+    atomically point ``CURRENT`` at it. Older segments beyond ``keep`` are
+    unlinked; workers still mapping them keep their pages until they move on.
+    """
+    os.makedirs(segment_dir, exist_ok=True)
+    name = f"{version[:20]}{SEGMENT_SUFFIX}"
+    path = os.path.join(segment_dir, name)
+    if not os.path.exists(path):
+        write_snapshot(df, path, source_version=version)
+
+    pointer = {'segment': name, 'version': version, 'rows': len(df), 'source': source,
+               'published_at': time.strftime('%Y-%m-%d %H:%M:%S')}
+    tmp_path = os.path.join(segment_dir, f"{POINTER_FILE}.tmp{os.getpid()}")
+    with open(tmp_path, 'w', encoding='utf-8') as fh:
+        json.dump(pointer, fh)
+    os.replace(tmp_path, os.path.join(segment_dir, POINTER_FILE))
+    logger.info(f"Published segment {name} ({len(df)} rows)")
+
+    segments = sorted((os.path.join(segment_dir, f) for f in os.listdir(segment_dir) if f.endswith(SEGMENT_SUFFIX)),
+                      key=os.path.getmtime)
+    for old in segments[:-keep]:
+        if old != path:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+    return path
+
+
+def current_segment(segment_dir):
+    """The published pointer ({'segment', 'version', ...}) or None"""
+    try:
+        with open(os.path.join(segment_dir, POINTER_FILE), encoding='utf-8') as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+class SegmentDatasetManager(DatasetManager):
+    """
+    Worker-side DatasetManager that follows the published segment instead
+    of the CSV: each access stats the ``CURRENT`` pointer, and a new segment
+    is memory-mapped (never parsed) when it changes. The frame has the CSV
+    frame's dtypes, and its dates and text columns stay views of the mapped
+    pages (see columnar_views), so the workers share one physical copy of
+    the bulk of the history. Rows a worker ingests
+    are not merged locally; they show up once the publisher republishes.
+    Until a segment exists it behaves like a plain DatasetManager.
+    """
+
+    def __init__(self, segment_dir, csv_paths=None):
+        super().__init__(csv_paths)
+        self.segment_dir = segment_dir
+        self.pointer_path = os.path.join(segment_dir, POINTER_FILE)
+        self.segment = None
+
+    def refresh(self):
+        with self._lock:
+            try:
+                st = os.stat(self.pointer_path)
+            except OSError:
+                return super().refresh() if self.segment is None else False
+            stat_key = ('segment', st.st_mtime_ns, st.st_size)
+            if self._df is not None and stat_key == self._stat:
+                return False
+
+            info = current_segment(self.segment_dir)
+            if info is None:
+                return False
+            if self._df is not None and info['version'] == self._version:
+                self._stat = stat_key
+                return False
+            segment_path = os.path.join(self.segment_dir, info['segment'])
+            df, version = read_snapshot(segment_path, views=True)
+            if df is None or not os.path.exists(segment_path):
+                logger.warning(f"Segment unreadable: {info['segment']}")
+                return False
+
+            self._df, self._version, self._stat = df, version or info['version'], stat_key
+            self._modified = os.path.getmtime(segment_path)
+            self._path = info.get('source')
+            self.segment = info['segment']
+            self.loads += 1
+            self._notify('reload', df)
+            logger.info(f"Attached segment {self.segment} ({len(df)} rows) | version {self._version[:12]}")
+            return True
+
+    def invalidate(self):
+        with self._lock:
+            self._stat = None
+
+
+class SharedPrecompute:
+    """
+    Warm precompute results shared by the workers following one segment
+    directory. The worker holding the directory's warm lock computes the
+    warm keys and publishes them next to the segments; the others adopt the
+    published file instead of each recomputing the same predictions. The
+    lock goes away with its process, so another worker takes over.
+    """
+
+    def __init__(self, segment_dir, keep=3):
+        self.segment_dir = segment_dir
+        self.keep = keep
+        self.leader = False
+        self._lock = file_lock(os.path.join(segment_dir, WARM_LOCK))
+
+    def elect(self):
+        """True when this process computes the warm keys (retried on every call until it does)"""
+        if not self.leader:
+            self.leader = self._lock.acquire(blocking=False)
+        return self.leader
+
+    def path(self, version):
+        return os.path.join(self.segment_dir, f"{version[:20]}{RESULTS_SUFFIX}")
+
+    def publish(self, version, results):
+        """Atomically write {PredictionKey: result} computed on ``version``"""
+        path = self.path(version)
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        with open(tmp_path, 'wb') as fh:
+            pickle.dump(results, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        logger.info(f"Published {len(results)} precomputed predictions | version {version[:12]}")
+
+        published = sorted((os.path.join(self.segment_dir, f) for f in os.listdir(self.segment_dir)
+                            if f.endswith(RESULTS_SUFFIX)), key=os.path.getmtime)
+        for old in published[:-self.keep]:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+    def load(self, version):
+        """{PredictionKey: result} published for ``version``, or None"""
+        try:
+            with open(self.path(version), 'rb') as fh:
+                return pickle.load(fh)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+
+class SegmentPublisher:
+    """
+    Publisher side (one per server, e.g. the pre-fork master): owns a plain
+    DatasetManager on the CSV and publishes a segment on every reload/append.
+    ``start`` polls the CSV in a thread so a newly scraped draw is published
+    without any request; ``reload`` forces a re-read (the reload signal).
+    """
+
+    def __init__(self, segment_dir=None, csv_paths=None, interval=5.0):
+        self.segment_dir = segment_dir or default_segment_dir()
+        self.manager = DatasetManager(csv_paths)
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+        self.manager.add_listener(self._on_dataset_event)
+
+    def _on_dataset_event(self, event, frame):
+        self.publish()
+
+    def publish(self):
+        df = self.manager.get_frame(copy=False)
+        if df.empty or self.manager.version is None:
+            return None
+        return publish_segment(df, self.manager.version, self.segment_dir,
+                               source=os.path.abspath(self.manager.path))
+
+    def reload(self):
+        self.manager.invalidate()
+        if not self.manager.refresh():
+            self.publish()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.manager.refresh()
+            except Exception as e:
+                logger.warning(f"Segment publisher refresh failed: {e}")
+
+    def start(self):
+        """Publish the current dataset and keep following the CSV"""
+        if not self.manager.refresh():
+            self.publish()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='segment-publisher', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Publish the results CSV as a shared dataset segment')
+    parser.add_argument('csv', nargs='*', help='results CSV paths (default: the app\'s CSV search paths)')
+    parser.add_argument('--dir', default=os.environ.get(SEGMENT_DIR_ENV) or default_segment_dir(),
+                        help='segment directory')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    publisher = SegmentPublisher(args.dir, args.csv or None)
+    publisher.reload()
+    print(json.dumps(current_segment(args.dir)))
@@ -0,0 +1,41 @@
+"""
+Process Singletons
+Lazily built, thread-safe process-wide instances behind the get_x() accessors
+
+    @process_singleton
+    def get_model_registry():
+        \"\"\"Process-wide ModelRegistry\"\"\"
+        return ModelRegistry()
+
+The factory runs once, on first call (its arguments are only used then);
+``get_model_registry.reset()`` drops the instance so the next call builds
+a fresh one, which tests and forked workers use.
+"""
+import functools
+import threading
+
+
+def process_singleton(factory):
+    """Decorator: double-checked-lock, build-once accessor around ``factory``"""
+    lock = threading.Lock()
+    slot = []
+
+    @functools.wraps(factory)
+    def accessor(*args, **kwargs):
+        if not slot:
+            with lock:
+                if not slot:
+                    slot.append(factory(*args, **kwargs))
+        return slot[0]
+
+    def reset():
+        with lock:
+            slot.clear()
+
+    def peek():
+        """The instance if already built, else None (never builds)"""
+        return slot[0] if slot else None
+
+    accessor.reset = reset
+    accessor.peek = peek
+    return accessor
@@ -0,0 +1,206 @@
+"""
+Columnar Snapshot of the Normalized Draw History
+Typed Feather (Arrow IPC) file that can be memory-mapped instead of re-parsing the CSV
+"""
+import json
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    HAS_ARROW = True
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    feather = None
+    HAS_ARROW = False
+
+SNAPSHOT_SUFFIX = '.snapshot.feather'
+SNAPSHOT_FORMAT_VERSION = 3
+
+NUMBER_COLUMNS = ['number_1st', 'number_2nd', 'number_3rd']
+CATEGORY_COLUMNS = ['provider_key', 'lottery_type']
+# Derived on load, never stored
+ALIAS_COLUMNS = {'1st_real': 'number_1st', '2nd_real': 'number_2nd',
+                 '3rd_real': 'number_3rd', 'provider': 'provider_key'}
+
+MISSING_NUMBER = np.iinfo(np.uint16).max
+_NUMBER_STRINGS = np.array([f'{i:04d}' for i in range(10000)], dtype=object)
+
+
+def snapshot_path_for(csv_path):
+    """Snapshot file that sits next to a results CSV"""
+    return os.path.splitext(csv_path)[0] + SNAPSHOT_SUFFIX
+
+
+def is_fresh(snapshot_path, csv_path):
+    """True when the snapshot exists and is at least as new as the CSV"""
+    if not os.path.exists(snapshot_path):
+        return False
+    if not os.path.exists(csv_path):
+        return True
+    return os.stat(snapshot_path).st_mtime_ns >= os.stat(csv_path).st_mtime_ns
+
+
+def encode_numbers(values):
+    """'0123'-style strings (or None) -> uint16, missing as 65535"""
+    numeric = pd.to_numeric(pd.Series(values, dtype=object), errors='coerce')
+    return numeric.fillna(MISSING_NUMBER).to_numpy(dtype=np.uint16)
+
+
+def decode_numbers(codes):
+    """uint16 codes -> zero-padded strings, missing as None"""
+    codes = np.asarray(codes)
+    out = np.empty(len(codes), dtype=object)
+    present = codes != MISSING_NUMBER
+    out[present] = _NUMBER_STRINGS[codes[present]]
+    return out
+
+
+def to_columnar(df):
+    """Canonical frame -> typed frame ready for Arrow"""
+    out = {}
+    for col in df.columns:
+        if col in ALIAS_COLUMNS:
+            continue
+        series = df[col]
+        if col in NUMBER_COLUMNS:
+            out[col] = encode_numbers(series)
+        elif col in CATEGORY_COLUMNS:
+            out[col] = series.astype('category')
+        elif col == 'date_parsed':
+            out[col] = pd.to_datetime(series)
+        elif col == 'total_4d_found':
+            out[col] = series.astype(np.uint16)
+        elif series.dtype == object or pd.api.types.is_string_dtype(series):
+            # Raw CSV text columns; keep nulls as nulls
+            out[col] = series.where(series.isna(), series.astype(str))
+        else:
+            out[col] = series
+    return pd.DataFrame(out, index=pd.RangeIndex(len(df)))
+
+
+def canonical_dtypes(df):
+    """{column: dtype name} of the columns to_columnar stores in a narrower type"""
+    return {col: str(df[col].dtype) for col in CATEGORY_COLUMNS + ['total_4d_found'] if col in df.columns}
+
+
+def from_columnar(df, columns=None, dtypes=None):
+    """
+    Typed snapshot frame -> canonical frame (string numbers + legacy aliases),
+    with ``dtypes`` (from canonical_dtypes) cast back so the frame equals
+    the one parsed from the CSV: a categorical provider would make groupby
+    and value_counts report providers that are not in the data.
+    """
+    for col in NUMBER_COLUMNS:
+        if col in df.columns:
+            df[col] = decode_numbers(df[col].to_numpy())
+    for col, dtype in (dtypes or {}).items():
+        if col in df.columns:
+            df[col] = df[col].astype(dtype)
+    for alias, source in ALIAS_COLUMNS.items():
+        if source in df.columns:
+            df[alias] = df[source]
+    if columns:
+        # Restore the canonical column order (raw CSV columns stay positional)
+        df = df[[c for c in columns if c in df.columns]]
+    return df
+
+
+def _arrow_text_dtype():
+    """pandas' Arrow-backed string dtype with NaN for missing values (pandas >= 2.3), else None"""
+    try:
+        return pd.StringDtype('pyarrow', na_value=np.nan)
+    except TypeError:
+        return None
+
+
+def columnar_views(table, columns=None, dtypes=None):
+    """
+    Typed snapshot table -> the canonical frame from_columnar builds, but with
+    dates and text columns left as views of the (memory-mapped) Arrow buffers
+    instead of per-process copies (text as Arrow strings; object copies
+    before pandas 2.3). Numbers and ``dtypes`` are decoded exactly as
+    from_columnar does, so the frame has the CSV frame's dtypes: a number is
+    one of 10,000 shared strings, so a decoded column costs a pointer per row.
+    """
+    text = _arrow_text_dtype()
+    mapper = None
+    if text is not None:
+        mapper = lambda t: text if pa.types.is_string(t) or pa.types.is_large_string(t) else None
+    df = table.to_pandas(split_blocks=True, types_mapper=mapper)
+    return from_columnar(df, columns, dtypes)
+
+
+def write_snapshot(df, snapshot_path, source_version=None):
+    """Atomically write the canonical frame as an uncompressed (mmap-able) Feather file"""
+    if not HAS_ARROW:
+        logger.warning("pyarrow not installed - snapshot not written")
+        return False
+    table = pa.Table.from_pandas(to_columnar(df), preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[b'snapshot_format'] = str(SNAPSHOT_FORMAT_VERSION).encode()
+    metadata[b'columns'] = json.dumps([str(c) for c in df.columns]).encode()
+    metadata[b'dtypes'] = json.dumps(canonical_dtypes(df)).encode()
+    if source_version:
+        metadata[b'source_version'] = str(source_version).encode()
+    table = table.replace_schema_metadata(metadata)
+
+    tmp_path = f"{snapshot_path}.tmp{os.getpid()}"
+    feather.write_feather(table, tmp_path, compression='uncompressed')
+    os.replace(tmp_path, snapshot_path)
+    logger.info(f"Snapshot written: {snapshot_path} ({len(df)} rows)")
+    return True
+
+
+def read_snapshot(snapshot_path, views=False):
+    """
+    Memory-map a snapshot. Returns (canonical_frame, source_version),
+    or (None, None) if it is missing, unreadable or from another format version.
+    ``views=True`` keeps the columns on the mapped buffers (see columnar_views).
+    """
+    if not HAS_ARROW or not os.path.exists(snapshot_path):
+        return None, None
+    try:
+        table = feather.read_table(snapshot_path, memory_map=True)
+    except Exception as e:
+        logger.warning(f"Snapshot unreadable ({snapshot_path}): {e}")
+        return None, None
+    metadata = table.schema.metadata or {}
+    if metadata.get(b'snapshot_format') != str(SNAPSHOT_FORMAT_VERSION).encode():
+        return None, None
+    source_version = metadata.get(b'source_version', b'').decode() or None
+    columns = json.loads(metadata[b'columns']) if b'columns' in metadata else None
+    dtypes = json.loads(metadata[b'dtypes']) if b'dtypes' in metadata else None
+    if views:
+        return columnar_views(table, columns, dtypes), source_version
+    df = table.to_pandas(split_blocks=True)
+    return from_columnar(df, columns, dtypes), source_version
+
+
+def compile_snapshot(csv_path, snapshot_path=None):
+    """Parse + normalize a results CSV once and write its snapshot"""
+    from utils.dataset_manager import _file_digest, read_canonical_csv
+
+    snapshot_path = snapshot_path or snapshot_path_for(csv_path)
+    df = read_canonical_csv(csv_path)
+    write_snapshot(df, snapshot_path, source_version=_file_digest(csv_path))
+    return snapshot_path
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Compile results CSV(s) into columnar snapshots')
+    parser.add_argument('csv', nargs='*', help='results CSV paths (default: the app\'s CSV search paths)')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    from utils.dataset_manager import DEFAULT_CSV_PATHS
+    for path in args.csv or [p for p in DEFAULT_CSV_PATHS if os.path.exists(p)]:
+        print(compile_snapshot(path))
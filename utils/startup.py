@@ -0,0 +1,144 @@
+"""
+Startup
+Per-module import-time profile of the app, and background warm-up of the modules routes import lazily
+
+    python -m utils.startup [--module app] [--top 30]
+"""
+import argparse
+import importlib
+import logging
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from collections import namedtuple
+
+from utils.singleton import process_singleton
+
+logger = logging.getLogger(__name__)
+
+WARMUP_ENV = 'WARMUP_PLUGINS'
+WARMUP_DELAY_ENV = 'WARMUP_DELAY'
+DEFAULT_WARMUP_DELAY = 1.0
+
+# One line of ``python -X importtime``: times in seconds, depth = nesting level
+ImportTime = namedtuple('ImportTime', 'module self_seconds cumulative_seconds depth')
+
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)\s*$')
+
+# Held by background threads while they import (or may import) heavy
+# packages: the warm-up and the precompute scheduler take turns instead of
+# importing one package from two threads, which can trip the import
+# system's deadlock detection
+IMPORT_LOCK = threading.RLock()
+
+
+def warm_up_enabled():
+    """WARMUP_PLUGINS=1 (set by gunicorn.conf.py) turns the background warm-up on"""
+    return os.environ.get(WARMUP_ENV, '').strip().lower() in ('1', 'true', 'yes')
+
+
+def parse_importtime(text):
+    """``-X importtime`` stderr -> [ImportTime] in import order"""
+    rows = []
+    for line in text.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append(ImportTime(module, int(self_us) / 1e6, int(cumulative_us) / 1e6, (len(indent) - 1) // 2))
+    return rows
+
+
+def import_profile(module='app', cwd=None):
+    """
+    Import ``module`` in a fresh interpreter with ``-X importtime`` and
+    return its [ImportTime] rows. A fresh process is the only way to see
+    what the import really costs: in this one, everything is cached already.
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=cwd, capture_output=True, text=True)
+    rows = parse_importtime(result.stderr)
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed: {result.stderr.strip().splitlines()[-1:]}")
+    return rows
+
+
+def format_profile(rows, top=30):
+    """Slowest imports by cumulative time, with their own (self) time"""
+    total = sum(row.cumulative_seconds for row in rows if row.depth == 0)
+    lines = [f"{'cumulative':>10}  {'self':>8}  module", f"{total * 1000:>8.1f}ms  {'':>8}  (all imports)"]
+    for row in sorted(rows, key=lambda row: -row.cumulative_seconds)[:top]:
+        lines.append(f"{row.cumulative_seconds * 1000:>8.1f}ms  {row.self_seconds * 1000:>6.1f}ms  "
+                     f"{'  ' * row.depth}{row.module}")
+    return '\n'.join(lines)
+
+
+class WarmUp:
+    """
+    Imports modules the routes load on first use in a background thread,
+    so the first request of each route does not pay for them. Started once
+    the server is taking requests (idempotent); a module that fails to
+    import is logged and skipped, and the route will raise as it did.
+
+    ``then`` runs in the same thread once the imports are done. Each import
+    holds IMPORT_LOCK, so background work that imports the same packages
+    (e.g. unpickling models) waits for it rather than racing it.
+    """
+
+    def __init__(self):
+        self.seconds = {}
+        self.failed = {}
+        self.done = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self, modules, delay=None, then=None):
+        with self._lock:
+            if self._thread is None:
+                if delay is None:
+                    delay = float(os.environ.get(WARMUP_DELAY_ENV, DEFAULT_WARMUP_DELAY))
+                self._thread = threading.Thread(target=self._run, args=(tuple(modules), delay, then),
+                                                name='warm-up', daemon=True)
+                self._thread.start()
+        return self
+
+    def _import(self, name):
+        with IMPORT_LOCK:
+            started = time.perf_counter()
+            importlib.import_module(name)
+            self.seconds[name] = time.perf_counter() - started
+
+    def _run(self, modules, delay, then):
+        time.sleep(delay)
+        began = time.perf_counter()
+        for name in modules:
+            try:
+                self._import(name)
+            except Exception as e:
+                self.failed[name] = str(e)
+                logger.warning(f"Warm-up skipped {name}: {e}")
+        self.done.set()
+        logger.info(f"Warm-up imported {len(self.seconds)}/{len(modules)} modules "
+                    f"in {time.perf_counter() - began:.2f}s")
+        if then is not None:
+            then()
+
+    def stats(self):
+        return {'running': self._thread is not None and not self.done.is_set(), 'done': self.done.is_set(),
+                'seconds': dict(self.seconds), 'failed': dict(self.failed)}
+
+
+@process_singleton
+def get_warm_up():
+    """Process-wide WarmUp"""
+    return WarmUp()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Import-time profile of the app (python -X importtime)')
+    parser.add_argument('--module', default='app')
+    parser.add_argument('--top', type=int, default=30)
+    args = parser.parse_args()
+    print(format_profile(import_profile(args.module), top=args.top))
@@ -0,0 +1,362 @@
+"""
+Draw Statistics Store
+Number / digit / digit-pair / transition counters per provider, kept in step with the dataset
+"""
+import logging
+import threading
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import LRUCache, _frame_key
+from utils.dataset_manager import frame_origin
+from utils.singleton import process_singleton
+
+logger = logging.getLogger(__name__)
+
+PRIZE_COLUMNS = ['number_1st', 'number_2nd', 'number_3rd']
+ALL_SCOPE = 'all'
+NUM_NUMBERS = 10000
+
+# Digits of every 4D number, (10000, 4)
+NUMBER_DIGITS = (np.arange(NUM_NUMBERS, dtype=np.int64)[:, None] // np.array([1000, 100, 10, 1])) % 10
+
+
+def _valid(number):
+    return isinstance(number, str) and len(number) == 4 and number.isdigit()
+
+
+def _overlap(a, b):
+    """Digits two numbers share (the 'repeated next draw' measure)"""
+    return len(set(a) & set(b))
+
+
+def month_bounds(month):
+    """'YYYY-MM' -> (first day, first day of next month), or None"""
+    try:
+        start = pd.Timestamp(f'{month}-01')
+    except (ValueError, TypeError):
+        return None
+    return start, start + pd.offsets.MonthBegin(1)
+
+
+class DrawStats:
+    """
+    Counters over one scope's draws (a provider, or every provider).
+
+    Draws are held oldest first, one slot per canonical row, with ``None``
+    for a missing prize. Reading them newest first, prize by prize, gives
+    the number sequence the predictors always built from the frame
+    (all 1st prizes, then all 2nd, then all 3rd).
+
+    - ``numbers`` / ``digits`` / ``digit_pairs``: counts over every prize number
+    - ``transitions``: per prize column, (earlier, later) consecutive numbers
+    - ``successors`` / ``successor_overlap``: per later number, how often it
+      followed another and how many digits they shared
+    - ``repeats``: [shared-digit, total] consecutive 1st-prize transitions
+
+    ``add`` updates everything in O(1) counter work per draw, so merging
+    new rows never rescans the history.
+    """
+
+    def __init__(self, scope=ALL_SCOPE, key=None):
+        self.scope = scope
+        self.key = key
+        self.dates = []
+        self.prizes = ([], [], [])
+        self.numbers = Counter()
+        self.digits = Counter()
+        self.digit_pairs = Counter()
+        self.transitions = (Counter(), Counter(), Counter())
+        self.successors = np.zeros(NUM_NUMBERS, dtype=np.int64)
+        self.successor_overlap = np.zeros(NUM_NUMBERS, dtype=np.int64)
+        self.repeats = [0, 0]
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.dates)
+
+    @classmethod
+    def from_frame(cls, df, scope=ALL_SCOPE, key=None):
+        """Build from a canonical (newest first) frame"""
+        stats = cls(scope, key)
+        if df.empty:
+            return stats
+        stats.dates = df['date_parsed'].tolist()[::-1]
+        for k, col in enumerate(PRIZE_COLUMNS):
+            values = df[col].tolist()[::-1] if col in df.columns else [None] * len(df)
+            column = [n if _valid(n) else None for n in values]
+            stats.prizes[k].extend(column)
+            present = [n for n in column if n is not None]
+            stats._count(reversed(present))
+            for earlier, later in zip(present, present[1:]):
+                stats._link(k, earlier, later, 1)
+        return stats
+
+    def _count(self, numbers, sign=1):
+        for number in numbers:
+            self.numbers[number] += sign
+            for i, d in enumerate(number):
+                self.digits[d] += sign
+                if i < 3:
+                    self.digit_pairs[number[i:i + 2]] += sign
+
+    def _link(self, k, earlier, later, sign):
+        transitions = self.transitions[k]
+        transitions[(earlier, later)] += sign
+        if not transitions[(earlier, later)]:
+            del transitions[(earlier, later)]
+        code = int(later)
+        shared = _overlap(earlier, later)
+        self.successors[code] += sign
+        self.successor_overlap[code] += sign * shared
+        if k == 0:
+            self.repeats[0] += sign * (shared > 0)
+            self.repeats[1] += sign
+
+    def _neighbours(self, column, pos):
+        """Nearest present numbers before / from ``pos`` in a column"""
+        earlier = next((column[i] for i in range(pos - 1, -1, -1) if column[i] is not None), None)
+        later = next((column[i] for i in range(pos, len(column)) if column[i] is not None), None)
+        return earlier, later
+
+    def add(self, date, numbers):
+        """
+        Merge one draw. It lands before (oldest-first order) every draw on
+        the same date: newest first, the dataset manager places appended
+        rows after the same-date rows already in the file.
+        """
+        with self._lock:
+            pos = bisect_left(self.dates, date)
+            self.dates.insert(pos, date)
+            for k, number in enumerate(numbers):
+                column = self.prizes[k]
+                number = number if _valid(number) else None
+                if number is not None:
+                    earlier, later = self._neighbours(column, pos)
+                    if earlier is not None and later is not None:
+                        self._link(k, earlier, later, -1)
+                    if earlier is not None:
+                        self._link(k, earlier, number, 1)
+                    if later is not None:
+                        self._link(k, number, later, 1)
+                    self._count([number])
+                column.insert(pos, number)
+
+    # ---- queries ----
+
+    def span(self, start=None, end=None, include_start=True):
+        """(lo, hi) draw range dated within [start, end); start exclusive if include_start=False"""
+        with self._lock:
+            if start is None:
+                lo = 0
+            else:
+                lo = (bisect_left if include_start else bisect_right)(self.dates, pd.Timestamp(start))
+            hi = len(self.dates) if end is None else bisect_left(self.dates, pd.Timestamp(end))
+            return lo, max(lo, hi)
+
+    def latest_date(self, lo=0, hi=None):
+        with self._lock:
+            hi = len(self.dates) if hi is None else hi
+            return self.dates[hi - 1] if hi > lo else None
+
+    def sequence(self, lo=0, hi=None):
+        """Present numbers of draws [lo, hi) newest first, 1st prizes then 2nd then 3rd"""
+        with self._lock:
+            hi = len(self.dates) if hi is None else hi
+            return [n for column in self.prizes for n in reversed(column[lo:hi]) if n is not None]
+
+    def recent_numbers(self, lookback=None):
+        """First ``lookback`` numbers of the full sequence (all if falsy)"""
+        with self._lock:
+            if not lookback:
+                return self.sequence()
+            stream = (n for column in self.prizes for n in reversed(column) if n is not None)
+            return list(islice(stream, lookback))
+
+    def counts(self, lo=0, hi=None):
+        """Number counts over draws [lo, hi), keys in sequence order"""
+        with self._lock:
+            if lo == 0 and (hi is None or hi == len(self.dates)):
+                return Counter(self.numbers)
+            return Counter(self.sequence(lo, hi))
+
+    def _boundaries(self):
+        """
+        Neighbours the flat sequence has across prize columns, in sequence
+        order: the oldest number of one column, then the newest of the next
+        """
+        ends = []
+        for column in self.prizes:
+            newest = next((n for n in reversed(column) if n is not None), None)
+            if newest is not None:
+                ends.append((newest, next(n for n in column if n is not None)))
+        return [(prev[1], nxt[0]) for prev, nxt in zip(ends, ends[1:])]
+
+    def number_pairs(self, top_n=20):
+        """
+        Most common 'first-second' neighbours of the flat sequence. Equal
+        counts come in counter insertion order, so after appends their order
+        can differ from a rebuild's; the counts themselves do not.
+        """
+        with self._lock:
+            pairs = Counter()
+            for transitions in self.transitions:
+                for (earlier, later), count in reversed(transitions.items()):
+                    pairs[f'{later}-{earlier}'] += count
+            for first, second in self._boundaries():
+                pairs[f'{first}-{second}'] += 1
+            return pairs.most_common(top_n)
+
+    def successor_moments(self):
+        """
+        (count, overlap) arrays over the flat sequence's neighbour pairs, indexed
+        by the newer-in-sequence number; column boundaries included
+        """
+        with self._lock:
+            counts = self.successors.copy()
+            overlap = self.successor_overlap.copy()
+            for first, second in self._boundaries():
+                counts[int(first)] += 1
+                overlap[int(first)] += _overlap(first, second)
+            return counts, overlap
+
+    def repeat_rate(self):
+        """Share of consecutive 1st prizes that repeat a digit"""
+        matches, total = self.repeats
+        return (matches / total) if total else 0.0
+
+
+def weighted_linear_fit(features, counts, target_sums):
+    """
+    Coefficients of StandardScaler + LinearRegression over grouped samples:
+    feature row i stands for ``counts[i]`` samples whose targets sum to
+    ``target_sums[i]``. Exact integer moments, so no per-sample pass is needed.
+    Constant features get a zero coefficient, as sklearn gives them.
+    """
+    # Python ints: the squared sums outgrow int64 on long histories
+    X = np.asarray(features, dtype=np.int64).astype(object)
+    w = np.asarray(counts, dtype=np.int64).astype(object)
+    y = np.asarray(target_sums, dtype=np.int64).astype(object)
+    n = int(w.sum())
+    sums = list(X.T @ w)
+    cross = ((X.T * w) @ X).tolist()
+    target_cross = list(X.T @ y)
+    y_sum = int(y.sum())
+
+    k = X.shape[1]
+    cov = np.array([[(n * cross[i][j] - sums[i] * sums[j]) / n ** 2 for j in range(k)] for i in range(k)])
+    cov_y = np.array([(n * target_cross[i] - sums[i] * y_sum) / n ** 2 for i in range(k)])
+    scale = np.sqrt(np.clip(np.diag(cov), 0, None))
+    scale[scale == 0] = 1.0
+    scaled = cov / np.outer(scale, scale)
+    return np.linalg.pinv(scaled) @ (cov_y / scale)
+
+
+class StatsStore:
+    """
+    DrawStats for every provider plus 'all', following the DatasetManager:
+    a 'reload' rebuilds them, an 'append' merges only the new rows.
+
+    ``stats_for(df, provider)`` answers from the maintained counters when
+    ``df`` is the manager's current canonical frame (or a provider_slice of
+    it), recognised by identity (dataset_manager.frame_origin), and the
+    provider filter is explicit; any other frame gets a one-off DrawStats,
+    cached by its structural key.
+    """
+
+    def __init__(self, manager):
+        self.manager = manager
+        self._scopes = {}
+        self._version = None
+        self._lock = threading.RLock()
+        self._frames = LRUCache(maxsize=16, name='stats.frames')
+        manager.add_listener(self._on_dataset)
+        frame = manager.get_frame(copy=False)
+        if not frame.empty and not self._scopes:
+            self.rebuild(frame)
+
+    def _on_dataset(self, event, frame):
+        if event == 'append' and self._scopes:
+            self.merge(frame)
+        else:
+            self.rebuild(frame)
+
+    def rebuild(self, df):
+        scopes = {}
+        if not df.empty:
+            scopes[ALL_SCOPE] = DrawStats.from_frame(df, ALL_SCOPE)
+            for provider, group in df.groupby('provider_key', sort=False, observed=True):
+                scopes[provider] = DrawStats.from_frame(group, provider)
+        with self._lock:
+            self._scopes = scopes
+            self._version = self.manager._version
+        logger.info(f"Stats store rebuilt: {len(df)} draws, {len(scopes) - 1 if scopes else 0} providers")
+
+    def merge(self, new_rows):
+        """Fold newly appended canonical rows into the counters"""
+        with self._lock:
+            # Frame order (newest first): each row lands before the same-date ones added so far
+            for row in new_rows[['date_parsed', 'provider_key'] + PRIZE_COLUMNS].itertuples(index=False):
+                date, provider, numbers = row[0], row[1], row[2:]
+                self._scopes[ALL_SCOPE].add(date, numbers)
+                self._scopes.setdefault(provider, DrawStats(provider)).add(date, numbers)
+            self._version = self.manager._version
+
+    def scope(self, name=ALL_SCOPE):
+        """Maintained DrawStats of a provider (or 'all'); empty if unknown"""
+        with self._lock:
+            return self._scopes.get(name or ALL_SCOPE) or DrawStats(name or ALL_SCOPE)
+
+    def providers(self):
+        return self.providers_at()[1]
+
+    def providers_at(self):
+        """(dataset version, providers) of the maintained scopes, read together"""
+        self.manager.refresh()
+        with self._lock:
+            return self._version, sorted(p for p in self._scopes if p != ALL_SCOPE)
+
+    def _scope_of(self, df):
+        """Maintained scope ``df`` is the canonical frame (or provider slice) of, else None"""
+        origin = frame_origin(df)
+        if origin is None:
+            return None
+        version, scope = origin
+        with self._lock:
+            return scope if version == self._version and scope in self._scopes else None
+
+    def stats_for(self, df, provider=None):
+        """DrawStats for a frame, optionally narrowed to one provider"""
+        provider = None if provider in (None, '', ALL_SCOPE) else provider
+        self.manager.refresh()
+        scope = self._scope_of(df)
+        if scope == ALL_SCOPE:
+            return self.scope(provider or ALL_SCOPE)
+        if scope is not None:
+            return self.scope(scope) if provider in (None, scope) else DrawStats(provider)
+
+        if provider and 'provider' in df.columns:
+            df = df[df['provider'] == provider]
+        key = (_frame_key(df), provider)
+        stats = self._frames.get(key)
+        if stats is None:
+            stats = DrawStats.from_frame(df, provider or ALL_SCOPE, key=key)
+            self._frames.set(key, stats)
+        return stats
+
+    def cache_key(self, stats):
+        """Hashable token that changes whenever ``stats`` can change"""
+        if stats.key is not None:
+            return stats.key
+        return ('scope', self._version, stats.scope, len(stats))
+
+
+@process_singleton
+def get_stats_store():
+    """Process-wide StatsStore bound to the process-wide DatasetManager"""
+    from utils.dataset_manager import get_dataset_manager
+    return StatsStore(get_dataset_manager())
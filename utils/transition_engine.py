@@ -0,0 +1,247 @@
+"""
+Transition Engine
+Number- and digit-level transition counts for 4D draw sequences, as NumPy / sparse arrays
+"""
+import numpy as np
+import scipy.sparse as sp
+
+NUM_STATES = 10000
+MISSING = np.iinfo(np.uint16).max
+_POW10 = np.array([1000, 100, 10, 1], dtype=np.int64)
+
+
+def encode_numbers(numbers):
+    """'0123'-style values -> uint16 ids; anything that is not a 4-digit number -> MISSING"""
+    out = np.full(len(numbers), MISSING, dtype=np.uint16)
+    for i, n in enumerate(numbers):
+        s = str(n).strip()
+        if len(s) == 4 and s.isdigit():
+            out[i] = int(s)
+    return out
+
+
+def decode_number(code):
+    return f'{int(code):04d}'
+
+
+def number_digits(codes):
+    """uint16 ids -> (N, 4) digit array"""
+    return (np.asarray(codes, dtype=np.int64)[:, None] // _POW10) % 10
+
+
+def _sequence(draws):
+    """Numbers of a draw sequence: dicts with 'number', plain values, or a canonical frame's 1st prizes"""
+    if hasattr(draws, 'columns'):
+        col = 'number_1st' if 'number_1st' in draws.columns else '1st_real'
+        return draws[col].tolist()
+    return [d.get('number', '') if isinstance(d, dict) else d for d in draws]
+
+
+class TransitionEngine:
+    """
+    Transition counts of a sequence of 4D numbers, where each number is
+    followed by the next one in the sequence.
+
+    - ``digits``: (4, 10, 10) counts, one current-digit x next-digit table per position
+    - ``matrix``: 10000 x 10000 sparse (CSR) number -> next number counts
+
+    A pair is only counted when both numbers are valid, so gaps break the
+    chain. ``extend`` appends to the sequence in O(new numbers); the sparse
+    matrix absorbs pending pairs lazily on the next query.
+
+    The engine also reads like the nested dicts it replaced:
+    ``engine['1234']`` / ``engine.get('1234', {})`` give a number's
+    {next number: count}, and ``engine['sequence_patterns']`` /
+    ``engine['digit_transitions']`` give the day-to-day learner's
+    {number: {next: count}} and {digit: {position: {next digit: count}}}.
+    """
+
+    LEGACY_VIEWS = ('sequence_patterns', 'digit_transitions')
+
+    def __init__(self):
+        self.digits = np.zeros((4, 10, 10), dtype=np.int64)
+        self._matrix = sp.csr_matrix((NUM_STATES, NUM_STATES), dtype=np.int64)
+        self._pending = []
+        self._last = MISSING
+        self._powers = {}
+
+    @classmethod
+    def from_draws(cls, draws):
+        engine = cls()
+        engine.extend(_sequence(draws))
+        return engine
+
+    def extend(self, numbers):
+        """Append numbers to the sequence (continuing from the last one seen)"""
+        codes = encode_numbers(numbers)
+        if not len(codes):
+            return self
+        chain = np.concatenate([[self._last], codes]).astype(np.uint16)
+        src, dst = chain[:-1], chain[1:]
+        valid = (src != MISSING) & (dst != MISSING)
+        src, dst = src[valid].astype(np.int64), dst[valid].astype(np.int64)
+        if len(src):
+            src_digits, dst_digits = number_digits(src), number_digits(dst)
+            for pos in range(4):
+                np.add.at(self.digits[pos], (src_digits[:, pos], dst_digits[:, pos]), 1)
+            self._pending.append((src, dst))
+            self._powers.clear()
+        self._last = codes[-1]
+        return self
+
+    @property
+    def matrix(self):
+        """Number-level transition counts (CSR, int64)"""
+        if self._pending:
+            src = np.concatenate([p[0] for p in self._pending])
+            dst = np.concatenate([p[1] for p in self._pending])
+            added = sp.csr_matrix((np.ones(len(src), dtype=np.int64), (src, dst)), shape=(NUM_STATES, NUM_STATES))
+            self._matrix = (self._matrix + added).tocsr()
+            self._matrix.sort_indices()
+            self._pending = []
+        return self._matrix
+
+    # ---- number level ----
+
+    def __len__(self):
+        """Numbers that have at least one follower"""
+        return int(np.count_nonzero(np.diff(self.matrix.indptr)))
+
+    def __contains__(self, number):
+        if number in self.LEGACY_VIEWS:
+            return True
+        codes = encode_numbers([number])
+        if codes[0] == MISSING:
+            return False
+        indptr = self.matrix.indptr
+        return indptr[codes[0] + 1] > indptr[codes[0]]
+
+    def __iter__(self):
+        """Numbers that have at least one follower, ascending"""
+        return (decode_number(c) for c in np.flatnonzero(np.diff(self.matrix.indptr)))
+
+    def __getitem__(self, key):
+        if key == 'sequence_patterns':
+            return self.as_dict()
+        if key == 'digit_transitions':
+            return self.digit_transitions()
+        if key in self:
+            return dict(self.followers(key))
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return list(self)
+
+    def items(self):
+        return [(number, dict(self.followers(number))) for number in self]
+
+    def as_dict(self):
+        """{number: {next number: count}}"""
+        return dict(self.items())
+
+    def total(self):
+        """Number of counted transitions"""
+        return int(self.matrix.sum())
+
+    def out_degree(self):
+        """Transitions counted out of every number, (10000,)"""
+        return np.asarray(self.matrix.sum(axis=1)).ravel()
+
+    def followers(self, number):
+        """[(next number, count)] of a number, most frequent first (ties by number)"""
+        codes = encode_numbers([number])
+        if codes[0] == MISSING:
+            return []
+        m = self.matrix
+        lo, hi = m.indptr[codes[0]], m.indptr[codes[0] + 1]
+        cols, counts = m.indices[lo:hi], m.data[lo:hi]
+        order = np.argsort(-counts, kind='stable')
+        return [(decode_number(c), int(n)) for c, n in zip(cols[order], counts[order])]
+
+    def target_counts(self):
+        """How often each number was the 'next' state, (10000,)"""
+        return np.asarray(self.matrix.sum(axis=0)).ravel()
+
+    def probability_matrix(self, steps=1):
+        """
+        Row-normalised transition matrix raised to ``steps`` (cached per step
+        count). Powers fill in quickly on long histories; top_k propagates
+        only the queried rows instead.
+        """
+        steps = max(int(steps), 1)
+        if steps not in self._powers:
+            if steps == 1:
+                degree = self.out_degree().astype(np.float64)
+                scale = np.divide(1.0, degree, out=np.zeros_like(degree), where=degree > 0)
+                self._powers[1] = sp.diags(scale) @ self.matrix.astype(np.float64)
+            else:
+                self._powers[steps] = (self.probability_matrix(steps - 1) @ self.probability_matrix(1)).tocsr()
+        return self._powers[steps]
+
+    def top_k(self, numbers, k=5, steps=1):
+        """
+        Batched next-state query: for each number, the ``k`` most likely
+        numbers ``steps`` draws later. Returns one [(number, probability)]
+        list per input, most likely first; unseen numbers get [].
+        """
+        codes = encode_numbers(numbers)
+        valid = codes != MISSING
+        results = [[] for _ in codes]
+        if not valid.any():
+            return results
+        transition = self.probability_matrix(1)
+        dist = transition[codes[valid].astype(np.int64)]
+        for _ in range(max(int(steps), 1) - 1):
+            dist = dist @ transition
+        rows = dist.toarray()
+        k = min(k, NUM_STATES)
+        top = np.argpartition(-rows, k - 1, axis=1)[:, :k]
+        for out_idx, row, cand in zip(np.flatnonzero(valid), rows, top):
+            probs = row[cand]
+            order = np.lexsort((cand, -probs))
+            results[out_idx] = [(decode_number(cand[i]), float(probs[i])) for i in order if probs[i] > 0]
+        return results
+
+    # ---- digit level ----
+
+    def digit_probabilities(self, number):
+        """(4, 10) next-digit probabilities per position given a number's digits"""
+        codes = encode_numbers([number])
+        if codes[0] == MISSING:
+            return np.zeros((4, 10))
+        current = number_digits(codes)[0]
+        counts = self.digits[np.arange(4), current].astype(np.float64)
+        totals = counts.sum(axis=1, keepdims=True)
+        return np.divide(counts, totals, out=np.zeros_like(counts), where=totals > 0)
+
+    def digit_transitions(self):
+        """{current digit: {position: {next digit: count}}}, counted pairs only"""
+        out = {}
+        for pos, current, nxt in zip(*np.nonzero(self.digits)):
+            out.setdefault(str(current), {}).setdefault(int(pos), {})[str(nxt)] = int(self.digits[pos, current, nxt])
+        return out
+
+    def statistics(self):
+        """Summary of the number-level chain"""
+        m = self.matrix
+        fan_out = np.diff(m.indptr)
+        sources = np.flatnonzero(fan_out)
+        stats = {
+            'unique_numbers': len(sources),
+            'total_transitions': int(m.data.sum()),
+            'avg_transitions_per_number': 0,
+            'most_connected': None,
+            'least_connected': None,
+        }
+        if len(sources):
+            stats['avg_transitions_per_number'] = float(fan_out[sources].mean())
+            most, least = sources[np.argmax(fan_out[sources])], sources[np.argmin(fan_out[sources])]
+            stats['most_connected'] = {'number': decode_number(most), 'followers': int(fan_out[most])}
+            stats['least_connected'] = {'number': decode_number(least), 'followers': int(fan_out[least])}
+        return stats